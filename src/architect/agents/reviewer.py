@@ -148,6 +148,15 @@ class AutoReviewer:
             if hasattr(result, "cost_tracker") and result.cost_tracker:
                 cost = result.cost_tracker.total_cost_usd
 
+            # Escalate: a cheaper review model produced no usable review,
+            # retry once with the builder's model
+            if not response.strip() and self.review_model:
+                self.log.warning("auto_review.escalate", review_model=self.review_model)
+                result = self.agent_factory(agent="review", model=None).run(prompt)
+                response = getattr(result, "final_output", "") or ""
+                if hasattr(result, "cost_tracker") and result.cost_tracker:
+                    cost += result.cost_tracker.total_cost_usd
+
             # Detect "no issues" in both languages
             has_issues = (
                 "sin issues" not in response.lower()
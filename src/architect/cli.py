@@ -10,54 +10,20 @@ import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 import click
 
-from .agents import AgentNotFoundError, get_agent, list_available_agents
-from .config.loader import load_config
-from .i18n import set_language as _set_language
-from .core import AgentLoop, ContextBuilder, ContextManager, MixedModeRunner, SelfEvaluator
-from .core.shutdown import GracefulShutdown
-from .costs import CostTracker, PriceLoader
-from .execution import ExecutionEngine
-from .indexer import IndexCache, RepoIndex, RepoIndexer
-from .llm import LLMAdapter, LocalLLMCache
-from .logging import configure_logging
-from .mcp import MCPDiscovery
-from .tools import ToolRegistry, register_all_tools
-from .tools.setup import register_dispatch_tool
-
-# v4-A1: Complete hooks system
-from .core.hooks import HookConfig, HookEvent, HookExecutor, HooksRegistry
-# v4-A2: Guardrails
-from .core.guardrails import GuardrailsEngine
-# v4-A3: Skills ecosystem
-from .skills import ProceduralMemory, SkillInstaller, SkillsLoader
-# v4-B1: Sessions
-from .features.sessions import SessionManager, generate_session_id
-# v4-B2: Reports
-from .features.report import ExecutionReport, ReportGenerator, collect_git_diff
-# v4-B4: Dry Run Tracker
-from .features.dryrun import DryRunTracker
-# v4-C1: Ralph Loop
-from .features.ralph import RalphConfig, RalphLoop
-# v4-C2: Parallel Runs
-from .features.parallel import ParallelConfig, ParallelRunner
-# v4-C3: Pipelines
-from .features.pipelines import PipelineRunner, PipelineValidationError
-# v4-C4: Checkpoints
-from .features.checkpoints import CheckpointManager
-# v4-C5: Auto-Review
-from .agents.reviewer import AutoReviewer
-# v4-D3: Competitive Eval
-from .features.competitive import CompetitiveConfig, CompetitiveEval
-# v4-D2: Code Health Delta
-from .core.health import CodeHealthAnalyzer
-# v4-D4: Telemetry
-from .telemetry.otel import create_tracer
 # v4-D5: Preset Configs
-from .config.presets import AVAILABLE_PRESETS, PresetManager
+from .config.presets import AVAILABLE_PRESETS
+
+# Subsystems are imported inside the commands that use them, so
+# `architect --help` (and light commands like `sessions`) start fast.
+# LiteLLM in particular is only loaded on the first LLM call.
+if TYPE_CHECKING:
+    from .config.schema import ContextConfig
+    from .core.hooks import HooksRegistry
+    from .llm import Cassette
 
 # Exit codes
 EXIT_SUCCESS = 0
@@ -139,6 +105,92 @@ def _print_result_separator(quiet: bool) -> None:
         click.echo(f"\n─── Result {'─' * 40}\n", err=True)
 
 
+def _cassette_options(fn: Callable) -> Callable:
+    """Add the --record/--replay cassette options to a command.
+
+    The options also read ARCHITECT_RECORD / ARCHITECT_REPLAY so that
+    worker subprocesses (parallel, eval) inherit them.
+    """
+    options = [
+        click.option(
+            "--record",
+            "record_path",
+            type=click.Path(dir_okay=False, path_type=Path),
+            envvar="ARCHITECT_RECORD",
+            default=None,
+            help="Record every LLM call of the session to a cassette (JSONL)",
+        ),
+        click.option(
+            "--replay",
+            "replay_path",
+            type=click.Path(dir_okay=False, path_type=Path),
+            envvar="ARCHITECT_REPLAY",
+            default=None,
+            help="Replay LLM responses from a cassette instead of calling the provider",
+        ),
+        click.option(
+            "--replay-match",
+            "replay_match",
+            type=click.Choice(["order", "key"]),
+            default="order",
+            help="Match replayed calls by recorded order or by request key (default: order)",
+        ),
+        click.option(
+            "--replay-realtime",
+            "replay_realtime",
+            is_flag=True,
+            default=False,
+            help="Reproduce the recorded streaming chunk timing on replay",
+        ),
+    ]
+    for option in reversed(options):
+        fn = option(fn)
+    return fn
+
+
+def _open_cassette(
+    record_path: Path | None,
+    replay_path: Path | None,
+    replay_match: str = "order",
+    replay_realtime: bool = False,
+) -> "Cassette | None":
+    """Open the session cassette requested on the command line, if any.
+
+    Exits with EXIT_CONFIG_ERROR if both modes are requested or the replay
+    cassette cannot be read.
+    """
+    from .llm import Cassette, CassetteError
+
+    if record_path and replay_path:
+        click.echo("Error: --record and --replay are mutually exclusive", err=True)
+        sys.exit(EXIT_CONFIG_ERROR)
+    try:
+        if replay_path:
+            return Cassette(
+                replay_path, mode="replay", match=replay_match, realtime=replay_realtime  # type: ignore[arg-type]
+            )
+        if record_path:
+            return Cassette(record_path, mode="record")
+    except (CassetteError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(EXIT_CONFIG_ERROR)
+    return None
+
+
+def _session_context_config(
+    context_config: "ContextConfig", cassette: "Cassette | None"
+) -> "ContextConfig":
+    """Context config for a session, given its cassette.
+
+    Background summary precompute is turned off while recording or
+    replaying: its LLM calls would interleave with the agent's at
+    nondeterministic points and break order-matched replay.
+    """
+    if cassette is None or context_config.precompute_summary_at <= 0:
+        return context_config
+    return context_config.model_copy(update={"precompute_summary_at": 0.0})
+
+
 @click.group()
 @click.version_option(version=_VERSION, prog_name="architect")
 def main() -> None:
@@ -348,6 +400,14 @@ def main() -> None:
     default=False,
     help="Run code health analysis before/after (v4-D2)",
 )
+@click.option(
+    "--no-daemon",
+    "no_daemon",
+    is_flag=True,
+    default=False,
+    help="Run in this process even if an `architect serve` daemon is listening",
+)
+@_cassette_options
 def run(prompt: str, **kwargs) -> None:  # type: ignore
     """Run a task using an AI agent.
 
@@ -386,6 +446,39 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
         # With cost limit and cost summary
         $ architect run "refactor everything" --budget 0.50 --show-costs
     """
+    from .features.daemon import active_warm_state, forward_to_daemon
+
+    # Thin client: hand the run to a warm `architect serve` daemon if one is
+    # listening for this checkout (before importing anything heavy)
+    if not kwargs.get("no_daemon"):
+        daemon_exit_code = forward_to_daemon(click.get_current_context().params)
+        if daemon_exit_code is not None:
+            sys.exit(daemon_exit_code)
+
+    from .agents import AgentNotFoundError, get_agent, list_available_agents
+    from .config.loader import load_config
+    from .core import AgentLoop, ContextBuilder, ContextManager, SelfEvaluator
+    from .core.guardrails import GuardrailsEngine
+    from .core.health import CodeHealthAnalyzer
+    from .core.hooks import HookExecutor
+    from .core.shutdown import GracefulShutdown
+    from .costs import CostLedger, CostTracker, LedgerContext, PriceLoader
+    from .execution import ExecutionEngine
+    from .features.dryrun import DryRunTracker
+    from .features.report import ExecutionReport, ReportGenerator, collect_git_diff
+    from .features.sessions import SessionManager
+    from .http_pool import configure_http_pool, get_http_pool
+    from .i18n import set_language as _set_language
+    from .indexer import IndexCache, RepoIndex, RepoIndexer
+    from .llm import LLMAdapter, LocalLLMCache, ModelCascade
+    from .logging import configure_logging
+    from .mcp import MCPDiscovery
+    from .skills import ProceduralMemory, SkillsLoader
+    from .telemetry.otel import create_tracer
+    from .tools import ToolRegistry, register_all_tools
+    from .tools.setup import register_dispatch_tool
+
+    cascade: ModelCascade | None = None
     try:
         # Load configuration
         config = load_config(
@@ -401,6 +494,9 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
             quiet=kwargs.get("quiet", False),
         )
 
+        # Shared keep-alive pool for LLM and MCP HTTP calls
+        configure_http_pool(config.http)
+
         # Install GracefulShutdown for SIGINT + SIGTERM (after logging)
         shutdown = GracefulShutdown()
 
@@ -426,6 +522,9 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
         if kwargs.get("no_commands"):
             config.commands.enabled = False
 
+        # Warm state when executed by `architect serve` (None otherwise)
+        warm = active_warm_state()
+
         # Create tool registry
         registry = ToolRegistry()
         register_all_tools(registry, config.workspace, config.commands)
@@ -437,7 +536,7 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
                     f"Discovering MCP tools from {len(config.mcp.servers)} server(s)...",
                     err=True,
                 )
-            discovery = MCPDiscovery()
+            discovery = warm.mcp_discovery() if warm else MCPDiscovery()
             mcp_stats = discovery.discover_and_register(config.mcp.servers, registry)
 
             if not kwargs.get("quiet") and kwargs.get("verbose", 0) >= 1:
@@ -462,18 +561,23 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
                 exclude_dirs=config.indexer.exclude_dirs,
                 exclude_patterns=config.indexer.exclude_patterns,
             )
-            cache = IndexCache() if config.indexer.use_cache else None
-            if cache:
-                repo_index = cache.get(workspace_root)
-            if repo_index is None:
-                repo_index = indexer.build_index()
+            if warm:
+                # Kept in memory and updated incrementally between daemon runs
+                repo_index = warm.repo_index(indexer)
+            else:
+                cache = IndexCache() if config.indexer.use_cache else None
                 if cache:
-                    cache.set(workspace_root, repo_index)
+                    repo_index = cache.get(workspace_root)
+                if repo_index is None:
+                    repo_index = indexer.build_index()
+                    if cache:
+                        cache.set(workspace_root, repo_index)
 
         # v4-A3: Create SkillsLoader and load project context
         skills_loader: SkillsLoader | None = None
         if config.skills.auto_discover:
-            skills_loader = SkillsLoader(str(Path(config.workspace.root).resolve()))
+            skills_root = str(Path(config.workspace.root).resolve())
+            skills_loader = warm.skills_loader(skills_root) if warm else SkillsLoader(skills_root)
             skills_loader.load_project_context()
             skills_loader.discover_skills()
 
@@ -520,6 +624,7 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
             hook_executor = HookExecutor(
                 registry=hooks_registry,
                 workspace_root=str(Path(config.workspace.root).resolve()),
+                max_concurrency=config.hooks.max_concurrency,
             )
 
         # Determine whether to use local LLM cache
@@ -534,6 +639,7 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
             local_cache = LocalLLMCache(
                 cache_dir=config.llm_cache.dir,
                 ttl_hours=config.llm_cache.ttl_hours,
+                max_size_mb=config.llm_cache.max_size_mb,
             )
             if kwargs.get("cache_clear"):
                 cleared = local_cache.clear()
@@ -543,19 +649,42 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
         # Create cost tracker
         cost_tracker: CostTracker | None = None
         if config.costs.enabled:
-            price_loader = PriceLoader(custom_path=config.costs.prices_file)
+            price_loader = (
+                warm.price_loader(config.costs.prices_file) if warm
+                else PriceLoader(custom_path=config.costs.prices_file)
+            )
             budget_usd = kwargs.get("budget") or config.costs.budget_usd
             cost_tracker = CostTracker(
                 price_loader=price_loader,
                 budget_usd=budget_usd,
                 warn_at_usd=config.costs.warn_at_usd,
+                baseline_model=config.llm.model,
+                lookahead_steps=config.costs.budget_lookahead_steps,
+                ledger=(
+                    CostLedger.for_workspace(Path(config.workspace.root).resolve())
+                    if config.costs.ledger else None
+                ),
+                ledger_context=LedgerContext.from_env(),
             )
 
-        # Create LLM adapter
-        llm = LLMAdapter(config.llm, local_cache=local_cache)
+        # Create LLM adapter (optionally recording to / replaying from a cassette)
+        cassette = _open_cassette(
+            kwargs.get("record_path"),
+            kwargs.get("replay_path"),
+            kwargs.get("replay_match") or "order",
+            bool(kwargs.get("replay_realtime")),
+        )
+        llm = LLMAdapter(config.llm, local_cache=local_cache, cassette=cassette)
+        # Per-purpose models for auxiliary calls (llm.models)
+        cascade = ModelCascade(llm, config.llm.models, cost_tracker)
 
         # Create context manager and context builder
-        context_mgr = ContextManager(config.context)
+        context_config = _session_context_config(config.context, cassette)
+        context_mgr = ContextManager(
+            context_config,
+            model=config.llm.model,
+            summary_llm=cascade.for_purpose("summary"),
+        )
         ctx = ContextBuilder(repo_index=repo_index, context_manager=context_mgr)
 
         # Resolve agent with CLI overrides
@@ -662,11 +791,14 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
                 confirm_mode="yolo",
                 guardrails=guardrails_engine,
             )
-            sub_ctx = ContextBuilder(repo_index=repo_index, context_manager=ContextManager(config.context))
+            sub_ctx = ContextBuilder(
+                repo_index=repo_index,
+                context_manager=ContextManager(context_config, model=config.llm.model),
+            )
             return AgentLoop(
                 llm, sub_engine, sub_agent_config, sub_ctx,
                 shutdown=shutdown, step_timeout=0,
-                context_manager=ContextManager(config.context),
+                context_manager=ContextManager(context_config, model=config.llm.model),
                 cost_tracker=cost_tracker,
             )
 
@@ -724,7 +856,7 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
                 click.echo("Evaluating result...", err=True)
 
             evaluator = SelfEvaluator(
-                llm,
+                cascade.for_purpose("eval"),
                 max_retries=config.evaluation.max_retries,
                 confidence_threshold=config.evaluation.confidence_threshold,
             )
@@ -834,6 +966,27 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
         show_costs = kwargs.get("show_costs") or kwargs.get("verbose", 0) >= 1
         if show_costs and not kwargs.get("quiet") and cost_tracker and cost_tracker.has_data():
             click.echo(f"\nCost: {cost_tracker.format_summary_line()}", err=True)
+            cost_summary = cost_tracker.summary()
+            for source, saved in cost_summary["savings_by_source"].items():
+                spent = cost_summary["by_source"].get(source, 0.0)
+                click.echo(f"  {source}: ${spent:.4f} (saved ${saved:.4f})", err=True)
+
+        # HTTP connection reuse per host (verbose)
+        if kwargs.get("verbose", 0) >= 1 and not kwargs.get("quiet"):
+            for host, st in get_http_pool().stats().items():
+                click.echo(
+                    f"HTTP {host}: {st['requests']} requests, "
+                    f"{st['connections']} new connections ({st['reused']} reused)",
+                    err=True,
+                )
+            if hook_executor:
+                hs = hook_executor.stats()
+                click.echo(
+                    f"Hooks: {hs['completed']} pooled runs, peak {hs['peak_active']}/"
+                    f"{hs['max_concurrency']} concurrent, peak queue {hs['peak_queued']}, "
+                    f"{hs['async_dropped']} async dropped",
+                    err=True,
+                )
 
         # v3-M5: Result separator
         _print_result_separator(kwargs.get("quiet", False))
@@ -901,6 +1054,116 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
                 import traceback
                 traceback.print_exc()
             sys.exit(EXIT_FAILED)
+    finally:
+        # Hedge threads of the endpoint router outlive the run in `architect serve`
+        if cascade is not None:
+            cascade.close()
+
+
+@main.command("serve")
+@click.option(
+    "-c",
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    help="Configuration used to pre-warm index, MCP tools, prices and skills",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Unix socket (default: .architect/daemon.sock or $ARCHITECT_DAEMON_SOCKET)",
+)
+@click.option(
+    "--idle-timeout",
+    type=int,
+    default=0,
+    help="Exit after N seconds without requests (0 = never)",
+)
+@click.option("--status", is_flag=True, default=False, help="Show the running daemon and exit")
+@click.option("--stop", is_flag=True, default=False, help="Stop the running daemon and exit")
+def serve_cmd(
+    config: Path | None,
+    socket_path: Path | None,
+    idle_timeout: int,
+    status: bool,
+    stop: bool,
+) -> None:
+    """Keep a warm daemon that serves `architect run` for this checkout.
+
+    While it runs, headless `architect run` invocations from this directory
+    are executed by the daemon (imports, repo index, MCP tools, prices and
+    skills stay loaded) and their output is streamed back. Without a daemon,
+    `architect run` executes in-process as usual.
+
+    Examples:
+
+        \b
+        $ architect serve --idle-timeout 600 &
+        $ architect run "fix the lint errors" --mode yolo
+
+        \b
+        $ architect serve --status
+        $ architect serve --stop
+    """
+    from .config.loader import load_config
+    from .features.daemon import DaemonClient, DaemonServer, WarmState, default_socket_path
+    from .i18n import set_language as _set_language
+    from .logging import configure_logging
+
+    socket_path = socket_path or default_socket_path()
+    client = DaemonClient(socket_path)
+
+    if status or stop:
+        info = client.ping()
+        if info is None:
+            click.echo(f"No daemon listening on {socket_path}")
+            sys.exit(EXIT_FAILED)
+        if stop:
+            client.shutdown()
+            click.echo(f"Daemon {info.get('pid')} stopped")
+        else:
+            click.echo(f"Daemon {info.get('pid')} listening on {socket_path}")
+            for key, value in info.get("stats", {}).items():
+                click.echo(f"  {key}: {value}")
+        return
+
+    try:
+        app_config = load_config(config_path=config)
+    except FileNotFoundError as e:
+        click.echo(f"Configuration error: {e}", err=True)
+        sys.exit(EXIT_CONFIG_ERROR)
+    _set_language(app_config.language)
+    configure_logging(app_config.logging)
+
+    warm = WarmState()
+    click.echo("Warming up (imports, index, MCP tools, prices, skills)...", err=True)
+    started = time.monotonic()
+    warm.prewarm(app_config)
+
+    server = DaemonServer(
+        socket_path,
+        run,
+        warm=warm,
+        idle_timeout=idle_timeout,
+        # Each run reconfigures logging for its own flags and output streams
+        on_run_finished=lambda: configure_logging(app_config.logging),
+    )
+    try:
+        server.bind()
+    except (RuntimeError, OSError) as e:
+        click.echo(f"Error: cannot listen on {socket_path}: {e}", err=True)
+        sys.exit(EXIT_CONFIG_ERROR)
+    click.echo(
+        f"architect daemon ready in {time.monotonic() - started:.1f}s, "
+        f"listening on {socket_path}",
+        err=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+    click.echo("Daemon stopped", err=True)
 
 
 @main.command()
@@ -912,6 +1175,9 @@ def run(prompt: str, **kwargs) -> None:  # type: ignore
 )
 def validate_config(config: Path | None) -> None:
     """Validate a YAML configuration file."""
+    from .config.loader import load_config
+    from .i18n import set_language as _set_language
+
     try:
         app_config = load_config(config_path=config)
         _set_language(app_config.language)
@@ -937,6 +1203,8 @@ def validate_config(config: Path | None) -> None:
 def agents(config: Path | None) -> None:
     """List available agents and their configuration."""
     from .agents import DEFAULT_AGENTS, list_available_agents
+    from .config.loader import load_config
+    from .i18n import set_language as _set_language
 
     try:
         app_config = load_config(config_path=config)
@@ -988,6 +1256,8 @@ def skill_install(source: str) -> None:
     """Install a skill from GitHub. Format: user/repo/path/to/skill."""
     import os
 
+    from .skills import SkillInstaller
+
     installer = SkillInstaller(os.getcwd())
     if installer.install_from_github(source):
         click.echo(f"Skill installed from {source}")
@@ -1002,6 +1272,8 @@ def skill_create(name: str) -> None:
     """Create a local skill with template."""
     import os
 
+    from .skills import SkillInstaller
+
     installer = SkillInstaller(os.getcwd())
     path = installer.create_local(name)
     click.echo(f"Skill created at {path}")
@@ -1012,6 +1284,8 @@ def skill_list() -> None:
     """List available skills."""
     import os
 
+    from .skills import SkillInstaller
+
     installer = SkillInstaller(os.getcwd())
     skills = installer.list_installed()
     if not skills:
@@ -1028,6 +1302,8 @@ def skill_remove(name: str) -> None:
     """Remove an installed skill."""
     import os
 
+    from .skills import SkillInstaller
+
     installer = SkillInstaller(os.getcwd())
     if installer.uninstall(name):
         click.echo(f"Skill '{name}' removed")
@@ -1035,6 +1311,142 @@ def skill_remove(name: str) -> None:
         click.echo(f"Skill '{name}' not found", err=True)
 
 
+@main.group()
+def prices() -> None:
+    """Inspect model price resolution."""
+    pass
+
+
+@prices.command("explain")
+@click.argument("models", nargs=-1, required=True)
+@click.option(
+    "-c",
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    help="Path to the YAML configuration file (for costs.prices_file)",
+)
+@click.option(
+    "--prices-file",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Custom prices JSON (overrides costs.prices_file)",
+)
+def prices_explain(models: tuple[str, ...], config: Path | None, prices_file: Path | None) -> None:
+    """Show which price entry each MODEL resolves to, and why."""
+    from .config.loader import load_config
+    from .config.schema import LoggingConfig
+    from .costs import PriceLoader
+    from .logging import configure_logging
+
+    try:
+        app_config = load_config(config_path=config)
+    except Exception:
+        app_config = None
+    configure_logging(app_config.logging if app_config else LoggingConfig())
+    if prices_file is None and app_config:
+        prices_file = app_config.costs.prices_file
+
+    loader = PriceLoader(custom_path=prices_file)
+    for model in models:
+        resolution = loader.explain(model)
+        pricing = resolution.pricing
+        cached = (
+            f"${pricing.cached_input_per_million}/M"
+            if pricing.cached_input_per_million is not None else "-"
+        )
+        click.echo(resolution.describe())
+        click.echo(
+            f"  input ${pricing.input_per_million}/M, output ${pricing.output_per_million}/M, "
+            f"cached input {cached}"
+        )
+
+
+@main.command()
+@click.option(
+    "-c",
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    help="Path to the YAML configuration file",
+)
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only the last N days (default: whole history)",
+)
+@click.option("--json", "json_output", is_flag=True, help="JSON output")
+def stats(config: Path | None, days: int | None, json_output: bool) -> None:
+    """Aggregate the cost ledger: cost per day, latency and cache hits per model."""
+    import os
+
+    from .config.loader import load_config
+    from .costs import CostLedger
+
+    try:
+        app_config = load_config(config_path=config)
+    except Exception:
+        app_config = None
+
+    workspace = str(Path(app_config.workspace.root).resolve()) if app_config else os.getcwd()
+    ledger = CostLedger.for_workspace(workspace)
+    if not ledger.exists():
+        click.echo(f"No ledger at {ledger.path} yet (it is written by 'architect run').")
+        return
+
+    report = {
+        "ledger": str(ledger.path),
+        "days": days,
+        "totals": ledger.totals(days),
+        "by_day": ledger.cost_by_day(days),
+        "by_model": ledger.models(days),
+        "top_sessions": ledger.sessions(days),
+    }
+    ledger.close()
+
+    if json_output:
+        click.echo(json.dumps(report, indent=2))
+        return
+
+    totals = report["totals"]
+    if not totals["calls"]:
+        click.echo("No LLM calls recorded in this period.")
+        return
+    span = f"last {days} days" if days else f"{totals['first_day']} .. {totals['last_day']}"
+    click.echo(
+        f"{totals['calls']} LLM calls, {totals['sessions']} sessions, "
+        f"${totals['cost_usd']:.4f} ({span})\n"
+    )
+
+    click.echo(f"  {'Day':<12s} {'Calls':>7s} {'Cost':>12s}")
+    click.echo(f"  {'─'*12} {'─'*7} {'─'*12}")
+    for row in report["by_day"]:
+        cost = "$" + format(row["cost_usd"], ".4f")
+        click.echo(f"  {row['day']:<12s} {row['calls']:>7d} {cost:>12s}")
+
+    def _ms(value: float | None) -> str:
+        return f"{value:.0f}ms" if value is not None else "-"
+
+    click.echo(
+        f"\n  {'Model':<32s} {'Calls':>7s} {'Cost':>12s} {'Cache':>7s} {'p50':>9s} {'p95':>9s}"
+    )
+    click.echo(f"  {'─'*32} {'─'*7} {'─'*12} {'─'*7} {'─'*9} {'─'*9}")
+    for row in report["by_model"]:
+        click.echo(
+            f"  {row['model']:<32s} {row['calls']:>7d} "
+            f"{'$' + format(row['cost_usd'], '.4f'):>12s} {row['cache_hit_rate']:>7.0%} "
+            f"{_ms(row['p50_latency_ms']):>9s} {_ms(row['p95_latency_ms']):>9s}"
+        )
+
+    if report["top_sessions"]:
+        click.echo(f"\n  {'Session':<24s} {'Calls':>7s} {'Cost':>12s}")
+        click.echo(f"  {'─'*24} {'─'*7} {'─'*12}")
+        for row in report["top_sessions"]:
+            click.echo(
+                f"  {row['session_id']:<24s} {row['calls']:>7d} "
+                f"{'$' + format(row['cost_usd'], '.4f'):>12s}"
+            )
+
+
 # ── SESSION COMMANDS (v4-B1) ─────────────────────────────────────────────
 
 
@@ -1049,6 +1461,10 @@ def sessions(config: Path | None) -> None:
     """List saved sessions."""
     import os
 
+    from .config.loader import load_config
+    from .features.sessions import SessionManager
+    from .i18n import set_language as _set_language
+
     try:
         app_config = load_config(config_path=config)
         _set_language(app_config.language)
@@ -1091,6 +1507,10 @@ def resume(session_id: str, config: Path | None) -> None:
     """
     import os
 
+    from .config.loader import load_config
+    from .features.sessions import SessionManager
+    from .i18n import set_language as _set_language
+
     try:
         app_config = load_config(config_path=config)
         _set_language(app_config.language)
@@ -1146,6 +1566,10 @@ def cleanup(older_than_days: int, config: Path | None) -> None:
     """Clean up old sessions."""
     import os
 
+    from .config.loader import load_config
+    from .features.sessions import SessionManager
+    from .i18n import set_language as _set_language
+
     try:
         app_config = load_config(config_path=config)
         _set_language(app_config.language)
@@ -1201,6 +1625,7 @@ def cleanup(older_than_days: int, config: Path | None) -> None:
 @click.option("--report", "report_format", type=click.Choice(["json", "markdown", "github"]), default=None, help="Report format")
 @click.option("--report-file", "report_file", type=click.Path(), default=None, help="Output file for the report")
 @click.option("--quiet", is_flag=True, help="Quiet mode")
+@_cassette_options
 def loop_cmd(
     task: str,
     checks: tuple[str, ...],
@@ -1216,6 +1641,10 @@ def loop_cmd(
     report_format: str | None,
     report_file: str | None,
     quiet: bool,
+    record_path: Path | None = None,
+    replay_path: Path | None = None,
+    replay_match: str = "order",
+    replay_realtime: bool = False,
 ) -> None:
     """Run a Ralph Loop: iterate until checks pass.
 
@@ -1247,6 +1676,20 @@ def loop_cmd(
     """
     import os
 
+    from .agents import AgentNotFoundError, get_agent
+    from .config.loader import load_config
+    from .core import AgentLoop, ContextBuilder, ContextManager
+    from .core.guardrails import GuardrailsEngine
+    from .core.hooks import HookExecutor
+    from .costs import CostLedger, CostTracker, LedgerContext, PriceLoader
+    from .execution import ExecutionEngine
+    from .features.ralph import RalphConfig, RalphLoop
+    from .features.report import ExecutionReport, ReportGenerator, collect_git_diff
+    from .i18n import set_language as _set_language
+    from .llm import LLMAdapter, ModelCascade
+    from .logging import configure_logging
+    from .tools import ToolRegistry, register_all_tools
+
     try:
         app_config = load_config(config_path=config)
         _set_language(app_config.language)
@@ -1273,6 +1716,17 @@ def loop_cmd(
         use_worktree=worktree,
     )
 
+    # One cassette for the whole loop: iterations record/replay in sequence
+    cassette = _open_cassette(record_path, replay_path, replay_match, replay_realtime)
+    # One ledger for the whole loop: each row carries its iteration number
+    ledger = (
+        CostLedger.for_workspace(workspace)
+        if app_config and app_config.costs.ledger else None
+    )
+
+    # Closed after the loop: releases the hedge threads of every iteration
+    cascades: list[ModelCascade] = []
+
     def agent_factory(**kwargs):
         """Create a fresh AgentLoop for each iteration.
 
@@ -1308,14 +1762,25 @@ def loop_cmd(
             # Override model for this iteration
             llm_config = app_config.llm.model_copy(update={"model": iter_model})
 
-        llm = LLMAdapter(llm_config)
-        context_mgr = ContextManager(app_config.context)
-        ctx = ContextBuilder(context_manager=context_mgr)
+        llm = LLMAdapter(llm_config, cassette=cassette)
 
         cost_tracker_iter: CostTracker | None = None
         if app_config.costs.enabled:
             price_loader = PriceLoader()
-            cost_tracker_iter = CostTracker(price_loader=price_loader)
+            cost_tracker_iter = CostTracker(
+                price_loader=price_loader, baseline_model=llm_config.model,
+                ledger=ledger,
+                ledger_context=LedgerContext(ralph_iteration=kwargs.get("iteration")),
+            )
+
+        cascade = ModelCascade(llm, llm_config.models, cost_tracker_iter)
+        cascades.append(cascade)
+        context_mgr = ContextManager(
+            _session_context_config(app_config.context, cassette),
+            model=llm_config.model,
+            summary_llm=cascade.for_purpose("summary"),
+        )
+        ctx = ContextBuilder(context_manager=context_mgr)
 
         try:
             agent_config = get_agent(iter_agent, app_config.agents, {"mode": "yolo"})
@@ -1340,6 +1805,7 @@ def loop_cmd(
                 iter_hook_executor = HookExecutor(
                     registry=iter_hooks_registry,
                     workspace_root=ws_root,
+                    max_concurrency=iter_app_config.hooks.max_concurrency,
                 )
 
         engine = ExecutionEngine(
@@ -1365,7 +1831,11 @@ def loop_cmd(
         )
 
     ralph = RalphLoop(ralph_config, agent_factory, workspace_root=workspace)
-    result = ralph.run()
+    try:
+        result = ralph.run()
+    finally:
+        for cascade in cascades:
+            cascade.close()
 
     # Summary
     if not quiet:
@@ -1470,6 +1940,8 @@ def parallel_cmd(
     """
     import os
 
+    from .features.parallel import ParallelConfig, ParallelRunner
+
     task_list = list(tasks) if tasks else ([task] if task else [])
     if not task_list:
         click.echo("Error: Specify a task as argument or with --task", err=True)
@@ -1530,6 +2002,8 @@ def parallel_cleanup_cmd() -> None:
     """Clean up worktrees and branches from parallel executions."""
     import os
 
+    from .features.parallel import ParallelConfig, ParallelRunner
+
     workspace = os.getcwd()
     runner = ParallelRunner(
         ParallelConfig(tasks=[""]),
@@ -1558,6 +2032,7 @@ def parallel_cleanup_cmd() -> None:
 @click.option("--report", "report_format", type=click.Choice(["json", "markdown", "github"]), default=None, help="Report format")
 @click.option("--report-file", "report_file", type=click.Path(), default=None, help="Output file for the report")
 @click.option("--quiet", is_flag=True, help="Quiet mode")
+@_cassette_options
 def pipeline_cmd(
     pipeline_file: str,
     variables: tuple[str, ...],
@@ -1567,6 +2042,10 @@ def pipeline_cmd(
     report_format: str | None,
     report_file: str | None,
     quiet: bool,
+    record_path: Path | None = None,
+    replay_path: Path | None = None,
+    replay_match: str = "order",
+    replay_realtime: bool = False,
 ) -> None:
     """Run a multi-step YAML workflow.
 
@@ -1589,6 +2068,20 @@ def pipeline_cmd(
     """
     import os
 
+    from .agents import AgentNotFoundError, get_agent
+    from .config.loader import load_config
+    from .core import AgentLoop, ContextBuilder, ContextManager
+    from .core.guardrails import GuardrailsEngine
+    from .core.hooks import HookExecutor
+    from .costs import CostLedger, CostTracker, LedgerContext, PriceLoader
+    from .execution import ExecutionEngine
+    from .features.pipelines import PipelineRunner, PipelineValidationError
+    from .features.report import ExecutionReport, ReportGenerator, collect_git_diff
+    from .i18n import set_language as _set_language
+    from .llm import LLMAdapter, ModelCascade
+    from .logging import configure_logging
+    from .tools import ToolRegistry, register_all_tools
+
     try:
         app_config = load_config(config_path=config)
         _set_language(app_config.language)
@@ -1602,6 +2095,12 @@ def pipeline_cmd(
         quiet=quiet,
     )
 
+    cassette = _open_cassette(record_path, replay_path, replay_match, replay_realtime)
+    ledger = (
+        CostLedger.for_workspace(workspace)
+        if app_config and app_config.costs.ledger else None
+    )
+
     # Parse variables
     vars_dict: dict[str, str] = {}
     for v in variables:
@@ -1609,6 +2108,9 @@ def pipeline_cmd(
             key, val = v.split("=", 1)
             vars_dict[key.strip()] = val.strip()
 
+    # Closed after the pipeline: releases the hedge threads of every step
+    cascades: list[ModelCascade] = []
+
     def agent_factory(**kwargs):
         """Create a fresh AgentLoop for each pipeline step."""
         iter_agent = kwargs.get("agent", "build")
@@ -1625,14 +2127,25 @@ def pipeline_cmd(
         if iter_model:
             llm_config = app_config.llm.model_copy(update={"model": iter_model})
 
-        llm = LLMAdapter(llm_config)
-        context_mgr = ContextManager(app_config.context)
-        ctx = ContextBuilder(context_manager=context_mgr)
+        llm = LLMAdapter(llm_config, cassette=cassette)
 
         cost_tracker_iter: CostTracker | None = None
         if app_config.costs.enabled:
             price_loader = PriceLoader()
-            cost_tracker_iter = CostTracker(price_loader=price_loader)
+            cost_tracker_iter = CostTracker(
+                price_loader=price_loader, baseline_model=llm_config.model,
+                ledger=ledger,
+                ledger_context=LedgerContext(pipeline_step=kwargs.get("step_name")),
+            )
+
+        cascade = ModelCascade(llm, llm_config.models, cost_tracker_iter)
+        cascades.append(cascade)
+        context_mgr = ContextManager(
+            _session_context_config(app_config.context, cassette),
+            model=llm_config.model,
+            summary_llm=cascade.for_purpose("summary"),
+        )
+        ctx = ContextBuilder(context_manager=context_mgr)
 
         try:
             agent_config = get_agent(iter_agent, app_config.agents, {"mode": "yolo"})
@@ -1655,6 +2168,7 @@ def pipeline_cmd(
                 pipe_hook_executor = HookExecutor(
                     registry=pipe_hooks_registry,
                     workspace_root=workspace,
+                    max_concurrency=app_config.hooks.max_concurrency,
                 )
 
         engine = ExecutionEngine(
@@ -1690,7 +2204,11 @@ def pipeline_cmd(
             err=True,
         )
 
-    results = runner.run(from_step=from_step, dry_run=dry_run)
+    try:
+        results = runner.run(from_step=from_step, dry_run=dry_run)
+    finally:
+        for cascade in cascades:
+            cascade.close()
 
     if not quiet:
         click.echo("\n--- Pipeline Results ---", err=True)
@@ -1770,6 +2288,8 @@ def rollback_cmd(to_step: int | None, to_commit: str | None) -> None:
     """
     import os
 
+    from .features.checkpoints import CheckpointManager
+
     if to_step is None and to_commit is None:
         click.echo("Error: Specify --to-step or --to-commit", err=True)
         sys.exit(EXIT_CONFIG_ERROR)
@@ -1794,6 +2314,8 @@ def history_cmd() -> None:
     import os
     from datetime import datetime
 
+    from .features.checkpoints import CheckpointManager
+
     mgr = CheckpointManager(os.getcwd())
     checkpoints = mgr.list_checkpoints()
 
@@ -1852,6 +2374,8 @@ def eval_cmd(
     """
     import os
 
+    from .features.competitive import CompetitiveConfig, CompetitiveEval
+
     model_list = [m.strip() for m in models.split(",") if m.strip()]
     if len(model_list) < 2:
         click.echo("Error: At least 2 models are required for comparison.", err=True)
@@ -1916,6 +2440,8 @@ def init_cmd(preset: str | None, overwrite: bool, show_list: bool) -> None:
     """
     import os
 
+    from .config.presets import PresetManager
+
     manager = PresetManager(os.getcwd())
 
     if show_list:
@@ -1991,7 +2517,7 @@ def _get_git_diff_context(ref: str) -> str | None:
         return None
 
 
-def _build_hooks_registry(config) -> HooksRegistry:
+def _build_hooks_registry(config) -> "HooksRegistry":
     """Build a HooksRegistry from the configuration (v4-A1).
 
     Maps the HookItemConfig lists from the hooks section of the YAML config
@@ -2004,6 +2530,8 @@ def _build_hooks_registry(config) -> HooksRegistry:
     Returns:
         HooksRegistry ready to use with HookExecutor.
     """
+    from .core.hooks import HookConfig, HookEvent, HooksRegistry
+
     hooks_dict: dict[HookEvent, list[HookConfig]] = {}
 
     event_mapping = {
@@ -2031,6 +2559,7 @@ def _build_hooks_registry(config) -> HooksRegistry:
                     is_async=h.async_,
                     enabled=h.enabled,
                     name=h.name,
+                    persistent=h.persistent,
                 )
                 for h in items
             ]
@@ -2046,6 +2575,7 @@ def _build_hooks_registry(config) -> HooksRegistry:
                 is_async=h.async_,
                 enabled=h.enabled,
                 name=h.name or "post-edit-compat",
+                persistent=h.persistent,
             )
             for h in config.hooks.post_edit
         ]
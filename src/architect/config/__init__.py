@@ -1,19 +1,25 @@
 """
 Configuration module for architect.
 
-Exports the main components for convenient imports.
+Exports the main components for convenient imports. They are resolved on
+first access (PEP 562), so importing a light submodule such as
+``architect.config.presets`` does not build the pydantic schema.
 """
 
-from .loader import load_config
-from .schema import (
-    AgentConfig,
-    AppConfig,
-    LLMConfig,
-    LoggingConfig,
-    MCPConfig,
-    MCPServerConfig,
-    WorkspaceConfig,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .loader import load_config
+    from .schema import (
+        AgentConfig,
+        AppConfig,
+        LLMConfig,
+        LoggingConfig,
+        MCPConfig,
+        MCPServerConfig,
+        WorkspaceConfig,
+    )
 
 __all__ = [
     "load_config",
@@ -25,3 +31,14 @@ __all__ = [
     "MCPConfig",
     "MCPServerConfig",
 ]
+
+_EXPORTS = {name: ".schema" for name in __all__}
+_EXPORTS["load_config"] = ".loader"
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
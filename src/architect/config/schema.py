@@ -11,6 +11,22 @@ from typing import Any, Literal
 from pydantic import BaseModel, Field, field_validator
 
 
+class LLMModelsConfig(BaseModel):
+    """Per-purpose models for auxiliary LLM calls.
+
+    Unset purposes use the main ``llm.model``.
+    """
+
+    summary: str | None = Field(default=None, description="Model for context summaries.")
+    eval: str | None = Field(default=None, description="Model for self-evaluation.")
+    escalate: bool = Field(
+        default=True,
+        description="Retry on the main model when the output of a purpose model cannot be parsed.",
+    )
+
+    model_config = {"extra": "forbid"}
+
+
 class LLMConfig(BaseModel):
     """LLM provider configuration."""
 
@@ -29,6 +45,37 @@ class LLMConfig(BaseModel):
             "(Anthropic, OpenAI) caches it. Reduces cost 50-90% on repeated calls."
         ),
     )
+    rpm_limit: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Client-side requests-per-minute limit, shared by every architect process "
+            "using the same model/endpoint/key. 0 = unlimited."
+        ),
+    )
+    tpm_limit: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Client-side tokens-per-minute limit (estimated prompt tokens, settled "
+            "against reported usage), shared across processes. 0 = unlimited."
+        ),
+    )
+    api_bases: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Several OpenAI-compatible endpoints for the same model. Each call goes "
+            "to the fastest healthy one (EWMA of latency and errors). Overrides api_base."
+        ),
+    )
+    hedge_requests: bool = Field(
+        default=False,
+        description=(
+            "With api_bases: if a call exceeds the p95 latency of its endpoint, send "
+            "a second request to the next endpoint; the first response wins."
+        ),
+    )
+    models: LLMModelsConfig = Field(default_factory=LLMModelsConfig)
 
     model_config = {"extra": "forbid"}
 
@@ -73,6 +120,14 @@ class HookItemConfig(BaseModel):
         description="If True, execute in background without blocking",
     )
     enabled: bool = Field(default=True, description="If False, the hook is ignored")
+    persistent: bool = Field(
+        default=False,
+        description=(
+            "If True, the command is started once per session and receives each "
+            "event as a JSON line on stdin, answering with a JSON line "
+            "({\"decision\": \"allow|block|modify\", ...}) instead of one process per event."
+        ),
+    )
 
     model_config = {"extra": "forbid", "populate_by_name": True}
 
@@ -134,6 +189,16 @@ class HooksConfig(BaseModel):
         default_factory=list,
         description="(Compat v3) Post-edit hooks. Added to post_tool_use with matcher 'write_file|edit_file|apply_patch'.",
     )
+    max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description=(
+            "Workers of each hook pool. Non-blocking hooks of post events run on "
+            "one pool and async hooks on another, so async bursts never delay "
+            "them; pre-hooks stay sequential."
+        ),
+    )
 
     model_config = {"extra": "forbid"}
 
@@ -177,6 +242,41 @@ class MCPConfig(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class HTTPConfig(BaseModel):
+    """Shared HTTP connection pool for LLM and MCP calls.
+
+    LiteLLM and every MCP client send their requests through one pooled
+    transport, so repeated calls to the same host reuse open (keep-alive)
+    connections instead of paying a new TCP/TLS handshake each time.
+    """
+
+    enabled: bool = Field(
+        default=True,
+        description="Share one pooled transport between LiteLLM and MCP clients",
+    )
+    max_connections: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum simultaneous connections across all hosts",
+    )
+    max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        description="Idle connections kept open for reuse",
+    )
+    keepalive_expiry: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds an idle connection is kept before closing it",
+    )
+    http2: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 when the server supports it (requires the 'h2' package)",
+    )
+
+    model_config = {"extra": "forbid"}
+
+
 class IndexerConfig(BaseModel):
     """Repository indexer configuration (F10).
 
@@ -251,6 +351,27 @@ class ContextConfig(BaseModel):
         description="Recent complete steps to preserve during compression.",
     )
 
+    adaptive_tool_results: bool = Field(
+        default=True,
+        description=(
+            "Derive the per-result truncation budget from the remaining context "
+            "window and the number of results in the batch, instead of the fixed "
+            "max_tool_result_tokens. Requires max_context_tokens > 0."
+        ),
+    )
+
+    min_tool_result_tokens: int = Field(
+        default=500,
+        ge=0,
+        description="Lower bound of the adaptive per-result budget (tokens).",
+    )
+
+    max_adaptive_tool_result_tokens: int = Field(
+        default=8000,
+        ge=0,
+        description="Upper bound of the adaptive per-result budget (tokens).",
+    )
+
     max_context_tokens: int = Field(
         default=80000,
         description=(
@@ -267,6 +388,56 @@ class ContextConfig(BaseModel):
         ),
     )
 
+    spill_tool_output_chars: int = Field(
+        default=8000,
+        ge=0,
+        description=(
+            "Tool outputs longer than this (chars) are moved from the step history "
+            "to a per-session blob store on disk; the history keeps a preview and "
+            "the store is removed when the session ends. "
+            "The LLM context is not affected. 0 = keep everything in memory."
+        ),
+    )
+
+    max_summary_checkpoints: int = Field(
+        default=3,
+        ge=1,
+        description=(
+            "Maximum summary checkpoints kept after the user prompt. Each compression "
+            "appends a new checkpoint instead of rewriting earlier ones (stable prefix "
+            "for provider prompt caching); when the limit is reached they are merged."
+        ),
+    )
+
+    precompute_summary_at: float = Field(
+        default=0.6,
+        ge=0.0,
+        lt=0.75,
+        description=(
+            "Context usage fraction at which the summary of the oldest steps starts "
+            "being computed in a background thread, so compression at 75% does not "
+            "add an LLM round trip to the critical path. 0 = disabled."
+        ),
+    )
+
+    compact_superseded: bool = Field(
+        default=True,
+        description=(
+            "Before LLM summarization, replace tool results superseded by a later "
+            "call (re-read/edited file, repeated search or command) with short stubs. "
+            "Deterministic and free (no LLM call)."
+        ),
+    )
+
+    tokenizer: Literal["heuristic", "auto", "litellm", "tiktoken"] = Field(
+        default="heuristic",
+        description=(
+            "Token counting backend for context budgeting: "
+            "'heuristic' (~4 chars/token), 'litellm' (litellm.token_counter), "
+            "'tiktoken' (local BPE, if installed), 'auto' (tiktoken > litellm > heuristic)."
+        ),
+    )
+
     model_config = {"extra": "forbid"}
 
 
@@ -348,6 +519,25 @@ class CostsConfig(BaseModel):
         ),
     )
 
+    budget_lookahead_steps: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "With budget_usd, close the agent gracefully (with a final summary) when "
+            "the recent spend rate per step predicts the budget runs out within this "
+            "many steps. 0 = only stop once the budget is exceeded."
+        ),
+    )
+
+    ledger: bool = Field(
+        default=True,
+        description=(
+            "If True, each LLM call (model, tokens, latency, cost) is appended to "
+            "the cross-session ledger at .architect/ledger.db, queried by "
+            "'architect stats'."
+        ),
+    )
+
     model_config = {"extra": "forbid"}
 
 
@@ -378,6 +568,15 @@ class LLMCacheConfig(BaseModel):
         description="Hours of validity for each cache entry. After that it is considered expired.",
     )
 
+    max_size_mb: int = Field(
+        default=256,
+        ge=0,
+        description=(
+            "Maximum total size of cached responses in MB. When exceeded, the "
+            "least recently used entries are evicted. 0 = no limit."
+        ),
+    )
+
     model_config = {"extra": "forbid"}
 
 
@@ -781,6 +980,7 @@ class AppConfig(BaseModel):
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     workspace: WorkspaceConfig = Field(default_factory=WorkspaceConfig)
     mcp: MCPConfig = Field(default_factory=MCPConfig)
+    http: HTTPConfig = Field(default_factory=HTTPConfig)
     indexer: IndexerConfig = Field(default_factory=IndexerConfig)
     context: ContextConfig = Field(default_factory=ContextConfig)
     evaluation: EvaluationConfig = Field(default_factory=EvaluationConfig)
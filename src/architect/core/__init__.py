@@ -12,6 +12,7 @@ from .context import ContextBuilder, ContextManager
 from .evaluator import EvalResult, SelfEvaluator
 from .hooks import HookConfig, HookDecision, HookEvent, HookExecutor, HookResult, HooksRegistry
 from .loop import AgentLoop
+from .messages import MessageLog
 from .mixed_mode import MixedModeRunner
 from .shutdown import GracefulShutdown
 from .state import AgentState, StepResult, StopReason, ToolCallResult
@@ -29,6 +30,7 @@ __all__ = [
     "HookExecutor",
     "HookResult",
     "HooksRegistry",
+    "MessageLog",
     "MixedModeRunner",
     "SelfEvaluator",
     "AgentState",
@@ -0,0 +1,70 @@
+"""
+Blob Store - Per-session on-disk storage for large step payloads.
+
+Long ralph and pipeline runs keep every ``StepResult`` in memory. The LLM
+only ever sees the (truncated) copy in ``state.messages``, so full tool
+outputs above a size threshold are spilled here and the step history keeps
+a short preview. ``ToolCallResult.full_output`` reads a spilled payload
+back while its session is running.
+
+Blobs are content-addressed (SHA-1) files in a temporary directory owned by
+the store. The agent loop closes the store when the session ends; otherwise
+the directory is removed when the store is garbage-collected or the process
+exits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import shutil
+import tempfile
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class BlobRef:
+    """Reference to a spilled payload."""
+
+    path: Path
+    size: int
+
+    def load(self) -> str:
+        """Read the payload back from disk.
+
+        Raises:
+            FileNotFoundError: If the store was already cleaned up
+        """
+        return self.path.read_bytes().decode("utf-8", "surrogatepass")
+
+
+class BlobStore:
+    """Content-addressed blob files for one agent session."""
+
+    def __init__(self, session_id: str | None = None) -> None:
+        """Create the store directory.
+
+        Args:
+            session_id: Session identifier, used as the directory prefix
+        """
+        prefix = f"architect-{session_id}-" if session_id else "architect-"
+        self.root = Path(tempfile.mkdtemp(prefix=prefix))
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.root, True)
+        self.bytes_written = 0
+
+    def put(self, text: str) -> BlobRef:
+        """Write a payload (deduplicated by content) and return its reference."""
+        data = text.encode("utf-8", "surrogatepass")
+        path = self.root / hashlib.sha1(data).hexdigest()
+        if not path.exists():
+            path.write_bytes(data)
+            self.bytes_written += len(data)
+        return BlobRef(path=path, size=len(text))
+
+    def close(self) -> None:
+        """Remove the store directory now."""
+        self._finalizer()
+
+    def __repr__(self) -> str:
+        return f"<BlobStore(root='{self.root}', bytes_written={self.bytes_written})>"
@@ -10,11 +10,18 @@ F11: ContextManager with 3 pruning levels (truncation, summarization, sliding wi
 
 from __future__ import annotations
 
+import json
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import structlog
 from typing import TYPE_CHECKING, Any
 
 from ..config.schema import AgentConfig, ContextConfig
 from ..llm.adapter import LLMAdapter, ToolCall
+from ..llm.cascade import PurposeLLM
+from ..llm.tokenizer import Tokenizer
+from .messages import MessageLog
 from .state import ToolCallResult
 
 if TYPE_CHECKING:
@@ -22,48 +29,166 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger()
 
+# Tools whose execution makes earlier reads of the same file stale
+_FILE_WRITE_TOOLS = frozenset({"write_file", "edit_file", "apply_patch", "delete_file"})
+# Read-only tools whose output is fully determined by their arguments
+_REPEATABLE_TOOLS = frozenset({"grep", "search_code", "find_files", "list_files", "run_command"})
+# Results shorter than this are not worth replacing with a stub
+_MIN_ELIDE_CHARS = 200
+# Relative value kept by a superseded tool result when enforcing the window
+_SUPERSEDED_VALUE = 0.1
+# Search tools whose matched lines are kept first when truncating
+_SEARCH_TOOLS = frozenset({"grep", "search_code"})
+# Lines worth keeping in command/test output (failures, errors, tracebacks)
+_FAILURE_LINE = re.compile(
+    r"FAILED|FAIL\b|ERROR|Error|error:|Exception|Traceback|assert|panicked|^E\s"
+)
+# Matched lines in grep/search_code output ("📄 path:12: ...", "> 12: ...")
+_MATCH_LINE = re.compile(r"^(📄 |> |\S+:\d+:)")
+# Lines kept around each important line
+_IMPORTANT_CONTEXT = 2
+
 
 class ContextManager:
     """Context window manager to prevent overflow in long tasks.
 
     Operates at three progressive levels (F11):
     - Level 1: ``truncate_tool_result`` — truncates individual tool results.
-    - Level 2: ``maybe_compress``       — summarizes old steps using the LLM.
-    - Level 3: ``enforce_window``       — hard limit on total tokens.
+    - Level 2: ``compact_superseded``   — elides superseded tool results (no LLM),
+               then ``maybe_compress``  — summarizes old steps using the LLM.
+    - Level 3: ``enforce_window``       — hard limit on total tokens; evicts
+               whole tool-call units, lowest value per token first.
 
     Level 1 is applied in ``ContextBuilder._format_tool_result()``.
     Levels 2 and 3 are applied in the loop after each step.
     """
 
-    def __init__(self, config: ContextConfig) -> None:
+    def __init__(
+        self,
+        config: ContextConfig,
+        model: str | None = None,
+        summary_llm: LLMAdapter | PurposeLLM | None = None,
+    ) -> None:
+        """Initialize the context manager.
+
+        Args:
+            config: Context configuration
+            model: Model name, used by the litellm/tiktoken token counters
+            summary_llm: LLM for summaries (e.g. a cheaper ``llm.models.summary``
+                model). None = the agent's adapter passed to ``manage()``.
+        """
         self.config = config
+        self.summary_llm = summary_llm
+        self.tokenizer = Tokenizer(config.tokenizer, model=model)
         self.log = logger.bind(component="context_manager")
+        # Token ledger: id(message) -> (message, signature, tokens).
+        # Each message is measured once; later estimates reuse the cached
+        # count as long as the message object and its signature are unchanged.
+        self._token_ledger: dict[int, tuple[dict[str, Any], tuple[int, ...], float]] = {}
+        # Background summary (precomputed before compression is needed):
+        # (future, dialog offset, covered messages, their signatures at submit time)
+        self._summary_executor: ThreadPoolExecutor | None = None
+        self._pending_summary: (
+            tuple[Future[str], int, list[dict[str, Any]], list[tuple[int, ...]]] | None
+        ) = None
+        # Level 1 totals: results truncated and their sizes before/after
+        self.truncation_stats: dict[str, int] = {
+            "results": 0, "original_chars": 0, "kept_chars": 0,
+        }
 
     # ── Level 1: Tool result truncation ──────────────────────────────────
 
-    def truncate_tool_result(self, content: str) -> str:
-        """Truncate a tool result if it exceeds the configured limit.
+    def tool_result_budget(
+        self, messages: list[dict[str, Any]], batch_size: int = 1
+    ) -> int:
+        """Token budget for each tool result of the next batch.
+
+        Derived from the headroom left before the 75% compression threshold,
+        shared by the results of the batch (half of the headroom at most),
+        and clamped to ``[min_tool_result_tokens, max_adaptive_tool_result_tokens]``.
+        Falls back to the fixed ``max_tool_result_tokens`` when adaptive
+        truncation is off or there is no context limit.
+
+        Args:
+            messages: Current message list
+            batch_size: Number of tool results about to be appended
+
+        Returns:
+            Max tokens per result (0 = no truncation)
+        """
+        cfg = self.config
+        if (
+            cfg.max_tool_result_tokens == 0
+            or not cfg.adaptive_tool_results
+            or cfg.max_context_tokens == 0
+        ):
+            return cfg.max_tool_result_tokens
+
+        headroom = int(cfg.max_context_tokens * 0.75) - self._estimate_tokens(messages)
+        budget = headroom // (2 * max(batch_size, 1))
+        return max(
+            cfg.min_tool_result_tokens,
+            min(budget, cfg.max_adaptive_tool_result_tokens),
+        )
+
+    def truncate_tool_result(
+        self,
+        content: str,
+        max_tokens: int | None = None,
+        tool_name: str | None = None,
+    ) -> str:
+        """Truncate a tool result if it exceeds the token budget.
 
-        Preserves the first 40 lines and the last 20 to keep
-        the beginning (important for structures) and the end (usually has
-        summaries and errors).
+        Generic content keeps its first and last lines (40 and 20 at the
+        default budget, scaled with it): the beginning holds structure, the
+        end usually has summaries and errors. For ``run_command`` output,
+        failure lines and tracebacks are kept first; for ``grep`` and
+        ``search_code``, the matched lines.
 
         Args:
             content: Tool result content
+            max_tokens: Token budget (default: ``max_tool_result_tokens``)
+            tool_name: Tool that produced the content, for content-aware cuts
 
         Returns:
-            Truncated content with omission marker, or the original if it fits
+            Truncated content with omission markers, or the original if it fits
         """
         if self.config.max_tool_result_tokens == 0:
             return content
 
-        max_chars = self.config.max_tool_result_tokens * 4  # ~4 chars/token
+        limit = self.config.max_tool_result_tokens if max_tokens is None else max_tokens
+        max_chars = limit * 4  # ~4 chars/token
         if len(content) <= max_chars:
             return content
 
         lines = content.splitlines()
-        head_lines = 40
-        tail_lines = 20
+        important = self._important_lines(lines, tool_name)
+        if important:
+            truncated = self._keep_important_lines(lines, important, max_chars)
+        else:
+            truncated = self._keep_head_and_tail(content, lines, limit, max_chars)
+
+        self.truncation_stats["results"] += 1
+        self.truncation_stats["original_chars"] += len(content)
+        self.truncation_stats["kept_chars"] += len(truncated)
+        self.log.debug(
+            "context.tool_result_truncated",
+            tool=tool_name,
+            budget_tokens=limit,
+            original_chars=len(content),
+            kept_chars=len(truncated),
+            important_lines=len(important),
+        )
+        return truncated
+
+    def _keep_head_and_tail(
+        self, content: str, lines: list[str], limit: int, max_chars: int
+    ) -> str:
+        """Generic truncation: first and last lines, or chars for long lines."""
+        from ..i18n import t
+        scale = limit / max(self.config.max_tool_result_tokens, 1)
+        head_lines = max(1, round(40 * scale))
+        tail_lines = max(1, round(20 * scale))
 
         if len(lines) <= head_lines + tail_lines:
             # Content is long but has few lines (very long lines)
@@ -71,18 +196,209 @@ class ContextManager:
             head = content[:max_chars // 2]
             tail = content[-(max_chars // 4):]
             omitted_chars = len(content) - len(head) - len(tail)
-            from ..i18n import t
             marker = t("context.chars_omitted", n=omitted_chars)
             return f"{head}\n\n{marker}\n\n{tail}"
 
         head = "\n".join(lines[:head_lines])
         tail = "\n".join(lines[-tail_lines:])
         omitted = len(lines) - head_lines - tail_lines
-        from ..i18n import t
         marker = t("context.lines_omitted", n=omitted)
         return f"{head}\n\n{marker}\n\n{tail}"
 
-    # ── Level 2: Old step summarization ─────────────────────────────────
+    @staticmethod
+    def _important_lines(lines: list[str], tool_name: str | None) -> list[int]:
+        """Indexes of lines to keep first for this tool's output."""
+        if tool_name in _SEARCH_TOOLS:
+            return [i for i, line in enumerate(lines) if _MATCH_LINE.match(line)]
+        if tool_name != "run_command":
+            return []
+
+        important: list[int] = []
+        in_traceback = False
+        for i, line in enumerate(lines):
+            if line.startswith("Traceback"):
+                in_traceback = True
+            if in_traceback or _FAILURE_LINE.search(line):
+                important.append(i)
+            # A traceback ends at its first non-indented line (the exception)
+            if in_traceback and line and not line[0].isspace() and not line.startswith("Traceback"):
+                in_traceback = False
+        return important
+
+    @staticmethod
+    def _keep_important_lines(
+        lines: list[str], important: list[int], max_chars: int
+    ) -> str:
+        """Keep the important lines (with context) plus head and tail.
+
+        Important lines are kept first, then the first and last lines, then
+        ``_IMPORTANT_CONTEXT`` lines around each important line, in order,
+        until the character budget is used. Lines that do not fit are
+        skipped, not the rest of the pass; an important line longer than
+        half the budget is cut by characters. Gaps become omission markers.
+        """
+        from ..i18n import t
+        keep: dict[int, str] = {}
+        used = 0
+
+        def _take(indexes: range, cut: bool = False) -> None:
+            nonlocal used
+            for i in indexes:
+                if i in keep:
+                    continue
+                line = lines[i]
+                if cut and len(line) > max_chars // 2:
+                    head = line[:max_chars // 4]
+                    tail = line[-(max_chars // 8):]
+                    marker = t("context.chars_omitted", n=len(line) - len(head) - len(tail))
+                    line = f"{head} {marker} {tail}"
+                cost = len(line) + 1
+                if used + cost > max_chars:
+                    continue
+                keep[i] = line
+                used += cost
+
+        for i in important:
+            _take(range(i, i + 1), cut=True)
+        _take(range(min(5, len(lines))))
+        _take(range(max(0, len(lines) - 10), len(lines)))
+        for i in important:
+            _take(range(
+                max(0, i - _IMPORTANT_CONTEXT),
+                min(len(lines), i + _IMPORTANT_CONTEXT + 1),
+            ))
+
+        parts: list[str] = []
+        gap = 0
+        for i in range(len(lines)):
+            if i in keep:
+                if gap:
+                    parts.append(t("context.lines_omitted", n=gap))
+                    gap = 0
+                parts.append(keep[i])
+            else:
+                gap += 1
+        if gap:
+            parts.append(t("context.lines_omitted", n=gap))
+        return "\n".join(parts)
+
+    # ── Level 2a: Structural compaction (zero-LLM) ─────────────────────
+
+    def compact_superseded(
+        self, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Replace tool results superseded by later calls with short stubs.
+
+        A result is superseded when a later step makes it redundant:
+        - ``read_file`` of a path that is later re-read, written, edited,
+          patched or deleted.
+        - ``grep``/``search_code``/``find_files``/``list_files`` repeated later
+          with identical arguments.
+        - Successful ``run_command`` output of a command that is run again.
+
+        Only the ``content`` of tool messages changes, so tool_call/tool
+        pairing stays valid. Runs in linear time: one forward pass to map
+        tool_call ids to their call, one backward pass to find superseded
+        results. Modified messages are copied, never mutated in place.
+
+        Args:
+            messages: Current agent message list
+
+        Returns:
+            Compacted list, or the original list if nothing was elided
+        """
+        if not self.config.compact_superseded:
+            return messages
+
+        replacements = self._superseded_results(messages)
+
+        # Keep only replacements that actually save space
+        replacements = {
+            idx: stub
+            for idx, stub in replacements.items()
+            if len(str(messages[idx].get("content") or "")) > max(len(stub), _MIN_ELIDE_CHARS)
+        }
+        if not replacements:
+            return messages
+
+        compacted = [
+            {**msg, "content": replacements[idx]} if idx in replacements else msg
+            for idx, msg in enumerate(messages)
+        ]
+        self.log.info(
+            "context.compacted",
+            elided_results=len(replacements),
+            tokens_before=self._estimate_tokens(messages),
+            tokens_after=self._estimate_tokens(compacted),
+        )
+        return compacted
+
+    def _superseded_results(self, messages: list[dict[str, Any]]) -> dict[int, str]:
+        """Find tool results made redundant by a later call.
+
+        Args:
+            messages: Message list
+
+        Returns:
+            Mapping of tool message index -> stub text that would replace it
+        """
+        # Forward pass: tool_call_id -> (tool name, parsed arguments, step)
+        calls: dict[str, tuple[str, dict[str, Any], int]] = {}
+        step = 0
+        for msg in messages:
+            if msg.get("role") != "assistant" or not msg.get("tool_calls"):
+                continue
+            step += 1
+            for tc in msg["tool_calls"]:
+                if not isinstance(tc, dict) or "function" not in tc:
+                    continue
+                func = tc["function"]
+                calls[tc.get("id", "")] = (
+                    func.get("name", ""),
+                    self._parse_call_arguments(func.get("arguments")),
+                    step,
+                )
+
+        # Backward pass: the newest occurrence of each key wins
+        seen: set[tuple[str, ...]] = set()
+        replacements: dict[int, str] = {}
+        from ..i18n import t
+        for idx in range(len(messages) - 1, -1, -1):
+            msg = messages[idx]
+            if msg.get("role") != "tool":
+                continue
+            call = calls.get(msg.get("tool_call_id", ""))
+            if call is None:
+                continue
+            name, args, call_step = call
+            content = msg.get("content")
+            is_error = isinstance(content, str) and content.startswith("Error:")
+
+            if name == "read_file" or name in _FILE_WRITE_TOOLS:
+                key = ("file", str(args.get("path", "")))
+                if name == "read_file" and key in seen:
+                    replacements[idx] = t("context.elided_file", path=key[1], step=call_step)
+                seen.add(key)
+            elif name in _REPEATABLE_TOOLS:
+                key = ("call", name, json.dumps(args, sort_keys=True))
+                if key in seen and not (name == "run_command" and is_error):
+                    replacements[idx] = t("context.elided_output", tool=name, step=call_step)
+                seen.add(key)
+
+        return replacements
+
+    @staticmethod
+    def _parse_call_arguments(arguments: Any) -> dict[str, Any]:
+        """Parse tool call arguments as stored in assistant messages."""
+        if isinstance(arguments, dict):
+            return arguments
+        try:
+            parsed = json.loads(arguments or "{}")
+        except (TypeError, ValueError):
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+
+    # ── Level 2b: Old step summarization ────────────────────────────────
 
     def maybe_compress(
         self, messages: list[dict[str, Any]], llm: LLMAdapter
@@ -116,7 +432,11 @@ class ContextManager:
 
         system_msg = messages[0]
         user_msg = messages[1]
-        dialog_msgs = messages[2:]
+        # Earlier summaries are append-only checkpoints: never re-summarized
+        # (keeps the cached prompt prefix stable) until the limit is reached
+        n_checkpoints = self._leading_checkpoints(messages)
+        checkpoints = messages[2:2 + n_checkpoints]
+        dialog_msgs = messages[2 + n_checkpoints:]
 
         # Keep the last keep_recent_steps*3 messages intact
         keep_count = self.config.keep_recent_steps * 3
@@ -126,11 +446,17 @@ class ContextManager:
         old_msgs = dialog_msgs[:-keep_count]
         recent_msgs = dialog_msgs[-keep_count:]
 
+        if n_checkpoints >= self.config.max_summary_checkpoints:
+            # Merge all checkpoints into the new summary (one-time prefix rewrite)
+            old_msgs = [*checkpoints, *old_msgs]
+            checkpoints = []
+
         self.log.info(
             "context.compressing",
             tool_exchanges=tool_exchanges,
             old_messages=len(old_msgs),
             kept_messages=len(recent_msgs),
+            checkpoints=len(checkpoints),
         )
 
         # Summarize old messages with the LLM
@@ -140,13 +466,9 @@ class ContextManager:
             self.log.warning("context.compress_failed", error=str(e))
             return messages  # Graceful degradation: no compression
 
-        from ..i18n import t
-        summary_msg: dict[str, Any] = {
-            "role": "assistant",
-            "content": f"{t('context.summary_header')}\n{summary}",
-        }
+        summary_msg = self._make_summary_message(summary)
 
-        compressed = [system_msg, user_msg, summary_msg, *recent_msgs]
+        compressed = [system_msg, user_msg, *checkpoints, summary_msg, *recent_msgs]
         self.log.info(
             "context.compressed",
             original_messages=len(messages),
@@ -154,6 +476,180 @@ class ContextManager:
         )
         return compressed
 
+    # ── Level 2c: Background summary pre-computation ─────────────────────
+
+    def precompute_summary(
+        self, messages: list[dict[str, Any]], llm: LLMAdapter
+    ) -> None:
+        """Start summarizing the oldest window in background if usage is high.
+
+        Called by the agent loop right before it executes a batch of tools,
+        so the summary call overlaps with tool execution. Triggers when the
+        context crosses ``precompute_summary_at`` (but is still below the 75%
+        compression threshold). The window is the same one ``maybe_compress``
+        would summarize right now; the summary is swapped in later by
+        ``_apply_precomputed_summary`` if those messages are still unchanged.
+        At most one summary is in flight.
+
+        Args:
+            messages: Current message list
+            llm: LLMAdapter used for the summary call
+        """
+        cfg = self.config
+        if (
+            cfg.precompute_summary_at <= 0
+            or cfg.max_context_tokens == 0
+            or cfg.summarize_after_steps == 0
+        ):
+            return
+
+        if self._pending_summary is not None:
+            if self._pending_covers(messages[2:]):
+                return
+            self._discard_pending_summary("messages_changed")
+
+        if not self._is_above_threshold(messages, cfg.precompute_summary_at):
+            return
+
+        n_checkpoints = self._leading_checkpoints(messages)
+        if n_checkpoints >= cfg.max_summary_checkpoints:
+            return  # Next compression merges checkpoints: left to the sync path
+
+        dialog = messages[2:]
+        keep_count = cfg.keep_recent_steps * 3
+        if len(dialog) - n_checkpoints <= keep_count:
+            return
+
+        window = list(dialog[n_checkpoints:-keep_count])
+        if self._summary_executor is None:
+            self._summary_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="context-summary"
+            )
+        future = self._summary_executor.submit(self._summarize_steps, window, llm)
+        self._pending_summary = (
+            future,
+            n_checkpoints,
+            window,
+            [self._message_signature(m) for m in window],
+        )
+        self.log.info("context.summary_precompute_started", messages=len(window))
+
+    def _apply_precomputed_summary(
+        self, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Swap in the background summary if it is still valid.
+
+        Only applies when compression is due (same step condition as
+        ``maybe_compress``) and the covered messages are still the first
+        dialog messages, unchanged. Otherwise the summary is discarded (or
+        kept for later if compression is simply not due yet) and the
+        synchronous path remains the fallback.
+
+        Args:
+            messages: Current message list
+
+        Returns:
+            Compressed list, or the original if no valid summary is available
+        """
+        if self._pending_summary is None:
+            return messages
+        if self._count_tool_exchanges(messages) <= self.config.summarize_after_steps:
+            return messages
+
+        dialog = messages[2:]
+        if not self._pending_covers(dialog):
+            self._discard_pending_summary("messages_changed")
+            return messages
+
+        future, offset, window, _ = self._pending_summary
+        self._pending_summary = None
+        try:
+            # Usually already done; otherwise wait for the remainder of a
+            # call that started steps ago instead of starting a new one.
+            summary = future.result()
+        except Exception as e:
+            self.log.warning("context.compress_failed", error=str(e))
+            return messages
+
+        compressed = [
+            messages[0],
+            messages[1],
+            *dialog[:offset],
+            self._make_summary_message(summary),
+            *dialog[offset + len(window):],
+        ]
+        self.log.info(
+            "context.compressed",
+            original_messages=len(messages),
+            compressed_messages=len(compressed),
+            precomputed=True,
+        )
+        return compressed
+
+    def _pending_covers(self, dialog: list[dict[str, Any]]) -> bool:
+        """True if the pending summary's window is an unchanged dialog prefix."""
+        assert self._pending_summary is not None
+        _, offset, window, signatures = self._pending_summary
+        if self._leading_checkpoints(dialog, start=0) != offset:
+            return False
+        if len(dialog) < offset + len(window):
+            return False
+        return all(
+            dialog[offset + i] is msg and self._message_signature(msg) == signatures[i]
+            for i, msg in enumerate(window)
+        )
+
+    def _discard_pending_summary(self, reason: str) -> None:
+        """Drop the in-flight summary (its result is ignored if it finishes)."""
+        if self._pending_summary is None:
+            return
+        self._pending_summary[0].cancel()
+        self._pending_summary = None
+        self.log.debug("context.summary_precompute_discarded", reason=reason)
+
+    def close(self) -> None:
+        """Release the background summary thread (if any)."""
+        self._discard_pending_summary("closed")
+        if self._summary_executor is not None:
+            self._summary_executor.shutdown(wait=False, cancel_futures=True)
+            self._summary_executor = None
+
+    def _leading_checkpoints(
+        self, messages: list[dict[str, Any]], start: int = 2
+    ) -> int:
+        """Count the summary checkpoints right after the system + user prefix.
+
+        Args:
+            messages: Message list
+            start: Index where the dialog starts (2 for a full message list)
+        """
+        count = 0
+        for msg in messages[start:]:
+            if not self._is_checkpoint(msg):
+                break
+            count += 1
+        return count
+
+    @staticmethod
+    def _is_checkpoint(msg: dict[str, Any]) -> bool:
+        """True if msg is a summary produced by compression."""
+        from ..i18n import t
+        content = msg.get("content")
+        return (
+            msg.get("role") == "assistant"
+            and not msg.get("tool_calls")
+            and isinstance(content, str)
+            and content.startswith(t("context.summary_header"))
+        )
+
+    def _make_summary_message(self, summary: str) -> dict[str, Any]:
+        """Build the assistant message that replaces summarized steps."""
+        from ..i18n import t
+        return {
+            "role": "assistant",
+            "content": f"{t('context.summary_header')}\n{summary}",
+        }
+
     def _summarize_steps(
         self, messages: list[dict[str, Any]], llm: LLMAdapter
     ) -> str:
@@ -164,11 +660,12 @@ class ContextManager:
 
         Args:
             messages: Dialog messages to summarize
-            llm: LLMAdapter for the summary call
+            llm: LLMAdapter for the summary call (``summary_llm`` takes precedence)
 
         Returns:
             Summary text (~200 words)
         """
+        llm = self.summary_llm or llm
         formatted = self._format_steps_for_summary(messages)
 
         from ..i18n import t
@@ -180,6 +677,8 @@ class ContextManager:
                 },
             ]
             response = llm.completion(summary_prompt, tools=None)
+            if not (response.content or "").strip() and isinstance(llm, PurposeLLM):
+                response = llm.escalate(summary_prompt) or response
             return response.content or formatted
         except Exception as e:
             self.log.warning("context.summarize_llm_failed", error=str(e))
@@ -199,6 +698,9 @@ class ContextManager:
                         if isinstance(tc, dict) and "function" in tc
                     ]
                     parts.append(t("context.agent_called_tools", tools=", ".join(tool_names)))
+                elif self._is_checkpoint(msg):
+                    # Merging checkpoints: keep the earlier summary in full
+                    parts.append(str(msg["content"]))
                 elif msg.get("content"):
                     content = str(msg["content"])[:300]
                     parts.append(t("context.agent_responded", content=content))
@@ -224,7 +726,10 @@ class ContextManager:
         """Unified context management pipeline.
 
         Called before each LLM call. Applies in order:
-        1. Compress old steps (Level 2) if context exceeds 75%
+        1. If context exceeds 75%: swap in a precomputed summary (Level 2c,
+           started by ``precompute_summary`` while tools ran), elide
+           superseded tool results (Level 2a), then, if still above 75%,
+           summarize old steps synchronously (Level 2b).
         2. Hard token limit (Level 3)
 
         Level 1 (tool result truncation) is applied in ContextBuilder
@@ -235,12 +740,23 @@ class ContextManager:
             llm: LLMAdapter for generating summaries (can be None)
 
         Returns:
-            Managed message list (possibly compressed or truncated)
+            Managed message list (possibly compressed or truncated). A
+            MessageLog is updated in place and returned.
         """
-        # Only compress if context exceeds 75% of maximum
-        if llm and self._is_above_threshold(messages, 0.75):
-            messages = self.maybe_compress(messages, llm)
+        # Only compress if context exceeds 75% of maximum.
+        # The free structural pass runs first; the LLM summary only if still needed.
+        log = messages
+        if self._is_above_threshold(messages, 0.75):
+            messages = self._apply_precomputed_summary(messages)
+            messages = self.compact_superseded(messages)
+            if llm and self._is_above_threshold(messages, 0.75):
+                messages = self.maybe_compress(messages, llm)
         messages = self.enforce_window(messages)
+        if isinstance(log, MessageLog) and messages is not log:
+            # Rewrite only the changed region of the caller's log
+            log.sync(messages)
+            messages = log
+        self._prune_ledger(messages)
         return messages
 
     def _is_above_threshold(
@@ -285,9 +801,16 @@ class ContextManager:
     ) -> list[dict[str, Any]]:
         """Apply a hard token limit to the context window.
 
-        If the estimated total exceeds ``max_context_tokens``, removes pairs of
-        old dialog messages (2 at a time, starting from the oldest)
-        until it fits, always keeping system and user messages.
+        If the estimated total exceeds ``max_context_tokens``, evicts dialog
+        units until it fits, always keeping system, user, summary checkpoints
+        and the newest unit. A unit is an assistant message together with its
+        tool results, so tool_call/tool pairing is never broken; any other
+        message is a unit on its own.
+
+        Units are evicted by lowest value per token first. Value grows with
+        recency and drops for units whose tool results were superseded by a
+        later call (same keys as ``compact_superseded``), so large, stale or
+        redundant results go before small recent ones.
 
         Args:
             messages: Message list
@@ -298,40 +821,101 @@ class ContextManager:
         if self.config.max_context_tokens == 0:
             return messages
 
-        if self._estimate_tokens(messages) <= self.config.max_context_tokens:
+        sizes = [self._message_tokens(m) for m in messages]
+        total = sum(sizes)
+        if int(total) <= self.config.max_context_tokens:
             return messages
 
-        system_msg = messages[0]
-        user_msg = messages[1]
-        dialog = list(messages[2:])
-        removed = 0
+        # System, user and summary checkpoints form the frozen head
+        head_len = 2 + self._leading_checkpoints(messages)
+        units = self._dialog_units(messages, head_len)
+        if len(units) <= 1:
+            return messages
 
-        while (
-            len(dialog) > 2
-            and self._estimate_tokens([system_msg, user_msg] + dialog)
-            > self.config.max_context_tokens
-        ):
-            # Remove the 2 oldest dialog messages
-            dialog = dialog[2:]
-            removed += 2
-
-        if removed > 0:
-            self.log.warning(
-                "context.window_enforced",
-                removed_messages=removed,
-                remaining_messages=len(dialog),
-            )
+        superseded = self._superseded_results(messages)
+        scored: list[tuple[float, int]] = []
+        for position, (first, last) in enumerate(units[:-1]):
+            value = (position + 1) / len(units)
+            tool_results = [i for i in range(first, last) if messages[i].get("role") == "tool"]
+            if tool_results:
+                stale = sum(1 for i in tool_results if i in superseded) / len(tool_results)
+                value *= 1.0 - stale * (1.0 - _SUPERSEDED_VALUE)
+            unit_tokens = sum(sizes[first:last]) or 1.0
+            scored.append((value / unit_tokens, position))
+
+        # Single pass over units ordered by value density
+        evicted: set[int] = set()
+        for _, position in sorted(scored):
+            if int(total) <= self.config.max_context_tokens:
+                break
+            first, last = units[position]
+            total -= sum(sizes[first:last])
+            evicted.add(position)
+
+        kept = messages[:head_len]
+        for position, (first, last) in enumerate(units):
+            if position not in evicted:
+                kept.extend(messages[first:last])
+
+        self.log.warning(
+            "context.window_enforced",
+            removed_messages=len(messages) - len(kept),
+            removed_units=len(evicted),
+            remaining_messages=len(kept) - head_len,
+            evicted=[self._describe_unit(messages, *units[p]) for p in sorted(evicted)],
+        )
+        return kept
+
+    @staticmethod
+    def _dialog_units(
+        messages: list[dict[str, Any]], start: int
+    ) -> list[tuple[int, int]]:
+        """Split the dialog into atomic ``[first, last)`` index ranges.
 
-        return [system_msg, user_msg] + dialog
+        An assistant message with tool_calls absorbs the tool messages that
+        follow it and answer one of its calls.
+        """
+        units: list[tuple[int, int]] = []
+        idx = start
+        while idx < len(messages):
+            msg = messages[idx]
+            end = idx + 1
+            if msg.get("role") == "assistant" and msg.get("tool_calls"):
+                call_ids = {
+                    tc.get("id") for tc in msg["tool_calls"] if isinstance(tc, dict)
+                }
+                while (
+                    end < len(messages)
+                    and messages[end].get("role") == "tool"
+                    and messages[end].get("tool_call_id") in call_ids
+                ):
+                    end += 1
+            units.append((idx, end))
+            idx = end
+        return units
+
+    @staticmethod
+    def _describe_unit(
+        messages: list[dict[str, Any]], first: int, last: int
+    ) -> str:
+        """Short label of an evicted unit for logs (tool names or role)."""
+        msg = messages[first]
+        if msg.get("tool_calls"):
+            names = [
+                tc.get("function", {}).get("name", "?")
+                for tc in msg["tool_calls"] if isinstance(tc, dict)
+            ]
+            return ",".join(names)
+        return str(msg.get("role", "?"))
 
     # ── Utilities ─────────────────────────────────────────────────────────
 
     def _estimate_tokens(self, messages: list[dict[str, Any]]) -> int:
         """Estimate the number of tokens in a message list.
 
-        Approximation: ~4 characters per token (valid for English and code).
-        Extracts only the relevant content fields instead of serializing
-        the full dict (which overestimates due to JSON keys and metadata).
+        Uses the configured tokenizer backend (default: ~4 characters per
+        token). Per-message counts come from the token ledger, so repeated
+        estimates over a growing history only measure new messages.
 
         Args:
             messages: Message list
@@ -339,21 +923,96 @@ class ContextManager:
         Returns:
             Token estimate
         """
-        total_chars = 0
-        for m in messages:
-            # Main message content
-            content = m.get("content")
-            if content:
-                total_chars += len(str(content))
-            # Tool calls: count name and arguments
-            for tc in m.get("tool_calls", []):
-                if isinstance(tc, dict):
-                    func = tc.get("function", {})
-                    total_chars += len(str(func.get("name", "")))
-                    total_chars += len(str(func.get("arguments", "")))
-            # Overhead per message (~4 metadata tokens per message)
-            total_chars += 16
-        return total_chars // 4
+        return int(sum(self._message_tokens(m) for m in messages))
+
+    def _message_tokens(self, message: dict[str, Any]) -> float:
+        """Return the cached token count of a message, measuring it once."""
+        signature = self._message_signature(message)
+        entry = self._token_ledger.get(id(message))
+        if entry is not None and entry[0] is message and entry[1] == signature:
+            return entry[2]
+        tokens = self._measure_message(message)
+        self._token_ledger[id(message)] = (message, signature, tokens)
+        return tokens
+
+    @staticmethod
+    def _message_signature(message: dict[str, Any]) -> tuple[int, ...]:
+        """Cheap fingerprint that detects in-place edits of a cached message.
+
+        Covers the known mutation (appending skills/memory to the system
+        prompt) without re-serializing the message. List-form content
+        (multimodal parts, cache_control blocks) is fingerprinted by the
+        list identity, its part count and the length of its text parts,
+        which is O(parts) rather than O(content size).
+        """
+        content = message.get("content")
+        tool_calls = len(message.get("tool_calls") or ())
+        if isinstance(content, str):
+            return len(content), tool_calls
+        if isinstance(content, list):
+            text_len = sum(
+                len(part.get("text") or "") for part in content if isinstance(part, dict)
+            )
+            return id(content), len(content), text_len, tool_calls
+        return int(content is not None), tool_calls
+
+    def _measure_message(self, message: dict[str, Any]) -> float:
+        """Measure the tokens of a single message.
+
+        Extracts only the content fields instead of serializing the full
+        dict (which overestimates due to JSON keys and metadata).
+        """
+        count = self.tokenizer.count
+        # Overhead per message (~4 metadata tokens per message)
+        tokens = 4.0
+        # Main message content
+        content = message.get("content")
+        if content:
+            tokens += count(content if isinstance(content, str) else str(content))
+        # Tool calls: count name and arguments
+        for tc in message.get("tool_calls", []):
+            if isinstance(tc, dict):
+                func = tc.get("function", {})
+                tokens += count(str(func.get("name", "")))
+                tokens += count(str(func.get("arguments", "")))
+        return tokens
+
+    def record_usage(
+        self, messages: list[dict[str, Any]], usage: dict[str, Any]
+    ) -> None:
+        """Log estimated vs actual prompt tokens to calibrate the estimator.
+
+        The actual count also includes tool schemas and provider framing,
+        so a stable ratio above 1.0 is expected.
+
+        Args:
+            messages: Messages sent in the LLM call
+            usage: ``LLMResponse.usage`` of that call
+        """
+        actual = int(usage.get("prompt_tokens", 0) or 0)
+        if actual <= 0:
+            return
+        estimated = self._estimate_tokens(messages)
+        self.log.debug(
+            "context.token_calibration",
+            tokenizer=self.tokenizer.name,
+            estimated_tokens=estimated,
+            actual_prompt_tokens=actual,
+            ratio=round(actual / estimated, 3) if estimated else None,
+        )
+
+    def _prune_ledger(self, messages: list[dict[str, Any]]) -> None:
+        """Drop ledger entries for messages no longer in the context.
+
+        Entries hold a reference to their message, so pruning also releases
+        messages removed by compression or the sliding window.
+        """
+        if len(self._token_ledger) <= 2 * len(messages):
+            return
+        live = {id(m) for m in messages}
+        self._token_ledger = {
+            key: entry for key, entry in self._token_ledger.items() if key in live
+        }
 
 
 class ContextBuilder:
@@ -389,6 +1048,7 @@ class ContextBuilder:
         self,
         agent_config: AgentConfig,
         prompt: str,
+        extra_system_sections: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """Build the initial messages for the LLM.
 
@@ -396,12 +1056,17 @@ class ContextBuilder:
         as a "Project Structure" section. This allows the agent to know which
         files exist without needing to manually call list_files.
 
+        The system prompt is final once built: nothing appends to it during
+        the session, so providers can cache it as a stable prefix.
+
         Args:
             agent_config: Agent configuration (system_prompt, allowed_tools, etc.)
             prompt: User prompt
+            extra_system_sections: Extra sections appended to the system prompt
+                (skills, procedural memory)
 
         Returns:
-            Message list in OpenAI format: [system, user]
+            MessageLog in OpenAI format: [system, user]
         """
         # Base agent system prompt
         system_content = agent_config.system_prompt
@@ -410,10 +1075,13 @@ class ContextBuilder:
         if self.repo_index is not None:
             system_content = self._inject_repo_index(system_content, self.repo_index)
 
-        return [
+        for section in extra_system_sections or []:
+            system_content += "\n\n" + section
+
+        return MessageLog([
             {"role": "system", "content": system_content},
             {"role": "user", "content": prompt},
-        ]
+        ])
 
     def _inject_repo_index(self, system_prompt: str, index: RepoIndex) -> str:
         """Add the project structure section to the system prompt.
@@ -469,9 +1137,15 @@ class ContextBuilder:
             results: Results from executing the tool calls
 
         Returns:
-            New message list with tool results appended
+            The same MessageLog with the results appended, or a new list
+            if ``messages`` is a plain list
         """
-        new_messages = messages.copy()
+        # Level 1 budget: shared by this batch, sized to the remaining window
+        budget = (
+            self.context_manager.tool_result_budget(messages, len(results))
+            if self.context_manager else None
+        )
+        new_messages = self._appendable(messages)
 
         # 1. Add assistant message with tool_calls
         assistant_message: dict[str, Any] = {
@@ -493,7 +1167,7 @@ class ContextBuilder:
 
         # 2. Add tool messages with the results
         for tc, result in zip(tool_calls, results):
-            tool_message = self._format_tool_result(tc, result)
+            tool_message = self._format_tool_result(tc, result, budget)
             new_messages.append(tool_message)
 
         return new_messages
@@ -502,10 +1176,12 @@ class ContextBuilder:
         self,
         tool_call: ToolCall,
         result: ToolCallResult,
+        budget: int | None = None,
     ) -> dict[str, Any]:
         """Format a tool result for the LLM.
 
-        Applies truncation (Level 1 of F11) if a ContextManager is configured.
+        Applies truncation (Level 1 of F11) if a ContextManager is configured,
+        with ``budget`` tokens (default: ``max_tool_result_tokens``).
         """
         if result.was_dry_run:
             content = f"[DRY-RUN] {result.result.output}"
@@ -516,7 +1192,9 @@ class ContextBuilder:
 
         # Level 1 (F11): Truncate if the result is too long
         if self.context_manager and content:
-            content = self.context_manager.truncate_tool_result(content)
+            content = self.context_manager.truncate_tool_result(
+                content, max_tokens=budget, tool_name=tool_call.name,
+            )
 
         return {
             "role": "tool",
@@ -536,7 +1214,7 @@ class ContextBuilder:
         content: str,
     ) -> list[dict[str, Any]]:
         """Append an assistant message (final response)."""
-        new_messages = messages.copy()
+        new_messages = self._appendable(messages)
         new_messages.append({"role": "assistant", "content": content})
         return new_messages
 
@@ -546,6 +1224,17 @@ class ContextBuilder:
         content: str,
     ) -> list[dict[str, Any]]:
         """Append a user message."""
-        new_messages = messages.copy()
+        new_messages = self._appendable(messages)
         new_messages.append({"role": "user", "content": content})
         return new_messages
+
+    @staticmethod
+    def _appendable(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the list to append to.
+
+        A MessageLog is appended in place (O(1) per message); plain lists
+        keep the original copy-on-append semantics.
+        """
+        if isinstance(messages, MessageLog):
+            return messages
+        return messages.copy()
@@ -21,12 +21,13 @@ from __future__ import annotations
 import json
 import re
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 import structlog
 
 if TYPE_CHECKING:
     from ..llm.adapter import LLMAdapter
+    from ..llm.cascade import PurposeLLM
     from .state import AgentState
 
 logger = structlog.get_logger()
@@ -77,7 +78,7 @@ class SelfEvaluator:
 
     def __init__(
         self,
-        llm: LLMAdapter,
+        llm: LLMAdapter | PurposeLLM,
         max_retries: int = 2,
         confidence_threshold: float = 0.8,
     ) -> None:
@@ -149,6 +150,18 @@ class SelfEvaluator:
                 raw_response="",
             )
 
+        # Escalate to the main model if a cheaper eval model returned
+        # something that is not the expected JSON verdict
+        from ..llm.cascade import PurposeLLM
+        if self._extract_eval_data(raw) is None and isinstance(self.llm, PurposeLLM):
+            try:
+                escalated = self.llm.escalate(eval_messages, tools=None)
+            except Exception as e:
+                self.log.warning("eval.basic.escalation_error", error=str(e))
+                escalated = None
+            if escalated is not None:
+                raw = escalated.content or ""
+
         result = self._parse_eval(raw)
 
         self.log.info(
@@ -296,21 +309,11 @@ class SelfEvaluator:
 
         return "\n".join(parts)
 
-    def _parse_eval(self, content: str) -> EvalResult:
-        """Parse the JSON response from the evaluator LLM.
-
-        Tries three strategies in order:
-        1. Parse the content directly as JSON
-        2. Extract the first ``{...}`` block with regex
-        3. Extract from a code block ```json ... ```
-
-        If all fail, returns a conservative EvalResult (not completed).
+    def _extract_eval_data(self, content: str) -> dict[str, Any] | None:
+        """Extract the evaluator JSON object from the response, if any.
 
-        Args:
-            content: Raw LLM response.
-
-        Returns:
-            Parsed EvalResult or conservative fallback.
+        Tries three strategies in order: the content directly as JSON, a
+        ```json ... ``` code block, and the first ``{...}`` block.
         """
         content = content.strip()
 
@@ -331,6 +334,23 @@ class SelfEvaluator:
             if brace_match:
                 data = self._try_parse_json(brace_match.group(0))
 
+        return data
+
+    def _parse_eval(self, content: str) -> EvalResult:
+        """Parse the JSON response from the evaluator LLM.
+
+        Extraction strategies are in ``_extract_eval_data``. If all fail,
+        returns a conservative EvalResult (not completed).
+
+        Args:
+            content: Raw LLM response.
+
+        Returns:
+            Parsed EvalResult or conservative fallback.
+        """
+        content = content.strip()
+        data = self._extract_eval_data(content)
+
         # Fallback: conservative evaluation
         if data is None:
             from ..i18n import t
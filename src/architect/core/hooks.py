@@ -13,6 +13,28 @@ Exit code protocol:
 - Exit 2  = BLOCK  (block the action, stderr = reason)
 - Other   = Hook error (logged as WARNING, does not block)
 
+Persistent hooks (``persistent: true``) are started once per session instead
+of once per event. They receive one JSON line per event on stdin and answer
+each with one JSON line on stdout:
+
+    -> {"id": 7, "event": "pre_tool_use", "context": {...}, "data": {...}}
+    <- {"id": 7, "decision": "block", "reason": "..."}
+
+``decision`` is "allow" (default), "block" or "modify" (with
+``updatedInput``); ``additionalContext`` works as in one-shot hooks. A
+persistent hook that crashes or misses the event timeout is killed and
+started again on the next event (up to 3 times per session, then it is
+disabled). The timeout covers writing the event too: a hook that stops
+reading its stdin cannot block the agent on a full pipe.
+
+Hooks run on bounded per-executor worker pools (``max_concurrency``
+workers each). Pre-hooks (pre_tool_use, pre_llm_call) run one after another
+so a BLOCK still short-circuits the rest; hooks of other events cannot block
+and run concurrently. Async hooks are queued on a separate pool, so a burst
+of them never delays the hooks the agent waits for (at most
+``max_concurrency * 4`` waiting; beyond that they are dropped), and their
+output is collected for the agent's next step (``drain_async_context()``).
+
 Invariants:
 - Hooks NEVER break the loop (errors -> log + return ALLOW)
 - Each hook's timeout is configurable (default 10s)
@@ -23,10 +45,14 @@ Invariants:
 import fnmatch
 import json
 import os
+import queue
 import re
+import select
 import subprocess
 import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
@@ -91,6 +117,8 @@ class HookConfig:
         is_async: If True, the hook runs in background without blocking.
         enabled: If False, the hook is ignored.
         name: Descriptive hook name.
+        persistent: If True, one long-lived process answers every event
+            over JSON lines instead of a new process per event.
     """
 
     command: str
@@ -100,6 +128,218 @@ class HookConfig:
     is_async: bool = False
     enabled: bool = True
     name: str = ""
+    persistent: bool = False
+
+
+# Restarts allowed per persistent hook and session before it is disabled
+_MAX_RESTARTS = 3
+
+# Seconds a persistent hook gets to exit after its stdin is closed
+_SHUTDOWN_GRACE = 1.0
+
+# Returned by _PersistentHook._read_reply when the process exits mid-request
+_CRASHED = object()
+
+# Events whose hooks may BLOCK: run sequentially with short-circuit
+_BLOCKING_EVENTS = frozenset({HookEvent.PRE_TOOL_USE, HookEvent.PRE_LLM_CALL})
+
+# Async hooks allowed to wait for a worker, per unit of max_concurrency
+_ASYNC_QUEUE_FACTOR = 4
+
+
+class _PersistentHook:
+    """Long-lived hook process speaking newline-delimited JSON.
+
+    One request is in flight at a time (requests are serialized with a
+    lock). stdout and stderr are drained by daemon threads so a chatty or
+    stuck hook can never block the agent; replies carry the request id so a
+    late answer to an earlier, timed-out event is discarded.
+    """
+
+    def __init__(self, hook: HookConfig, cwd: str, env: dict[str, str]) -> None:
+        self.hook = hook
+        self.cwd = cwd
+        self.env = env
+        self.restarts = 0
+        self.disabled = False
+        self._proc: subprocess.Popen[str] | None = None
+        self._replies: queue.Queue[str | None] = queue.Queue()
+        self._stderr: deque[str] = deque(maxlen=20)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.log = logger.bind(component="hooks", hook=hook.name)
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def request(self, event: HookEvent, context: dict[str, Any],
+                data: dict[str, Any] | None) -> dict[str, Any] | None:
+        """Send one event and wait for its reply.
+
+        Returns:
+            The decoded reply, or None if the hook timed out, crashed or is
+            disabled (the caller treats None as ALLOW).
+        """
+        with self._lock:
+            # One retry: a hook that died between events is restarted once
+            for _ in range(2):
+                if self.disabled or not self._ensure_started():
+                    return None
+                self._next_id += 1
+                request_id = self._next_id
+                line = json.dumps({
+                    "id": request_id,
+                    "event": event.value,
+                    "context": context,
+                    "data": data,
+                }, default=str)
+                deadline = time.monotonic() + self.hook.timeout
+                try:
+                    written = self._write((line + "\n").encode(), deadline)
+                except (BrokenPipeError, OSError, ValueError):
+                    self._discard("crashed")
+                    continue
+                if not written:
+                    self.log.warning(
+                        "hook.timeout", timeout=self.hook.timeout, persistent=True, stage="write",
+                    )
+                    self._discard("timeout")
+                    return None
+                reply = self._read_reply(request_id, deadline)
+                if reply is None or isinstance(reply, dict):
+                    return reply
+                self._discard("crashed")
+            return None
+
+    def close(self) -> None:
+        """Close stdin (EOF tells the hook to exit) and reap the process."""
+        with self._lock:
+            self._stop(graceful=True)
+
+    def _write(self, data: bytes, deadline: float) -> bool:
+        """Write ``data`` to the hook's (non-blocking) stdin before ``deadline``.
+
+        Returns:
+            False if the pipe stayed full until the deadline.
+        """
+        assert self._proc is not None and self._proc.stdin is not None
+        fd = self._proc.stdin.fileno()
+        pending = memoryview(data)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _, writable, _ = select.select([], [fd], [], remaining)
+            if not writable:
+                return False
+            try:
+                pending = pending[os.write(fd, pending):]
+            except BlockingIOError:
+                continue
+        return True
+
+    def _read_reply(self, request_id: int, deadline: float) -> Any:
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._replies.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                self.log.warning("hook.timeout", timeout=self.hook.timeout, persistent=True)
+                # A hook that missed its deadline is out of sync: start afresh
+                self._discard("timeout")
+                return None
+            if line is None:
+                return _CRASHED
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                self.log.warning("hook.invalid_reply", line=line[:200])
+                return None
+            if not isinstance(reply, dict):
+                self.log.warning("hook.invalid_reply", line=line[:200])
+                return None
+            if reply.get("id", request_id) != request_id:
+                continue  # late reply to an earlier event
+            return reply
+
+    def _ensure_started(self) -> bool:
+        if self.running:
+            return True
+        try:
+            self._proc = subprocess.Popen(
+                self.hook.command,
+                shell=True,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                cwd=self.cwd,
+                env=self.env,
+            )
+        except OSError as e:
+            self.log.error("hook.exception", error=str(e), persistent=True)
+            self.disabled = True
+            return False
+        # Events are written straight to the fd with a deadline (see _write)
+        assert self._proc.stdin is not None
+        os.set_blocking(self._proc.stdin.fileno(), False)
+        # Fresh queue: nothing from a previous process can be read as a reply
+        self._replies = queue.Queue()
+        threading.Thread(
+            target=self._pump_stdout, args=(self._proc, self._replies), daemon=True,
+        ).start()
+        threading.Thread(target=self._pump_stderr, args=(self._proc,), daemon=True).start()
+        self.log.debug("hook.persistent_started", pid=self._proc.pid)
+        return True
+
+    def _discard(self, reason: str) -> None:
+        """Kill the current process; the next request starts a new one."""
+        exit_code = self._proc.poll() if self._proc else None
+        self._stop(graceful=False)
+        self.restarts += 1
+        self.log.warning(
+            "hook.persistent_restart",
+            reason=reason,
+            exit_code=exit_code,
+            restarts=self.restarts,
+            stderr="\n".join(self._stderr)[-200:],
+        )
+        if self.restarts > _MAX_RESTARTS:
+            self.disabled = True
+            self.log.error("hook.persistent_disabled", restarts=self.restarts)
+
+    def _stop(self, graceful: bool) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            if graceful:
+                proc.wait(timeout=_SHUTDOWN_GRACE)
+        except subprocess.TimeoutExpired:
+            pass
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    @staticmethod
+    def _pump_stdout(proc: "subprocess.Popen[str]", replies: "queue.Queue[str | None]") -> None:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if line.strip():
+                replies.put(line.strip())
+        replies.put(None)  # EOF: the process exited
+
+    def _pump_stderr(self, proc: "subprocess.Popen[str]") -> None:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            self._stderr.append(line.rstrip())
 
 
 @dataclass
@@ -133,18 +373,44 @@ class HookExecutor:
     - Interpreting the exit code and stdout/stderr
     - Filtering hooks by matcher and file_patterns
     - Handling async hooks (background)
+    - Keeping persistent hooks alive for the session (close() stops them)
+    - Running non-blocking and async hooks on bounded worker pools
     """
 
-    def __init__(self, registry: HooksRegistry, workspace_root: str) -> None:
+    def __init__(
+        self,
+        registry: HooksRegistry,
+        workspace_root: str,
+        max_concurrency: int = 4,
+    ) -> None:
         """Initialize the executor.
 
         Args:
             registry: Hook registry by event.
             workspace_root: Workspace root directory for CWD.
+            max_concurrency: Workers of each hook pool (sync and async).
         """
         self.registry = registry
         self.workspace_root = workspace_root
+        self.max_concurrency = max(1, max_concurrency)
         self.log = logger.bind(component="hooks")
+        self._pool: ThreadPoolExecutor | None = None
+        self._async_pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        # Pool counters (guarded by _pool_lock)
+        self._queued = 0
+        self._active = 0
+        self._async_queued = 0
+        self._peak_queued = 0
+        self._peak_active = 0
+        self._completed = 0
+        self._async_dropped = 0
+        # additionalContext of finished async hooks, not yet seen by the agent
+        self._async_context: deque[str] = deque()
+        # Snapshot once: os.environ.copy() re-decodes every variable per call
+        self._base_env = {**os.environ, "ARCHITECT_WORKSPACE": workspace_root}
+        self._persistent: dict[int, _PersistentHook] = {}
+        self._persistent_lock = threading.Lock()
 
     def _build_env(self, event: HookEvent, context: dict[str, Any]) -> dict[str, str]:
         """Build environment variables for the hook.
@@ -159,9 +425,8 @@ class HookExecutor:
         Returns:
             Dict of env vars for subprocess.
         """
-        env = os.environ.copy()
+        env = dict(self._base_env)
         env["ARCHITECT_EVENT"] = event.value
-        env["ARCHITECT_WORKSPACE"] = self.workspace_root
         for key, value in context.items():
             env_key = f"ARCHITECT_{key.upper()}"
             env[env_key] = str(value) if value is not None else ""
@@ -186,6 +451,8 @@ class HookExecutor:
             HookResult with the decision and associated data.
         """
         start = time.monotonic()
+        if hook.persistent:
+            return self._execute_persistent(hook, event, context, stdin_data, start)
         env = self._build_env(event, context)
         stdin_json = json.dumps(stdin_data) if stdin_data else ""
 
@@ -229,6 +496,62 @@ class HookExecutor:
             self.log.error("hook.exception", hook=hook.name, error=str(e))
             return HookResult()
 
+    def _execute_persistent(
+        self,
+        hook: HookConfig,
+        event: HookEvent,
+        context: dict[str, Any],
+        stdin_data: dict[str, Any] | None,
+        start: float,
+    ) -> HookResult:
+        """Send the event to the hook's long-lived process (started on first use)."""
+        with self._persistent_lock:
+            server = self._persistent.get(id(hook))
+            if server is None:
+                server = _PersistentHook(hook, self.workspace_root, dict(self._base_env))
+                self._persistent[id(hook)] = server
+        reply = server.request(event, context, stdin_data)
+        duration = (time.monotonic() - start) * 1000
+        if reply is None:
+            return HookResult(duration_ms=duration)
+
+        decision = str(reply.get("decision", "allow")).lower()
+        if decision == "block":
+            return HookResult(
+                decision=HookDecision.BLOCK,
+                reason=reply.get("reason") or f"Hook '{hook.name}' blocked the action",
+                duration_ms=duration,
+            )
+        if decision == "modify" or reply.get("updatedInput") is not None:
+            return HookResult(
+                decision=HookDecision.MODIFY,
+                updated_input=reply.get("updatedInput"),
+                additional_context=reply.get("additionalContext"),
+                duration_ms=duration,
+            )
+        return HookResult(
+            additional_context=reply.get("additionalContext"),
+            duration_ms=duration,
+        )
+
+    def close(self) -> None:
+        """Release the worker pools and stop the persistent hook processes.
+
+        Queued async hooks still run; the pools and the persistent
+        processes are recreated if the executor is used again.
+        """
+        with self._pool_lock:
+            pools = (self._pool, self._async_pool)
+            self._pool = self._async_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False)
+        with self._persistent_lock:
+            servers = list(self._persistent.values())
+            self._persistent.clear()
+        for server in servers:
+            server.close()
+
     def _parse_allow_output(self, stdout: str) -> HookResult:
         """Parse JSON stdout from a hook that allows the action.
 
@@ -271,8 +594,9 @@ class HookExecutor:
         """Execute all hooks for an event.
 
         Filters hooks by matcher (for tool hooks) and file_patterns.
-        If a hook blocks, subsequent hooks are not executed.
-        Async hooks run in background.
+        Pre-hooks run in order and, if one blocks, subsequent hooks are not
+        executed. Hooks of other events run concurrently on the pool; the
+        results keep the registry order. Async hooks run in background.
 
         Args:
             event: Lifecycle event.
@@ -283,7 +607,7 @@ class HookExecutor:
             List of HookResult (one per executed hook).
         """
         hooks = self.registry.get_hooks(event)
-        results: list[HookResult] = []
+        selected: list[HookConfig] = []
 
         for hook in hooks:
             # Filter by matcher (for tool hooks)
@@ -297,22 +621,134 @@ class HookExecutor:
                 if not any(fnmatch.fnmatch(file_path, p) for p in hook.file_patterns):
                     continue
 
+            selected.append(hook)
+
+        results: list[HookResult | None] = [None] * len(selected)
+        futures: list[tuple[int, Future[HookResult]]] = []
+        blocking = event in _BLOCKING_EVENTS
+        sync_count = sum(1 for h in selected if not h.is_async)
+
+        for i, hook in enumerate(selected):
             if hook.is_async:
-                threading.Thread(
-                    target=self.execute_hook,
-                    args=(hook, event, context, stdin_data),
-                    daemon=True,
-                ).start()
-                results.append(HookResult())
-            else:
+                self._submit_async(hook, event, context, stdin_data)
+                results[i] = HookResult()
+            elif blocking or sync_count == 1:
                 result = self.execute_hook(hook, event, context, stdin_data)
-                results.append(result)
+                results[i] = result
 
                 # If a pre-hook blocks, do not execute the following ones
-                if result.decision == HookDecision.BLOCK:
+                if blocking and result.decision == HookDecision.BLOCK:
                     break
+            else:
+                futures.append((i, self._submit(hook, event, context, stdin_data)))
+
+        for i, future in futures:
+            results[i] = future.result()
+
+        return [r for r in results if r is not None]
+
+    def drain_async_context(self) -> list[str]:
+        """Pop the additionalContext produced by async hooks since the last call."""
+        drained: list[str] = []
+        while self._async_context:
+            drained.append(self._async_context.popleft())
+        return drained
+
+    def stats(self) -> dict[str, int]:
+        """Pool concurrency and queue depth (current and peak)."""
+        with self._pool_lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_active": self._peak_active,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "async_dropped": self._async_dropped,
+                "async_context_pending": len(self._async_context),
+            }
+
+    def _submit(
+        self,
+        hook: HookConfig,
+        event: HookEvent,
+        context: dict[str, Any],
+        stdin_data: dict[str, Any] | None,
+        is_async: bool = False,
+    ) -> "Future[HookResult]":
+        with self._pool_lock:
+            return self._submit_locked(hook, event, context, stdin_data, is_async)
+
+    def _submit_locked(
+        self,
+        hook: HookConfig,
+        event: HookEvent,
+        context: dict[str, Any],
+        stdin_data: dict[str, Any] | None,
+        is_async: bool,
+    ) -> "Future[HookResult]":
+        """Queue a hook on its pool (caller holds ``_pool_lock``)."""
+        # Async hooks get their own workers: sync hooks never queue behind them
+        if is_async:
+            if self._async_pool is None:
+                self._async_pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="architect-hook-async",
+                )
+            pool = self._async_pool
+            self._async_queued += 1
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="architect-hook",
+                )
+            pool = self._pool
+        self._queued += 1
+        self._peak_queued = max(self._peak_queued, self._queued)
+        return pool.submit(self._run_pooled, hook, event, context, stdin_data, is_async)
+
+    def _submit_async(
+        self,
+        hook: HookConfig,
+        event: HookEvent,
+        context: dict[str, Any],
+        stdin_data: dict[str, Any] | None,
+    ) -> None:
+        # Check and enqueue in one critical section so a burst cannot overshoot
+        with self._pool_lock:
+            queued = self._async_queued
+            full = queued >= self.max_concurrency * _ASYNC_QUEUE_FACTOR
+            if full:
+                self._async_dropped += 1
+            else:
+                self._submit_locked(hook, event, context, stdin_data, is_async=True)
+        if full:
+            self.log.warning("hook.async_dropped", hook=hook.name, queued=queued)
 
-        return results
+    def _run_pooled(
+        self,
+        hook: HookConfig,
+        event: HookEvent,
+        context: dict[str, Any],
+        stdin_data: dict[str, Any] | None,
+        is_async: bool,
+    ) -> HookResult:
+        with self._pool_lock:
+            self._queued -= 1
+            if is_async:
+                self._async_queued -= 1
+            self._active += 1
+            self._peak_active = max(self._peak_active, self._active)
+        try:
+            result = self.execute_hook(hook, event, context, stdin_data)
+        finally:
+            with self._pool_lock:
+                self._active -= 1
+                self._completed += 1
+        if is_async and result.additional_context:
+            label = hook.name or hook.command[:40]
+            self._async_context.append(f"[async hook {label}] {result.additional_context}")
+        return result
 
     # ── Backward compatibility with PostEditHooks (v3-M4) ─────────────
 
@@ -86,6 +86,7 @@ class AgentLoop:
         session_manager: "SessionManager | None" = None,
         session_id: str | None = None,
         dry_run_tracker: "DryRunTracker | None" = None,
+        cost_source: str = "agent",
     ):
         """Initialize the agent loop.
 
@@ -106,6 +107,8 @@ class AgentLoop:
             session_manager: SessionManager to persist sessions (v4-B1)
             session_id: Session ID for resume. None generates a new one.
             dry_run_tracker: DryRunTracker to record actions in dry-run mode (v4-B4)
+            cost_source: Source tag for this loop's calls in the CostTracker
+                (e.g. "plan" for the plan phase of mixed mode)
         """
         self.llm = llm
         self.engine = engine
@@ -123,6 +126,7 @@ class AgentLoop:
         self.session_manager = session_manager
         self.session_id = session_id
         self.dry_run_tracker = dry_run_tracker
+        self.cost_source = cost_source
         self._start_time: float = 0.0
         self._pending_context: list[str] = []
         self._files_touched: set[str] = set()
@@ -151,24 +155,39 @@ class AgentLoop:
         if not self.session_id and self.session_manager:
             from ..features.sessions import generate_session_id
             self.session_id = generate_session_id()
+        if self.cost_tracker and self.session_id:
+            ledger_context = self.cost_tracker.ledger_context
+            if not ledger_context.session_id:
+                ledger_context.session_id = self.session_id
 
-        # Initialize state
-        state = AgentState()
-        state.messages = self.ctx.build_initial(self.agent_config, prompt)
-        state.model = self.llm.config.model
-        state.cost_tracker = self.cost_tracker
+        # Sections appended to the system prompt. Assembled before building
+        # the messages so the system prompt is final from step 1 and the
+        # provider can cache it as a stable prefix.
+        extra_sections: list[str] = []
 
         # v4-A3: Inject skills context into the system prompt
         if self.skills_loader:
             skills_context = self.skills_loader.build_system_context()
-            if skills_context and state.messages and state.messages[0]["role"] == "system":
-                state.messages[0]["content"] += "\n\n" + skills_context
+            if skills_context:
+                extra_sections.append(skills_context)
 
         # v4-A4: Inject procedural memory into the system prompt
         if self.memory:
             memory_context = self.memory.get_context()
-            if memory_context and state.messages and state.messages[0]["role"] == "system":
-                state.messages[0]["content"] += "\n\n" + memory_context
+            if memory_context:
+                extra_sections.append(memory_context)
+
+        # Initialize state
+        state = AgentState()
+        state.messages = self.ctx.build_initial(
+            self.agent_config, prompt, extra_system_sections=extra_sections,
+        )
+        state.model = self.llm.config.model
+        state.cost_tracker = self.cost_tracker
+        if self.context_manager and self.context_manager.config.spill_tool_output_chars:
+            from .blobs import BlobStore
+            state.blob_store = BlobStore(self.session_id)
+            state.spill_threshold = self.context_manager.config.spill_tool_output_chars
 
         # Get schemas of allowed tools
         tools_schema = self.engine.registry.get_schemas(
@@ -212,7 +231,9 @@ class AgentLoop:
                     "step": str(step),
                 })
 
-                # Inject pending hook context (if any)
+                # Inject pending hook context (if any), including async hook output
+                if self.hook_executor:
+                    self._pending_context.extend(self.hook_executor.drain_async_context())
                 if self._pending_context:
                     for ctx_text in self._pending_context:
                         state.messages.append({
@@ -225,6 +246,7 @@ class AgentLoop:
                 self.log.info("agent.step.start", step=step)
                 self.hlog.llm_call(step, messages_count=len(state.messages))
 
+                llm_started = time.monotonic()
                 try:
                     with StepTimeout(self.step_timeout):
                         if stream:
@@ -236,6 +258,13 @@ class AgentLoop:
                                 if isinstance(chunk_or_response, StreamChunk):
                                     if on_stream_chunk and chunk_or_response.type == "content":
                                         on_stream_chunk(chunk_or_response.data)
+                                    elif chunk_or_response.type == "tool_call":
+                                        # Arguments complete before the stream ends
+                                        self.log.debug(
+                                            "agent.tool_call.streamed",
+                                            step=step,
+                                            tool_call=chunk_or_response.data,
+                                        )
                                 else:
                                     response = chunk_or_response
 
@@ -268,13 +297,18 @@ class AgentLoop:
                             step=step,
                             model=self.llm.config.model,
                             usage=response.usage,
-                            source="agent",
+                            source=self.cost_source,
+                            latency_s=time.monotonic() - llm_started,
                         )
                     except BudgetExceededError as e:
                         self.log.error("agent.budget_exceeded", step=step, error=str(e))
                         # Budget exceeded on this step — graceful close
                         return self._graceful_close(state, StopReason.BUDGET_EXCEEDED, tools_schema)
 
+                # Calibrate the context token estimator against the real prompt size
+                if self.context_manager and response.usage:
+                    self.context_manager.record_usage(state.messages, response.usage)
+
                 # ── POST-LLM HOOKS (v4-A1) ─────────────────────────────────
                 self._run_hooks_safe("post_llm_call", {
                     "step": str(step),
@@ -343,6 +377,10 @@ class AgentLoop:
                     tools=[tc.name for tc in response.tool_calls],
                 )
 
+                # Summarize old steps in background while the tools run
+                if self.context_manager:
+                    self.context_manager.precompute_summary(state.messages, self.llm)
+
                 # Execute tool calls (parallel or sequential)
                 tool_results = self._execute_tool_calls_batch(response.tool_calls, step)
 
@@ -352,7 +390,7 @@ class AgentLoop:
                 )
 
                 # Record step
-                state.steps.append(StepResult(
+                state.add_step(StepResult(
                     step_number=step,
                     llm_response=response,
                     tool_calls_made=tool_results,
@@ -369,12 +407,22 @@ class AgentLoop:
                 self._save_session(state, prompt, step)
 
         finally:
+            # Stop any in-flight background context summary
+            if self.context_manager:
+                self.context_manager.close()
+
             # ── SESSION END HOOK (v4-A1) — always runs ─────────────
             self._run_hooks_safe("session_end", {
                 "steps": str(step),
                 "status": state.status,
                 "cost": str(self.cost_tracker.total_cost_usd if self.cost_tracker else 0),
             })
+            # Persistent hook processes live for one session
+            if self.hook_executor:
+                self.hook_executor.close()
+            # Spilled tool outputs live for one session too
+            if state.blob_store is not None:
+                state.blob_store.close()
 
         # ── Final log ─────────────────────────────────────────────────────
         self.log.info(
@@ -383,6 +431,14 @@ class AgentLoop:
             stop_reason=state.stop_reason.value if state.stop_reason else None,
             total_steps=state.current_step,
             total_tool_calls=state.total_tool_calls,
+            cache_hit_ratio=(
+                round(self.cost_tracker.cache_hit_ratio, 4)
+                if self.cost_tracker and self.cost_tracker.has_data() else None
+            ),
+            truncation=(
+                self.context_manager.truncation_stats if self.context_manager else None
+            ),
+            hooks=self.hook_executor.stats() if self.hook_executor else None,
         )
         self.hlog.loop_complete(
             status=state.status,
@@ -493,6 +549,24 @@ class AgentLoop:
             self.hlog.safety_net("budget_exceeded", step=step)
             return StopReason.BUDGET_EXCEEDED
 
+        # 3b. Budget forecast — close early if the spend rate predicts
+        # exhaustion within costs.budget_lookahead_steps
+        if self.cost_tracker and self.cost_tracker.budget_forecast_exceeded():
+            self.log.warning(
+                "safety.budget_forecast",
+                step=step,
+                total_cost=self.cost_tracker.total_cost_usd,
+                spend_rate=round(self.cost_tracker.spend_rate_usd, 6),
+            )
+            self.hlog.safety_net(
+                "budget_forecast",
+                step=step,
+                spent=f"{self.cost_tracker.total_cost_usd:.4f}",
+                budget=f"{self.cost_tracker.budget_usd:.4f}",
+                rate=f"{self.cost_tracker.spend_rate_usd:.4f}",
+            )
+            return StopReason.BUDGET_EXCEEDED
+
         # 4. Total timeout — time watchdog
         if self.timeout and (time.time() - self._start_time) > self.timeout:
             self.log.warning("safety.timeout", elapsed=time.time() - self._start_time)
@@ -535,8 +609,11 @@ class AgentLoop:
             )
             return state
 
-        # BUDGET_EXCEEDED: immediate cut, do NOT spend more money on summary
-        if reason == StopReason.BUDGET_EXCEEDED:
+        # BUDGET_EXCEEDED: immediate cut, do NOT spend more money on summary.
+        # A forecast close (budget not yet exceeded) still gets the summary.
+        if reason == StopReason.BUDGET_EXCEEDED and (
+            not self.cost_tracker or self.cost_tracker.is_budget_exceeded()
+        ):
             cost_info = ""
             if self.cost_tracker:
                 cost_info = f" Total cost: ${self.cost_tracker.total_cost_usd:.4f}."
@@ -0,0 +1,64 @@
+"""
+Message Log - Append-only conversation history for the agent loop.
+
+``MessageLog`` is a ``list`` subclass, so every consumer that treats the
+conversation as a plain list of OpenAI-format dicts (adapter, sessions,
+hooks, reports) keeps working unchanged. It adds:
+
+- In-place appends from ``ContextBuilder`` (O(1) per message) instead of
+  copying the whole history on every step.
+- ``replace_range`` and ``sync`` for compaction: only the changed region
+  of the log is rewritten; the unchanged head and tail keep their slots.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+Message = dict[str, Any]
+
+
+class MessageLog(list[Message]):
+    """Conversation history with in-place appends and range replacement.
+
+    Messages themselves are never copied: the log holds references to the
+    same dicts, so identity-based caches (e.g. the ContextManager token
+    ledger) stay valid across steps.
+    """
+
+    def replace_range(self, start: int, stop: int, messages: Iterable[Message]) -> None:
+        """Replace ``self[start:stop]`` with ``messages`` in place.
+
+        Args:
+            start: First index to replace
+            stop: End index (exclusive)
+            messages: Messages to put in that range (any length)
+        """
+        self[start:stop] = list(messages)
+
+    def sync(self, messages: Sequence[Message]) -> None:
+        """Make this log equal to ``messages`` rewriting only what changed.
+
+        Compares by identity from both ends and replaces the differing
+        middle region. Typical compaction output (same head, summary in the
+        middle, same recent tail) touches only a few slots.
+
+        Args:
+            messages: Target message sequence (e.g. the result of compaction)
+        """
+        if messages is self:
+            return
+        limit = min(len(self), len(messages))
+        head = 0
+        while head < limit and self[head] is messages[head]:
+            head += 1
+        tail = 0
+        while (
+            tail < limit - head
+            and self[len(self) - 1 - tail] is messages[len(messages) - 1 - tail]
+        ):
+            tail += 1
+        if head == len(self) == len(messages):
+            return
+        self.replace_range(head, len(self) - tail, messages[head:len(messages) - tail])
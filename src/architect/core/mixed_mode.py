@@ -48,6 +48,7 @@ class MixedModeRunner:
         step_timeout: int = 0,
         context_manager: ContextManager | None = None,
         cost_tracker: "CostTracker | None" = None,
+        plan_llm: LLMAdapter | None = None,
     ):
         """Initialize the mixed mode runner.
 
@@ -61,8 +62,11 @@ class MixedModeRunner:
             step_timeout: Maximum seconds per step. 0 = no timeout.
             context_manager: ContextManager for context pruning (F11).
             cost_tracker: CostTracker to record costs (F14, optional).
+            plan_llm: Adapter for the plan phase (e.g. a cheaper model).
+                None = the same adapter as the build phase.
         """
         self.llm = llm
+        self.plan_llm = plan_llm
         self.engine = engine
         self.plan_config = plan_config
         self.build_config = build_config
@@ -97,7 +101,7 @@ class MixedModeRunner:
         # Phase 1: Run plan (without streaming -- plan is fast and silent)
         self.log.info("mixed_mode.phase.plan")
         plan_loop = AgentLoop(
-            self.llm,
+            self.plan_llm or self.llm,
             self.engine,
             self.plan_config,
             self.ctx,
@@ -105,6 +109,7 @@ class MixedModeRunner:
             step_timeout=self.step_timeout,
             context_manager=self.context_manager,
             cost_tracker=self.cost_tracker,
+            cost_source="plan",
         )
 
         plan_state = plan_loop.run(prompt, stream=False)
@@ -5,15 +5,19 @@ Defines the data structures representing the agent's execution state
 throughout its lifecycle.
 
 v3: Added StopReason enum and stop_reason field in AgentState.
+Step payloads use __slots__; large tool outputs can be spilled to a
+per-session BlobStore (see AgentState.add_step).
 """
 
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Literal
 
 from ..llm.adapter import LLMResponse
 from ..tools.base import ToolResult
+from .blobs import BlobRef, BlobStore
+from .messages import MessageLog
 
 if TYPE_CHECKING:
     from ..costs.tracker import CostTracker
@@ -35,11 +39,18 @@ class StopReason(Enum):
     LLM_ERROR = "llm_error"           # Unrecoverable LLM error
 
 
-@dataclass(frozen=True)
+# Characters of a spilled output kept in memory as a preview
+_SPILL_PREVIEW_CHARS = 500
+
+
+@dataclass(frozen=True, slots=True)
 class ToolCallResult:
     """Result of a tool call execution.
 
-    Immutable to facilitate debugging and logging.
+    Immutable to facilitate debugging and logging. If the output was
+    spilled to disk, ``result.output`` holds a short preview and
+    ``full_output`` loads the original lazily until the session's blob
+    store is closed.
     """
 
     tool_name: str
@@ -48,6 +59,42 @@ class ToolCallResult:
     was_confirmed: bool = True
     was_dry_run: bool = False
     timestamp: float = field(default_factory=time.time)
+    output_ref: BlobRef | None = None
+
+    @property
+    def full_output(self) -> str:
+        """Complete tool output, read from the blob store if it was spilled.
+
+        Raises:
+            FileNotFoundError: If the output was spilled and the store is closed
+        """
+        if self.output_ref is not None:
+            return self.output_ref.load()
+        return self.result.output
+
+    def spill(self, store: BlobStore, threshold: int) -> "ToolCallResult":
+        """Return a copy with the output moved to ``store`` if it exceeds threshold.
+
+        Args:
+            store: Session blob store
+            threshold: Maximum output length (chars) kept in memory
+
+        Returns:
+            Self if nothing was spilled, otherwise a copy holding a preview
+        """
+        output = self.result.output
+        if self.output_ref is not None or len(output) <= threshold:
+            return self
+        ref = store.put(output)
+        preview = (
+            output[:_SPILL_PREVIEW_CHARS]
+            + f"\n[... {len(output) - _SPILL_PREVIEW_CHARS} more chars on disk]"
+        )
+        return replace(
+            self,
+            result=self.result.model_copy(update={"output": preview}),
+            output_ref=ref,
+        )
 
     def __repr__(self) -> str:
         return (
@@ -58,7 +105,7 @@ class ToolCallResult:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StepResult:
     """Result of a complete agent step.
 
@@ -100,7 +147,7 @@ class AgentState:
         building the state step by step.
     """
 
-    messages: list[dict[str, Any]] = field(default_factory=list)
+    messages: list[dict[str, Any]] = field(default_factory=MessageLog)
     steps: list[StepResult] = field(default_factory=list)
     status: Literal["running", "success", "partial", "failed"] = "running"
     stop_reason: StopReason | None = None
@@ -108,6 +155,23 @@ class AgentState:
     start_time: float = field(default_factory=time.time)
     model: str | None = None
     cost_tracker: "CostTracker | None" = field(default=None)
+    blob_store: BlobStore | None = field(default=None, repr=False)
+    spill_threshold: int = 0
+
+    def add_step(self, step: StepResult) -> None:
+        """Record a completed step, spilling large tool outputs to disk.
+
+        Call after the tool results were appended to ``messages``: the LLM
+        copy there is independent of the spilled payload.
+        """
+        if self.blob_store is not None and self.spill_threshold > 0:
+            spilled = [
+                tc.spill(self.blob_store, self.spill_threshold)
+                for tc in step.tool_calls_made
+            ]
+            if any(a is not b for a, b in zip(spilled, step.tool_calls_made)):
+                step = replace(step, tool_calls_made=spilled)
+        self.steps.append(step)
 
     @property
     def current_step(self) -> int:
@@ -4,13 +4,17 @@ Cost tracking module -- tracks LLM call costs (F14).
 Exports the main components for cost tracking and budgeting.
 """
 
-from .prices import ModelPricing, PriceLoader
+from .ledger import CostLedger, LedgerContext
+from .prices import ModelPricing, PriceLoader, PriceResolution
 from .tracker import BudgetExceededError, CostTracker, StepCost
 
 __all__ = [
     "PriceLoader",
     "ModelPricing",
+    "PriceResolution",
     "CostTracker",
     "StepCost",
     "BudgetExceededError",
+    "CostLedger",
+    "LedgerContext",
 ]
@@ -0,0 +1,279 @@
+"""
+Cross-session cost and performance ledger (F14).
+
+Append-only SQLite database at `.architect/ledger.db` with one row per LLM
+call: model, source, tokens, cached tokens, latency and cost. Each row
+references the session, pipeline step, ralph iteration or parallel worker
+that made the call, so history survives the run and can be queried with
+`architect stats`.
+
+Parallel workers run `architect run` inside their worktree; the runner
+points them back at the main workspace ledger through the
+``ARCHITECT_LEDGER_PATH`` / ``ARCHITECT_LEDGER_WORKER`` environment variables.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from .tracker import StepCost
+
+logger = structlog.get_logger()
+
+LEDGER_PATH = ".architect/ledger.db"
+LEDGER_PATH_ENV = "ARCHITECT_LEDGER_PATH"
+LEDGER_WORKER_ENV = "ARCHITECT_LEDGER_WORKER"
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    session_id TEXT,
+    pipeline_step TEXT,
+    ralph_iteration INTEGER,
+    worker INTEGER,
+    step INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    source TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    latency_ms REAL,
+    cost_usd REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calls_day ON calls(day);
+CREATE INDEX IF NOT EXISTS idx_calls_model_latency ON calls(model, latency_ms);
+CREATE INDEX IF NOT EXISTS idx_calls_session ON calls(session_id);
+"""
+
+
+@dataclass
+class LedgerContext:
+    """What an LLM call belongs to (all optional)."""
+
+    session_id: str | None = None
+    pipeline_step: str | None = None
+    ralph_iteration: int | None = None
+    worker: int | None = None
+
+    @classmethod
+    def from_env(cls) -> "LedgerContext":
+        """Context inherited from a parent process (parallel worker id)."""
+        worker = os.environ.get(LEDGER_WORKER_ENV)
+        return cls(worker=int(worker) if worker and worker.isdigit() else None)
+
+
+class CostLedger:
+    """Append-only SQLite ledger of LLM calls.
+
+    The database is opened lazily on the first write or query. Writes never
+    raise: a failing ledger logs a warning once and disables itself, so the
+    agent run is never affected by it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the ledger.
+
+        Args:
+            path: Path to the SQLite file (created on first use).
+        """
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._disabled = False
+        self._log = logger.bind(component="cost_ledger")
+
+    @classmethod
+    def for_workspace(cls, workspace_root: str | Path) -> "CostLedger":
+        """Ledger of a workspace (``ARCHITECT_LEDGER_PATH`` takes priority)."""
+        override = os.environ.get(LEDGER_PATH_ENV)
+        if override:
+            return cls(Path(override))
+        return cls(Path(workspace_root) / LEDGER_PATH)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        step_cost: "StepCost",
+        latency_s: float | None = None,
+        context: LedgerContext | None = None,
+    ) -> None:
+        """Append one LLM call. Never raises."""
+        if self._disabled:
+            return
+        ctx = context or LedgerContext()
+        now = datetime.now().astimezone()
+        row = (
+            now.isoformat(timespec="milliseconds"),
+            now.date().isoformat(),
+            ctx.session_id,
+            ctx.pipeline_step,
+            ctx.ralph_iteration,
+            ctx.worker,
+            step_cost.step,
+            step_cost.model,
+            step_cost.source,
+            step_cost.input_tokens,
+            step_cost.output_tokens,
+            step_cost.cached_tokens,
+            latency_s * 1000 if latency_s is not None else None,
+            step_cost.cost_usd,
+        )
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT INTO calls (ts, day, session_id, pipeline_step, "
+                        "ralph_iteration, worker, step, model, source, input_tokens, "
+                        "output_tokens, cached_tokens, latency_ms, cost_usd) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row,
+                    )
+        except (sqlite3.Error, OSError) as e:
+            self._disabled = True
+            self._log.warning("cost_ledger.write_failed", path=str(self.path), error=str(e))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def totals(self, days: int | None = None) -> dict[str, Any]:
+        """Calls, tokens, cost and time span in the window."""
+        where, params = self._window(days)
+        row = self._query_one(
+            "SELECT COUNT(*), COALESCE(SUM(input_tokens), 0), "
+            "COALESCE(SUM(output_tokens), 0), COALESCE(SUM(cached_tokens), 0), "
+            "COALESCE(SUM(cost_usd), 0), MIN(day), MAX(day), "
+            f"COUNT(DISTINCT session_id) FROM calls {where}",
+            params,
+        )
+        return {
+            "calls": row[0],
+            "input_tokens": row[1],
+            "output_tokens": row[2],
+            "cached_tokens": row[3],
+            "cost_usd": round(row[4], 6),
+            "first_day": row[5],
+            "last_day": row[6],
+            "sessions": row[7],
+        }
+
+    def cost_by_day(self, days: int | None = None) -> list[dict[str, Any]]:
+        """Calls and cost per day, oldest first."""
+        where, params = self._window(days)
+        rows = self._query(
+            "SELECT day, COUNT(*), SUM(cost_usd) FROM calls "
+            f"{where} GROUP BY day ORDER BY day",
+            params,
+        )
+        return [
+            {"day": day, "calls": calls, "cost_usd": round(cost, 6)}
+            for day, calls, cost in rows
+        ]
+
+    def models(self, days: int | None = None) -> list[dict[str, Any]]:
+        """Per model: calls, cost, cache hit rate and p50/p95 latency."""
+        where, params = self._window(days)
+        rows = self._query(
+            "SELECT model, COUNT(*), SUM(cost_usd), SUM(input_tokens), "
+            f"SUM(cached_tokens), COUNT(latency_ms) FROM calls {where} "
+            "GROUP BY model ORDER BY SUM(cost_usd) DESC",
+            params,
+        )
+        result = []
+        for model, calls, cost, input_tokens, cached_tokens, timed in rows:
+            result.append({
+                "model": model,
+                "calls": calls,
+                "cost_usd": round(cost, 6),
+                "cache_hit_rate": (
+                    round(cached_tokens / input_tokens, 4) if input_tokens else 0.0
+                ),
+                "p50_latency_ms": self._latency_percentile(model, 0.50, timed, days),
+                "p95_latency_ms": self._latency_percentile(model, 0.95, timed, days),
+            })
+        return result
+
+    def sessions(self, days: int | None = None, limit: int = 10) -> list[dict[str, Any]]:
+        """Most expensive sessions in the window."""
+        where, params = self._window(days, "session_id IS NOT NULL")
+        rows = self._query(
+            "SELECT session_id, COUNT(*), SUM(cost_usd), MIN(ts) FROM calls "
+            f"{where} GROUP BY session_id ORDER BY SUM(cost_usd) DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [
+            {"session_id": sid, "calls": calls, "cost_usd": round(cost, 6), "started": ts}
+            for sid, calls, cost, ts in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _latency_percentile(
+        self, model: str, pct: float, count: int, days: int | None
+    ) -> float | None:
+        """Nearest-rank percentile, read with one seek on (model, latency_ms)."""
+        if not count:
+            return None
+        where, params = self._window(days, "model = ?", "latency_ms IS NOT NULL")
+        row = self._query_one(
+            f"SELECT latency_ms FROM calls {where} ORDER BY latency_ms LIMIT 1 OFFSET ?",
+            (model, *params, max(math.ceil(pct * count) - 1, 0)),
+        )
+        return round(row[0], 1) if row else None
+
+    @staticmethod
+    def _window(days: int | None, *conditions: str) -> tuple[str, tuple[Any, ...]]:
+        """WHERE clause for the extra conditions plus the last ``days`` days."""
+        clauses = list(conditions)
+        params: tuple[Any, ...] = ()
+        if days is not None:
+            clauses.append("day >= ?")
+            params = ((date.today() - timedelta(days=days - 1)).isoformat(),)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def _query_one(self, sql: str, params: tuple[Any, ...] = ()) -> tuple[Any, ...] | None:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchone()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Parallel workers append to the same file: WAL + busy timeout
+            conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+            self._conn = conn
+        return self._conn
+
+    def __repr__(self) -> str:
+        return f"<CostLedger(path='{self.path}')>"
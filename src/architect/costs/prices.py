@@ -3,11 +3,17 @@ LLM model price loader.
 
 Provides price lookup by model with prefix fallbacks
 and a generic price as a last resort.
+
+Price keys are indexed in a character trie when prices load, so a lookup
+is one walk over the model name (longest registered prefix wins) instead
+of a scan over every entry. Resolutions are memoized per model name and
+the memo is dropped whenever prices are (re)loaded.
 """
 
 import json
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import structlog
 
@@ -17,6 +23,9 @@ logger = structlog.get_logger()
 _FALLBACK_PRICING_INPUT = 3.0
 _FALLBACK_PRICING_OUTPUT = 15.0
 
+# Trie node slot holding the registered key that ends at that node
+_KEY = ""
+
 
 @dataclass
 class ModelPricing:
@@ -27,33 +36,99 @@ class ModelPricing:
     cached_input_per_million: float | None = None
 
 
+@dataclass
+class PriceResolution:
+    """How the price of a model name was resolved."""
+
+    model: str
+    pricing: ModelPricing
+    rule: str              # "exact" | "prefix" | "completion" | "fallback"
+    matched_key: str | None = None
+    matched_as: str | None = None  # name that matched (model or model without provider)
+    source: str | None = None      # prices file that defined matched_key
+
+    def describe(self) -> str:
+        """One-line human explanation of the resolution."""
+        if self.rule == "fallback":
+            return f"{self.model}: no price entry matches, using the generic fallback price"
+        via = f" (as '{self.matched_as}')" if self.matched_as != self.model else ""
+        rules = {
+            "exact": "exact key",
+            "prefix": "longest registered prefix",
+            "completion": "shortest key starting with the name",
+        }
+        return f"{self.model}{via}: {rules[self.rule]} '{self.matched_key}' from {self.source}"
+
+
+class _PriceTrie:
+    """Character trie of price keys for longest-prefix lookups."""
+
+    def __init__(self) -> None:
+        self._root: dict[str, Any] = {}
+
+    def insert(self, name: str, key: str) -> None:
+        """Index ``name`` as an alias of the registered price ``key``."""
+        node = self._root
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node.setdefault(_KEY, key)
+
+    def longest_prefix(self, name: str) -> tuple[str, int] | None:
+        """Key of the longest indexed name that prefixes ``name``, and that name's length."""
+        node = self._root
+        found = None
+        for depth, ch in enumerate(name, start=1):
+            node = node.get(ch)
+            if node is None:
+                break
+            if _KEY in node:
+                found = (node[_KEY], depth)
+        return found
+
+    def shortest_completion(self, name: str) -> str | None:
+        """Key of the shortest indexed name that starts with ``name``."""
+        node = self._root
+        for ch in name:
+            node = node.get(ch)
+            if node is None:
+                return None
+        # Breadth-first: first key reached is the shortest (ties: lexicographic)
+        level = [node]
+        while level:
+            keys = sorted(n[_KEY] for n in level if _KEY in n)
+            if keys:
+                return keys[0]
+            level = [child for n in level for ch, child in sorted(n.items()) if ch != _KEY]
+        return None
+
+
 class PriceLoader:
     """Loads and resolves LLM model prices.
 
-    Resolution order:
+    Resolution order (for the model name, then for the name without its
+    ``provider/`` prefix):
     1. Exact model price
-    2. Price by model prefix (e.g., "gpt-4o" matches "gpt-4o-2024-08-06")
-    3. Generic fallback price (3.0 / 15.0 USD per million tokens)
+    2. Longest registered key that prefixes the model
+       (e.g., "gpt-4o-mini" wins over "gpt-4o" for "gpt-4o-mini-2024-07-18")
+    3. Shortest registered key that starts with the model
+       (e.g., "claude-sonnet-4" for "claude-sonnet")
+    4. Generic fallback price (3.0 / 15.0 USD per million tokens)
 
-    Custom prices override the defaults.
+    Keys with a provider prefix (``gemini/gemini-2.5-pro``) are also indexed
+    under their bare name. Custom prices override the defaults.
     """
 
     _DEFAULT_PRICES_PATH = Path(__file__).parent / "default_prices.json"
 
     def __init__(self, custom_path: Path | None = None) -> None:
         self._prices: dict[str, ModelPricing] = {}
+        self._sources: dict[str, str] = {}
+        self._trie = _PriceTrie()
+        self._memo: dict[str, PriceResolution] = {}
+        self._custom_path = custom_path
+        self._custom_mtime: float | None = None
         self._log = logger.bind(component="price_loader")
-
-        # Load embedded defaults
-        self._load_file(self._DEFAULT_PRICES_PATH)
-
-        # Override with custom prices if provided
-        if custom_path:
-            if custom_path.exists():
-                self._load_file(custom_path)
-                self._log.info("price_loader.custom_loaded", path=str(custom_path))
-            else:
-                self._log.warning("price_loader.custom_not_found", path=str(custom_path))
+        self._load_all()
 
     def get_prices(self, model: str) -> ModelPricing:
         """Resolve the price for a given model.
@@ -66,35 +141,113 @@ class PriceLoader:
         Returns:
             ModelPricing with the resolved prices
         """
-        # 1. Exact match
-        if model in self._prices:
-            return self._prices[model]
-
-        # 2. Prefix match (model starts with registered key)
-        for key, pricing in self._prices.items():
-            if key.startswith("_"):
-                continue  # ignore JSON comments
-            if model.startswith(key) or key.startswith(model.split("/")[-1] if "/" in model else model):
-                self._log.debug("price_loader.prefix_match", model=model, matched_key=key)
-                return pricing
-
-        # 3. Attempt by base name without version
-        # e.g., "gpt-4o-2024-08-06" -> search "gpt-4o"
-        base_model = model.split("-")[0] if "-" in model else model
-        for key in self._prices:
-            if key.startswith("_"):
-                continue
-            if key.startswith(base_model):
-                return self._prices[key]
-
-        # 4. Generic fallback -- unknown model
-        self._log.debug("price_loader.fallback", model=model)
-        return ModelPricing(
-            input_per_million=_FALLBACK_PRICING_INPUT,
-            output_per_million=_FALLBACK_PRICING_OUTPUT,
-            cached_input_per_million=None,
+        return self.explain(model).pricing
+
+    def explain(self, model: str) -> PriceResolution:
+        """Resolve the price of ``model`` and record which rule chose it (memoized)."""
+        resolution = self._memo.get(model)
+        if resolution is None:
+            resolution = self._resolve(model)
+            self._memo[model] = resolution
+            if resolution.rule == "fallback":
+                self._log.debug("price_loader.fallback", model=model)
+            elif resolution.rule != "exact":
+                self._log.debug(
+                    "price_loader.prefix_match",
+                    model=model, matched_key=resolution.matched_key, rule=resolution.rule,
+                )
+        return resolution
+
+    def refresh(self) -> bool:
+        """Reload prices if the custom prices file changed since it was loaded.
+
+        Returns:
+            True if prices were reloaded (the resolution memo is dropped).
+        """
+        if self._custom_path is None or self._custom_mtime == self._mtime(self._custom_path):
+            return False
+        self._load_all()
+        return True
+
+    def invalidate(self) -> None:
+        """Drop memoized resolutions (e.g. after editing prices in place)."""
+        self._memo.clear()
+
+    @property
+    def memo_size(self) -> int:
+        return len(self._memo)
+
+    def _resolve(self, model: str) -> PriceResolution:
+        bare = model.rsplit("/", 1)[-1]
+        names = [model] if bare == model else [model, bare]
+
+        matches = [(name, self._trie.longest_prefix(name)) for name in names]
+        # An exact match (on a key or on a bare alias) beats any prefix
+        for name, match in matches:
+            if match is not None and match[1] == len(name):
+                return self._resolution(model, name, match[0], "exact")
+        for name, match in matches:
+            if match is not None:
+                return self._resolution(model, name, match[0], "prefix")
+        for name in names:
+            key = self._trie.shortest_completion(name)
+            if key is not None:
+                return self._resolution(model, name, key, "completion")
+
+        return PriceResolution(
+            model=model,
+            pricing=ModelPricing(
+                input_per_million=_FALLBACK_PRICING_INPUT,
+                output_per_million=_FALLBACK_PRICING_OUTPUT,
+                cached_input_per_million=None,
+            ),
+            rule="fallback",
+        )
+
+    def _resolution(self, model: str, name: str, key: str, rule: str) -> PriceResolution:
+        return PriceResolution(
+            model=model,
+            pricing=self._prices[key],
+            rule=rule,
+            matched_key=key,
+            matched_as=name,
+            source=self._sources.get(key),
         )
 
+    def _load_all(self) -> None:
+        """(Re)load defaults plus custom prices and rebuild the index."""
+        self._prices.clear()
+        self._sources.clear()
+
+        # Load embedded defaults
+        self._load_file(self._DEFAULT_PRICES_PATH)
+
+        # Override with custom prices if provided
+        custom_path = self._custom_path
+        if custom_path:
+            if custom_path.exists():
+                self._custom_mtime = self._mtime(custom_path)
+                self._load_file(custom_path)
+                self._log.info("price_loader.custom_loaded", path=str(custom_path))
+            else:
+                self._log.warning("price_loader.custom_not_found", path=str(custom_path))
+
+        self._trie = _PriceTrie()
+        # Full keys first, so a bare alias never shadows a real key
+        for key in self._prices:
+            self._trie.insert(key, key)
+        for key in self._prices:
+            if "/" in key:
+                self._trie.insert(key.rsplit("/", 1)[-1], key)
+        self._memo.clear()
+
+    @staticmethod
+    def _mtime(path: Path) -> float | None:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+
     def _load_file(self, path: Path) -> None:
         """Load a JSON prices file and add it to the registry."""
         try:
@@ -111,5 +264,8 @@ class PriceLoader:
                         else None
                     ),
                 )
+                self._sources[key] = (
+                    "default prices" if path == self._DEFAULT_PRICES_PATH else str(path)
+                )
         except Exception as e:
             self._log.error("price_loader.load_failed", path=str(path), error=str(e))
@@ -2,14 +2,34 @@
 LLM call cost tracker (F14).
 
 Records the cost of each agent step, groups by source
-(agent/eval/summary) and enforces budget limits.
+(agent/plan/summary/eval) and enforces budget limits.
+
+When a baseline model is set (the main agent model), calls made with a
+cheaper per-purpose model also record what they would have cost on the
+baseline, so the summary reports the savings per source.
+
+Totals and breakdowns (by model, by source, by step bucket) are running
+aggregates updated in ``record()``, so reading them is O(1) however long
+the run is. A rolling per-step spend rate lets the agent loop forecast
+budget exhaustion ``lookahead_steps`` ahead and close before overshooting.
+Auxiliary calls (summaries, evaluation) are recorded under ``current_step``,
+so they add to the step they happen in instead of counting as steps.
+
+With a ``CostLedger``, every recorded call is also appended to the
+cross-session SQLite ledger, tagged with the tracker's ``ledger_context``.
+
+``record()`` is thread-safe: background context summaries record their
+cost from a worker thread while the agent loop records its own calls.
 """
 
-from dataclasses import dataclass, field
+import threading
+from collections import deque
+from dataclasses import dataclass
 from typing import Any
 
 import structlog
 
+from .ledger import CostLedger, LedgerContext
 from .prices import PriceLoader
 
 logger = structlog.get_logger()
@@ -30,7 +50,42 @@ class StepCost:
     output_tokens: int
     cached_tokens: int   # tokens read from provider cache (Anthropic/OpenAI)
     cost_usd: float
-    source: str          # "agent" | "eval" | "summary"
+    source: str          # "agent" | "summary" | "eval" | "review" | "plan"
+    baseline_cost_usd: float = 0.0  # same tokens priced on the baseline model
+
+
+# Agent steps per bucket in the by-step breakdown ("0-9", "10-19", ...)
+_STEP_BUCKET = 10
+
+# Recent steps averaged by the spend-rate estimate
+_RATE_WINDOW = 5
+
+
+@dataclass
+class CostAggregate:
+    """Running totals for one group of calls (a model, a source, a step bucket)."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, step_cost: StepCost) -> None:
+        self.calls += 1
+        self.input_tokens += step_cost.input_tokens
+        self.output_tokens += step_cost.output_tokens
+        self.cached_tokens += step_cost.cached_tokens
+        self.cost_usd += step_cost.cost_usd
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+        }
 
 
 class CostTracker:
@@ -41,6 +96,7 @@ class CostTracker:
     - Support for prompt caching tokens (reduced cost for cached_tokens)
     - Budget enforcement: raises BudgetExceededError if limit is exceeded
     - Warn threshold: warning log when a configurable threshold is reached
+    - Budget forecast: rolling spend rate per step projected lookahead_steps ahead
 
     Invariant: record() never raises exceptions except BudgetExceededError.
     """
@@ -50,6 +106,10 @@ class CostTracker:
         price_loader: PriceLoader,
         budget_usd: float | None = None,
         warn_at_usd: float | None = None,
+        baseline_model: str | None = None,
+        lookahead_steps: int = 0,
+        ledger: CostLedger | None = None,
+        ledger_context: LedgerContext | None = None,
     ) -> None:
         """Initialize the tracker.
 
@@ -57,13 +117,34 @@ class CostTracker:
             price_loader: PriceLoader to resolve prices by model
             budget_usd: Spending limit in USD. If exceeded, raises BudgetExceededError.
             warn_at_usd: Warning threshold in USD. Logs a warning when reached.
+            baseline_model: Main model; calls on other models report savings against it.
+            lookahead_steps: Steps ahead used by budget_forecast_exceeded() (0 = off).
+            ledger: Cross-session ledger each call is appended to (None = off).
+            ledger_context: Session/pipeline step/iteration/worker of the calls.
         """
         self._price_loader = price_loader
+        self._baseline_model = baseline_model
         self._budget_usd = budget_usd
         self._warn_at_usd = warn_at_usd
+        self._lookahead_steps = lookahead_steps
+        self._ledger = ledger
+        self.ledger_context = ledger_context or LedgerContext()
         self._steps: list[StepCost] = []
+        self._current_step = 0
         self._budget_warned = False
         self._log = logger.bind(component="cost_tracker")
+        # Guards the step list, the aggregates and the warn flag (re-entrant:
+        # summary() reads spend_rate_usd while holding it)
+        self._lock = threading.RLock()
+
+        # Running aggregates (updated in record())
+        self._totals = CostAggregate()
+        self._by_model: dict[str, CostAggregate] = {}
+        self._by_source: dict[str, CostAggregate] = {}
+        self._by_bucket: dict[int, CostAggregate] = {}
+        self._savings_by_source: dict[str, float] = {}
+        # (step, cost) of the most recent steps, for the spend rate
+        self._recent_steps: deque[list[float]] = deque(maxlen=_RATE_WINDOW)
 
     # ------------------------------------------------------------------
     # Recording
@@ -75,6 +156,7 @@ class CostTracker:
         model: str,
         usage: dict[str, Any],
         source: str = "agent",
+        latency_s: float | None = None,
     ) -> None:
         """Record the cost of an LLM call.
 
@@ -82,7 +164,8 @@ class CostTracker:
             step: Agent step number
             model: Name of the model used (e.g., "gpt-4o")
             usage: Dict with LLM usage info (prompt_tokens, completion_tokens, etc.)
-            source: Call source: "agent" | "eval" | "summary"
+            source: Call source: "agent" | "plan" | "summary" | "eval"
+            latency_s: Wall time of the call in seconds (stored in the ledger)
 
         Raises:
             BudgetExceededError: If total cost exceeds budget_usd
@@ -93,6 +176,11 @@ class CostTracker:
         cached_tokens = int(usage.get("cache_read_input_tokens", 0) or 0)
 
         cost = self._calculate_cost(model, input_tokens, output_tokens, cached_tokens)
+        baseline_cost = cost
+        if self._baseline_model and model != self._baseline_model:
+            baseline_cost = self._calculate_cost(
+                self._baseline_model, input_tokens, output_tokens, cached_tokens
+            )
 
         step_cost = StepCost(
             step=step,
@@ -102,8 +190,22 @@ class CostTracker:
             cached_tokens=cached_tokens,
             cost_usd=cost,
             source=source,
+            baseline_cost_usd=baseline_cost,
         )
-        self._steps.append(step_cost)
+        with self._lock:
+            self._steps.append(step_cost)
+            self._current_step = step
+            self._accumulate(step_cost)
+            total_cost = self._totals.cost_usd
+            warn = (
+                not self._budget_warned
+                and self._warn_at_usd is not None
+                and total_cost >= self._warn_at_usd
+            )
+            if warn:
+                self._budget_warned = True
+        if self._ledger is not None:
+            self._ledger.append(step_cost, latency_s, self.ledger_context)
 
         self._log.debug(
             "cost_tracker.record",
@@ -114,26 +216,21 @@ class CostTracker:
             cached_tokens=cached_tokens,
             cost_usd=round(cost, 6),
             source=source,
-            total_cost_usd=round(self.total_cost_usd, 6),
+            total_cost_usd=round(total_cost, 6),
         )
 
         # Warn threshold (only once per session)
-        if (
-            not self._budget_warned
-            and self._warn_at_usd is not None
-            and self.total_cost_usd >= self._warn_at_usd
-        ):
-            self._budget_warned = True
+        if warn:
             self._log.warning(
                 "cost_tracker.warn_threshold",
                 warn_at_usd=self._warn_at_usd,
-                total_cost_usd=round(self.total_cost_usd, 6),
+                total_cost_usd=round(total_cost, 6),
             )
 
         # Budget enforcement
-        if self._budget_usd is not None and self.total_cost_usd > self._budget_usd:
+        if self._budget_usd is not None and total_cost > self._budget_usd:
             raise BudgetExceededError(
-                f"Budget exceeded: ${self.total_cost_usd:.4f} > ${self._budget_usd:.4f} USD"
+                f"Budget exceeded: ${total_cost:.4f} > ${self._budget_usd:.4f} USD"
             )
 
     # ------------------------------------------------------------------
@@ -142,19 +239,36 @@ class CostTracker:
 
     @property
     def total_input_tokens(self) -> int:
-        return sum(s.input_tokens for s in self._steps)
+        return self._totals.input_tokens
 
     @property
     def total_output_tokens(self) -> int:
-        return sum(s.output_tokens for s in self._steps)
+        return self._totals.output_tokens
 
     @property
     def total_cached_tokens(self) -> int:
-        return sum(s.cached_tokens for s in self._steps)
+        return self._totals.cached_tokens
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of input tokens served from the provider cache (0.0-1.0)."""
+        total_input = self.total_input_tokens
+        if total_input == 0:
+            return 0.0
+        return self.total_cached_tokens / total_input
 
     @property
     def total_cost_usd(self) -> float:
-        return sum(s.cost_usd for s in self._steps)
+        return self._totals.cost_usd
+
+    @property
+    def budget_usd(self) -> float | None:
+        return self._budget_usd
+
+    @property
+    def current_step(self) -> int:
+        """Step of the most recently recorded call (0 before the first)."""
+        return self._current_step
 
     @property
     def step_count(self) -> int:
@@ -174,6 +288,36 @@ class CostTracker:
             return False
         return self.total_cost_usd > self._budget_usd
 
+    # ------------------------------------------------------------------
+    # Spend rate and budget forecast
+    # ------------------------------------------------------------------
+
+    @property
+    def spend_rate_usd(self) -> float:
+        """Average cost per step over the last few recorded steps (USD)."""
+        with self._lock:
+            if not self._recent_steps:
+                return 0.0
+            return sum(cost for _, cost in self._recent_steps) / len(self._recent_steps)
+
+    def projected_cost_usd(self, steps_ahead: int) -> float:
+        """Total cost expected after ``steps_ahead`` more steps at the current rate."""
+        return self.total_cost_usd + self.spend_rate_usd * steps_ahead
+
+    def budget_forecast_exceeded(self, steps_ahead: int | None = None) -> bool:
+        """Return True if the budget is expected to run out within ``steps_ahead`` steps.
+
+        Used by the agent loop to close gracefully (with a summary) before
+        the budget is actually exceeded.
+
+        Args:
+            steps_ahead: Steps to look ahead (default: the configured lookahead_steps).
+        """
+        steps = self._lookahead_steps if steps_ahead is None else steps_ahead
+        if self._budget_usd is None or steps <= 0 or not self._recent_steps:
+            return False
+        return self.projected_cost_usd(steps) > self._budget_usd
+
     # ------------------------------------------------------------------
     # Summary
     # ------------------------------------------------------------------
@@ -182,28 +326,35 @@ class CostTracker:
         """Return a dict with cost summary for JSON/terminal output.
 
         Returns:
-            Dict with totals, breakdown by source, and metadata
+            Dict with totals, breakdowns by source/model/step bucket, and metadata
         """
-        by_source: dict[str, float] = {}
-        for step in self._steps:
-            by_source[step.source] = round(
-                by_source.get(step.source, 0.0) + step.cost_usd, 6
-            )
-
-        return {
-            "total_input_tokens": self.total_input_tokens,
-            "total_output_tokens": self.total_output_tokens,
-            "total_cached_tokens": self.total_cached_tokens,
-            "total_tokens": self.total_input_tokens + self.total_output_tokens,
-            "total_cost_usd": round(self.total_cost_usd, 6),
-            "by_source": by_source,
-        }
+        with self._lock:
+            return {
+                "total_input_tokens": self.total_input_tokens,
+                "total_output_tokens": self.total_output_tokens,
+                "total_cached_tokens": self.total_cached_tokens,
+                "cache_hit_ratio": round(self.cache_hit_ratio, 4),
+                "total_tokens": self.total_input_tokens + self.total_output_tokens,
+                "total_cost_usd": round(self.total_cost_usd, 6),
+                "by_source": {
+                    source: round(agg.cost_usd, 6) for source, agg in self._by_source.items()
+                },
+                "savings_by_source": {
+                    source: round(saved, 6) for source, saved in self._savings_by_source.items()
+                },
+                "by_model": {model: agg.to_dict() for model, agg in self._by_model.items()},
+                "by_step_bucket": {
+                    f"{bucket}-{bucket + _STEP_BUCKET - 1}": agg.to_dict()
+                    for bucket, agg in sorted(self._by_bucket.items())
+                },
+                "spend_rate_usd_per_step": round(self.spend_rate_usd, 6),
+            }
 
     def format_summary_line(self) -> str:
         """Format a compact summary line for terminal display.
 
         Returns:
-            String like: "$0.0042 (12,450 in / 3,200 out / 500 cached)"
+            String like: "$0.0042 (12,450 in / 3,200 out / 500 cached, 4% hit)"
         """
         total = self.total_cost_usd
         parts = [
@@ -211,7 +362,9 @@ class CostTracker:
             f"({self.total_input_tokens:,} in / {self.total_output_tokens:,} out",
         ]
         if self.total_cached_tokens > 0:
-            parts.append(f"/ {self.total_cached_tokens:,} cached)")
+            parts.append(
+                f"/ {self.total_cached_tokens:,} cached, {self.cache_hit_ratio:.0%} hit)"
+            )
         else:
             parts[-1] += ")"
         return " ".join(parts)
@@ -220,6 +373,24 @@ class CostTracker:
     # Private helpers
     # ------------------------------------------------------------------
 
+    def _accumulate(self, step_cost: StepCost) -> None:
+        """Fold one call into the running totals and breakdowns."""
+        self._totals.add(step_cost)
+        self._by_model.setdefault(step_cost.model, CostAggregate()).add(step_cost)
+        self._by_source.setdefault(step_cost.source, CostAggregate()).add(step_cost)
+        bucket = (step_cost.step // _STEP_BUCKET) * _STEP_BUCKET
+        self._by_bucket.setdefault(bucket, CostAggregate()).add(step_cost)
+        if step_cost.baseline_cost_usd != step_cost.cost_usd:
+            self._savings_by_source[step_cost.source] = (
+                self._savings_by_source.get(step_cost.source, 0.0)
+                + step_cost.baseline_cost_usd - step_cost.cost_usd
+            )
+        # Calls of the same step (agent + summary/eval) add up to one sample
+        if self._recent_steps and self._recent_steps[-1][0] == step_cost.step:
+            self._recent_steps[-1][1] += step_cost.cost_usd
+        else:
+            self._recent_steps.append([step_cost.step, step_cost.cost_usd])
+
     def _calculate_cost(
         self,
         model: str,
@@ -0,0 +1,568 @@
+"""
+Daemon mode -- `architect serve` keeps warm state for repeated runs.
+
+CI fires many short `architect run` invocations against the same checkout;
+each one pays for importing LiteLLM, loading prices, indexing the repo,
+discovering MCP tools and parsing skills. `architect serve` does that once
+and then listens on a Unix socket (``.architect/daemon.sock`` by default):
+
+- ``architect run`` acts as a thin client: if a daemon is listening (and
+  the run is headless), it sends its parsed options, working directory and
+  environment and streams stdout/stderr back, exiting with the run's code.
+  Otherwise it runs in-process as usual.
+- The daemon executes the same ``run`` command in-process with
+  ``WarmState`` active: prices, the repo index (updated incrementally),
+  MCP clients with their tool lists and HTTP connections, and parsed
+  skills survive between runs.
+
+Wire protocol: newline-delimited JSON. Requests are ``{"type": "run",
+"params": {...}, "cwd": ..., "env": {...}}``, ``{"type": "ping"}`` or
+``{"type": "shutdown"}``. Responses are events: ``stdout``/``stderr``
+(``data``), ``exit`` (``code``), ``pong`` (``stats``) and ``error``
+(``message``).
+
+Runs are served one at a time: they share the checkout (and the signal
+handlers of the process). A run launched from inside a daemon run (agent
+subprocesses, hooks) never goes back to the daemon (``ARCHITECT_DAEMON_RUN``
+is set in its environment), which would deadlock waiting for itself.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import click
+import structlog
+
+if TYPE_CHECKING:
+    from ..config.schema import AppConfig
+    from ..costs.prices import PriceLoader
+    from ..indexer.tree import RepoIndex, RepoIndexer
+    from ..mcp.discovery import MCPDiscovery
+    from ..skills.loader import SkillsLoader
+
+logger = structlog.get_logger()
+
+__all__ = [
+    "DaemonClient",
+    "DaemonServer",
+    "WarmState",
+    "active_warm_state",
+    "default_socket_path",
+    "forward_to_daemon",
+]
+
+# Socket path override (server and client)
+SOCKET_ENV = "ARCHITECT_DAEMON_SOCKET"
+# Set to disable the thin client
+NO_DAEMON_ENV = "ARCHITECT_NO_DAEMON"
+# Set in the environment of every run executed by the daemon (recursion guard)
+DAEMON_RUN_ENV = "ARCHITECT_DAEMON_RUN"
+
+_CONNECT_TIMEOUT = 2.0
+
+# Warm state of the running daemon (None outside `architect serve`)
+_active: "WarmState | None" = None
+
+
+def default_socket_path() -> Path:
+    """Socket of the daemon for the current checkout."""
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    return Path.cwd() / ".architect" / "daemon.sock"
+
+
+def active_warm_state() -> "WarmState | None":
+    """Warm state of the daemon executing the current run, if any."""
+    return _active
+
+
+# -- Warm state ---------------------------------------------------------------
+
+
+class WarmState:
+    """Expensive per-workspace objects kept alive between daemon runs."""
+
+    def __init__(self) -> None:
+        self._prices: dict[str, PriceLoader] = {}
+        self._indexes: dict[tuple[Any, ...], RepoIndex] = {}
+        self._skills: dict[str, SkillsLoader] = {}
+        self._mcp_servers: dict[str, Any] = {}
+        self.stats = {"runs": 0, "index_updates": 0, "price_hits": 0}
+
+    def prewarm(self, config: "AppConfig") -> None:
+        """Load up front what the first run would otherwise pay for."""
+        import litellm  # noqa: F401 -- the adapter's lazy proxy reuses the loaded module
+
+        from .. import core, execution  # noqa: F401
+        from ..http_pool import configure_http_pool
+        from ..indexer.tree import RepoIndexer
+        from ..tools import ToolRegistry
+
+        configure_http_pool(config.http)
+        root = Path(config.workspace.root).resolve()
+        if config.costs.enabled:
+            self.price_loader(config.costs.prices_file)
+        if config.indexer.enabled:
+            self.repo_index(RepoIndexer(
+                workspace_root=root,
+                max_file_size=config.indexer.max_file_size,
+                exclude_dirs=config.indexer.exclude_dirs,
+                exclude_patterns=config.indexer.exclude_patterns,
+            ))
+        if config.skills.auto_discover:
+            self.skills_loader(str(root)).discover_skills()
+        if config.mcp.servers:
+            self.mcp_discovery().discover_and_register(config.mcp.servers, ToolRegistry())
+
+    def price_loader(self, custom_path: Path | None) -> "PriceLoader":
+        """PriceLoader for ``custom_path``, reloaded only if the file changed."""
+        from ..costs.prices import PriceLoader
+
+        key = str(custom_path or "")
+        loader = self._prices.get(key)
+        if loader is None:
+            loader = PriceLoader(custom_path=custom_path)
+            self._prices[key] = loader
+        elif not loader.refresh():
+            # Unchanged prices: the memoized resolutions stay warm
+            self.stats["price_hits"] += 1
+        return loader
+
+    def repo_index(self, indexer: "RepoIndexer") -> "RepoIndex":
+        """Index of the indexer's workspace, updated incrementally after the first build."""
+        key = (
+            indexer.root, indexer.max_file_size,
+            indexer.ignore_dirs, indexer.ignore_patterns,
+        )
+        previous = self._indexes.get(key)
+        if previous is None:
+            index = indexer.build_index()
+        else:
+            index = indexer.update_index(previous)
+            self.stats["index_updates"] += 1
+        self._indexes[key] = index
+        return index
+
+    def skills_loader(self, workspace_root: str) -> "SkillsLoader":
+        """Long-lived SkillsLoader (re-discovery only re-parses changed skills)."""
+        from ..skills.loader import SkillsLoader
+
+        loader = self._skills.get(workspace_root)
+        if loader is None:
+            loader = SkillsLoader(workspace_root)
+            self._skills[workspace_root] = loader
+        return loader
+
+    def mcp_discovery(self) -> "MCPDiscovery":
+        """MCPDiscovery that reuses connected clients and their tool lists."""
+        from ..mcp.discovery import MCPDiscovery
+
+        return MCPDiscovery(server_cache=self._mcp_servers)
+
+    def summary(self) -> dict[str, Any]:
+        from ..http_pool import get_http_pool
+
+        http = get_http_pool().stats().values()
+        return {
+            **self.stats,
+            "indexes": len(self._indexes),
+            "price_loaders": len(self._prices),
+            "skills_loaders": len(self._skills),
+            "mcp_servers": len(self._mcp_servers),
+            "http_requests": sum(h["requests"] for h in http),
+            "http_connections": sum(h["connections"] for h in http),
+        }
+
+    def close(self) -> None:
+        """Close the MCP clients (and their HTTP connections)."""
+        for client, _ in self._mcp_servers.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        self._mcp_servers.clear()
+
+
+@contextmanager
+def _activated(warm: WarmState) -> Iterator[None]:
+    global _active
+    _active = warm
+    try:
+        yield
+    finally:
+        _active = None
+
+
+# -- Wire helpers -------------------------------------------------------------
+
+
+def _send(conn: socket.socket, message: dict[str, Any]) -> None:
+    conn.sendall((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def _read_lines(conn: socket.socket) -> Iterator[dict[str, Any]]:
+    """Yield the JSON messages received on ``conn`` until it closes."""
+    buffer = b""
+    while True:
+        data = conn.recv(65536)
+        if not data:
+            return
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            if line.strip():
+                yield json.loads(line)
+
+
+def _encode_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Make click params JSON-serializable (paths as strings, tuples as lists)."""
+    encoded: dict[str, Any] = {}
+    for name, value in params.items():
+        if isinstance(value, Path):
+            value = str(value)
+        elif isinstance(value, tuple):
+            value = [str(v) if isinstance(v, Path) else v for v in value]
+        encoded[name] = value
+    return encoded
+
+
+class _EventStream(io.TextIOBase):
+    """Text stream that forwards writes to the client as NDJSON events.
+
+    The first failed write (client gone) raises SIGINT in the daemon, so the
+    run's GracefulShutdown stops the agent after the current step.
+    """
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, conn: socket.socket, name: str, on_disconnect: Callable[[], None]) -> None:
+        super().__init__()
+        self._conn = conn
+        self._name = name
+        self._on_disconnect = on_disconnect
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # Like any text stream (click probes streams with a bytes write)
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            try:
+                _send(self._conn, {"event": self._name, "data": text})
+            except OSError:
+                self._on_disconnect()
+        return len(text)
+
+
+# -- Server -------------------------------------------------------------------
+
+
+class DaemonServer:
+    """Unix-socket server executing ``architect run`` requests with warm state."""
+
+    def __init__(
+        self,
+        socket_path: Path,
+        run_command: click.Command,
+        warm: WarmState | None = None,
+        idle_timeout: float = 0,
+        on_run_finished: Callable[[], None] | None = None,
+    ) -> None:
+        """Create the server (the socket is bound by ``bind``/``serve_forever``).
+
+        Args:
+            socket_path: Unix socket to listen on.
+            run_command: The ``run`` click command to execute per request.
+            warm: Warm state to share between runs (created if None).
+            idle_timeout: Seconds without requests before exiting (0 = never).
+            on_run_finished: Called after each run (e.g. to restore the
+                daemon's own logging, which the run reconfigured).
+        """
+        self.socket_path = socket_path
+        self.run_command = run_command
+        self.warm = warm or WarmState()
+        self.idle_timeout = idle_timeout
+        self.on_run_finished = on_run_finished
+        self._stop = False
+        self._sock: socket.socket | None = None
+        self.log = logger.bind(component="daemon", socket=str(socket_path))
+
+    def serve_forever(self) -> None:
+        """Accept and serve requests until shutdown, idle timeout or SIGTERM."""
+        if self._sock is None:
+            self.bind()
+        previous_term = signal.signal(signal.SIGTERM, self._on_sigterm)
+        self.log.info("daemon.listening", pid=os.getpid())
+        last_request = time.monotonic()
+        try:
+            while not self._stop:
+                try:
+                    conn, _ = self._sock.accept()  # type: ignore[union-attr]
+                except TimeoutError:
+                    if self.idle_timeout and time.monotonic() - last_request >= self.idle_timeout:
+                        self.log.info("daemon.idle_exit", idle_timeout=self.idle_timeout)
+                        break
+                    continue
+                with conn:
+                    self._handle(conn)
+                last_request = time.monotonic()
+        finally:
+            signal.signal(signal.SIGTERM, previous_term)
+            self.close()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+        self.warm.close()
+
+    def bind(self) -> None:
+        """Bind the socket, replacing a stale one left by a dead daemon.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on it.
+            OSError: If the socket cannot be created (e.g. path too long).
+        """
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if DaemonClient(self.socket_path).ping() is not None:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Runs get the client's environment (keys): the socket is never
+        # reachable by other users, not even between bind() and chmod()
+        previous_umask = os.umask(0o077)
+        try:
+            sock.bind(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.socket_path, 0o600)
+        sock.listen(16)
+        sock.settimeout(1.0)
+        self._sock = sock
+
+    def _on_sigterm(self, signum: int, frame: Any) -> None:
+        self._stop = True
+
+    def _handle(self, conn: socket.socket) -> None:
+        conn.settimeout(None)
+        try:
+            request = next(_read_lines(conn), None)
+        except (OSError, ValueError) as e:
+            self.log.warning("daemon.bad_request", error=str(e))
+            return
+        if request is None:
+            return
+        kind = request.get("type")
+        try:
+            if kind == "ping":
+                _send(conn, {"event": "pong", "pid": os.getpid(), "stats": self.warm.summary()})
+            elif kind == "shutdown":
+                self._stop = True
+                _send(conn, {"event": "exit", "code": 0})
+            elif kind == "run":
+                code = self._execute(conn, request)
+                _send(conn, {"event": "exit", "code": code})
+            else:
+                _send(conn, {"event": "error", "message": f"Unknown request type: {kind!r}"})
+        except OSError:
+            self.log.warning("daemon.client_gone", request=kind)
+
+    def _execute(self, conn: socket.socket, request: dict[str, Any]) -> int:
+        """Run one request in-process with the client's cwd, env and output."""
+        disconnected = False
+
+        def on_disconnect() -> None:
+            nonlocal disconnected
+            if not disconnected:
+                disconnected = True
+                self.log.warning("daemon.client_disconnected")
+                signal.raise_signal(signal.SIGINT)
+
+        saved_cwd = os.getcwd()
+        saved_env = dict(os.environ)
+        saved_streams = (sys.stdin, sys.stdout, sys.stderr)
+        saved_int = signal.getsignal(signal.SIGINT)
+        saved_term = signal.getsignal(signal.SIGTERM)
+        started = time.monotonic()
+        code = 1
+        try:
+            os.chdir(request.get("cwd") or saved_cwd)
+            os.environ.clear()
+            os.environ.update(request.get("env") or saved_env)
+            os.environ[DAEMON_RUN_ENV] = "1"
+            sys.stdin = io.StringIO()
+            sys.stdout = _EventStream(conn, "stdout", on_disconnect)
+            sys.stderr = _EventStream(conn, "stderr", on_disconnect)
+
+            with _activated(self.warm):
+                code = self._invoke(request.get("params") or {})
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            signal.signal(signal.SIGINT, saved_int)
+            signal.signal(signal.SIGTERM, saved_term)
+            os.environ.clear()
+            os.environ.update(saved_env)
+            os.chdir(saved_cwd)
+            self.warm.stats["runs"] += 1
+            if self.on_run_finished is not None:
+                self.on_run_finished()
+        self.log.info(
+            "daemon.run_done", exit_code=code, duration=round(time.monotonic() - started, 2),
+        )
+        return code
+
+    def _invoke(self, params: dict[str, Any]) -> int:
+        """Invoke the run command with params decoded by its own click types."""
+        command = self.run_command
+        try:
+            with click.Context(command, info_name=command.name) as ctx:
+                kwargs = {}
+                for param in command.params:
+                    if param.name in params and params[param.name] is not None:
+                        kwargs[param.name] = param.type_cast_value(ctx, params[param.name])
+                ctx.invoke(command, **kwargs)
+            return 0
+        except SystemExit as e:
+            if e.code is None:
+                return 0
+            return e.code if isinstance(e.code, int) else 1
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except KeyboardInterrupt:
+            # Raised by on_disconnect before the run installed its handlers
+            return 130
+        except Exception as e:
+            sys.stderr.write(f"Daemon error: {e}\n")
+            return 1
+
+
+# -- Client -------------------------------------------------------------------
+
+
+class DaemonClient:
+    """Client for a running ``architect serve`` daemon."""
+
+    def __init__(self, socket_path: Path | None = None) -> None:
+        self.socket_path = socket_path or default_socket_path()
+
+    def available(self) -> bool:
+        return self.socket_path.exists() and self.ping() is not None
+
+    def ping(self) -> dict[str, Any] | None:
+        """Daemon status (pid and warm-state stats), or None if not reachable."""
+        try:
+            with self._connect() as conn:
+                _send(conn, {"type": "ping"})
+                for message in _read_lines(conn):
+                    return message
+        except (OSError, ValueError):
+            return None
+        return None
+
+    def shutdown(self) -> bool:
+        try:
+            with self._connect() as conn:
+                _send(conn, {"type": "shutdown"})
+                return any(m.get("event") == "exit" for m in _read_lines(conn))
+        except (OSError, ValueError):
+            return False
+
+    def run(self, params: dict[str, Any]) -> int | None:
+        """Send a run and stream its output to this process's stdout/stderr.
+
+        Returns:
+            Exit code of the run, or None if the daemon could not be reached
+            (nothing was executed, the caller may run in-process).
+        """
+        streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+        try:
+            conn = self._connect()
+        except OSError:
+            return None
+        with conn:
+            try:
+                _send(conn, {
+                    "type": "run",
+                    "params": _encode_params(params),
+                    "cwd": os.getcwd(),
+                    "env": dict(os.environ),
+                })
+            except OSError:
+                return None
+            for message in _read_lines(conn):
+                event = message.get("event")
+                if event in streams:
+                    stream = streams[event]
+                    stream.write(message.get("data", ""))
+                    stream.flush()
+                elif event == "exit":
+                    return int(message.get("code", 1))
+                elif event == "error":
+                    sys.stderr.write(f"Daemon error: {message.get('message')}\n")
+                    return 1
+        # Connection closed without an exit event: the daemon died mid-run.
+        # The run may have changed files, so it is not retried in-process.
+        sys.stderr.write("Error: the architect daemon closed the connection mid-run\n")
+        return 1
+
+    def _connect(self) -> socket.socket:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(_CONNECT_TIMEOUT)
+        try:
+            conn.connect(str(self.socket_path))
+        except OSError:
+            conn.close()
+            raise
+        conn.settimeout(None)
+        return conn
+
+
+def forward_to_daemon(params: dict[str, Any]) -> int | None:
+    """Thin client for ``architect run``: execute it on a warm daemon if possible.
+
+    Falls back (returns None) when the daemon is disabled or not running,
+    when this process is itself a daemon run (recursion guard), when stdin
+    is a terminal (the daemon cannot ask for confirmations) and when the
+    prompt is ``-`` (the daemon run has no stdin to read it from).
+
+    Returns:
+        Exit code of the run executed by the daemon, or None to run in-process.
+    """
+    if _active is not None or os.environ.get(DAEMON_RUN_ENV) or os.environ.get(NO_DAEMON_ENV):
+        return None
+    if params.get("prompt") == "-":
+        return None
+    socket_path = default_socket_path()
+    if not socket_path.exists():
+        return None
+    try:
+        if sys.stdin.isatty():
+            return None
+    except (AttributeError, ValueError):
+        pass
+    return DaemonClient(socket_path).run(params)
@@ -8,6 +8,7 @@ as a subprocess in its own worktree.
 
 import json
 import logging
+import os
 import subprocess
 import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
@@ -16,6 +17,8 @@ from pathlib import Path
 
 import structlog
 
+from architect.costs.ledger import LEDGER_PATH, LEDGER_PATH_ENV, LEDGER_WORKER_ENV
+from architect.llm.cassette import RECORD_ENV, REPLAY_ENV, worker_cassette_path
 from architect.logging.levels import HUMAN
 
 logger = structlog.get_logger()
@@ -119,6 +122,7 @@ class ParallelRunner:
                         timeout=self.config.timeout_per_worker,
                         config_path=self.config.config_path,
                         api_base=self.config.api_base,
+                        ledger_path=str(self.root.resolve() / LEDGER_PATH),
                     )
                     futures[future] = i + 1
 
@@ -346,6 +350,7 @@ def _run_worker_process(
     timeout: int | None,
     config_path: str | None = None,
     api_base: str | None = None,
+    ledger_path: str | None = None,
 ) -> WorkerResult:
     """Run a worker in a worktree. Top-level function for ProcessPoolExecutor.
 
@@ -363,6 +368,7 @@ def _run_worker_process(
         timeout: Timeout in seconds. None = 600.
         config_path: Path to the configuration file. None = default.
         api_base: Base URL of the LLM API. None = default.
+        ledger_path: Cost ledger of the main workspace (rows tagged with worker_id).
 
     Returns:
         WorkerResult with execution metrics.
@@ -389,6 +395,15 @@ def _run_worker_process(
 
     effective_timeout = timeout or 600
 
+    # The worker records its LLM calls in the main workspace ledger, not the worktree's
+    env = {**os.environ, LEDGER_WORKER_ENV: str(worker_id)}
+    if ledger_path:
+        env[LEDGER_PATH_ENV] = ledger_path
+    # Each worker records to / replays from its own cassette, never a shared file
+    for var in (RECORD_ENV, REPLAY_ENV):
+        if env.get(var):
+            env[var] = str(worker_cassette_path(env[var], worker_id))
+
     try:
         proc = subprocess.run(
             cmd,
@@ -396,6 +411,7 @@ def _run_worker_process(
             text=True,
             timeout=effective_timeout,
             cwd=worktree_path,
+            env=env,
         )
         duration = time.time() - start
 
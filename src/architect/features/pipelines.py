@@ -98,7 +98,8 @@ class PipelineRunner:
 
         Args:
             config: Pipeline configuration.
-            agent_factory: Callable that creates an AgentLoop. Receives kwargs: agent, model.
+            agent_factory: Callable that creates an AgentLoop.
+                Receives kwargs: agent, model, step_name.
             workspace_root: Root directory of the workspace. None = cwd.
         """
         self.config = config
@@ -246,6 +247,7 @@ class PipelineRunner:
             agent = self.agent_factory(
                 agent=step.agent,
                 model=step.model,
+                step_name=step.name,
             )
             result = agent.run(prompt)
             duration = time.time() - start
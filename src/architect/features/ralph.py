@@ -110,7 +110,8 @@ class RalphLoop:
         Args:
             config: Loop configuration.
             agent_factory: Callable that creates a fresh AgentLoop.
-                Receives kwargs: agent, model. Returns an object with .run(prompt) -> AgentState.
+                Receives kwargs: agent, model, workspace_root, iteration.
+                Returns an object with .run(prompt) -> AgentState.
             workspace_root: Root directory of the workspace. None = cwd.
         """
         self.config = config
@@ -254,6 +255,7 @@ class RalphLoop:
                 agent=self.config.agent,
                 model=self.config.model,
                 workspace_root=self.workspace_root,
+                iteration=iteration,
             )
             agent_result = agent.run(prompt)
 
@@ -0,0 +1,238 @@
+"""
+Shared HTTP connection pool for LLM and MCP calls.
+
+Every ``MCPClient`` used to own an ``httpx.Client`` and LiteLLM built its
+own clients, so parallel tool batches, sub-agents and retries kept opening
+new TCP/TLS connections to the same hosts. ``HTTPPool`` holds one
+process-wide ``httpx.HTTPTransport`` (keep-alive limits, optional HTTP/2)
+that all of them share:
+
+- ``MCPClient`` builds its ``httpx.Client`` (own headers, timeout) on top
+  of the shared transport.
+- LiteLLM gets a client on the shared transport through its injection hook
+  ``litellm.client_session`` (used by the OpenAI-compatible providers).
+
+Clients receive a non-closing view of the transport, so closing one client
+does not tear down the pool. Per-host stats (requests, new connections,
+TLS handshakes, time spent connecting) come from httpcore's ``trace``
+request extension.
+"""
+
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import structlog
+
+if TYPE_CHECKING:
+    from .config.schema import HTTPConfig
+
+logger = structlog.get_logger()
+
+__all__ = [
+    "HTTPPool",
+    "HostStats",
+    "configure_http_pool",
+    "get_http_pool",
+    "install_litellm_client",
+]
+
+
+@dataclass
+class HostStats:
+    """Connection reuse counters for one host."""
+
+    requests: int = 0
+    connections: int = 0
+    tls_handshakes: int = 0
+    connect_seconds: float = 0.0
+
+    @property
+    def reused(self) -> int:
+        """Requests served on an already open connection."""
+        return max(0, self.requests - self.connections)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+            "tls_handshakes": self.tls_handshakes,
+            "connect_seconds": round(self.connect_seconds, 4),
+        }
+
+
+class _TracingTransport(httpx.HTTPTransport):
+    """HTTPTransport that records per-host connection reuse."""
+
+    def __init__(self, pool: "HTTPPool", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._owner = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        host = url.host if url.port is None else f"{url.host}:{url.port}"
+        self._owner._record(host, "request", 0.0)
+        previous = request.extensions.get("trace")
+        started: dict[str, float] = {}
+
+        def trace(event: str, info: dict[str, Any]) -> None:
+            # httpcore events: connection.connect_tcp.started/complete, connection.start_tls.*
+            if event in ("connection.connect_tcp.started", "connection.start_tls.started"):
+                started[event.rsplit(".", 1)[0]] = time.monotonic()
+            elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                phase = event.rsplit(".", 1)[0]
+                elapsed = time.monotonic() - started.pop(phase, time.monotonic())
+                kind = "connection" if phase.endswith("connect_tcp") else "tls"
+                self._owner._record(host, kind, elapsed)
+            if previous is not None:
+                previous(event, info)
+
+        request.extensions["trace"] = trace
+        return super().handle_request(request)
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Non-closing view of the pool transport handed to each client."""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        # The pool outlives the clients built on it
+        pass
+
+
+class HTTPPool:
+    """Process-wide keep-alive connection pool with per-host reuse stats."""
+
+    def __init__(self, config: "HTTPConfig | None" = None) -> None:
+        """Create the pool (the transport is built on first use).
+
+        Args:
+            config: Pool limits and protocol options (defaults if None).
+        """
+        if config is None:
+            from .config.schema import HTTPConfig
+            config = HTTPConfig()
+        self.config = config
+        self._transport: _TracingTransport | None = None
+        self._stats: dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+        self.http2 = False
+        self.log = logger.bind(component="http_pool")
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def transport(self) -> httpx.BaseTransport:
+        """Shared transport for a new client (closing the client keeps the pool)."""
+        with self._lock:
+            if self._transport is None:
+                self._transport = self._create_transport()
+        return _SharedTransport(self._transport)
+
+    def client_kwargs(self) -> dict[str, Any]:
+        """Extra ``httpx.Client`` kwargs to build a client on the pool ({} if disabled)."""
+        if not self.enabled:
+            return {}
+        return {"transport": self.transport()}
+
+    def client(self, **kwargs: Any) -> httpx.Client:
+        """``httpx.Client`` on the shared pool (own connections if disabled)."""
+        return httpx.Client(**{**kwargs, **self.client_kwargs()})
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-host connection reuse stats."""
+        with self._lock:
+            return {host: st.to_dict() for host, st in self._stats.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._transport is not None:
+                self._transport.close()
+                self._transport = None
+
+    def _create_transport(self) -> _TracingTransport:
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        if self.config.http2:
+            try:
+                transport = _TracingTransport(self, limits=limits, http2=True)
+                self.http2 = True
+                return transport
+            except ImportError:
+                self.log.warning(
+                    "http_pool.http2_unavailable",
+                    hint="pip install architect-ai-cli[http2]",
+                    fallback="http/1.1",
+                )
+        return _TracingTransport(self, limits=limits)
+
+    def _record(self, host: str, kind: str, seconds: float) -> None:
+        with self._lock:
+            st = self._stats.setdefault(host, HostStats())
+            if kind == "request":
+                st.requests += 1
+            elif kind == "connection":
+                st.connections += 1
+                st.connect_seconds += seconds
+            else:
+                st.tls_handshakes += 1
+                st.connect_seconds += seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"<HTTPPool(enabled={self.enabled}, http2={self.config.http2}, "
+            f"hosts={len(self._stats)})>"
+        )
+
+
+_pool: HTTPPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HTTPPool:
+    """The process-wide pool (created with defaults on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HTTPPool()
+        return _pool
+
+
+def configure_http_pool(config: "HTTPConfig") -> HTTPPool:
+    """Apply ``config`` to the process-wide pool.
+
+    The current pool (and its warm connections) is kept if the configuration
+    did not change. Otherwise a new pool replaces it; the old one is left to
+    the clients still using it. If LiteLLM is already loaded its client is
+    re-pointed to the new pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.config == config:
+            return _pool
+        _pool = HTTPPool(config)
+        pool = _pool
+
+    litellm = sys.modules.get("litellm")
+    if litellm is not None:
+        install_litellm_client(litellm)
+    return pool
+
+
+def install_litellm_client(litellm: Any) -> None:
+    """Point LiteLLM's sync client hook at the shared pool (if enabled)."""
+    pool = get_http_pool()
+    litellm.client_session = pool.client() if pool.enabled else None
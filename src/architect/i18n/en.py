@@ -32,6 +32,10 @@ STRINGS: dict[str, str] = {
         "\n⚠️  Budget exceeded (${spent}/{budget})\n"
         "    Asking the agent to summarize..."
     ),
+    "human.budget_forecast": (
+        "\n⚠️  Budget about to run out (${spent}/${budget}, ~${rate}/step)\n"
+        "    Asking the agent to summarize..."
+    ),
     "human.timeout": "\n⚠️  Timeout reached\n    Asking the agent to summarize...",
     "human.context_full": "\n⚠️  Context full\n    Asking the agent to summarize...",
     # ── Human Formatter: LLM errors ─────────────────────────────────────
@@ -239,6 +243,10 @@ STRINGS: dict[str, str] = {
     "context.agent_responded": "Agent responded: {content}",
     "context.tool_result": "Result of {name}: {content}",
     "context.no_messages": "(no messages)",
+    "context.elided_file": "[content of {path} at step {step} elided; re-read if needed]",
+    "context.elided_output": (
+        "[output of {tool} at step {step} elided; superseded by a later identical call]"
+    ),
     # ── Guardrails ──────────────────────────────────────────────────────
     "guardrail.sensitive_blocked": (
         "Sensitive file blocked by guardrail: {file} (pattern: {pattern})"
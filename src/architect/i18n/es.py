@@ -31,6 +31,10 @@ STRINGS: dict[str, str] = {
         "\n⚠️  Presupuesto excedido (${spent}/{budget})\n"
         "    Pidiendo al agente que resuma..."
     ),
+    "human.budget_forecast": (
+        "\n⚠️  Presupuesto a punto de agotarse (${spent}/${budget}, ~${rate}/paso)\n"
+        "    Pidiendo al agente que resuma..."
+    ),
     "human.timeout": "\n⚠️  Timeout alcanzado\n    Pidiendo al agente que resuma...",
     "human.context_full": "\n⚠️  Contexto lleno\n    Pidiendo al agente que resuma...",
     # ── Human Formatter: LLM errors ─────────────────────────────────────
@@ -238,6 +242,12 @@ STRINGS: dict[str, str] = {
     "context.agent_responded": "Agente respondió: {content}",
     "context.tool_result": "Resultado de {name}: {content}",
     "context.no_messages": "(sin mensajes)",
+    "context.elided_file": (
+        "[contenido de {path} del paso {step} omitido; vuelve a leerlo si lo necesitas]"
+    ),
+    "context.elided_output": (
+        "[salida de {tool} del paso {step} omitida; reemplazada por una llamada idéntica posterior]"
+    ),
     # ── Guardrails ──────────────────────────────────────────────────────
     "guardrail.sensitive_blocked": (
         "Archivo sensible bloqueado por guardrail: {file} (patrón: {pattern})"
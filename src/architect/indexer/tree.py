@@ -193,6 +193,24 @@ class RepoIndexer:
             RepoIndex with all indexed files and formatted tree.
             Typically takes <200ms on repos with 500 files.
         """
+        return self._build({})
+
+    def update_index(self, previous: RepoIndex) -> RepoIndex:
+        """Rebuild the index reusing the entries of unchanged files.
+
+        Files whose size and mtime match ``previous`` are not read again;
+        new and modified files are analyzed and deleted ones drop out.
+        Used by ``architect serve`` to keep a warm index between runs.
+
+        Args:
+            previous: Index built earlier for the same workspace.
+
+        Returns:
+            Up-to-date RepoIndex.
+        """
+        return self._build(previous.files)
+
+    def _build(self, previous: dict[str, FileInfo]) -> RepoIndex:
         start_ms = time.monotonic() * 1000
 
         files: dict[str, FileInfo] = {}
@@ -200,6 +218,10 @@ class RepoIndexer:
             rel_path = str(file_path.relative_to(self.root))
             # Normalize separators for cross-platform compatibility
             rel_path = rel_path.replace("\\", "/")
+            cached = previous.get(rel_path)
+            if cached is not None and self._unchanged(file_path, cached):
+                files[rel_path] = cached
+                continue
             info = self._analyze_file(file_path, rel_path)
             files[rel_path] = info
 
@@ -249,6 +271,14 @@ class RepoIndexer:
 
                 yield file_path
 
+    def _unchanged(self, path: Path, info: FileInfo) -> bool:
+        """True if the file still has the size and mtime recorded in ``info``."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return stat.st_size == info.size_bytes and stat.st_mtime == info.last_modified
+
     def _analyze_file(self, path: Path, rel_path: str) -> FileInfo:
         """Analyze a file and return its FileInfo."""
         try:
@@ -0,0 +1,66 @@
+"""
+Lazy module proxies -- defer heavy imports until first use.
+
+``architect --help`` or ``architect sessions`` should not pay for importing
+litellm (seconds) or other heavy dependencies they never touch.
+``LazyModule("litellm")`` behaves like the module but imports it on the
+first attribute access. Attribute writes and deletes are forwarded to the
+real module, so module-level configuration (``litellm.set_verbose = False``)
+and ``unittest.mock.patch("...adapter.litellm.completion")`` keep working.
+"""
+
+import importlib
+import types
+from collections.abc import Callable
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(
+        self,
+        name: str,
+        on_load: Callable[[types.ModuleType], None] | None = None,
+    ) -> None:
+        """Create the proxy (nothing is imported yet).
+
+        Args:
+            name: Absolute module name to import.
+            on_load: Called once with the real module right after import.
+        """
+        super().__init__(name)
+        object.__setattr__(self, "_lazy_module", None)
+        object.__setattr__(self, "_lazy_on_load", on_load)
+
+    @property
+    def loaded(self) -> bool:
+        """True once the real module has been imported."""
+        return object.__getattribute__(self, "_lazy_module") is not None
+
+    def _load(self) -> types.ModuleType:
+        module = object.__getattribute__(self, "_lazy_module")
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            object.__setattr__(self, "_lazy_module", module)
+            on_load = object.__getattribute__(self, "_lazy_on_load")
+            if on_load is not None:
+                on_load(module)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes not found on the proxy itself
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule '{self.__name__}' ({state})>"
@@ -6,6 +6,8 @@ Exports the LLMAdapter, response models, and local cache.
 
 from .adapter import LLMAdapter, LLMResponse, StreamChunk, ToolCall
 from .cache import LocalLLMCache
+from .cascade import ModelCascade, PurposeLLM
+from .cassette import Cassette, CassetteError
 
 __all__ = [
     "LLMAdapter",
@@ -13,4 +15,8 @@ __all__ = [
     "StreamChunk",
     "ToolCall",
     "LocalLLMCache",
+    "Cassette",
+    "CassetteError",
+    "ModelCascade",
+    "PurposeLLM",
 ]
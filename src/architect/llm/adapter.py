@@ -16,10 +16,13 @@ Retries configurable from LLMConfig:
 
 import json
 import os
+import sqlite3
+import time
 import uuid
+from functools import cache
+from types import ModuleType
 from typing import Any, Generator
 
-import litellm
 import structlog
 from pydantic import BaseModel, Field
 from tenacity import (
@@ -31,17 +34,45 @@ from tenacity import (
 )
 
 from ..config.schema import LLMConfig
+from ..http_pool import install_litellm_client
+from ..lazy import LazyModule
 from .cache import LocalLLMCache
+from .cassette import Cassette
+from .ratelimit import RateLimiter, estimate_tokens
+from .routing import EndpointRouter
+from .streamjson import ToolArgsBuffer
 
 logger = structlog.get_logger()
 
-# Transient errors that justify retries
-_RETRYABLE_ERRORS = (
-    litellm.RateLimitError,
-    litellm.ServiceUnavailableError,
-    litellm.APIConnectionError,
-    litellm.Timeout,
-)
+
+def _setup_litellm(module: ModuleType) -> None:
+    """Reduce LiteLLM verbosity and attach the shared HTTP pool on import."""
+    module.suppress_debug_info = True
+    module.set_verbose = False
+    install_litellm_client(module)
+
+
+# LiteLLM takes seconds to import: load it on the first LLM call, not when
+# the CLI (or anything importing the adapter) starts
+litellm = LazyModule("litellm", on_load=_setup_litellm)
+
+
+@cache
+def _retryable_errors() -> tuple[type[Exception], ...]:
+    """Transient errors that justify retries."""
+    return (
+        litellm.RateLimitError,
+        litellm.ServiceUnavailableError,
+        litellm.APIConnectionError,
+        litellm.Timeout,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility: _RETRYABLE_ERRORS resolved lazily (PEP 562)
+    if name == "_RETRYABLE_ERRORS":
+        return _retryable_errors()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class StreamChunk(BaseModel):
@@ -52,7 +83,12 @@ class StreamChunk(BaseModel):
     """
 
     type: str = Field(description="Chunk type: 'content' or 'tool_call'")
-    data: str = Field(description="Chunk content")
+    data: str = Field(
+        description=(
+            "Chunk content; for 'tool_call', JSON with index, id and name of a "
+            "tool call whose arguments are complete and valid"
+        )
+    )
 
     model_config = {"extra": "forbid"}
 
@@ -107,16 +143,28 @@ class LLMAdapter:
     - Handles errors with structured logging
     """
 
-    def __init__(self, config: LLMConfig, local_cache: LocalLLMCache | None = None):
+    def __init__(
+        self,
+        config: LLMConfig,
+        local_cache: LocalLLMCache | None = None,
+        cassette: Cassette | None = None,
+    ):
         """Initialize the adapter with configuration.
 
         Args:
             config: LLM configuration
             local_cache: Local response cache (optional, for development only)
+            cassette: Session cassette to record calls to or replay them from
         """
         self.config = config
         self._local_cache = local_cache
+        self._cassette = cassette
         self.log = logger.bind(component="llm_adapter", model=config.model)
+        self._rate_limiter = self._create_rate_limiter()
+        self._router = (
+            EndpointRouter(config.api_bases, hedge=config.hedge_requests)
+            if config.api_bases else None
+        )
 
         # Configure LiteLLM
         self._configure_litellm()
@@ -129,12 +177,88 @@ class LLMAdapter:
             retries=config.retries,
             prompt_caching=config.prompt_caching,
             local_cache=local_cache is not None,
+            cassette=cassette.mode if cassette else None,
+            rpm_limit=config.rpm_limit,
+            tpm_limit=config.tpm_limit,
+            endpoints=len(config.api_bases) or None,
+            hedge=config.hedge_requests if config.api_bases else None,
+        )
+
+    def derive(self, model: str) -> "LLMAdapter":
+        """New adapter for ``model`` sharing this one's local cache and cassette."""
+        return LLMAdapter(
+            self.config.model_copy(update={"model": model}),
+            local_cache=self._local_cache,
+            cassette=self._cassette,
         )
 
+    def close(self) -> None:
+        """Release the endpoint router's hedge threads (the adapter stays usable)."""
+        if self._router is not None:
+            self._router.close()
+
+    @property
+    def endpoint_stats(self) -> list[dict[str, Any]] | None:
+        """Latency/error stats per endpoint when api_bases routing is active."""
+        return self._router.stats() if self._router else None
+
+    def _create_rate_limiter(self) -> RateLimiter | None:
+        """Open the shared RPM/TPM buckets if limits are configured.
+
+        Processes calling the same model through the same endpoint and key
+        share one bucket. If the state file cannot be opened the adapter
+        runs unthrottled.
+        """
+        if not (self.config.rpm_limit or self.config.tpm_limit):
+            return None
+        name = f"{self.config.model}|{self.config.api_base or ''}|{self.config.api_key_env}"
+        try:
+            return RateLimiter(name, rpm=self.config.rpm_limit, tpm=self.config.tpm_limit)
+        except (OSError, sqlite3.Error) as e:
+            self.log.warning("llm.ratelimit.unavailable", error=str(e))
+            return None
+
+    @staticmethod
+    def _retry_after_seconds(exc: BaseException) -> float | None:
+        """Read ``retry-after-ms`` / ``retry-after`` (seconds) from a provider error."""
+        for headers in (
+            getattr(exc, "litellm_response_headers", None),
+            getattr(getattr(exc, "response", None), "headers", None),
+        ):
+            if not headers:
+                continue
+            try:
+                if headers.get("retry-after-ms"):
+                    return float(headers["retry-after-ms"]) / 1000.0
+                if headers.get("retry-after"):
+                    return float(headers["retry-after"])
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return None
+
+    def _throttle(self, messages: list[dict[str, Any]]) -> int:
+        """Wait for rate-limit capacity; returns the estimated prompt tokens charged."""
+        if self._rate_limiter is None:
+            return 0
+        estimated = estimate_tokens(messages)
+        self._rate_limiter.acquire(estimated)
+        return estimated
+
+    def _settle_rate_limit(self, estimated: int, usage: dict[str, Any] | None) -> None:
+        """Correct the TPM bucket with the tokens the provider actually reported."""
+        if self._rate_limiter is None or not usage:
+            return
+        actual = usage.get("total_tokens") or 0
+        if actual:
+            self._rate_limiter.settle(estimated, actual)
+
     def _on_retry_sleep(self, retry_state: RetryCallState) -> None:
         """Callback called before each retry. Logs the attempt and wait time."""
         next_wait = retry_state.next_action.sleep if retry_state.next_action else 0
         exc = retry_state.outcome.exception() if retry_state.outcome else None
+        # A 429 blocks the shared bucket for every process, not just this one
+        if self._rate_limiter is not None and isinstance(exc, litellm.RateLimitError):
+            self._rate_limiter.penalize(self._retry_after_seconds(exc) or next_wait)
         self.log.warning(
             "llm.retry",
             attempt=retry_state.attempt_number,
@@ -147,12 +271,12 @@ class LLMAdapter:
         """Execute fn with automatic retries only for transient errors.
 
         Uses config.retries to determine the maximum number of attempts.
-        Retries are applied only to transient errors (_RETRYABLE_ERRORS).
+        Retries are applied only to transient errors (_retryable_errors()).
         Authentication and configuration errors are propagated immediately.
         """
         max_attempts = self.config.retries + 1  # 1 original attempt + N retries
         for attempt in Retrying(
-            retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+            retry=retry_if_exception_type(_retryable_errors()),
             stop=stop_after_attempt(max_attempts),
             wait=wait_exponential(multiplier=1, min=2, max=60),
             before_sleep=self._on_retry_sleep,
@@ -161,54 +285,106 @@ class LLMAdapter:
             with attempt:
                 return fn(*args, **kwargs)
 
+    @staticmethod
+    def _cached_prompt_tokens(usage: Any) -> int:
+        """Prompt tokens served from the provider cache.
+
+        Anthropic reports ``cache_read_input_tokens``; OpenAI reports
+        ``prompt_tokens_details.cached_tokens``.
+        """
+        cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+        if isinstance(cached, int) and cached > 0:
+            return cached
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) if details is not None else 0
+        return cached if isinstance(cached, int) else 0
+
     def _prepare_messages_with_caching(
         self, messages: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
-        """Mark the system prompt with cache_control for provider prompt caching.
+        """Place provider prompt-cache breakpoints on stable message boundaries.
+
+        Breakpoints (at most 3, under Anthropic's limit of 4):
+        1. The system prompt (frozen at the start of the run).
+        2. The last context summary checkpoint, i.e. the end of the stable
+           prefix that compression appends to but never rewrites.
+        3. The last message once the dialog has started (Anthropic-family
+           models only), so the next call reads the whole current prefix
+           from cache.
 
-        Adds cache_control to the system message content so that
-        Anthropic and OpenAI (compatible) cache it automatically.
-        The markup is ignored by providers that don't support it.
+        The markup is ignored by providers that cache automatically.
 
         Args:
             messages: Original list of messages
 
         Returns:
-            List of messages with cache_control on the system (if applicable)
+            List of messages with cache_control breakpoints (if applicable)
         """
         if not self.config.prompt_caching:
             return messages
 
+        from ..i18n import t
+        summary_header = t("context.summary_header")
+        last_checkpoint = -1
+        for i, msg in enumerate(messages):
+            content = msg.get("content")
+            if (
+                msg.get("role") == "assistant"
+                and not msg.get("tool_calls")
+                and isinstance(content, str)
+                and content.startswith(summary_header)
+            ):
+                last_checkpoint = i
+
         result: list[dict[str, Any]] = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                content = msg.get("content", "")
-                # Anthropic requires content as a list of blocks with cache_control
-                if isinstance(content, str):
-                    enhanced = {
-                        **msg,
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": content,
-                                "cache_control": {"type": "ephemeral"},
-                            }
-                        ],
-                    }
-                else:
-                    # Already a list (e.g. from indexer) — add cache_control to the last block
-                    enhanced = dict(msg)
-                result.append(enhanced)
+        for i, msg in enumerate(messages):
+            if msg.get("role") == "system" or i == last_checkpoint:
+                result.append(self._with_cache_block(msg))
             else:
                 result.append(msg)
+
+        # Past [system, user]: the initial prompt is left untouched
+        if self._uses_explicit_cache_control() and len(result) > 2:
+            last = len(result) - 1
+            if last != last_checkpoint and result[last].get("role") != "system":
+                # Message-level marker: litellm maps it onto the final content
+                # block (tool_result, text) for Anthropic
+                result[last] = {**result[last], "cache_control": {"type": "ephemeral"}}
         return result
 
+    @staticmethod
+    def _with_cache_block(msg: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of msg with its text content marked as cacheable."""
+        content = msg.get("content", "")
+        # Anthropic requires content as a list of blocks with cache_control
+        if isinstance(content, str):
+            return {
+                **msg,
+                "content": [
+                    {
+                        "type": "text",
+                        "text": content,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            }
+        # Already a list (e.g. from indexer) — keep as is
+        return dict(msg)
+
+    def _uses_explicit_cache_control(self) -> bool:
+        """True for providers that need explicit cache breakpoints (Anthropic)."""
+        model = self.config.model.lower()
+        return "claude" in model or "anthropic" in model
+
     def _configure_litellm(self) -> None:
-        """Configure LiteLLM according to the configuration."""
+        """Configure LiteLLM according to the configuration.
+
+        Does not import LiteLLM: the API base is passed per call and the
+        verbosity settings are applied when the module is first loaded.
+        """
 
-        # Configure API base if specified
+        # Configure API base if specified (sent with every call)
         if self.config.api_base:
-            litellm.api_base = self.config.api_base
             self.log.debug("llm.api_base_set", api_base=self.config.api_base)
 
         # Configure API key from environment variable
@@ -225,10 +401,6 @@ class LLMAdapter:
                 message=f"Environment variable {self.config.api_key_env} not found",
             )
 
-        # Configure LiteLLM logging mode (reduce verbosity)
-        litellm.suppress_debug_info = True
-        litellm.set_verbose = False
-
     def completion(
         self,
         messages: list[dict[str, Any]],
@@ -260,6 +432,15 @@ class LLMAdapter:
                 "For streaming, use completion_stream() instead of completion(stream=True)"
             )
 
+        # Offline replay: serve the recorded response, no provider call
+        if self._cassette and self._cassette.replaying:
+            return self._cassette.replay(messages, tools)
+
+        # Local cache key on the original messages: the prepared copies below
+        # are new objects every call and would defeat per-message memoization
+        original_messages = messages
+        cache_key = self._local_cache.make_key(messages, tools) if self._local_cache else None
+
         # Apply prompt caching if enabled
         messages = self._prepare_messages_with_caching(messages)
 
@@ -268,15 +449,27 @@ class LLMAdapter:
             messages_count=len(messages),
             has_tools=tools is not None,
             tools_count=len(tools) if tools else 0,
+            stable_prefix=(
+                self._local_cache.last_stable_prefix if self._local_cache else None
+            ),
         )
 
         # Query local cache (development)
         if self._local_cache:
-            cached = self._local_cache.get(messages, tools)
+            cached = self._local_cache.get(messages, tools, key=cache_key)
             if cached is not None:
+                if self._cassette:
+                    self._cassette.record(
+                        original_messages, tools, cached, model=self.config.model
+                    )
                 return cached
 
+        estimated_tokens = 0
+
         def _call() -> Any:
+            # Every attempt (including retries) queues for rate-limit capacity
+            nonlocal estimated_tokens
+            estimated_tokens = self._throttle(messages)
             kwargs: dict[str, Any] = {
                 "model": self.config.model,
                 "messages": messages,
@@ -285,15 +478,27 @@ class LLMAdapter:
             }
             if tools:
                 kwargs["tools"] = tools
+            if self._router is not None:
+                return self._router.call(
+                    lambda api_base: litellm.completion(**kwargs, api_base=api_base)
+                )
+            if self.config.api_base:
+                kwargs["api_base"] = self.config.api_base
             return litellm.completion(**kwargs)
 
         try:
             response = self._call_with_retry(_call)
             normalized = self._normalize_response(response)
+            self._settle_rate_limit(estimated_tokens, normalized.usage)
 
             # Save to local cache if enabled
             if self._local_cache:
-                self._local_cache.set(messages, tools, normalized)
+                self._local_cache.set(messages, tools, normalized, key=cache_key)
+
+            if self._cassette:
+                self._cassette.record(
+                    original_messages, tools, normalized, model=self.config.model
+                )
 
             self.log.info(
                 "llm.completion.success",
@@ -333,6 +538,16 @@ class LLMAdapter:
         Raises:
             Exception: If the LLM call fails
         """
+        # Offline replay: recorded chunks (optionally with recorded timing)
+        if self._cassette and self._cassette.replaying:
+            yield from self._cassette.replay_stream(messages, tools)
+            return
+
+        original_messages = messages
+        recorded: list[tuple[float, StreamChunk]] | None = [] if self._cassette else None
+        started = time.monotonic()
+        cache_key = self._local_cache.make_key(messages, tools) if self._local_cache else None
+
         # Apply prompt caching if enabled
         messages = self._prepare_messages_with_caching(messages)
 
@@ -341,8 +556,32 @@ class LLMAdapter:
             messages_count=len(messages),
             has_tools=tools is not None,
             tools_count=len(tools) if tools else 0,
+            stable_prefix=(
+                self._local_cache.last_stable_prefix if self._local_cache else None
+            ),
         )
 
+        # Query local cache (development): replay the hit as a stream
+        if self._local_cache:
+            cached = self._local_cache.get(messages, tools, key=cache_key)
+            if cached is not None:
+                if self._cassette:
+                    hit = (
+                        [(0.0, StreamChunk(type="content", data=cached.content))]
+                        if cached.content else []
+                    )
+                    self._cassette.record(
+                        original_messages, tools, cached, chunks=hit, model=self.config.model,
+                    )
+                if cached.content:
+                    yield StreamChunk(type="content", data=cached.content)
+                yield cached
+                return
+
+        endpoint: str | None = None
+        # Tool calls: id, name and an incremental buffer for the arguments
+        # (buffers may spill to temp files: released in the finally below)
+        collected_tool_calls: dict[int, dict[str, Any]] = {}
         try:
             # Prepare kwargs for LiteLLM
             kwargs: dict[str, Any] = {
@@ -358,14 +597,23 @@ class LLMAdapter:
             # Add tools if available
             if tools:
                 kwargs["tools"] = tools
+            if self.config.api_base:
+                kwargs["api_base"] = self.config.api_base
 
             # Accumulators for building the complete response
             collected_content: list[str] = []
-            collected_tool_calls: dict[int, dict[str, Any]] = {}
             finish_reason = "stop"
             usage_info = None
 
+            # Streaming goes to the best endpoint (no hedging: chunks are
+            # already being yielded to the caller)
+            if self._router:
+                endpoint = self._router.ranked()[0]
+                kwargs["api_base"] = endpoint
+
             # Streaming
+            estimated_tokens = self._throttle(messages)
+            stream_started = time.monotonic()
             for chunk in litellm.completion(**kwargs):
                 choice = chunk.choices[0] if chunk.choices else None
                 if not choice:
@@ -376,7 +624,10 @@ class LLMAdapter:
                 # Text content
                 if hasattr(delta, "content") and delta.content:
                     collected_content.append(delta.content)
-                    yield StreamChunk(type="content", data=delta.content)
+                    stream_chunk = StreamChunk(type="content", data=delta.content)
+                    if recorded is not None:
+                        recorded.append((time.monotonic() - started, stream_chunk))
+                    yield stream_chunk
 
                 # Tool calls (accumulated incrementally)
                 if hasattr(delta, "tool_calls") and delta.tool_calls:
@@ -385,23 +636,34 @@ class LLMAdapter:
                         if idx not in collected_tool_calls:
                             collected_tool_calls[idx] = {
                                 "id": getattr(tc_delta, "id", ""),
-                                "type": "function",
-                                "function": {"name": "", "arguments": ""},
+                                "name": "",
+                                "arguments": ToolArgsBuffer(),
                             }
+                        tc_acc = collected_tool_calls[idx]
 
                         # Accumulate fields
                         if tc_delta.id:
-                            collected_tool_calls[idx]["id"] = tc_delta.id
+                            tc_acc["id"] = tc_delta.id
 
                         if hasattr(tc_delta, "function"):
                             if tc_delta.function.name:
-                                collected_tool_calls[idx]["function"]["name"] = (
-                                    tc_delta.function.name
-                                )
-                            if tc_delta.function.arguments:
-                                collected_tool_calls[idx]["function"]["arguments"] += (
-                                    tc_delta.function.arguments
+                                tc_acc["name"] = tc_delta.function.name
+                            if (
+                                tc_delta.function.arguments
+                                and tc_acc["arguments"].feed(tc_delta.function.arguments)
+                            ):
+                                # Arguments complete and valid before the stream ends
+                                stream_chunk = StreamChunk(
+                                    type="tool_call",
+                                    data=json.dumps({
+                                        "index": idx,
+                                        "id": tc_acc["id"],
+                                        "name": tc_acc["name"],
+                                    }),
                                 )
+                                if recorded is not None:
+                                    recorded.append((time.monotonic() - started, stream_chunk))
+                                yield stream_chunk
 
                 # Finish reason
                 if choice.finish_reason:
@@ -415,26 +677,23 @@ class LLMAdapter:
                             chunk.usage, "completion_tokens", 0
                         ) or 0,
                         "total_tokens": getattr(chunk.usage, "total_tokens", 0) or 0,
-                        # Tokens served from provider cache (Anthropic: cache_read_input_tokens)
-                        "cache_read_input_tokens": (
-                            getattr(chunk.usage, "cache_read_input_tokens", 0) or 0
-                        ),
+                        # Tokens served from provider cache (Anthropic/OpenAI)
+                        "cache_read_input_tokens": self._cached_prompt_tokens(chunk.usage),
                     }
 
             # Build complete response
             content = "".join(collected_content) if collected_content else None
 
-            # Convert accumulated tool calls to ToolCall objects
+            # Convert accumulated tool calls to ToolCall objects (arguments
+            # that completed during the stream are already parsed)
             tool_calls = []
-            for tc_dict in collected_tool_calls.values():
+            for tc_acc in collected_tool_calls.values():
+                args_buffer = tc_acc["arguments"]
+                arguments = args_buffer.parsed()
+                if arguments is None:
+                    arguments = self._parse_arguments(args_buffer.text())
                 tool_calls.append(
-                    ToolCall(
-                        id=tc_dict["id"],
-                        name=tc_dict["function"]["name"],
-                        arguments=self._parse_arguments(
-                            tc_dict["function"]["arguments"]
-                        ),
-                    )
+                    ToolCall(id=tc_acc["id"], name=tc_acc["name"], arguments=arguments)
                 )
 
             # Fallback: if the provider did not return usage in streaming,
@@ -447,6 +706,8 @@ class LLMAdapter:
                 usage_info = self._estimate_streaming_usage(
                     messages, content, collected_tool_calls
                 )
+            for tc_acc in collected_tool_calls.values():
+                tc_acc["arguments"].close()
 
             response = LLMResponse(
                 content=content,
@@ -463,16 +724,36 @@ class LLMAdapter:
                 usage=response.usage,
             )
 
+            self._settle_rate_limit(estimated_tokens, response.usage)
+            if self._router and endpoint:
+                self._router.record_success(endpoint, time.monotonic() - stream_started)
+
+            if self._local_cache:
+                self._local_cache.set(messages, tools, response, key=cache_key)
+
+            if self._cassette:
+                self._cassette.record(
+                    original_messages, tools, response,
+                    chunks=recorded, model=self.config.model,
+                )
+
             # Yield complete response at the end
             yield response
 
         except Exception as e:
+            if self._router and endpoint:
+                self._router.record_failure(endpoint)
             self.log.error(
                 "llm.completion_stream.error",
                 error=str(e),
                 error_type=type(e).__name__,
             )
             raise
+        finally:
+            # Also on errors and when the caller stops consuming the stream
+            # early (GeneratorExit is not an Exception)
+            for tc_acc in collected_tool_calls.values():
+                tc_acc["arguments"].close()
 
     def _normalize_response(self, response: Any) -> LLMResponse:
         """Normalize the LiteLLM response to internal format.
@@ -527,10 +808,8 @@ class LLMAdapter:
                 "prompt_tokens": getattr(response.usage, "prompt_tokens", 0) or 0,
                 "completion_tokens": getattr(response.usage, "completion_tokens", 0) or 0,
                 "total_tokens": getattr(response.usage, "total_tokens", 0) or 0,
-                # Tokens served from provider cache (Anthropic: cache_read_input_tokens)
-                "cache_read_input_tokens": (
-                    getattr(response.usage, "cache_read_input_tokens", 0) or 0
-                ),
+                # Tokens served from provider cache (Anthropic/OpenAI)
+                "cache_read_input_tokens": self._cached_prompt_tokens(response.usage),
             }
 
         return LLMResponse(
@@ -651,11 +930,10 @@ class LLMAdapter:
             prompt_tokens = total_chars // 4
 
         # Estimate output tokens
-        output_text = content or ""
-        for tc_dict in tool_calls_raw.values():
-            output_text += tc_dict.get("function", {}).get("name", "")
-            output_text += tc_dict.get("function", {}).get("arguments", "")
-        completion_tokens = max(1, len(output_text) // 4)
+        output_chars = len(content or "")
+        for tc_acc in tool_calls_raw.values():
+            output_chars += len(tc_acc["name"]) + tc_acc["arguments"].size
+        completion_tokens = max(1, output_chars // 4)
 
         self.log.debug(
             "llm.streaming_usage_estimated",
@@ -4,13 +4,26 @@ Local LLM response cache (F14).
 Deterministic on-disk cache for development -- avoids repeated LLM calls
 when messages are identical. NOT for production use.
 
-The cache key is a SHA-256 hash of the canonical JSON content of
-(messages, tools). Entries expire after ttl_hours.
+The cache key combines a rolling SHA-256 chain over the messages with a
+hash of the tool schemas (see ``PrefixHasher``). Entries expire after
+ttl_hours.
+
+Storage is a single SQLite database in WAL mode, so parallel workers
+(separate processes) can read and write it concurrently: every write is
+an atomic upsert inside a transaction, readers never see half-written
+entries. Entry count and total size are kept in a one-row ``totals``
+table maintained by triggers, so ``stats()`` never scans the entries.
+When the total size exceeds ``max_size_mb``, the least recently used
+entries are evicted.
 """
 
 import hashlib
 import json
+import sqlite3
+import threading
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -21,14 +34,123 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger()
 
+_DB_NAME = "llm_cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key        TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_hit ON entries(last_hit);
+CREATE INDEX IF NOT EXISTS idx_entries_created_at ON entries(created_at);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id      INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes   INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, entries, bytes) VALUES (1, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_after_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_after_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_after_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 1;
+END;
+"""
+
+
+class PrefixHasher:
+    """Rolling hash chain over a conversation, for cache keys.
+
+    Each message is serialized and hashed once, memoized by identity plus
+    a cheap signature (content length, number of tool calls) that detects
+    in-place edits. ``link[i] = sha256(link[i-1] + hash(message[i]))``, and
+    the links of the previous call are reused for the unchanged prefix, so
+    a growing history only hashes its new messages. The tools hash is
+    memoized per schema list object (built once per run by the loop).
+
+    The length of the reused prefix doubles as a diagnostic: the part of
+    the request that is byte-identical to the previous call, i.e. what a
+    provider prompt cache can serve.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # id(message) -> (message, signature, digest)
+        self._digests: dict[int, tuple[dict[str, Any], tuple[int, int], bytes]] = {}
+        # Previous call: (message digest, chain link) per position
+        self._chain: list[tuple[bytes, bytes]] = []
+        self._tools: tuple[Any, bytes] | None = None
+        self.last_stable_prefix = 0
+
+    def key(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> str:
+        """Cache key for (messages, tools).
+
+        Also sets ``last_stable_prefix``: number of leading messages equal
+        to those of the previous call.
+        """
+        with self._lock:
+            digests: dict[int, tuple[dict[str, Any], tuple[int, int], bytes]] = {}
+            chain: list[tuple[bytes, bytes]] = []
+            link = b""
+            stable = 0
+            for i, msg in enumerate(messages):
+                digest = self._message_digest(msg)
+                digests[id(msg)] = (msg, self._signature(msg), digest)
+                if stable == i and i < len(self._chain) and self._chain[i][0] == digest:
+                    link = self._chain[i][1]
+                    stable += 1
+                else:
+                    link = hashlib.sha256(link + digest).digest()
+                chain.append((digest, link))
+
+            self._digests = digests
+            self._chain = chain
+            self.last_stable_prefix = stable
+            return hashlib.sha256(link + self._tools_digest(tools)).hexdigest()[:24]
+
+    def _message_digest(self, msg: dict[str, Any]) -> bytes:
+        entry = self._digests.get(id(msg))
+        if entry is not None and entry[0] is msg and entry[1] == self._signature(msg):
+            return entry[2]
+        canonical = json.dumps(msg, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).digest()
+
+    def _tools_digest(self, tools: list[dict[str, Any]] | None) -> bytes:
+        if self._tools is not None and self._tools[0] is tools:
+            return self._tools[1]
+        canonical = json.dumps(tools, sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha256(canonical.encode("utf-8")).digest()
+        self._tools = (tools, digest)
+        return digest
+
+    @staticmethod
+    def _signature(msg: dict[str, Any]) -> tuple[int, int]:
+        content = msg.get("content")
+        size = len(content) if isinstance(content, str) else len(str(content or ""))
+        return size, len(msg.get("tool_calls") or ())
+
 
 class LocalLLMCache:
     """Local on-disk cache for LLM responses.
 
     Features:
-    - Deterministic key: SHA-256 of (messages, tools) in canonical JSON
-    - Storage in JSON Lines per file
-    - Simple TTL based on file mtime
+    - Deterministic key: rolling SHA-256 chain of (messages, tools)
+    - Single-file SQLite store (WAL) safe across processes
+    - TTL based on the entry creation time
+    - Byte-size cap with LRU eviction (by last hit)
+    - Hit/miss/eviction counters for this instance
     - Silent failures: never breaks the adapter flow
 
     Usage:
@@ -39,53 +161,82 @@ class LocalLLMCache:
             cache.set(messages, tools, response)
     """
 
-    def __init__(self, cache_dir: Path, ttl_hours: int = 24) -> None:
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_hours: int = 24,
+        max_size_mb: int = 256,
+    ) -> None:
         """Initialize the cache.
 
         Args:
-            cache_dir: Directory to store cache entries.
+            cache_dir: Directory to store the cache database.
             ttl_hours: Validity period for each entry in hours (1-8760).
+            max_size_mb: Maximum total size of cached responses. 0 = no limit.
         """
         self._dir = Path(cache_dir).expanduser().resolve()
         self._ttl_seconds = ttl_hours * 3600
+        self._max_bytes = max_size_mb * 1024 * 1024
         self._log = logger.bind(component="llm_cache")
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hasher = PrefixHasher()
 
-        # Create directory if it doesn't exist
         try:
             self._dir.mkdir(parents=True, exist_ok=True)
+            self._conn = self._connect(self._dir / _DB_NAME)
         except Exception as e:
-            self._log.warning("llm_cache.dir_create_failed", path=str(self._dir), error=str(e))
+            self._log.warning("llm_cache.open_failed", path=str(self._dir), error=str(e))
+
+    @property
+    def last_stable_prefix(self) -> int:
+        """Leading messages unchanged since the previous key computation."""
+        return self._hasher.last_stable_prefix
 
     def get(
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
+        key: str | None = None,
     ) -> "LLMResponse | None":
         """Look up a cached response.
 
         Args:
             messages: List of context messages.
             tools: List of tool schemas (can be None).
+            key: Precomputed key from ``make_key`` (avoids rehashing).
 
         Returns:
             LLMResponse if cache hit, None if not found or expired.
         """
+        if self._conn is None:
+            return None
         try:
-            cache_file = self._cache_path(messages, tools)
-            if not cache_file.exists():
+            key = key or self.make_key(messages, tools)
+            now = time.time()
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
                 return None
-
-            # Check TTL
-            age = time.time() - cache_file.stat().st_mtime
-            if age > self._ttl_seconds:
-                self._log.debug("llm_cache.expired", file=cache_file.name, age_hours=age / 3600)
+            value, created_at = row
+            if now - created_at > self._ttl_seconds:
+                self.misses += 1
+                self._log.debug("llm_cache.expired", key=key, age_hours=(now - created_at) / 3600)
                 return None
+            with self._write() as conn:
+                conn.execute("UPDATE entries SET last_hit = ? WHERE key = ?", (now, key))
 
             # Deserialize response
             from .adapter import LLMResponse
-            data = json.loads(cache_file.read_text(encoding="utf-8"))
-            response = LLMResponse(**data)
-            self._log.info("llm_cache.hit", file=cache_file.name)
+            response = LLMResponse(**json.loads(value))
+            self.hits += 1
+            self._log.info("llm_cache.hit", key=key)
             return response
 
         except Exception as e:
@@ -97,18 +248,33 @@ class LocalLLMCache:
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
         response: "LLMResponse",
+        key: str | None = None,
     ) -> None:
-        """Save a response to the cache.
+        """Save a response to the cache (atomic upsert).
 
         Args:
             messages: List of context messages.
             tools: List of tool schemas (can be None).
             response: LLMResponse to cache.
+            key: Precomputed key from ``make_key`` (avoids rehashing).
         """
+        if self._conn is None:
+            return
         try:
-            cache_file = self._cache_path(messages, tools)
-            cache_file.write_text(response.model_dump_json(), encoding="utf-8")
-            self._log.debug("llm_cache.set", file=cache_file.name)
+            key = key or self.make_key(messages, tools)
+            value = response.model_dump_json()
+            now = time.time()
+            with self._write() as conn:
+                conn.execute(
+                    "INSERT INTO entries (key, value, size, created_at, last_hit) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                    "size = excluded.size, created_at = excluded.created_at, "
+                    "last_hit = excluded.last_hit",
+                    (key, value, len(value.encode("utf-8")), now, now),
+                )
+                evicted = self._evict_over_cap()
+            self._log.debug("llm_cache.set", key=key, evicted=evicted)
         except Exception as e:
             self._log.warning("llm_cache.set_failed", error=str(e))
 
@@ -116,60 +282,131 @@ class LocalLLMCache:
         """Delete all cache entries.
 
         Returns:
-            Number of files deleted.
+            Number of entries deleted.
         """
         count = 0
-        try:
-            for f in self._dir.glob("*.json"):
-                try:
-                    f.unlink()
-                    count += 1
-                except Exception:
-                    pass
-            self._log.info("llm_cache.cleared", count=count)
-        except Exception as e:
-            self._log.warning("llm_cache.clear_failed", error=str(e))
+        if self._conn is not None:
+            try:
+                with self._write() as conn:
+                    count = conn.execute("SELECT entries FROM totals WHERE id = 1").fetchone()[0]
+                    conn.execute("DELETE FROM entries")
+                self._log.info("llm_cache.cleared", count=count)
+            except Exception as e:
+                self._log.warning("llm_cache.clear_failed", error=str(e))
+        # Entries from the previous one-file-per-key layout
+        for f in self._dir.glob("*.json"):
+            try:
+                f.unlink()
+                count += 1
+            except Exception:
+                pass
         return count
 
     def stats(self) -> dict[str, Any]:
         """Return cache statistics.
 
         Returns:
-            Dict with number of entries, total size, and expired entries.
+            Dict with number of entries, total size, expired entries and
+            this instance's hit/miss/eviction counters.
         """
+        counters = {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+        if self._conn is None:
+            return {"entries": 0, "expired": 0, "total_size_bytes": 0, **counters}
         try:
-            files = list(self._dir.glob("*.json"))
-            now = time.time()
-            expired = sum(1 for f in files if (now - f.stat().st_mtime) > self._ttl_seconds)
-            total_size = sum(f.stat().st_size for f in files)
+            with self._lock:
+                entries, total_size = self._conn.execute(
+                    "SELECT entries, bytes FROM totals WHERE id = 1"
+                ).fetchone()
+                expired = self._conn.execute(
+                    "SELECT COUNT(*) FROM entries WHERE created_at < ?",
+                    (time.time() - self._ttl_seconds,),
+                ).fetchone()[0]
             return {
-                "entries": len(files),
+                "entries": entries,
                 "expired": expired,
                 "total_size_bytes": total_size,
+                "max_size_bytes": self._max_bytes,
                 "dir": str(self._dir),
+                **counters,
             }
         except Exception:
-            return {"entries": 0, "expired": 0, "total_size_bytes": 0}
+            return {"entries": 0, "expired": 0, "total_size_bytes": 0, **counters}
 
-    def _cache_path(
-        self,
-        messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None,
-    ) -> Path:
-        """Generate the cache file path for a given request."""
-        key = self._make_key(messages, tools)
-        return self._dir / f"{key}.json"
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        """Open the database in WAL mode and create the schema."""
+        # Autocommit: write transactions are opened explicitly in _write()
+        conn = sqlite3.connect(
+            path, timeout=10.0, check_same_thread=False, isolation_level=None,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+        return conn
+
+    @contextmanager
+    def _write(self, conn: sqlite3.Connection | None = None) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction.
+
+        BEGIN IMMEDIATE takes the write lock up front (waiting up to the
+        connection timeout), so concurrent writers from other processes
+        serialize instead of failing on lock upgrade.
+        """
+        conn = conn or self._conn
+        assert conn is not None
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _evict_over_cap(self) -> int:
+        """Delete least recently used entries until the size cap holds.
+
+        Runs inside the caller's transaction.
+
+        Returns:
+            Number of evicted entries.
+        """
+        if self._max_bytes <= 0:
+            return 0
+        assert self._conn is not None
+        total = self._conn.execute("SELECT bytes FROM totals WHERE id = 1").fetchone()[0]
+        excess = total - self._max_bytes
+        if excess <= 0:
+            return 0
+
+        victims: list[str] = []
+        freed = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_hit ASC"
+        ):
+            victims.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+        self.evictions += len(victims)
+        self._log.debug("llm_cache.evicted", count=len(victims), freed_bytes=freed)
+        return len(victims)
 
-    def _make_key(
+    def make_key(
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
     ) -> str:
-        """Generate a deterministic SHA-256 key for (messages, tools).
+        """Generate a deterministic key for (messages, tools).
 
-        Uses canonical JSON (sort_keys=True) to guarantee determinism
-        regardless of key ordering.
+        Only messages not seen in previous calls are serialized; see
+        ``PrefixHasher``.
         """
-        payload = {"messages": messages, "tools": tools}
-        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+        return self._hasher.key(messages, tools)
@@ -0,0 +1,159 @@
+"""
+Model cascade -- cheaper models for auxiliary LLM calls.
+
+Context summaries and self-evaluation do not need the main agent model.
+``llm.models`` assigns a model per purpose; each purpose gets its own
+``LLMAdapter`` (sharing the local cache and cassette of the main adapter)
+wrapped in a ``PurposeLLM`` that:
+
+- Records every call in the ``CostTracker`` under ``source=<purpose>``, so
+  the cost summary shows spend and savings per purpose.
+- Can escalate: when the caller cannot parse the cheap model's output it
+  calls ``escalate()`` and the same request is retried on the main model.
+"""
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from .adapter import LLMAdapter, LLMResponse
+
+if TYPE_CHECKING:
+    from ..config.schema import LLMConfig, LLMModelsConfig
+    from ..costs.tracker import CostTracker
+
+logger = structlog.get_logger()
+
+PURPOSES = ("summary", "eval")
+
+
+class PurposeLLM:
+    """LLMAdapter facade for one auxiliary purpose, with escalation."""
+
+    def __init__(
+        self,
+        purpose: str,
+        adapter: LLMAdapter,
+        fallback: LLMAdapter | None = None,
+        cost_tracker: "CostTracker | None" = None,
+    ) -> None:
+        """Create the facade.
+
+        Args:
+            purpose: Purpose name, used as the cost source.
+            adapter: Adapter of the purpose model.
+            fallback: Main adapter to escalate to (None = no escalation).
+            cost_tracker: Tracker where calls are recorded (optional).
+        """
+        self.purpose = purpose
+        self.adapter = adapter
+        self.fallback = fallback
+        self.cost_tracker = cost_tracker
+        self.escalations = 0
+        self.log = logger.bind(component="model_cascade", purpose=purpose)
+
+    @property
+    def config(self) -> "LLMConfig":
+        return self.adapter.config
+
+    def completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+    ) -> LLMResponse:
+        """Call the purpose model (same contract as ``LLMAdapter.completion``)."""
+        return self._call(self.adapter, messages, tools)
+
+    def escalate(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+    ) -> LLMResponse | None:
+        """Retry a request on the main model after unusable output.
+
+        Returns:
+            The main model response, or None if there is nothing to escalate to.
+        """
+        if self.fallback is None:
+            return None
+        self.escalations += 1
+        self.log.warning(
+            "cascade.escalate",
+            from_model=self.adapter.config.model,
+            to_model=self.fallback.config.model,
+        )
+        return self._call(self.fallback, messages, tools)
+
+    def _call(
+        self,
+        adapter: LLMAdapter,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> LLMResponse:
+        started = time.monotonic()
+        response = adapter.completion(messages, tools=tools)
+        if self.cost_tracker is not None and response.usage:
+            # Auxiliary calls belong to the agent step they happen in
+            self.cost_tracker.record(
+                step=self.cost_tracker.current_step,
+                model=adapter.config.model,
+                usage=response.usage,
+                source=self.purpose,
+                latency_s=time.monotonic() - started,
+            )
+        return response
+
+    def __repr__(self) -> str:
+        return f"<PurposeLLM(purpose='{self.purpose}', model='{self.adapter.config.model}')>"
+
+
+class ModelCascade:
+    """Per-purpose adapters derived from the main one."""
+
+    def __init__(
+        self,
+        main: LLMAdapter,
+        models: "LLMModelsConfig",
+        cost_tracker: "CostTracker | None" = None,
+    ) -> None:
+        """Create the cascade.
+
+        Args:
+            main: Main agent adapter.
+            models: Per-purpose model configuration (``llm.models``).
+            cost_tracker: Tracker for auxiliary calls (optional).
+        """
+        self.main = main
+        self.models = models
+        self.cost_tracker = cost_tracker
+        self._adapters: dict[str, LLMAdapter] = {}
+
+    def model_for(self, purpose: str) -> str:
+        """Model configured for ``purpose`` (the main model if unset)."""
+        if purpose not in PURPOSES:
+            raise ValueError(f"Unknown LLM purpose '{purpose}'. Valid: {', '.join(PURPOSES)}")
+        return getattr(self.models, purpose) or self.main.config.model
+
+    def adapter(self, purpose: str) -> LLMAdapter:
+        """Adapter for ``purpose`` (models shared between purposes reuse one)."""
+        model = self.model_for(purpose)
+        if model == self.main.config.model:
+            return self.main
+        if model not in self._adapters:
+            self._adapters[model] = self.main.derive(model)
+        return self._adapters[model]
+
+    def for_purpose(self, purpose: str) -> PurposeLLM:
+        """Cost-tracked facade for ``purpose`` with escalation to the main model."""
+        adapter = self.adapter(purpose)
+        fallback = (
+            self.main if self.models.escalate and adapter is not self.main else None
+        )
+        return PurposeLLM(purpose, adapter, fallback=fallback, cost_tracker=self.cost_tracker)
+
+    def close(self) -> None:
+        """Release the main adapter and the per-purpose adapters derived from it."""
+        self.main.close()
+        for adapter in self._adapters.values():
+            adapter.close()
@@ -0,0 +1,242 @@
+"""
+LLM cassettes -- record and replay whole sessions offline.
+
+In ``record`` mode the file is truncated and every LLM call made through
+``LLMAdapter`` (local cache hits included) is appended to it as JSON Lines:
+the request key, the final ``LLMResponse`` (with
+usage) and, for streaming calls, each chunk with its offset from the start
+of the call. In ``replay`` mode the adapter serves those responses instead
+of calling the provider, so agent runs can be regression-tested and
+benchmarked without network access or cost.
+
+Replay matching:
+- ``order`` (default): responses are served in recorded order.
+- ``key``: responses are looked up by request key (rolling hash of the
+  messages and tool schemas); repeated keys are served in recorded order.
+
+With ``realtime=True`` streaming replays sleep between chunks to reproduce
+the recorded timing.
+
+Worker subprocesses inherit ``ARCHITECT_RECORD`` / ``ARCHITECT_REPLAY``;
+parallel runs point each worker at its own file (``worker_cassette_path``).
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Generator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+import structlog
+
+from .cache import PrefixHasher
+
+if TYPE_CHECKING:
+    from .adapter import LLMResponse, StreamChunk
+
+logger = structlog.get_logger()
+
+CassetteMode = Literal["record", "replay"]
+ReplayMatch = Literal["order", "key"]
+
+RECORD_ENV = "ARCHITECT_RECORD"
+REPLAY_ENV = "ARCHITECT_REPLAY"
+
+
+class CassetteError(Exception):
+    """Error raised when a cassette cannot serve a request during replay."""
+    pass
+
+
+class Cassette:
+    """JSON Lines recording of LLM calls for one session."""
+
+    def __init__(
+        self,
+        path: Path,
+        mode: CassetteMode,
+        match: ReplayMatch = "order",
+        realtime: bool = False,
+    ) -> None:
+        """Open a cassette.
+
+        Args:
+            path: Cassette file (JSON Lines).
+            mode: ``record`` truncates the file and appends calls;
+                ``replay`` serves them.
+            match: Replay lookup: by recorded ``order`` or by request ``key``.
+            realtime: In replay, reproduce the recorded chunk timing.
+
+        Raises:
+            CassetteError: If the file cannot be read in replay mode.
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self.match = match
+        self.realtime = realtime
+        self._hasher = PrefixHasher()
+        self._lock = threading.Lock()
+        self._log = logger.bind(component="cassette", path=str(self.path), mode=mode)
+        self._seq = 0
+        self._entries: deque[dict[str, Any]] = deque()
+        self._by_key: dict[str, deque[dict[str, Any]]] = {}
+
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # A new recording replaces the old one: seq restarts at 0
+            self.path.write_text("", encoding="utf-8")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # ------------------------------------------------------------------
+    # Record
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        response: "LLMResponse",
+        chunks: list[tuple[float, "StreamChunk"]] | None = None,
+        model: str | None = None,
+    ) -> None:
+        """Append one call to the cassette.
+
+        Args:
+            messages: Original request messages (before prompt-caching markup).
+            tools: Tool schemas of the request.
+            response: Final normalized response.
+            chunks: Streaming chunks as (offset seconds, chunk), if streamed.
+            model: Model that produced the response.
+        """
+        with self._lock:
+            entry = {
+                "seq": self._seq,
+                "key": self._hasher.key(messages, tools),
+                "model": model,
+                "stream": chunks is not None,
+                "messages_count": len(messages),
+                "response": response.model_dump(),
+                "chunks": [
+                    {"t": round(offset, 4), "type": c.type, "data": c.data}
+                    for offset, c in (chunks or [])
+                ],
+            }
+            self._seq += 1
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._log.debug("cassette.recorded", seq=entry["seq"], stream=entry["stream"])
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def replay(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> "LLMResponse":
+        """Serve the next recorded response for this request.
+
+        Raises:
+            CassetteError: If no recorded call matches.
+        """
+        from .adapter import LLMResponse
+        entry = self._next_entry(messages, tools)
+        return LLMResponse(**entry["response"])
+
+    def replay_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> Generator["StreamChunk | LLMResponse", None, None]:
+        """Serve a recorded call as stream chunks followed by the response.
+
+        Calls recorded without streaming are replayed as a single content
+        chunk.
+
+        Raises:
+            CassetteError: If no recorded call matches.
+        """
+        from .adapter import LLMResponse, StreamChunk
+        entry = self._next_entry(messages, tools)
+        response = LLMResponse(**entry["response"])
+        chunks = entry.get("chunks") or []
+        if not chunks and response.content:
+            chunks = [{"t": 0.0, "type": "content", "data": response.content}]
+
+        start = time.monotonic()
+        for chunk in chunks:
+            if self.realtime:
+                delay = chunk["t"] - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            yield StreamChunk(type=chunk["type"], data=chunk["data"])
+        yield response
+
+    def remaining(self) -> int:
+        """Number of recorded calls not served yet."""
+        return len(self._entries)
+
+    def _next_entry(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> dict[str, Any]:
+        with self._lock:
+            key = self._hasher.key(messages, tools)
+            if self.match == "key":
+                queue = self._by_key.get(key)
+                if not queue:
+                    raise CassetteError(
+                        f"No recorded LLM call for request key {key} in {self.path}"
+                    )
+                entry = queue.popleft()
+                self._entries.remove(entry)
+            else:
+                if not self._entries:
+                    raise CassetteError(
+                        f"Cassette exhausted: all {self._seq} recorded LLM calls "
+                        f"in {self.path} were already served"
+                    )
+                entry = self._entries.popleft()
+                self._by_key[entry["key"]].popleft()
+                if entry["key"] != key:
+                    self._log.warning(
+                        "cassette.key_mismatch", seq=entry["seq"], expected=entry["key"], got=key,
+                    )
+        self._log.debug("cassette.replayed", seq=entry["seq"], stream=entry["stream"])
+        return entry
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as e:
+            raise CassetteError(f"Cannot read cassette {self.path}: {e}") from e
+        for line in lines:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            self._entries.append(entry)
+            self._by_key.setdefault(entry["key"], deque()).append(entry)
+        self._seq = len(self._entries)
+        self._log.info("cassette.loaded", calls=self._seq, match=self.match)
+
+    def __repr__(self) -> str:
+        return f"<Cassette(path='{self.path}', mode='{self.mode}', match='{self.match}')>"
+
+
+def worker_cassette_path(path: str | Path, worker_id: int) -> Path:
+    """Per-worker cassette next to ``path``: ``session.jsonl`` -> ``session.worker-2.jsonl``.
+
+    The result is absolute (resolved against the current directory), since
+    workers run in their own worktree.
+    """
+    path = Path(path).absolute()
+    return path.with_name(f"{path.stem}.worker-{worker_id}{path.suffix}")
@@ -0,0 +1,217 @@
+"""
+Client-side rate limiter -- token buckets shared across processes.
+
+``ParallelRunner`` and ``CompetitiveEval`` launch several ``architect run``
+processes against the same provider key. Without coordination they all hit
+``RateLimitError`` together and tenacity retries them in lockstep. The
+limiter makes each request wait for capacity before it is sent instead.
+
+Two buckets per endpoint (model + api_base + key env var):
+- requests per minute (RPM): each call takes 1 token.
+- tokens per minute (TPM): each call takes its estimated prompt tokens;
+  the estimate is settled against the reported usage afterwards.
+
+Bucket state lives in a small SQLite database (``~/.architect/ratelimit.db``
+by default) updated under ``BEGIN IMMEDIATE``, so every process on the
+machine draws from the same buckets. When the provider answers with
+``retry-after``, ``penalize`` blocks the bucket for that long for everyone.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger()
+
+DEFAULT_STATE_PATH = Path("~/.architect/ratelimit.db")
+
+# Upper bound for a single sleep while waiting, so a penalty lifted by
+# another process (or a refill) is noticed promptly.
+_MAX_SLEEP = 5.0
+
+# Tolerance for refill float arithmetic (avoids spinning on ~1e-12 waits)
+_EPSILON = 1e-6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name          TEXT PRIMARY KEY,
+    requests      REAL NOT NULL,
+    tokens        REAL NOT NULL,
+    updated_at    REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Cheap prompt token estimate (~4 chars/token) for admission control."""
+    chars = 0
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(
+                len(str(block.get("text", ""))) for block in content if isinstance(block, dict)
+            )
+        for tc in msg.get("tool_calls") or []:
+            chars += len(str(tc.get("function", {}).get("arguments", "")))
+    return chars // 4 + 4 * len(messages)
+
+
+class RateLimiter:
+    """RPM/TPM token buckets persisted in SQLite and shared across processes."""
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        state_path: Path | None = None,
+    ) -> None:
+        """Open (or create) the shared bucket state.
+
+        Args:
+            name: Bucket name; processes using the same name share capacity.
+            rpm: Requests per minute (0 = unlimited).
+            tpm: Tokens per minute (0 = unlimited).
+            state_path: SQLite file (default ``~/.architect/ratelimit.db``).
+        """
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.state_path = (state_path or DEFAULT_STATE_PATH).expanduser()
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+        self._log = logger.bind(component="rate_limiter", bucket=name)
+
+        self._conn = sqlite3.connect(
+            str(self.state_path), isolation_level=None, check_same_thread=False, timeout=30,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request of ``tokens`` prompt tokens fits the buckets.
+
+        A request larger than the whole TPM capacity waits for a full
+        bucket and then proceeds (driving it negative) instead of waiting
+        forever.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        if not self.enabled:
+            return 0.0
+        need = min(tokens, self.tpm) if self.tpm else 0
+        waited = 0.0
+        while True:
+            wait = self._try_take(tokens, need)
+            if wait <= 0:
+                break
+            if waited == 0.0:
+                self._log.info("ratelimit.waiting", wait_seconds=round(wait, 2), tokens=tokens)
+            step = min(wait, _MAX_SLEEP)
+            time.sleep(step)
+            waited += step
+        self.waited_seconds += waited
+        return waited
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Charge (or refund) the difference between estimated and real tokens."""
+        if not self.tpm or actual == estimated:
+            return
+        with self._transaction() as cur:
+            cur.execute(
+                "UPDATE buckets SET tokens = MIN(tokens - ?, ?) WHERE name = ?",
+                (actual - estimated, float(self.tpm), self.name),
+            )
+
+    def penalize(self, retry_after: float) -> None:
+        """Block the bucket for ``retry_after`` seconds after a provider 429."""
+        if retry_after <= 0:
+            return
+        until = time.time() + retry_after
+        with self._transaction() as cur:
+            self._load(cur, time.time())
+            cur.execute(
+                "UPDATE buckets SET blocked_until = MAX(blocked_until, ?), requests = 0 "
+                "WHERE name = ?",
+                (until, self.name),
+            )
+        self._log.warning("ratelimit.penalized", retry_after=round(retry_after, 2))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+
+    def _try_take(self, tokens: int, need: int) -> float:
+        """Take capacity if available; otherwise return the seconds to wait."""
+        now = time.time()
+        with self._transaction() as cur:
+            requests, bucket_tokens, blocked_until = self._load(cur, now)
+            if blocked_until > now:
+                return blocked_until - now
+            waits = []
+            if self.rpm and requests < 1 - _EPSILON:
+                waits.append((1 - requests) * 60.0 / self.rpm)
+            if self.tpm and bucket_tokens < need - _EPSILON:
+                waits.append((need - bucket_tokens) * 60.0 / self.tpm)
+            if waits:
+                return max(waits)
+            cur.execute(
+                "UPDATE buckets SET requests = requests - ?, tokens = tokens - ? WHERE name = ?",
+                (1 if self.rpm else 0, tokens if self.tpm else 0, self.name),
+            )
+            return 0.0
+
+    def _load(self, cur: sqlite3.Cursor, now: float) -> tuple[float, float, float]:
+        """Read the bucket row, refilled up to ``now`` (creates it full)."""
+        row = cur.execute(
+            "SELECT requests, tokens, updated_at, blocked_until FROM buckets WHERE name = ?",
+            (self.name,),
+        ).fetchone()
+        if row is None:
+            requests, tokens, blocked_until = float(self.rpm), float(self.tpm), 0.0
+            cur.execute(
+                "INSERT INTO buckets (name, requests, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                (self.name, requests, tokens, now),
+            )
+            return requests, tokens, blocked_until
+        requests, tokens, updated_at, blocked_until = row
+        elapsed = max(0.0, now - updated_at)
+        requests = min(float(self.rpm), requests + elapsed * self.rpm / 60.0)
+        tokens = min(float(self.tpm), tokens + elapsed * self.tpm / 60.0)
+        cur.execute(
+            "UPDATE buckets SET requests = ?, tokens = ?, updated_at = ? WHERE name = ?",
+            (requests, tokens, now, self.name),
+        )
+        return requests, tokens, blocked_until
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run a write transaction (BEGIN IMMEDIATE ... COMMIT) under the thread lock."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn.cursor()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def __repr__(self) -> str:
+        return f"<RateLimiter(bucket='{self.name}', rpm={self.rpm}, tpm={self.tpm})>"
+
@@ -0,0 +1,220 @@
+"""
+Endpoint routing -- latency-aware selection across several api_base backends.
+
+With ``llm.api_bases`` configured (e.g. several OpenAI-compatible vLLM
+replicas), each call goes to the fastest healthy endpoint instead of a
+single fixed ``api_base``:
+
+- Per endpoint, an EWMA of latency and of the error rate, plus a window of
+  recent latencies.
+- Endpoints are ranked by latency EWMA plus a penalty proportional to the
+  error EWMA; never-tried endpoints count as zero latency (so every replica
+  gets measured). An endpoint whose error EWMA exceeds
+  ``_UNHEALTHY_ERROR_RATE`` drops behind the healthy ones for
+  ``_COOLDOWN_SECONDS``.
+- Optional hedging: if the primary request has not answered by the p95 of
+  its recent latencies, a second request goes to the next endpoint and the
+  first response wins. The losing request cannot be aborted mid-flight
+  (LiteLLM calls are blocking); its result is discarded and its latency
+  still feeds the stats when it finishes.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Smoothing factor for the latency/error EWMAs
+_ALPHA = 0.3
+
+# Seconds of latency one unit of error EWMA is worth when ranking, so an
+# endpoint that just failed loses to an equally fast (or unmeasured) one
+_ERROR_PENALTY_SECONDS = 10.0
+
+# Error EWMA above which an endpoint is considered unhealthy
+_UNHEALTHY_ERROR_RATE = 0.5
+
+# Seconds an unhealthy endpoint is skipped before being retried
+_COOLDOWN_SECONDS = 30.0
+
+# Recent latencies kept per endpoint (for the hedging percentile)
+_LATENCY_WINDOW = 50
+
+# Samples required before hedging kicks in for an endpoint
+_MIN_HEDGE_SAMPLES = 5
+
+
+@dataclass
+class EndpointStats:
+    """Health and latency of one endpoint."""
+
+    url: str
+    latency_ewma: float | None = None
+    error_ewma: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    hedges_won: int = 0
+    cooldown_until: float = 0.0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+    def healthy(self, now: float) -> bool:
+        return self.error_ewma <= _UNHEALTHY_ERROR_RATE or now >= self.cooldown_until
+
+    def percentile(self, q: float) -> float | None:
+        """Latency percentile ``q`` (0-1) over the recent window."""
+        if len(self.latencies) < _MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "latency_ewma": round(self.latency_ewma, 4) if self.latency_ewma is not None else None,
+            "p95": self.percentile(0.95),
+            "error_ewma": round(self.error_ewma, 4),
+            "requests": self.requests,
+            "errors": self.errors,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class EndpointRouter:
+    """Chooses the fastest healthy endpoint and optionally hedges slow calls."""
+
+    def __init__(self, endpoints: list[str], hedge: bool = False) -> None:
+        """Create the router.
+
+        Args:
+            endpoints: api_base URLs, in preference order for ties.
+            hedge: Send a second request when the first exceeds its p95.
+
+        Raises:
+            ValueError: If no endpoints are given.
+        """
+        if not endpoints:
+            raise ValueError("EndpointRouter needs at least one endpoint")
+        self.hedge = hedge and len(endpoints) > 1
+        self._stats = {url: EndpointStats(url) for url in endpoints}
+        self._order = list(endpoints)
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.log = logger.bind(component="endpoint_router")
+
+    def ranked(self) -> list[str]:
+        """Endpoints best-first: healthy before unhealthy, then by latency and errors."""
+        now = time.monotonic()
+        with self._lock:
+            def rank(url: str) -> tuple[int, float, int]:
+                st = self._stats[url]
+                latency = st.latency_ewma if st.latency_ewma is not None else 0.0
+                cost = latency + st.error_ewma * _ERROR_PENALTY_SECONDS
+                return (0 if st.healthy(now) else 1, cost, self._order.index(url))
+            return sorted(self._order, key=rank)
+
+    def record_success(self, url: str, latency: float) -> None:
+        with self._lock:
+            st = self._stats[url]
+            st.requests += 1
+            st.latencies.append(latency)
+            st.latency_ewma = (
+                latency if st.latency_ewma is None
+                else _ALPHA * latency + (1 - _ALPHA) * st.latency_ewma
+            )
+            st.error_ewma = (1 - _ALPHA) * st.error_ewma
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            st = self._stats[url]
+            st.requests += 1
+            st.errors += 1
+            st.error_ewma = _ALPHA + (1 - _ALPHA) * st.error_ewma
+            if st.error_ewma > _UNHEALTHY_ERROR_RATE:
+                st.cooldown_until = time.monotonic() + _COOLDOWN_SECONDS
+        self.log.warning("router.endpoint_error", endpoint=url, error_ewma=round(st.error_ewma, 3))
+
+    def hedge_deadline(self, url: str) -> float | None:
+        """Seconds to wait on ``url`` before hedging (its p95), or None."""
+        with self._lock:
+            return self._stats[url].percentile(0.95)
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [self._stats[url].to_dict() for url in self._order]
+
+    def call(self, fn: Callable[[str], T]) -> T:
+        """Run ``fn(api_base)`` on the best endpoint (hedged if enabled).
+
+        Raises:
+            Exception: The error of the last attempted endpoint if none
+                succeeded (so the caller's retry policy applies).
+        """
+        ranked = self.ranked()
+        primary = ranked[0]
+        deadline = self.hedge_deadline(primary) if self.hedge else None
+        if deadline is None:
+            return self._timed(primary, fn)
+
+        executor = self._pool()
+        futures: dict[Future[T], str] = {executor.submit(self._timed, primary, fn): primary}
+        done, _ = wait(futures, timeout=deadline)
+        if not done:
+            backup = ranked[1]
+            self.log.info(
+                "router.hedge", primary=primary, backup=backup, deadline=round(deadline, 3)
+            )
+            futures[executor.submit(self._timed, backup, fn)] = backup
+
+        error: BaseException | None = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is not None:
+                    error = exc
+                    continue
+                winner = futures[future]
+                for other in pending:
+                    other.cancel()
+                if winner != primary:
+                    with self._lock:
+                        self._stats[winner].hedges_won += 1
+                return future.result()
+        assert error is not None
+        raise error
+
+    def close(self) -> None:
+        """Shut down the hedge threads (a later hedged call starts a new pool)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _timed(self, url: str, fn: Callable[[str], T]) -> T:
+        started = time.monotonic()
+        try:
+            result = fn(url)
+        except Exception:
+            self.record_failure(url)
+            raise
+        self.record_success(url, time.monotonic() - started)
+        return result
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2 * len(self._order), thread_name_prefix="architect-hedge",
+            )
+        return self._executor
+
+    def __repr__(self) -> str:
+        return f"<EndpointRouter(endpoints={len(self._order)}, hedge={self.hedge})>"
@@ -0,0 +1,161 @@
+"""
+Incremental accumulation of streamed tool-call arguments.
+
+Providers stream the JSON arguments of a tool call in small fragments.
+``ToolArgsBuffer`` collects them without repeated string concatenation:
+
+- Fragments go into a list; once the total size exceeds a threshold (large
+  ``write_file`` or ``apply_patch`` contents) they are written to an anonymous
+  temporary file instead of being kept in memory while the stream lasts.
+- Each fragment is scanned once (string/escape state and bracket depth), so
+  the buffer knows the moment the top-level JSON value closes. At that point
+  it is parsed once; ``ready`` tells the caller the arguments are complete
+  and valid before the stream ends.
+"""
+
+import json
+import tempfile
+from typing import IO, Any
+
+# Buffered characters above which the arguments are moved to a temp file
+DEFAULT_SPOOL_THRESHOLD = 256 * 1024
+
+_OPENERS = "{["
+_CLOSERS = "}]"
+_WHITESPACE = " \t\r\n"
+
+
+class ToolArgsBuffer:
+    """Accumulates the argument fragments of one streamed tool call."""
+
+    def __init__(self, spool_threshold: int = DEFAULT_SPOOL_THRESHOLD) -> None:
+        """Create an empty buffer.
+
+        Args:
+            spool_threshold: Characters kept in memory before spilling to a
+                temporary file.
+        """
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self._parts: list[str] = []
+        self._file: IO[str] | None = None
+        # Scanner state
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._closed = False
+        self._trailing = False
+        self._parsed: dict[str, Any] | None = None
+
+    @property
+    def spilled(self) -> bool:
+        """True if the arguments are being written to a temp file."""
+        return self._file is not None
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level JSON object has closed (and nothing follows)."""
+        return self._closed and not self._trailing
+
+    @property
+    def ready(self) -> bool:
+        """True if the arguments are complete and parsed into a dict."""
+        return self.complete and self._parsed is not None
+
+    def feed(self, fragment: str) -> bool:
+        """Add a fragment.
+
+        Returns:
+            True if this fragment completed a valid JSON object.
+        """
+        if not fragment:
+            return False
+        self._store(fragment)
+        was_ready = self.ready
+        self._scan(fragment)
+        if self.complete and self._parsed is None and not was_ready:
+            self._parsed = self._try_parse(self.text())
+        elif self._trailing:
+            self._parsed = None
+        return self.ready and not was_ready
+
+    def text(self) -> str:
+        """Full accumulated arguments string."""
+        if self._file is None:
+            if len(self._parts) > 1:
+                self._parts = ["".join(self._parts)]
+            return self._parts[0] if self._parts else ""
+        self._file.seek(0)
+        data = self._file.read()
+        self._file.seek(0, 2)
+        return data
+
+    def parsed(self) -> dict[str, Any] | None:
+        """Arguments parsed when they completed during the stream (None otherwise)."""
+        return self._parsed if self.ready else None
+
+    def close(self) -> None:
+        """Release the temporary file (if any)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._parts = []
+
+    def _store(self, fragment: str) -> None:
+        self.size += len(fragment)
+        if self._file is not None:
+            self._file.write(fragment)
+            return
+        self._parts.append(fragment)
+        if self.size > self.spool_threshold:
+            self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+            self._file.writelines(self._parts)
+            self._parts = []
+
+    def _scan(self, fragment: str) -> None:
+        if self._closed:
+            if fragment.strip(_WHITESPACE):
+                self._trailing = True
+            return
+        for ch in fragment:
+            if self._closed:
+                if ch not in _WHITESPACE:
+                    self._trailing = True
+                    return
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._started = True
+            elif ch in _OPENERS:
+                self._started = True
+                self._depth += 1
+            elif ch in _CLOSERS:
+                self._depth -= 1
+                if self._started and self._depth == 0:
+                    self._closed = True
+            elif not self._started and ch not in _WHITESPACE:
+                # Scalar at the top level: not a tool-call arguments object
+                self._started = True
+
+    @staticmethod
+    def _try_parse(text: str) -> dict[str, Any] | None:
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def __repr__(self) -> str:
+        return (
+            f"<ToolArgsBuffer(size={self.size}, complete={self.complete}, "
+            f"spilled={self.spilled})>"
+        )
@@ -0,0 +1,137 @@
+"""
+Token counting backends for context budgeting.
+
+The ContextManager estimates context size before every LLM call. The
+default ``heuristic`` backend assumes ~4 characters per token, which is
+cheap but misestimates code, JSON tool arguments and non-English text.
+Real tokenizers are available as pluggable backends:
+
+- ``heuristic`` -- ~4 chars/token (default, no dependencies)
+- ``litellm``   -- ``litellm.token_counter`` for the configured model
+- ``tiktoken``  -- local BPE (cl100k_base or the model's encoding), if installed
+- ``auto``      -- tiktoken if installed, else litellm, else heuristic
+
+Exact counts are memoized by content hash so repeated measurements of the
+same text (re-reads, copies of messages, resumed sessions) stay cheap.
+Any backend error falls back to the heuristic for that text.
+"""
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Literal
+
+import structlog
+
+logger = structlog.get_logger()
+
+TokenizerName = Literal["heuristic", "auto", "litellm", "tiktoken"]
+
+# Maximum number of memoized counts (LRU)
+_MEMO_SIZE = 8192
+
+
+def heuristic_count(text: str) -> float:
+    """Approximate token count: ~4 characters per token."""
+    return len(text) / 4
+
+
+class Tokenizer:
+    """Token counter with a pluggable backend and a content-hash memo.
+
+    Attributes:
+        name: Effective backend name (after resolving ``auto`` and fallbacks).
+        exact: True if counts come from a real tokenizer.
+    """
+
+    def __init__(self, name: TokenizerName = "heuristic", model: str | None = None) -> None:
+        """Initialize the tokenizer.
+
+        Args:
+            name: Requested backend.
+            model: Model name, used by litellm and to pick the tiktoken encoding.
+        """
+        self.model = model
+        self._log = logger.bind(component="tokenizer")
+        self._memo: OrderedDict[str, float] = OrderedDict()
+        self.name, self._backend = self._resolve_backend(name, model)
+        self.exact = self.name != "heuristic"
+        if name != "heuristic":
+            self._log.debug("tokenizer.selected", requested=name, backend=self.name, model=model)
+
+    def count(self, text: str) -> float:
+        """Count tokens in a text.
+
+        The heuristic is computed directly (it is cheaper than hashing).
+        Exact backends are memoized by SHA-1 of the text.
+
+        Args:
+            text: Text to measure.
+
+        Returns:
+            Number of tokens (float for the heuristic, integral otherwise).
+        """
+        if not text:
+            return 0
+        if not self.exact:
+            return heuristic_count(text)
+
+        key = hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+        cached = self._memo.get(key)
+        if cached is not None:
+            self._memo.move_to_end(key)
+            return cached
+
+        try:
+            tokens = float(self._backend(text))
+        except Exception as e:
+            self._log.debug("tokenizer.count_failed", backend=self.name, error=str(e))
+            return heuristic_count(text)
+
+        self._memo[key] = tokens
+        if len(self._memo) > _MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return tokens
+
+    def _resolve_backend(
+        self, name: TokenizerName, model: str | None
+    ) -> tuple[str, Callable[[str], Any]]:
+        """Resolve the requested backend, falling back to the heuristic."""
+        if name in ("auto", "tiktoken"):
+            encode = _load_tiktoken(model)
+            if encode is not None:
+                return "tiktoken", lambda text: len(encode(text))
+            if name == "tiktoken":
+                self._log.warning("tokenizer.tiktoken_unavailable", fallback="heuristic")
+                return "heuristic", heuristic_count
+
+        if name in ("auto", "litellm") and model:
+            def _litellm_count(text: str) -> int:
+                # Imported on first count, not when the tokenizer is built
+                import litellm
+                return litellm.token_counter(model=model, text=text)
+
+            return "litellm", _litellm_count
+
+        return "heuristic", heuristic_count
+
+    def __repr__(self) -> str:
+        return f"<Tokenizer(backend='{self.name}', model='{self.model}')>"
+
+
+def _load_tiktoken(model: str | None) -> Callable[[str], list[int]] | None:
+    """Return the encode function of a local BPE, or None if not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        base_model = model.split("/")[-1] if model else ""
+        try:
+            encoding = tiktoken.encoding_for_model(base_model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: encoding.encode(text, disallowed_special=())
+    except Exception:
+        # Encodings are downloaded on first use; offline environments fail here
+        return None
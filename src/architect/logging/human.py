@@ -122,6 +122,14 @@ class HumanFormatter:
                 budget = kw.get("budget", "?")
                 return t("human.budget_exceeded", spent=spent, budget=budget)
 
+            case "safety.budget_forecast":
+                return t(
+                    "human.budget_forecast",
+                    spent=kw.get("spent", "?"),
+                    budget=kw.get("budget", "?"),
+                    rate=kw.get("rate", "?"),
+                )
+
             case "safety.timeout":
                 return t("human.timeout")
 
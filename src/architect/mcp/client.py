@@ -16,6 +16,7 @@ import httpx
 import structlog
 
 from ..config.schema import MCPServerConfig
+from ..http_pool import get_http_pool
 
 logger = structlog.get_logger()
 
@@ -79,11 +80,13 @@ class MCPClient:
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
 
-        # Create HTTP client (without base_url -- we use direct URL)
+        # Create HTTP client (without base_url -- we use direct URL) on the
+        # shared connection pool, so clients to the same host reuse connections
         self.http = httpx.Client(
             headers=headers,
             timeout=30.0,
             follow_redirects=True,
+            **get_http_pool().client_kwargs(),
         )
 
         self.log.info(
@@ -425,7 +428,7 @@ class MCPClient:
         return sanitized
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client (the shared pool connections stay open)."""
         self.http.close()
         self.log.info("mcp.client.closed")
 
@@ -5,9 +5,11 @@ Connects to MCP servers, discovers their available tools,
 and registers them in the ToolRegistry as local tools.
 """
 
-import structlog
+import os
 from typing import Any
 
+import structlog
+
 from ..config.schema import MCPServerConfig
 from ..tools.registry import ToolRegistry
 from .adapter import MCPToolAdapter
@@ -24,9 +26,21 @@ class MCPDiscovery:
     available to agents.
     """
 
-    def __init__(self):
-        """Initialize the discovery."""
+    def __init__(
+        self,
+        server_cache: dict[str, tuple[MCPClient, list[dict[str, Any]]]] | None = None,
+    ):
+        """Initialize the discovery.
+
+        Args:
+            server_cache: Optional dict, kept by the caller across discoveries,
+                mapping each server to its connected client and tool list.
+                When given, servers already in it are not contacted again and
+                their clients (and HTTP connections) are reused. Used by
+                ``architect serve``.
+        """
         self.log = logger.bind(component="mcp_discovery")
+        self.server_cache = server_cache
 
     def discover_and_register(
         self,
@@ -109,12 +123,21 @@ class MCPDiscovery:
             url=server_config.url,
         )
 
-        # Create MCP client
-        client = MCPClient(server_config)
+        cache_key = self._cache_key(server_config)
+        cached = self.server_cache.get(cache_key) if self.server_cache is not None else None
+
+        if cached is not None:
+            client, tools = cached
+        else:
+            # Create MCP client
+            client = MCPClient(server_config)
 
         try:
-            # List available tools
-            tools = client.list_tools()
+            if cached is None:
+                # List available tools
+                tools = client.list_tools()
+                if self.server_cache is not None:
+                    self.server_cache[cache_key] = (client, tools)
             stats["tools_discovered"] += len(tools)
 
             self.log.info(
@@ -142,6 +165,14 @@ class MCPDiscovery:
             # Re-raise MCP errors to be caught at the upper level
             raise
 
+    @staticmethod
+    def _cache_key(server_config: MCPServerConfig) -> str:
+        """Server identity for the cache (includes the token, which may come from env)."""
+        token = server_config.token
+        if not token and server_config.token_env:
+            token = os.environ.get(server_config.token_env)
+        return f"{server_config.name}|{server_config.url}|{token or ''}"
+
     def _register_tool(
         self,
         client: MCPClient,
@@ -38,6 +38,9 @@ class SkillsLoader:
         self.root = Path(workspace_root)
         self._project_context: str | None = None
         self._skills: list[SkillInfo] = []
+        # SKILL.md path -> ((mtime_ns, size), parsed skill); lets a long-lived
+        # loader (architect serve) re-discover without re-parsing
+        self._parsed: dict[Path, tuple[tuple[int, int], SkillInfo | None]] = {}
 
     def load_project_context(self) -> str | None:
         """Load .architect.md (or equivalents). Always injected into the system prompt."""
@@ -61,7 +64,7 @@ class SkillsLoader:
                 if skill_dir.is_dir():
                     skill_md = skill_dir / "SKILL.md"
                     if skill_md.exists():
-                        skill = self._parse_skill(skill_md)
+                        skill = self._parse_skill_cached(skill_md)
                         if skill:
                             skills.append(skill)
         self._skills = skills
@@ -72,6 +75,20 @@ class SkillsLoader:
         )
         return skills
 
+    def _parse_skill_cached(self, path: Path) -> SkillInfo | None:
+        """Parse a SKILL.md unless it is unchanged since the last discovery."""
+        try:
+            stat = path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return self._parse_skill(path)
+        cached = self._parsed.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        skill = self._parse_skill(path)
+        self._parsed[path] = (signature, skill)
+        return skill
+
     def _parse_skill(self, path: Path) -> SkillInfo | None:
         """Parse a SKILL.md with optional YAML frontmatter."""
         try:
@@ -0,0 +1,164 @@
+"""
+Tests para la cascada de modelos por propósito (llm.models).
+
+Cubre:
+- ModelCascade: modelo por propósito, reutilización de adapters, validación
+- PurposeLLM: registro de coste por source y escalado al modelo principal
+- CostTracker: ahorro por source frente al modelo base
+- Consumidores: resúmenes de contexto, SelfEvaluator y AutoReviewer escalan
+  cuando la salida del modelo barato no se puede usar
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from architect.agents.reviewer import AutoReviewer
+from architect.config.schema import ContextConfig, LLMConfig, LLMModelsConfig
+from architect.core.context import ContextManager
+from architect.core.evaluator import SelfEvaluator
+from architect.core.state import AgentState
+from architect.costs.prices import PriceLoader
+from architect.costs.tracker import CostTracker
+from architect.llm.adapter import LLMAdapter, LLMResponse
+from architect.llm.cascade import ModelCascade, PurposeLLM
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+_USAGE = {"prompt_tokens": 1_000_000, "completion_tokens": 0, "total_tokens": 1_000_000}
+
+
+def _fake_adapter(model: str, *contents: str) -> MagicMock:
+    adapter = MagicMock(spec=LLMAdapter)
+    adapter.config = LLMConfig(model=model)
+    adapter.completion.side_effect = [
+        LLMResponse(content=c, finish_reason="stop", usage=_USAGE) for c in contents
+    ]
+    return adapter
+
+
+def _tracker() -> CostTracker:
+    return CostTracker(PriceLoader(), baseline_model="gpt-4o")
+
+
+# ── Tests: ModelCascade ───────────────────────────────────────────────────
+
+
+class TestModelCascade:
+    def test_unset_purpose_uses_main_adapter(self):
+        main = LLMAdapter(LLMConfig(model="gpt-4o"))
+        cascade = ModelCascade(main, LLMModelsConfig())
+        assert cascade.adapter("summary") is main
+        assert cascade.for_purpose("summary").fallback is None
+
+    def test_purposes_sharing_a_model_share_the_adapter(self):
+        main = LLMAdapter(LLMConfig(model="gpt-4o"))
+        cascade = ModelCascade(main, LLMModelsConfig(summary="gpt-4o-mini", eval="gpt-4o-mini"))
+        summary = cascade.adapter("summary")
+        assert summary.config.model == "gpt-4o-mini"
+        assert cascade.adapter("eval") is summary
+        assert cascade.for_purpose("eval").fallback is main
+
+    def test_no_fallback_when_escalation_disabled(self):
+        main = LLMAdapter(LLMConfig(model="gpt-4o"))
+        cascade = ModelCascade(main, LLMModelsConfig(summary="gpt-4o-mini", escalate=False))
+        assert cascade.for_purpose("summary").fallback is None
+
+    def test_unknown_purpose(self):
+        cascade = ModelCascade(LLMAdapter(LLMConfig(model="gpt-4o")), LLMModelsConfig())
+        with pytest.raises(ValueError):
+            cascade.model_for("translate")
+
+    def test_only_wired_purposes_are_configurable(self):
+        """Solo summary y eval tienen consumidores: review/plan no son claves válidas."""
+        with pytest.raises(ValueError):
+            LLMModelsConfig(review="gpt-4o-mini")
+        cascade = ModelCascade(LLMAdapter(LLMConfig(model="gpt-4o")), LLMModelsConfig())
+        with pytest.raises(ValueError):
+            cascade.model_for("plan")
+
+
+# ── Tests: PurposeLLM y ahorro ────────────────────────────────────────────
+
+
+class TestPurposeLLM:
+    def test_records_cost_with_purpose_source_and_savings(self):
+        tracker = _tracker()
+        llm = PurposeLLM("summary", _fake_adapter("gpt-4o-mini", "ok"), cost_tracker=tracker)
+        llm.completion([{"role": "user", "content": "x"}])
+        summary = tracker.summary()
+        assert summary["by_source"]["summary"] == pytest.approx(0.15)
+        # 1M tokens de entrada: 2.50 $ en gpt-4o frente a 0.15 $ en gpt-4o-mini
+        assert summary["savings_by_source"] == {"summary": pytest.approx(2.35)}
+
+    def test_main_model_calls_report_no_savings(self):
+        tracker = _tracker()
+        tracker.record(step=1, model="gpt-4o", usage=_USAGE, source="agent")
+        assert tracker.summary()["savings_by_source"] == {}
+
+    def test_escalate_uses_fallback(self):
+        tracker = _tracker()
+        main = _fake_adapter("gpt-4o", "principal")
+        llm = PurposeLLM("eval", _fake_adapter("gpt-4o-mini"), fallback=main, cost_tracker=tracker)
+        response = llm.escalate([{"role": "user", "content": "x"}])
+        assert response.content == "principal"
+        assert llm.escalations == 1
+        assert tracker.summary()["by_source"]["eval"] == pytest.approx(2.5)
+
+    def test_escalate_without_fallback(self):
+        llm = PurposeLLM("eval", _fake_adapter("gpt-4o-mini"))
+        assert llm.escalate([]) is None
+
+
+# ── Tests: consumidores ───────────────────────────────────────────────────
+
+
+class TestConsumersEscalate:
+    def test_empty_summary_escalates(self):
+        llm = PurposeLLM(
+            "summary",
+            _fake_adapter("gpt-4o-mini", ""),
+            fallback=_fake_adapter("gpt-4o", "resumen del principal"),
+        )
+        mgr = ContextManager(ContextConfig(), summary_llm=llm)
+        msgs = [{"role": "assistant", "content": "hecho"}]
+        assert mgr._summarize_steps(msgs, MagicMock()) == "resumen del principal"
+
+    def test_summary_llm_takes_precedence(self):
+        agent_llm = MagicMock()
+        llm = PurposeLLM("summary", _fake_adapter("gpt-4o-mini", "resumen barato"))
+        mgr = ContextManager(ContextConfig(), summary_llm=llm)
+        summary = mgr._summarize_steps([{"role": "user", "content": "x"}], agent_llm)
+        assert summary == "resumen barato"
+        agent_llm.completion.assert_not_called()
+
+    def test_unparseable_eval_escalates(self):
+        verdict = '{"completed": true, "confidence": 0.9, "issues": [], "suggestion": ""}'
+        llm = PurposeLLM(
+            "eval",
+            _fake_adapter("gpt-4o-mini", "parece que sí"),
+            fallback=_fake_adapter("gpt-4o", verdict),
+        )
+        state = AgentState()
+        state.final_output = "listo"
+        result = SelfEvaluator(llm).evaluate_basic("tarea", state)
+        assert result.completed is True
+        assert llm.escalations == 1
+
+    def test_parseable_eval_does_not_escalate(self):
+        verdict = '{"completed": false, "confidence": 0.4, "issues": ["falta"], "suggestion": ""}'
+        main = _fake_adapter("gpt-4o")
+        llm = PurposeLLM("eval", _fake_adapter("gpt-4o-mini", verdict), fallback=main)
+        state = AgentState()
+        state.final_output = "listo"
+        assert SelfEvaluator(llm).evaluate_basic("tarea", state).completed is False
+        main.completion.assert_not_called()
+
+    def test_empty_review_escalates_to_builder_model(self):
+        cheap = MagicMock(final_output="", cost_tracker=None)
+        main = MagicMock(final_output="No issues found.", cost_tracker=None)
+        factory = MagicMock(side_effect=[MagicMock(run=MagicMock(return_value=cheap)),
+                                         MagicMock(run=MagicMock(return_value=main))])
+        result = AutoReviewer(factory, review_model="gpt-4o-mini").review_changes("t", "diff --git")
+        assert result.has_issues is False
+        assert factory.call_args_list[1].kwargs == {"agent": "review", "model": None}
@@ -0,0 +1,299 @@
+"""
+Tests para cassettes de grabación/reproducción del LLMAdapter (F14).
+
+Cubre:
+- Grabación de completion y completion_stream (chunks con offset y usage)
+- Grabar trunca el fichero; los aciertos de la caché local también se graban
+  (incluido un acierto en streaming solo con tool calls)
+- Reproducción por orden y por clave, sin llamar al proveedor
+- Reproducción en streaming de llamadas grabadas sin streaming
+- Errores: cassette agotado, clave desconocida, fichero inexistente
+- Opciones de CLI: --record y --replay son excluyentes; sin resumen en
+  background con cassette
+- Workers paralelos: un cassette por worker
+"""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from architect.config.schema import LLMConfig
+from architect.llm import (
+    Cassette,
+    CassetteError,
+    LLMAdapter,
+    LLMResponse,
+    LocalLLMCache,
+    StreamChunk,
+)
+from architect.llm.cassette import worker_cassette_path
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _msgs(text: str) -> list[dict]:
+    return [{"role": "system", "content": "S"}, {"role": "user", "content": text}]
+
+
+def _raw_response(content: str) -> SimpleNamespace:
+    """Respuesta no streaming con la forma de un ModelResponse de LiteLLM."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(content=content, tool_calls=None),
+            finish_reason="stop",
+        )],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=3, total_tokens=13),
+    )
+
+
+def _raw_stream(parts: list[str]) -> list[SimpleNamespace]:
+    """Chunks de streaming; el último trae finish_reason y usage."""
+    chunks = [
+        SimpleNamespace(
+            choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=p, tool_calls=None), finish_reason=None,
+            )],
+            usage=None,
+        )
+        for p in parts
+    ]
+    chunks.append(SimpleNamespace(
+        choices=[SimpleNamespace(
+            delta=SimpleNamespace(content=None, tool_calls=None), finish_reason="stop",
+        )],
+        usage=SimpleNamespace(prompt_tokens=20, completion_tokens=5, total_tokens=25),
+    ))
+    return chunks
+
+
+def _adapter(cassette: Cassette) -> LLMAdapter:
+    return LLMAdapter(LLMConfig(model="gpt-4o-mini"), cassette=cassette)
+
+
+def _record_session(path: Path) -> None:
+    """Graba dos llamadas: una normal y una en streaming."""
+    adapter = _adapter(Cassette(path, mode="record"))
+    with patch("architect.llm.adapter.litellm.completion", return_value=_raw_response("uno")):
+        adapter.completion(_msgs("primera"))
+    with patch(
+        "architect.llm.adapter.litellm.completion", return_value=iter(_raw_stream(["do", "s"]))
+    ):
+        list(adapter.completion_stream(_msgs("segunda")))
+
+
+# ── Tests: grabación ──────────────────────────────────────────────────────
+
+
+class TestRecord:
+    def test_records_one_line_per_call(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["seq"] for e in entries] == [0, 1]
+        assert entries[0]["stream"] is False
+        assert entries[0]["response"]["content"] == "uno"
+        assert entries[0]["response"]["usage"]["total_tokens"] == 13
+
+    def test_stream_chunks_and_usage_recorded(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        entry = json.loads(path.read_text().splitlines()[1])
+        assert entry["stream"] is True
+        assert [c["data"] for c in entry["chunks"]] == ["do", "s"]
+        assert all(c["t"] >= 0 for c in entry["chunks"])
+        assert entry["response"]["usage"]["prompt_tokens"] == 20
+
+    def test_record_still_returns_live_response(self, tmp_path: Path):
+        adapter = _adapter(Cassette(tmp_path / "c.jsonl", mode="record"))
+        with patch("architect.llm.adapter.litellm.completion", return_value=_raw_response("vivo")):
+            assert adapter.completion(_msgs("x")).content == "vivo"
+
+    def test_new_recording_replaces_old_file(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        _record_session(path)
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["seq"] for e in entries] == [0, 1]
+
+    def test_local_cache_hits_are_recorded(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        cache = LocalLLMCache(tmp_path / "cache")
+        adapter = LLMAdapter(
+            LLMConfig(model="gpt-4o-mini"), local_cache=cache,
+            cassette=Cassette(path, mode="record"),
+        )
+        with patch("architect.llm.adapter.litellm.completion", return_value=_raw_response("uno")):
+            adapter.completion(_msgs("x"))
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            adapter.completion(_msgs("x"))
+            list(adapter.completion_stream(_msgs("x")))
+
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["response"]["content"] for e in entries] == ["uno"] * 3
+        assert entries[2]["stream"] is True
+        assert [c["data"] for c in entries[2]["chunks"]] == ["uno"]
+
+        # La sesión se reproduce completa sin caché
+        replay = _adapter(Cassette(path, mode="replay"))
+        for _ in range(3):
+            assert replay.completion(_msgs("x")).content == "uno"
+
+
+    def test_streamed_cache_hit_with_only_tool_calls(self, tmp_path: Path):
+        """Un acierto sin contenido (solo tool calls) se graba sin chunks."""
+        path = tmp_path / "session.jsonl"
+        adapter = LLMAdapter(
+            LLMConfig(model="gpt-4o-mini"), local_cache=LocalLLMCache(tmp_path / "cache"),
+            cassette=Cassette(path, mode="record"),
+        )
+        raw = _raw_response(None)
+        raw.choices[0].finish_reason = "tool_calls"
+        raw.choices[0].message.tool_calls = [SimpleNamespace(
+            id="c1", function=SimpleNamespace(name="read_file", arguments='{"path": "a"}'),
+        )]
+        with patch("architect.llm.adapter.litellm.completion", return_value=raw):
+            adapter.completion(_msgs("x"))
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            chunks = list(adapter.completion_stream(_msgs("x")))
+
+        assert chunks[-1].tool_calls[0].name == "read_file"
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert entries[1]["stream"] is True
+        assert entries[1]["chunks"] == []
+        assert entries[1]["response"]["tool_calls"][0]["arguments"] == {"path": "a"}
+
+
+# ── Tests: reproducción ───────────────────────────────────────────────────
+
+
+class TestReplay:
+    def test_replay_in_order_without_provider(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        cassette = Cassette(path, mode="replay")
+        adapter = _adapter(cassette)
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            first = adapter.completion(_msgs("primera"))
+            items = list(adapter.completion_stream(_msgs("segunda")))
+        assert first.content == "uno"
+        assert [i.data for i in items if isinstance(i, StreamChunk)] == ["do", "s"]
+        assert isinstance(items[-1], LLMResponse)
+        assert items[-1].content == "dos"
+        assert items[-1].usage["total_tokens"] == 25
+        assert cassette.remaining() == 0
+
+    def test_replay_by_key_ignores_order(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        adapter = _adapter(Cassette(path, mode="replay", match="key"))
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            assert adapter.completion(_msgs("segunda")).content == "dos"
+            assert adapter.completion(_msgs("primera")).content == "uno"
+
+    def test_unknown_key_raises(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        adapter = _adapter(Cassette(path, mode="replay", match="key"))
+        with pytest.raises(CassetteError):
+            adapter.completion(_msgs("otra"))
+
+    def test_exhausted_cassette_raises(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        adapter = _adapter(Cassette(path, mode="replay"))
+        adapter.completion(_msgs("primera"))
+        adapter.completion(_msgs("segunda"))
+        with pytest.raises(CassetteError, match="exhausted"):
+            adapter.completion(_msgs("tercera"))
+
+    def test_non_stream_entry_replayed_as_stream(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _record_session(path)
+        adapter = _adapter(Cassette(path, mode="replay"))
+        items = list(adapter.completion_stream(_msgs("primera")))
+        assert items[0] == StreamChunk(type="content", data="uno")
+        assert items[-1].content == "uno"
+
+    def test_realtime_replay_sleeps_recorded_offsets(self, tmp_path: Path):
+        path = tmp_path / "c.jsonl"
+        entry = {
+            "seq": 0, "key": "k", "model": None, "stream": True, "messages_count": 1,
+            "response": LLMResponse(content="ab", finish_reason="stop").model_dump(),
+            "chunks": [
+                {"t": 0.0, "type": "content", "data": "a"},
+                {"t": 0.5, "type": "content", "data": "b"},
+            ],
+        }
+        path.write_text(json.dumps(entry) + "\n")
+        cassette = Cassette(path, mode="replay", realtime=True)
+        with patch("architect.llm.cassette.time.sleep") as sleep:
+            list(cassette.replay_stream(_msgs("x"), None))
+        assert sleep.call_count == 1
+        assert 0.4 < sleep.call_args[0][0] <= 0.5
+
+    def test_missing_file_raises(self, tmp_path: Path):
+        with pytest.raises(CassetteError):
+            Cassette(tmp_path / "nope.jsonl", mode="replay")
+
+
+# ── Tests: CLI ────────────────────────────────────────────────────────────
+
+
+class TestCli:
+    def test_record_and_replay_are_exclusive(self, tmp_path: Path):
+        from architect.cli import EXIT_CONFIG_ERROR, _open_cassette
+
+        with pytest.raises(SystemExit) as exc:
+            _open_cassette(tmp_path / "a.jsonl", tmp_path / "b.jsonl")
+        assert exc.value.code == EXIT_CONFIG_ERROR
+
+    def test_run_exposes_cassette_options(self):
+        from click.testing import CliRunner
+
+        from architect.cli import main
+
+        for command in ("run", "loop", "pipeline"):
+            result = CliRunner().invoke(main, [command, "--help"])
+            assert "--record" in result.output
+            assert "--replay" in result.output
+
+    def test_no_background_summary_with_cassette(self, tmp_path: Path):
+        from architect.cli import _session_context_config
+        from architect.config.schema import ContextConfig
+
+        config = ContextConfig(precompute_summary_at=0.6)
+        assert _session_context_config(config, None) is config
+        recording = _session_context_config(config, Cassette(tmp_path / "c.jsonl", mode="record"))
+        assert recording.precompute_summary_at == 0
+        assert config.precompute_summary_at == 0.6
+
+
+# ── Tests: workers paralelos ──────────────────────────────────────────────
+
+
+class TestWorkers:
+    def test_worker_cassette_path(self, tmp_path: Path):
+        path = worker_cassette_path(tmp_path / "session.jsonl", 2)
+        assert path == tmp_path / "session.worker-2.jsonl"
+        assert worker_cassette_path("rel.jsonl", 1).is_absolute()
+
+    def test_each_worker_gets_its_own_cassette(self, tmp_path: Path, monkeypatch):
+        from architect.features.parallel import _run_worker_process
+
+        monkeypatch.setenv("ARCHITECT_RECORD", str(tmp_path / "session.jsonl"))
+        monkeypatch.delenv("ARCHITECT_REPLAY", raising=False)
+        with patch("architect.features.parallel.subprocess.run") as run:
+            run.return_value = SimpleNamespace(stdout="{}", returncode=0)
+            for worker_id in (1, 2):
+                _run_worker_process(
+                    worker_id, "t", None, str(tmp_path), f"b{worker_id}", "build", 5, None, None,
+                )
+        records = [c.kwargs["env"]["ARCHITECT_RECORD"] for c in run.call_args_list]
+        assert records == [
+            str(tmp_path / "session.worker-1.jsonl"),
+            str(tmp_path / "session.worker-2.jsonl"),
+        ]
+        assert "ARCHITECT_REPLAY" not in run.call_args_list[0].kwargs["env"]
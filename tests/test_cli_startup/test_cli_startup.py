@@ -0,0 +1,114 @@
+"""
+Tests para el tiempo de arranque de la CLI (imports lazy).
+
+Cubre:
+- `architect --help` no importa litellm, httpx ni opentelemetry
+- El import de architect.cli se mantiene dentro del presupuesto (-X importtime)
+- LLMAdapter no carga litellm hasta la primera llamada
+- LazyModule reenvía getattr/setattr/delattr (compatible con mock.patch)
+"""
+
+import subprocess
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+from architect.lazy import LazyModule
+
+# Presupuesto de import acumulado de architect.cli (µs). Hoy ronda 0.2s;
+# el margen absorbe máquinas de CI lentas, no imports pesados nuevos
+# (litellm solo ya cuesta varios segundos).
+_STARTUP_BUDGET_US = 1_000_000
+
+_HEAVY_MODULES = ("litellm", "httpx", "opentelemetry", "tiktoken")
+
+
+def _importtime(*args: str) -> tuple[subprocess.CompletedProcess, dict[str, int]]:
+    """Ejecuta python -X importtime y devuelve (proceso, {módulo: µs acumulados})."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, timeout=120,
+    )
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line.split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum.strip())
+    return proc, cumulative
+
+
+class TestCliStartup:
+    def test_help_skips_heavy_modules(self):
+        """--help funciona sin importar dependencias pesadas."""
+        proc, modules = _importtime("-m", "architect", "--help")
+        assert proc.returncode == 0
+        assert "Usage" in proc.stdout
+        for heavy in _HEAVY_MODULES:
+            loaded = [m for m in modules if m == heavy or m.startswith(heavy + ".")]
+            assert not loaded, f"architect --help importó {heavy}"
+
+    def test_cli_import_within_budget(self):
+        proc, modules = _importtime("-c", "import architect.cli")
+        assert proc.returncode == 0
+        assert modules["architect.cli"] < _STARTUP_BUDGET_US, (
+            f"import architect.cli tardó {modules['architect.cli'] / 1e6:.2f}s "
+            f"(presupuesto {_STARTUP_BUDGET_US / 1e6:.2f}s)"
+        )
+
+    def test_adapter_defers_litellm(self):
+        """Crear un LLMAdapter no importa litellm; la primera llamada sí."""
+        code = (
+            "import sys\n"
+            "from architect.config.schema import LLMConfig\n"
+            "from architect.llm.adapter import LLMAdapter\n"
+            "LLMAdapter(LLMConfig(model='gpt-4o', api_key_env='NO_SUCH_KEY'))\n"
+            "print('litellm' in sys.modules)\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, timeout=120,
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip().splitlines()[-1] == "False"
+
+
+class TestLazyModule:
+    def test_loads_on_first_access(self):
+        loaded = []
+        lazy = LazyModule("json", on_load=lambda m: loaded.append(m.__name__))
+        assert not lazy.loaded
+        assert lazy.dumps({"a": 1}) == '{"a": 1}'
+        assert lazy.loaded
+        assert loaded == ["json"]
+
+        lazy.loads("1")
+        assert loaded == ["json"]  # on_load solo una vez
+
+    def test_setattr_and_patch_reach_real_module(self):
+        real = types.ModuleType("fake_lazy_target")
+        real.value = 1
+        real.func = lambda: "real"
+        with patch.dict(sys.modules, {"fake_lazy_target": real}):
+            lazy = LazyModule("fake_lazy_target")
+            lazy.value = 2
+            assert real.value == 2
+
+            with patch.object(lazy, "func", return_value="mocked"):
+                assert real.func() == "mocked"
+                assert lazy.func() == "mocked"
+            assert real.func() == "real"
+
+    def test_missing_module_raises_on_access(self):
+        lazy = LazyModule("architect_no_such_module")
+        with pytest.raises(ModuleNotFoundError):
+            lazy.anything
+
+    def test_adapter_retryable_errors_resolve(self):
+        """_RETRYABLE_ERRORS sigue disponible (compatibilidad)."""
+        from architect.llm import adapter
+
+        assert adapter._RETRYABLE_ERRORS == adapter._retryable_errors()
+        assert adapter.litellm.RateLimitError in adapter._RETRYABLE_ERRORS
@@ -0,0 +1,911 @@
+"""
+Tests para el ContextManager (F11 / v3-M2) y sus optimizaciones.
+
+Cubre:
+- Ledger de tokens: cada mensaje se mide una sola vez
+- enforce_window en una pasada, por unidades assistant+tool y por valor/token
+- Tokenizer pluggable (heuristic/litellm/tiktoken) con memo por hash de contenido
+- Compactación estructural sin LLM de tool results reemplazados
+- Pre-cálculo del resumen en background y sustitución en el siguiente paso
+- Prefijo estable para prompt caching: checkpoints de resumen append-only,
+  system prompt congelado, breakpoints del adapter y ratio de cache hits
+- MessageLog append-only: appends in-place y sustitución del tramo cambiado
+- Truncado adaptativo de tool results según el presupuesto restante
+"""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from architect.config.schema import ContextConfig
+from architect.core.context import ContextManager
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _make_cm(**overrides: Any) -> ContextManager:
+    return ContextManager(ContextConfig(**overrides))
+
+
+def _exchange(i: int, size: int = 400) -> list[dict[str, Any]]:
+    """Un intercambio assistant(tool_calls) + tool result."""
+    return [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": "read_file", "arguments": f'{{"path": "f{i}.py"}}'},
+            }],
+        },
+        {"role": "tool", "tool_call_id": f"call_{i}", "name": "read_file", "content": "x" * size},
+    ]
+
+
+def _multi_call(i: int, n: int) -> dict[str, Any]:
+    """Assistant con n tool_calls en paralelo."""
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": f"call_{i}_{k}",
+                "type": "function",
+                "function": {"name": "read_file", "arguments": f'{{"path": "m{i}_{k}.py"}}'},
+            }
+            for k in range(n)
+        ],
+    }
+
+
+def _multi_results(i: int, n: int, size: int = 400) -> list[dict[str, Any]]:
+    return [
+        {
+            "role": "tool", "tool_call_id": f"call_{i}_{k}",
+            "name": "read_file", "content": "y" * size,
+        }
+        for k in range(n)
+    ]
+
+
+def _read(i: int, path: str, size: int = 400) -> list[dict[str, Any]]:
+    """Intercambio read_file de una ruta concreta."""
+    msgs = _exchange(i, size)
+    msgs[0]["tool_calls"][0]["function"]["arguments"] = f'{{"path": "{path}"}}'
+    return msgs
+
+
+def _conversation(n_exchanges: int, size: int = 400) -> list[dict[str, Any]]:
+    msgs: list[dict[str, Any]] = [
+        {"role": "system", "content": "You are an agent."},
+        {"role": "user", "content": "Do the task."},
+    ]
+    for i in range(n_exchanges):
+        msgs.extend(_exchange(i, size))
+    return msgs
+
+
+# ── Tests: Token ledger ──────────────────────────────────────────────────
+
+
+class TestTokenLedger:
+    def test_estimate_matches_char_heuristic(self):
+        cm = _make_cm()
+        msgs = [{"role": "user", "content": "a" * 400}]
+        # 400 chars + 16 overhead -> 104 tokens
+        assert cm._estimate_tokens(msgs) == 104
+
+    def test_each_message_measured_once(self):
+        cm = _make_cm()
+        msgs = _conversation(10)
+        cm._measure_message = MagicMock(wraps=cm._measure_message)
+        cm._estimate_tokens(msgs)
+        cm._estimate_tokens(msgs)
+        cm.is_critically_full(msgs)
+        cm.enforce_window(msgs)
+        assert cm._measure_message.call_count == len(msgs)
+
+    def test_appended_messages_measured_incrementally(self):
+        cm = _make_cm()
+        msgs = _conversation(5)
+        cm._estimate_tokens(msgs)
+        msgs.extend(_exchange(99))
+        cm._measure_message = MagicMock(wraps=cm._measure_message)
+        cm._estimate_tokens(msgs)
+        assert cm._measure_message.call_count == 2
+
+    def test_in_place_edit_invalidates_entry(self):
+        cm = _make_cm()
+        msgs = _conversation(1)
+        before = cm._estimate_tokens(msgs)
+        msgs[0]["content"] += "\n\n" + "skill " * 100
+        assert cm._estimate_tokens(msgs) > before
+
+    def test_list_content_signature_is_not_serialized(self):
+        """Contenido en forma de lista: la firma no serializa el contenido."""
+        cm = _make_cm()
+
+        class _Parts(list):
+            def __str__(self):
+                raise AssertionError("str() en la firma")
+
+            __repr__ = __str__
+
+        parts = _Parts([
+            {"type": "text", "text": "a" * 1000, "cache_control": {"type": "ephemeral"}},
+        ])
+        msgs = [{"role": "user", "content": parts}]
+        assert cm._message_signature(msgs[0]) == (id(parts), 1, 1000, 0)
+
+        plain = [{"role": "user", "content": list(parts)}]
+        before = cm._estimate_tokens(plain)
+        plain[0]["content"].append({"type": "text", "text": "b" * 400})
+        assert cm._estimate_tokens(plain) > before
+
+    def test_ledger_pruned_after_manage(self):
+        cm = _make_cm(max_context_tokens=500, summarize_after_steps=0)
+        msgs = _conversation(30)
+        result = cm.manage(msgs)
+        assert len(cm._token_ledger) <= 2 * len(result)
+
+
+# ── Tests: enforce_window ────────────────────────────────────────────────
+
+
+def _reference_enforce(cm: ContextManager, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Algoritmo original (cuadrático) para comparar resultados."""
+    limit = cm.config.max_context_tokens
+    if cm._estimate_tokens(messages) <= limit:
+        return messages
+    head, dialog = messages[:2], list(messages[2:])
+    while len(dialog) > 2 and cm._estimate_tokens(head + dialog) > limit:
+        dialog = dialog[2:]
+    return head + dialog
+
+
+class TestEnforceWindow:
+    @pytest.mark.parametrize("limit", [100, 300, 1000, 2500, 10_000])
+    def test_same_result_as_reference(self, limit: int):
+        cm = _make_cm(max_context_tokens=limit)
+        msgs = _conversation(20, size=300)
+        assert cm.enforce_window(msgs) == _reference_enforce(cm, msgs)
+
+    def test_within_limit_returns_same_list(self):
+        cm = _make_cm(max_context_tokens=100_000)
+        msgs = _conversation(3)
+        assert cm.enforce_window(msgs) is msgs
+
+    def test_keeps_system_user_and_last_pair(self):
+        cm = _make_cm(max_context_tokens=10)
+        msgs = _conversation(10)
+        result = cm.enforce_window(msgs)
+        assert result[0]["role"] == "system"
+        assert result[1]["role"] == "user"
+        assert len(result) == 4
+
+    def test_disabled(self):
+        cm = _make_cm(max_context_tokens=0)
+        msgs = _conversation(50)
+        assert cm.enforce_window(msgs) is msgs
+
+    def test_multi_call_unit_never_split(self):
+        cm = _make_cm(max_context_tokens=400)
+        msgs = _conversation(0) + [_multi_call(1, 3), *_multi_results(1, 3)] + _conversation(6)[2:]
+        result = cm.enforce_window(msgs)
+        call_ids = {
+            tc["id"] for m in result if m.get("tool_calls") for tc in m["tool_calls"]
+        }
+        tool_ids = {m["tool_call_id"] for m in result if m["role"] == "tool"}
+        assert tool_ids <= call_ids
+        assert result[2]["role"] == "assistant"
+
+    def test_superseded_unit_evicted_before_older(self):
+        cm = _make_cm(max_context_tokens=450)
+        msgs = _conversation(0)
+        msgs += _read(0, "a.py") + _read(1, "b.py") + _read(2, "c.py") + _read(3, "b.py")
+        result = cm.enforce_window(msgs)
+        # La lectura obsoleta de b.py sale antes que la de a.py, más antigua
+        ids = [m.get("tool_call_id") for m in result if m["role"] == "tool"]
+        assert "call_1" not in ids
+        assert "call_0" in ids
+
+    def test_large_unit_evicted_before_small_older_one(self):
+        cm = _make_cm(max_context_tokens=900)
+        msgs = _conversation(0) + _exchange(0, 400) + _exchange(1, 3000) + _exchange(2, 400)
+        result = cm.enforce_window(msgs)
+        ids = [m.get("tool_call_id") for m in result if m["role"] == "tool"]
+        assert ids == ["call_0", "call_2"]
+
+    def test_logs_evicted_units(self):
+        cm = _make_cm(max_context_tokens=300)
+        cm.log = MagicMock()
+        cm.enforce_window(_conversation(5))
+        event, = [c for c in cm.log.warning.call_args_list if c[0][0] == "context.window_enforced"]
+        assert event.kwargs["removed_units"] >= 1
+        assert set(event.kwargs["evicted"]) == {"read_file"}
+
+
+# ── Tests: Tokenizer pluggable ───────────────────────────────────────────
+
+
+class TestTokenizer:
+    def test_default_is_heuristic(self):
+        cm = _make_cm()
+        assert cm.tokenizer.name == "heuristic"
+        assert cm.tokenizer.exact is False
+
+    def test_heuristic_count(self):
+        from architect.llm.tokenizer import Tokenizer
+
+        assert Tokenizer("heuristic").count("a" * 40) == 10
+        assert Tokenizer("heuristic").count("") == 0
+
+    def test_litellm_backend_memoized_by_content(self):
+        from architect.llm.tokenizer import Tokenizer
+
+        with patch("litellm.token_counter", return_value=7) as counter:
+            tok = Tokenizer("litellm", model="gpt-4o")
+            assert tok.name == "litellm"
+            assert tok.count("hello world") == 7
+            assert tok.count("hello world") == 7
+            assert tok.count("other text") == 7
+        assert counter.call_count == 2
+
+    def test_litellm_without_model_falls_back(self):
+        from architect.llm.tokenizer import Tokenizer
+
+        assert Tokenizer("litellm", model=None).name == "heuristic"
+
+    def test_backend_error_falls_back_to_heuristic(self):
+        from architect.llm.tokenizer import Tokenizer
+
+        with patch("litellm.token_counter", side_effect=RuntimeError("boom")):
+            tok = Tokenizer("litellm", model="gpt-4o")
+            assert tok.count("a" * 40) == 10
+
+    def test_tiktoken_unavailable_falls_back(self):
+        from architect.llm import tokenizer as tokmod
+
+        with patch.object(tokmod, "_load_tiktoken", return_value=None):
+            assert tokmod.Tokenizer("tiktoken").name == "heuristic"
+
+    def test_context_manager_uses_exact_counts(self):
+        from architect.llm import tokenizer as tokmod
+
+        fake_encode = lambda text: text.split()  # noqa: E731 — 1 token por palabra
+        with patch.object(tokmod, "_load_tiktoken", return_value=fake_encode):
+            cm = ContextManager(ContextConfig(tokenizer="tiktoken"), model="gpt-4o")
+        msgs = [{"role": "user", "content": "one two three"}]
+        # 3 palabras + 4 de overhead
+        assert cm._estimate_tokens(msgs) == 7
+
+    def test_record_usage_logs_calibration(self):
+        cm = _make_cm()
+        msgs = [{"role": "user", "content": "a" * 400}]
+        with patch.object(cm, "log") as log:
+            cm.record_usage(msgs, {"prompt_tokens": 208})
+        _, kwargs = log.debug.call_args
+        assert kwargs["estimated_tokens"] == 104
+        assert kwargs["actual_prompt_tokens"] == 208
+        assert kwargs["ratio"] == 2.0
+
+    def test_record_usage_ignores_missing_prompt_tokens(self):
+        cm = _make_cm()
+        with patch.object(cm, "log") as log:
+            cm.record_usage([{"role": "user", "content": "x"}], {})
+        log.debug.assert_not_called()
+
+
+# ── Tests: Compactación estructural ──────────────────────────────────────
+
+
+def _call(i: int, name: str, **args: Any) -> dict[str, Any]:
+    import json
+
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": f"c{i}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(args)},
+        }],
+    }
+
+
+def _result(i: int, name: str, content: str) -> dict[str, Any]:
+    return {"role": "tool", "tool_call_id": f"c{i}", "name": name, "content": content}
+
+
+def _base() -> list[dict[str, Any]]:
+    return [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "task"},
+    ]
+
+
+BIG = "line of code\n" * 100
+
+
+class TestCompactSuperseded:
+    def test_reread_file_elided(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "read_file", path="src/x.py"), _result(1, "read_file", BIG),
+            _call(2, "read_file", path="src/x.py"), _result(2, "read_file", BIG),
+        ]
+        result = cm.compact_superseded(msgs)
+        assert result[3]["content"] == (
+            "[content of src/x.py at step 1 elided; re-read if needed]"
+        )
+        assert result[5]["content"] == BIG
+        # El original no se muta
+        assert msgs[3]["content"] == BIG
+
+    def test_edit_supersedes_previous_read(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "read_file", path="a.py"), _result(1, "read_file", BIG),
+            _call(2, "edit_file", path="a.py", old_str="x", new_str="y"),
+            _result(2, "edit_file", "ok"),
+        ]
+        result = cm.compact_superseded(msgs)
+        assert "elided" in result[3]["content"]
+
+    def test_read_of_other_file_kept(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "read_file", path="a.py"), _result(1, "read_file", BIG),
+            _call(2, "read_file", path="b.py"), _result(2, "read_file", BIG),
+        ]
+        assert cm.compact_superseded(msgs) is msgs
+
+    def test_repeated_search_elided(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "grep", text="foo"), _result(1, "grep", BIG),
+            _call(2, "grep", text="bar"), _result(2, "grep", BIG),
+            _call(3, "grep", text="foo"), _result(3, "grep", BIG),
+        ]
+        result = cm.compact_superseded(msgs)
+        assert result[3]["content"].startswith("[output of grep at step 1 elided")
+        assert result[5]["content"] == BIG
+        assert result[7]["content"] == BIG
+
+    def test_failed_command_not_elided(self):
+        cm = _make_cm()
+        failure = "Error: " + BIG
+        msgs = _base() + [
+            _call(1, "run_command", command="pytest"), _result(1, "run_command", failure),
+            _call(2, "run_command", command="pytest"), _result(2, "run_command", BIG),
+        ]
+        assert cm.compact_superseded(msgs) is msgs
+
+    def test_successful_command_elided(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "run_command", command="pytest"), _result(1, "run_command", BIG),
+            _call(2, "run_command", command="pytest"), _result(2, "run_command", BIG),
+        ]
+        assert "elided" in cm.compact_superseded(msgs)[3]["content"]
+
+    def test_short_results_not_elided(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "read_file", path="a.py"), _result(1, "read_file", "tiny"),
+            _call(2, "read_file", path="a.py"), _result(2, "read_file", "tiny"),
+        ]
+        assert cm.compact_superseded(msgs) is msgs
+
+    def test_pairing_preserved(self):
+        cm = _make_cm()
+        msgs = _base() + [
+            _call(1, "read_file", path="a.py"), _result(1, "read_file", BIG),
+            _call(2, "read_file", path="a.py"), _result(2, "read_file", BIG),
+        ]
+        result = cm.compact_superseded(msgs)
+        assert len(result) == len(msgs)
+        for before, after in zip(msgs, result):
+            assert before.get("tool_call_id") == after.get("tool_call_id")
+            assert before["role"] == after["role"]
+
+    def test_disabled(self):
+        cm = _make_cm(compact_superseded=False)
+        msgs = _base() + [
+            _call(1, "read_file", path="a.py"), _result(1, "read_file", BIG),
+            _call(2, "read_file", path="a.py"), _result(2, "read_file", BIG),
+        ]
+        assert cm.compact_superseded(msgs) is msgs
+
+    def test_manage_compacts_before_llm_summary(self):
+        cm = _make_cm(max_context_tokens=800, summarize_after_steps=1, keep_recent_steps=1)
+        msgs = _base()
+        for i in range(4):
+            msgs += [_call(i, "read_file", path="a.py"), _result(i, "read_file", BIG)]
+        llm = MagicMock()
+        result = cm.manage(msgs, llm)
+        # Tras la compactación cabe en el 75%: no se llama al LLM
+        llm.completion.assert_not_called()
+        assert sum("elided" in str(m.get("content")) for m in result) == 3
+
+
+# ── Tests: Resumen pre-calculado en background ──────────────────────────
+
+
+def _summary_llm(text: str = "precomputed summary") -> MagicMock:
+    llm = MagicMock()
+    llm.completion.return_value = MagicMock(content=text)
+    return llm
+
+
+def _precompute_cm() -> ContextManager:
+    # 8 intercambios de ~115 tokens -> ~935 tokens: entre 60% y 75% de 1.500
+    return _make_cm(
+        max_context_tokens=1500,
+        summarize_after_steps=2,
+        keep_recent_steps=2,
+        precompute_summary_at=0.6,
+        compact_superseded=False,
+    )
+
+
+class TestPrecomputedSummary:
+    def test_starts_between_watermarks(self):
+        cm = _precompute_cm()
+        llm = _summary_llm()
+        cm.precompute_summary(_conversation(8), llm)
+        assert cm._pending_summary is not None
+        cm._pending_summary[0].result(timeout=5)
+        llm.completion.assert_called_once()
+
+    def test_manage_does_not_start_it(self):
+        """manage() corre justo antes de la llamada del agente: no lanza el resumen."""
+        cm = _precompute_cm()
+        llm = _summary_llm()
+        msgs = _conversation(8)
+        assert cm.manage(msgs, llm) is msgs
+        assert cm._pending_summary is None
+        llm.completion.assert_not_called()
+
+    def test_not_started_below_watermark(self):
+        cm = _precompute_cm()
+        cm.precompute_summary(_conversation(2), _summary_llm())
+        assert cm._pending_summary is None
+
+    def test_disabled(self):
+        cm = _make_cm(max_context_tokens=1500, precompute_summary_at=0.0)
+        cm.precompute_summary(_conversation(8), _summary_llm())
+        assert cm._pending_summary is None
+
+    def test_swapped_in_when_threshold_crossed(self):
+        cm = _precompute_cm()
+        llm = _summary_llm()
+        msgs = _conversation(8)
+        cm.precompute_summary(msgs, llm)
+        covered = len(cm._pending_summary[2])
+        cm._pending_summary[0].result(timeout=5)
+
+        msgs = msgs + _exchange(50) + _exchange(51) + _exchange(52)
+        result = cm.manage(msgs, llm)
+        # Solo la llamada en background: la compresión no añade otra
+        assert llm.completion.call_count == 1
+        assert "precomputed summary" in result[2]["content"]
+        assert result[3:] == msgs[2 + covered:]
+
+    def test_discarded_when_covered_messages_change(self):
+        cm = _precompute_cm()
+        llm = _summary_llm()
+        msgs = _conversation(8)
+        cm.precompute_summary(msgs, llm)
+        cm._pending_summary[0].result(timeout=5)
+
+        msgs = [dict(m) for m in msgs] + _exchange(50) + _exchange(51) + _exchange(52)
+        result = cm.manage(msgs, llm)
+        # Fallback síncrono: segunda llamada al LLM
+        assert llm.completion.call_count == 2
+        assert result[2]["content"].endswith("precomputed summary")
+
+    def test_failed_background_falls_back(self):
+        cm = _precompute_cm()
+        llm = _summary_llm()
+        msgs = _conversation(8)
+        cm.precompute_summary(msgs, llm)
+        cm._pending_summary[0].result(timeout=5)
+        cm._pending_summary = (_failed_future(), *cm._pending_summary[1:])
+
+        msgs = msgs + _exchange(50) + _exchange(51) + _exchange(52)
+        result = cm.manage(msgs, llm)
+        assert llm.completion.call_count == 2
+        assert "precomputed summary" in result[2]["content"]
+
+    def test_close_releases_executor(self):
+        cm = _precompute_cm()
+        cm.precompute_summary(_conversation(8), _summary_llm())
+        cm.close()
+        assert cm._pending_summary is None
+        assert cm._summary_executor is None
+
+    def test_loop_starts_it_before_running_tools(self):
+        """El AgentLoop lanza el resumen antes de ejecutar las tools del paso."""
+        from architect.config.schema import AgentConfig
+        from architect.core.loop import AgentLoop
+        from architect.llm.adapter import LLMResponse, ToolCall
+        from architect.tools.base import ToolResult
+
+        calls: list[str] = []
+        cm = MagicMock()
+        cm.config.spill_tool_output_chars = 0
+        cm.manage.side_effect = lambda msgs, llm: msgs
+        cm.is_critically_full.return_value = False
+        cm.precompute_summary.side_effect = lambda *a: calls.append("precompute")
+        llm = MagicMock()
+        llm.config.model = "gpt-4o"
+        llm.completion.side_effect = [
+            LLMResponse(
+                finish_reason="tool_calls",
+                tool_calls=[ToolCall(id="c1", name="read_file", arguments={"path": "a"})],
+            ),
+            LLMResponse(content="listo", finish_reason="stop"),
+        ]
+        engine = MagicMock()
+        engine.check_guardrails.return_value = None
+        engine.check_code_rules.return_value = []
+        engine.run_pre_tool_hooks.return_value = None
+        engine.run_post_tool_hooks.return_value = None
+        engine.execute_tool_call.side_effect = lambda *a, **k: (
+            calls.append("tool") or ToolResult(success=True, output="ok")
+        )
+        ctx = MagicMock()
+        ctx.build_initial.return_value = [{"role": "user", "content": "x"}]
+        ctx.append_tool_results.side_effect = lambda msgs, *a: msgs
+
+        loop = AgentLoop(
+            llm, engine, AgentConfig(system_prompt="s", max_steps=3), ctx, context_manager=cm,
+        )
+        loop.hlog = MagicMock()
+        loop.run("tarea", stream=False)
+
+        assert calls == ["precompute", "tool"]
+
+
+# ── Tests: Prefijo estable para prompt caching ───────────────────────────
+
+
+def _checkpoint_cm(**overrides: Any) -> ContextManager:
+    return _make_cm(
+        summarize_after_steps=2,
+        keep_recent_steps=1,
+        compact_superseded=False,
+        **overrides,
+    )
+
+
+class TestSummaryCheckpoints:
+    def test_second_compression_appends_checkpoint(self):
+        cm = _checkpoint_cm()
+        first = cm.maybe_compress(_conversation(6), _summary_llm("summary one"))
+        checkpoint = first[2]
+        assert cm._is_checkpoint(checkpoint)
+
+        msgs = first + _exchange(50) + _exchange(51) + _exchange(52)
+        second = cm.maybe_compress(msgs, _summary_llm("summary two"))
+        # El checkpoint anterior queda intacto (mismo objeto) en el prefijo
+        assert second[2] is checkpoint
+        assert second[3]["content"].endswith("summary two")
+        assert cm._leading_checkpoints(second) == 2
+
+    def test_checkpoints_not_resummarized(self):
+        cm = _checkpoint_cm()
+        first = cm.maybe_compress(_conversation(6), _summary_llm("summary one"))
+        llm = _summary_llm("summary two")
+        cm.maybe_compress(first + _exchange(50) + _exchange(51) + _exchange(52), llm)
+        prompt = llm.completion.call_args[0][0][0]["content"]
+        assert "summary one" not in prompt
+
+    def test_merged_when_limit_reached(self):
+        cm = _checkpoint_cm(max_summary_checkpoints=2)
+        msgs = cm.maybe_compress(_conversation(6), _summary_llm("summary one"))
+        msgs = cm.maybe_compress(
+            msgs + _exchange(50) + _exchange(51) + _exchange(52), _summary_llm("summary two"),
+        )
+        llm = _summary_llm("merged")
+        msgs = cm.maybe_compress(
+            msgs + _exchange(60) + _exchange(61) + _exchange(62), llm,
+        )
+        prompt = llm.completion.call_args[0][0][0]["content"]
+        assert "summary one" in prompt and "summary two" in prompt
+        assert cm._leading_checkpoints(msgs) == 1
+        assert msgs[2]["content"].endswith("merged")
+
+    def test_enforce_window_keeps_checkpoints(self):
+        cm = _checkpoint_cm(max_context_tokens=300)
+        msgs = cm.maybe_compress(_conversation(6), _summary_llm("summary one"))
+        msgs = msgs + _conversation(10)[2:]
+        result = cm.enforce_window(msgs)
+        assert result[:3] == msgs[:3]
+        assert len(result) < len(msgs)
+
+
+class TestFrozenSystemPrompt:
+    def test_extra_sections_appended_at_build(self):
+        from architect.config.schema import AgentConfig
+        from architect.core.context import ContextBuilder
+
+        agent = AgentConfig(system_prompt="Base prompt.")
+        msgs = ContextBuilder().build_initial(
+            agent, "task", extra_system_sections=["## Skills", "## Memory"],
+        )
+        assert msgs[0]["content"] == "Base prompt.\n\n## Skills\n\n## Memory"
+        assert msgs[1] == {"role": "user", "content": "task"}
+
+
+def _adapter(model: str, prompt_caching: bool = True):
+    from architect.config.schema import LLMConfig
+    from architect.llm.adapter import LLMAdapter
+
+    return LLMAdapter(LLMConfig(model=model, prompt_caching=prompt_caching))
+
+
+class TestCacheBreakpoints:
+    def test_system_checkpoint_and_tail_marked_for_anthropic(self):
+        cm = _checkpoint_cm()
+        msgs = cm.maybe_compress(_conversation(6), _summary_llm("summary one"))
+        prepared = _adapter("claude-sonnet-4-6")._prepare_messages_with_caching(msgs)
+
+        assert prepared[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert prepared[2]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert prepared[-1]["cache_control"] == {"type": "ephemeral"}
+        # Los mensajes originales no se modifican
+        assert isinstance(msgs[0]["content"], str)
+        assert "cache_control" not in msgs[-1]
+
+    def test_no_tail_marker_for_other_providers(self):
+        msgs = _conversation(3)
+        prepared = _adapter("gpt-4o")._prepare_messages_with_caching(msgs)
+        assert prepared[1:] == msgs[1:]
+
+    def test_disabled_leaves_messages_unchanged(self):
+        msgs = _conversation(3)
+        adapter = _adapter("claude-sonnet-4-6", prompt_caching=False)
+        prepared = adapter._prepare_messages_with_caching(msgs)
+        assert prepared == msgs
+
+
+class TestCacheHitRatio:
+    def _tracker(self):
+        from architect.costs.prices import PriceLoader
+        from architect.costs.tracker import CostTracker
+
+        return CostTracker(PriceLoader())
+
+    def test_ratio_and_summary_line(self):
+        tracker = self._tracker()
+        tracker.record(1, "gpt-4o", {"prompt_tokens": 1000, "completion_tokens": 10})
+        tracker.record(2, "gpt-4o", {
+            "prompt_tokens": 1000, "completion_tokens": 10, "cache_read_input_tokens": 800,
+        })
+        assert tracker.cache_hit_ratio == pytest.approx(0.4)
+        assert tracker.summary()["cache_hit_ratio"] == 0.4
+        assert "800 cached, 40% hit)" in tracker.format_summary_line()
+
+    def test_ratio_zero_without_data(self):
+        assert self._tracker().cache_hit_ratio == 0.0
+
+    def test_openai_cached_tokens_read_from_details(self):
+        from architect.llm.adapter import LLMAdapter
+
+        usage = MagicMock(spec=["prompt_tokens_details"])
+        usage.prompt_tokens_details = MagicMock(cached_tokens=512)
+        assert LLMAdapter._cached_prompt_tokens(usage) == 512
+
+
+# ── Tests: MessageLog ────────────────────────────────────────────────────
+
+
+def _tool_call(i: int):
+    from architect.llm.adapter import ToolCall
+
+    return ToolCall(id=f"call_{i}", name="read_file", arguments={"path": f"f{i}.py"})
+
+
+def _tool_result():
+    from architect.core.state import ToolCallResult
+    from architect.tools.base import ToolResult
+
+    return ToolCallResult(
+        tool_name="read_file", args={}, result=ToolResult(success=True, output="ok"),
+    )
+
+
+class TestMessageLog:
+    def _builder_log(self):
+        from architect.config.schema import AgentConfig
+        from architect.core.context import ContextBuilder
+
+        builder = ContextBuilder()
+        return builder, builder.build_initial(AgentConfig(system_prompt="S"), "task")
+
+    def test_build_initial_returns_message_log(self):
+        from architect.core.messages import MessageLog
+
+        _, log = self._builder_log()
+        assert isinstance(log, MessageLog)
+        assert log == [{"role": "system", "content": "S"}, {"role": "user", "content": "task"}]
+
+    def test_appends_in_place(self):
+        builder, log = self._builder_log()
+        result = builder.append_tool_results(log, [_tool_call(1)], [_tool_result()])
+        result = builder.append_user_message(result, "more")
+        result = builder.append_assistant_message(result, "done")
+        assert result is log
+        assert [m["role"] for m in log] == [
+            "system", "user", "assistant", "tool", "user", "assistant",
+        ]
+
+    def test_plain_list_keeps_copy_semantics(self):
+        from architect.core.context import ContextBuilder
+
+        msgs = [{"role": "system", "content": "S"}]
+        result = ContextBuilder().append_user_message(msgs, "hi")
+        assert result is not msgs
+        assert len(msgs) == 1
+
+    def test_sync_rewrites_only_changed_middle(self):
+        from architect.core.messages import MessageLog
+
+        log = MessageLog(_conversation(6))
+        head, tail = list(log[:2]), list(log[-4:])
+        summary = {"role": "assistant", "content": "summary"}
+        log.sync([*head, summary, *tail])
+        assert len(log) == 7
+        assert all(a is b for a, b in zip(log[:2], head))
+        assert log[2] is summary
+        assert all(a is b for a, b in zip(log[3:], tail))
+
+    def test_sync_same_content_is_noop(self):
+        from architect.core.messages import MessageLog
+
+        log = MessageLog(_conversation(2))
+        items = list(log)
+        log.sync(items)
+        assert all(a is b for a, b in zip(log, items))
+
+    def test_manage_updates_log_in_place(self):
+        from architect.core.messages import MessageLog
+
+        cm = _make_cm(max_context_tokens=300)
+        log = MessageLog(_conversation(10))
+        result = cm.manage(log)
+        assert result is log
+        assert len(log) < 22
+
+
+# ── Tests: Truncado adaptativo ───────────────────────────────────────────
+
+
+def _pytest_output(n_passing: int = 400) -> str:
+    lines = [f"tests/test_mod.py::test_ok_{i} PASSED" for i in range(n_passing)]
+    lines[150:150] = [
+        "Traceback (most recent call last):",
+        '  File "src/mod.py", line 12, in compute',
+        "    return a / b",
+        "ZeroDivisionError: division by zero",
+    ]
+    lines.append("FAILED tests/test_mod.py::test_divide - ZeroDivisionError")
+    lines.append("===== 1 failed, 400 passed in 3.2s =====")
+    return "\n".join(lines)
+
+
+class TestAdaptiveTruncation:
+    def test_budget_large_when_context_empty(self):
+        cm = _make_cm(max_context_tokens=80_000)
+        assert cm.tool_result_budget(_conversation(1)) == 8000
+
+    def test_budget_shrinks_as_context_fills(self):
+        cm = _make_cm(max_context_tokens=10_000)
+        early = cm.tool_result_budget(_conversation(2))
+        late = cm.tool_result_budget(_conversation(70))
+        assert late < early
+        assert late == cm.config.min_tool_result_tokens
+
+    def test_budget_split_across_batch(self):
+        cm = _make_cm(max_context_tokens=20_000)
+        msgs = _conversation(2)
+        assert cm.tool_result_budget(msgs, 4) < cm.tool_result_budget(msgs, 1)
+
+    def test_fixed_budget_when_disabled(self):
+        cm = _make_cm(adaptive_tool_results=False)
+        assert cm.tool_result_budget(_conversation(1)) == 2000
+        cm = _make_cm(max_context_tokens=0)
+        assert cm.tool_result_budget(_conversation(1)) == 2000
+
+    def test_default_budget_unchanged(self):
+        cm = _make_cm()
+        content = "\n".join(f"line {i}" for i in range(2000))
+        result = cm.truncate_tool_result(content)
+        assert result.startswith("line 0\n")
+        assert result.endswith("line 1999")
+        assert "1940" in result  # 60 líneas omitidas -> marcador con 1940
+
+    def test_larger_budget_keeps_more(self):
+        cm = _make_cm()
+        content = "\n".join(f"line {i}" for i in range(2000))
+        small = cm.truncate_tool_result(content, max_tokens=500)
+        large = cm.truncate_tool_result(content, max_tokens=6000)
+        assert len(large) > len(small)
+
+    def test_keeps_failures_and_traceback(self):
+        cm = _make_cm()
+        result = cm.truncate_tool_result(_pytest_output(), max_tokens=300, tool_name="run_command")
+        assert "ZeroDivisionError: division by zero" in result
+        assert '  File "src/mod.py", line 12, in compute' in result
+        assert "FAILED tests/test_mod.py::test_divide" in result
+        assert "1 failed, 400 passed" in result
+        assert "test_ok_100 PASSED" not in result
+        assert len(result) <= 300 * 4 + 200
+
+    def test_overlong_important_line_cut_by_chars(self):
+        cm = _make_cm()
+        content = "Error: " + "x" * 50_000 + "\nok\n"
+        result = cm.truncate_tool_result(content, tool_name="run_command")
+        # La línea de error se recorta por caracteres en vez de perderse
+        assert result.startswith("Error: xxx")
+        assert "characters omitted" in result
+        assert result.endswith("\nok")
+        assert len(result) <= 2000 * 4
+
+    def test_line_that_does_not_fit_is_skipped_not_final(self):
+        cm = _make_cm()
+        lines = ["FAILED test_a", "y" * 900, "FAILED test_b", "fin"]
+        result = cm.truncate_tool_result(
+            "\n".join(lines * 3), max_tokens=200, tool_name="run_command",
+        )
+        # Las líneas que no caben se omiten, pero las siguientes se conservan
+        assert result.count("FAILED test_b") == 3
+        assert result.endswith("fin")
+
+    def test_keeps_matched_lines_of_search(self):
+        cm = _make_cm()
+        parts = ["Found 3 result(s) for 'needle':"]
+        for k in range(3):
+            parts.append(f"📄 src/f{k}.py:{k * 100}")
+            parts.extend(f"  {j:4d}: filler line {'x' * 60}" for j in range(40))
+            parts.append(f"> {k * 100:4d}: needle here")
+        result = cm.truncate_tool_result("\n".join(parts), max_tokens=200, tool_name="search_code")
+        for k in range(3):
+            assert f"📄 src/f{k}.py:{k * 100}" in result
+            assert f"> {k * 100:4d}: needle here" in result
+
+    def test_sizes_reported(self):
+        cm = _make_cm()
+        cm.truncate_tool_result("x\n" * 10_000)
+        stats = cm.truncation_stats
+        assert stats["results"] == 1
+        assert stats["original_chars"] == 20_000
+        assert 0 < stats["kept_chars"] < stats["original_chars"]
+
+    def test_builder_uses_batch_budget(self):
+        from architect.core.context import ContextBuilder
+
+        cm = _make_cm(max_context_tokens=80_000)
+        builder = ContextBuilder(context_manager=cm)
+        big = "\n".join(f"line {i}" for i in range(3000))  # ~26K chars > 8K fijos
+        from architect.core.state import ToolCallResult
+        from architect.tools.base import ToolResult
+
+        tcr = ToolCallResult(
+            tool_name="read_file", args={}, result=ToolResult(success=True, output=big),
+        )
+        msgs = builder.append_tool_results(_conversation(0), [_tool_call(1)], [tcr])
+        # Contexto casi vacío: cabe entero con el presupuesto adaptativo
+        assert msgs[-1]["content"] == big
+
+
+def _failed_future():
+    from concurrent.futures import Future
+
+    future: Future[str] = Future()
+    future.set_exception(RuntimeError("network down"))
+    return future
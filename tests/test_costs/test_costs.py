@@ -0,0 +1,233 @@
+"""
+Tests para los agregados incrementales y la previsión de presupuesto del
+CostTracker (F14).
+
+Cubre:
+- Totales mantenidos en record() (coinciden con la suma de los pasos)
+- Desgloses por modelo, por source y por bloque de pasos en summary()
+- Tasa de gasto por paso (ventana móvil; varias llamadas del mismo paso
+  cuentan como una muestra) y coste proyectado
+- budget_forecast_exceeded(): sin presupuesto, sin lookahead, antes y
+  después del umbral; resúmenes intercalados entre pasos del agente no
+  cuentan como pasos
+- AgentLoop: la previsión cierra con resumen del LLM; el presupuesto
+  realmente excedido sigue cortando sin llamar al LLM
+- record() concurrente (resumen en background + agente): totales exactos
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from architect.config.schema import AgentConfig
+from architect.core.loop import AgentLoop
+from architect.core.state import AgentState, StopReason
+from architect.costs.prices import ModelPricing
+from architect.costs.tracker import BudgetExceededError, CostTracker
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _price_loader() -> MagicMock:
+    """$1/M tokens de entrada y $2/M de salida para cualquier modelo."""
+    loader = MagicMock()
+    loader.get_prices.return_value = ModelPricing(
+        input_per_million=1.0, output_per_million=2.0,
+    )
+    return loader
+
+
+def _usage(inp: int, out: int = 0, cached: int = 0) -> dict:
+    return {"prompt_tokens": inp, "completion_tokens": out, "cache_read_input_tokens": cached}
+
+
+def _tracker(**kwargs) -> CostTracker:
+    return CostTracker(price_loader=_price_loader(), **kwargs)
+
+
+# ── Tests: agregados ──────────────────────────────────────────────────────
+
+
+class TestRunningAggregates:
+    def test_totals_match_recorded_steps(self):
+        tracker = _tracker()
+        for step in range(1, 30):
+            tracker.record(step, "gpt-4o", _usage(1000 * step, 100, cached=10))
+
+        steps = tracker._steps
+        assert tracker.total_input_tokens == sum(s.input_tokens for s in steps)
+        assert tracker.total_output_tokens == sum(s.output_tokens for s in steps)
+        assert tracker.total_cached_tokens == sum(s.cached_tokens for s in steps)
+        assert tracker.total_cost_usd == pytest.approx(sum(s.cost_usd for s in steps))
+        assert tracker.step_count == 29
+
+    def test_breakdowns(self):
+        tracker = _tracker(baseline_model="big")
+        tracker.record(1, "big", _usage(1_000_000))
+        tracker.record(1, "small", _usage(1_000_000), source="summary")
+        tracker.record(12, "big", _usage(0, 1_000_000))
+
+        summary = tracker.summary()
+        assert summary["by_source"] == {"agent": 3.0, "summary": 1.0}
+        assert summary["by_model"]["big"]["calls"] == 2
+        assert summary["by_model"]["big"]["cost_usd"] == 3.0
+        assert summary["by_model"]["small"]["input_tokens"] == 1_000_000
+        assert list(summary["by_step_bucket"]) == ["0-9", "10-19"]
+        assert summary["by_step_bucket"]["0-9"]["calls"] == 2
+        assert summary["by_step_bucket"]["10-19"]["cost_usd"] == 2.0
+
+    def test_budget_still_enforced(self):
+        tracker = _tracker(budget_usd=1.5)
+        tracker.record(1, "m", _usage(1_000_000))
+        with pytest.raises(BudgetExceededError):
+            tracker.record(2, "m", _usage(1_000_000))
+
+    def test_concurrent_record(self):
+        """Los resúmenes en background registran desde otro hilo: no se pierden updates."""
+        tracker = _tracker()
+        barrier = threading.Barrier(8)
+
+        def worker(source: str) -> None:
+            barrier.wait()
+            for step in range(200):
+                tracker.record(step, "m", _usage(1000, 10), source=source)
+
+        threads = [
+            threading.Thread(target=worker, args=("agent" if i % 2 else "summary",))
+            for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        summary = tracker.summary()
+        assert tracker.step_count == 1600
+        assert tracker.total_input_tokens == 1_600_000
+        assert summary["by_model"]["m"]["calls"] == 1600
+        assert sum(b["calls"] for b in summary["by_step_bucket"].values()) == 1600
+        assert tracker.total_cost_usd == pytest.approx(sum(s.cost_usd for s in tracker._steps))
+
+
+# ── Tests: tasa de gasto y previsión ──────────────────────────────────────
+
+
+class TestSpendRate:
+    def test_empty_tracker(self):
+        tracker = _tracker(budget_usd=1.0, lookahead_steps=3)
+        assert tracker.spend_rate_usd == 0.0
+        assert tracker.budget_forecast_exceeded() is False
+
+    def test_calls_of_same_step_are_one_sample(self):
+        tracker = _tracker()
+        tracker.record(1, "m", _usage(1_000_000))
+        tracker.record(1, "m", _usage(1_000_000), source="eval")
+        tracker.record(2, "m", _usage(0))
+        assert tracker.spend_rate_usd == pytest.approx(1.0)  # (2 + 0) / 2
+
+    def test_rolling_window(self):
+        tracker = _tracker()
+        for step in range(1, 4):
+            tracker.record(step, "m", _usage(10_000_000))  # $10/paso
+        for step in range(4, 9):
+            tracker.record(step, "m", _usage(1_000_000))  # $1/paso
+        assert tracker.spend_rate_usd == pytest.approx(1.0)
+        assert tracker.summary()["spend_rate_usd_per_step"] == 1.0
+
+    def test_forecast(self):
+        tracker = _tracker(budget_usd=4.5, lookahead_steps=2)
+        tracker.record(1, "m", _usage(1_000_000))
+        tracker.record(2, "m", _usage(1_000_000))
+        assert tracker.projected_cost_usd(2) == pytest.approx(4.0)
+        assert tracker.budget_forecast_exceeded() is False
+        tracker.record(3, "m", _usage(1_000_000))
+        assert tracker.budget_forecast_exceeded() is True
+        assert tracker.budget_forecast_exceeded(steps_ahead=1) is False
+        assert tracker.is_budget_exceeded() is False
+
+    def test_forecast_with_interleaved_summaries(self):
+        """Las llamadas de PurposeLLM suman al paso del agente en curso."""
+        from architect.llm.adapter import LLMResponse
+        from architect.llm.cascade import PurposeLLM
+
+        tracker = _tracker(budget_usd=10.0, lookahead_steps=3)
+        adapter = MagicMock()
+        adapter.config.model = "m"
+        adapter.completion.return_value = LLMResponse(
+            content="resumen", usage=_usage(1_000_000),
+        )
+        summary_llm = PurposeLLM("summary", adapter, cost_tracker=tracker)
+
+        for step in range(1, 4):
+            tracker.record(step, "m", _usage(1_000_000))  # $1 el paso del agente
+            summary_llm.completion([{"role": "user", "content": "x"}])  # +$1 resumen
+        assert tracker.current_step == 3
+        assert [s.step for s in tracker._steps] == [1, 1, 2, 2, 3, 3]
+        assert tracker.spend_rate_usd == pytest.approx(2.0)
+        # 6 + 2 * 3 = 12 > 10 (con los resúmenes como pasos: 6 + 1 * 3 = 9)
+        assert tracker.budget_forecast_exceeded() is True
+        buckets = tracker.summary()["by_step_bucket"]
+        assert list(buckets) == ["0-9"]
+        assert buckets["0-9"]["calls"] == 6
+
+    def test_forecast_disabled(self):
+        tracker = _tracker(budget_usd=1.0)
+        tracker.record(1, "m", _usage(900_000))
+        assert tracker.budget_forecast_exceeded() is False
+        assert _tracker(lookahead_steps=5).budget_forecast_exceeded() is False
+
+
+# ── Tests: AgentLoop ──────────────────────────────────────────────────────
+
+
+def _loop(tracker: CostTracker) -> AgentLoop:
+    llm = MagicMock()
+    llm.completion.return_value = MagicMock(content="Resumen final")
+    loop = AgentLoop(
+        llm=llm,
+        engine=MagicMock(),
+        agent_config=AgentConfig(system_prompt="S", max_steps=50),
+        context_builder=MagicMock(),
+        cost_tracker=tracker,
+    )
+    loop.hlog = MagicMock()
+    return loop
+
+
+def _state() -> AgentState:
+    state = AgentState()
+    state.messages = [{"role": "system", "content": "S"}, {"role": "user", "content": "tarea"}]
+    return state
+
+
+class TestLoopForecast:
+    def test_forecast_triggers_close_with_summary(self):
+        tracker = _tracker(budget_usd=3.5, lookahead_steps=2)
+        tracker.record(1, "m", _usage(1_000_000))
+        tracker.record(2, "m", _usage(1_000_000))
+        loop = _loop(tracker)
+        state = _state()
+
+        assert loop._check_safety_nets(state, 3) == StopReason.BUDGET_EXCEEDED
+        result = loop._graceful_close(state, StopReason.BUDGET_EXCEEDED, None)
+        assert result.final_output == "Resumen final"
+        assert result.status == "partial"
+        loop.llm.completion.assert_called_once()
+
+    def test_exceeded_budget_skips_summary(self):
+        tracker = _tracker(budget_usd=1.5)
+        tracker.record(1, "m", _usage(1_000_000))
+        with pytest.raises(BudgetExceededError):
+            tracker.record(2, "m", _usage(1_000_000))
+        loop = _loop(tracker)
+
+        result = loop._graceful_close(_state(), StopReason.BUDGET_EXCEEDED, None)
+        assert "Budget exceeded" in result.final_output
+        loop.llm.completion.assert_not_called()
+
+    def test_no_forecast_without_lookahead(self):
+        tracker = _tracker(budget_usd=3.5)
+        tracker.record(1, "m", _usage(1_000_000))
+        tracker.record(2, "m", _usage(1_000_000))
+        assert _loop(tracker)._check_safety_nets(_state(), 3) is None
@@ -0,0 +1,428 @@
+"""
+Tests para el daemon `architect serve` y su cliente ligero (F14).
+
+Cubre:
+- Estado caliente: índice incremental, SkillsLoader memoizado, PriceLoader
+  y clientes MCP reutilizados entre ejecuciones
+- Servidor: ejecuta el comando con cwd/env del cliente y stdout/stderr
+  reenviados como eventos NDJSON; restaura el estado del proceso
+- Cliente: round-trip por socket Unix real, ping/shutdown, socket huérfano
+- Guardas del cliente ligero: sin daemon, dentro de un run del daemon,
+  ARCHITECT_NO_DAEMON, prompt `-` por stdin
+- Permisos: el socket se crea ya restringido (umask), sin ventana abierta
+- Un `architect run` servido por el daemon libera los hilos de hedging del
+  LLMAdapter al terminar
+"""
+
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import click
+import pytest
+import structlog
+from click.testing import CliRunner
+
+from architect.config.schema import MCPServerConfig
+from architect.features import daemon as daemon_mod
+from architect.features.daemon import (
+    DAEMON_RUN_ENV,
+    NO_DAEMON_ENV,
+    SOCKET_ENV,
+    DaemonClient,
+    DaemonServer,
+    WarmState,
+    active_warm_state,
+    forward_to_daemon,
+)
+from architect.indexer.tree import RepoIndexer
+from architect.mcp.discovery import MCPDiscovery
+from architect.skills.loader import SkillsLoader
+from architect.tools.registry import ToolRegistry
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+@click.command("run")
+@click.argument("prompt")
+@click.option("-c", "--config", type=click.Path(path_type=Path), default=None)
+@click.option("--tag", "tags", multiple=True)
+@click.option("-v", "--verbose", count=True)
+@click.option("--code", type=int, default=0)
+def _fake_run(prompt, config, tags, verbose, code):
+    """Comando de prueba con la forma de `architect run`."""
+    click.echo(f"prompt={prompt} cwd={os.getcwd()}")
+    click.echo(f"config={type(config).__name__}:{config} tags={list(tags)} v={verbose}", err=True)
+    click.echo(f"guard={os.environ.get(DAEMON_RUN_ENV)} env={os.environ.get('ARCH_TEST_VAR')}")
+    click.echo(f"warm={active_warm_state() is not None}")
+    sys.exit(code)
+
+
+def _client_in_thread(fn):
+    """Lanza el cliente en un hilo; el servidor atiende en el principal (señales)."""
+    result: dict = {}
+
+    def target():
+        result["value"] = fn()
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, result
+
+
+@pytest.fixture
+def restore_logging():
+    """`architect run` configura structlog y handlers globales; se restauran al terminar."""
+    handlers = list(logging.root.handlers)
+    yield
+    logging.root.handlers = handlers
+    structlog.reset_defaults()
+
+
+@pytest.fixture
+def sock_path(tmp_path):
+    # Rutas cortas: AF_UNIX limita la ruta a ~108 bytes
+    path = tmp_path / "d.sock"
+    if len(str(path)) > 100:
+        pytest.skip("tmp_path demasiado largo para un socket Unix")
+    return path
+
+
+# ── Estado caliente ───────────────────────────────────────────────────────
+
+
+class TestIncrementalIndex:
+    def test_update_reuses_unchanged_entries(self, tmp_path):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        (tmp_path / "b.py").write_text("y = 2\n")
+        indexer = RepoIndexer(tmp_path)
+        first = indexer.build_index()
+
+        (tmp_path / "b.py").write_text("y = 2\nz = 3\n")
+        os.utime(tmp_path / "b.py", (1, 1))  # mtime distinto garantizado
+        (tmp_path / "c.py").write_text("w = 4\n")
+        updated = indexer.update_index(first)
+
+        assert updated.files["a.py"] is first.files["a.py"]
+        assert updated.files["b.py"].lines == 2
+        assert "c.py" in updated.files
+        assert updated.total_files == 3
+
+    def test_update_drops_deleted_files(self, tmp_path):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        (tmp_path / "b.py").write_text("y = 2\n")
+        indexer = RepoIndexer(tmp_path)
+        first = indexer.build_index()
+
+        (tmp_path / "b.py").unlink()
+        updated = indexer.update_index(first)
+        assert set(updated.files) == {"a.py"}
+        assert updated.total_lines == 1
+
+    def test_warm_state_updates_after_first_build(self, tmp_path):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        warm = WarmState()
+        indexer = RepoIndexer(tmp_path)
+        with patch.object(RepoIndexer, "update_index", wraps=indexer.update_index) as upd:
+            warm.repo_index(indexer)
+            assert upd.call_count == 0
+            warm.repo_index(RepoIndexer(tmp_path))
+            assert upd.call_count == 1
+        assert warm.stats["index_updates"] == 1
+
+
+class TestWarmCaches:
+    def test_skills_reparsed_only_when_changed(self, tmp_path):
+        skill_dir = tmp_path / ".architect" / "skills" / "demo"
+        skill_dir.mkdir(parents=True)
+        skill_md = skill_dir / "SKILL.md"
+        skill_md.write_text("---\nname: demo\n---\nbody\n")
+
+        warm = WarmState()
+        loader = warm.skills_loader(str(tmp_path))
+        with patch.object(SkillsLoader, "_parse_skill", wraps=loader._parse_skill) as parse:
+            loader.discover_skills()
+            loader.discover_skills()
+            assert parse.call_count == 1
+
+            skill_md.write_text("---\nname: demo2\n---\nnuevo cuerpo\n")
+            os.utime(skill_md, (1, 1))
+            skills = warm.skills_loader(str(tmp_path)).discover_skills()
+            assert parse.call_count == 2
+        assert skills[0].name == "demo2"
+        assert warm.skills_loader(str(tmp_path)) is loader
+
+    def test_price_loader_reloaded_when_file_changes(self, tmp_path):
+        prices = tmp_path / "prices.json"
+        prices.write_text("{}")
+        warm = WarmState()
+        first = warm.price_loader(prices)
+        assert first.get_prices("mi-modelo").input_per_million == 3.0  # fallback
+        assert warm.price_loader(prices) is first
+        assert warm.stats["price_hits"] == 1
+
+        prices.write_text('{"mi-modelo": {"input_per_million": 0.5, "output_per_million": 1}}')
+        os.utime(prices, (1, 1))
+        assert warm.price_loader(prices) is first
+        assert warm.stats["price_hits"] == 1
+        assert first.get_prices("mi-modelo").input_per_million == 0.5
+        assert warm.price_loader(None) is warm.price_loader(None)
+
+    def test_mcp_clients_reused_between_discoveries(self):
+        server = MCPServerConfig(name="docs", url="http://mcp.local")
+        fake_client = MagicMock()
+        fake_client.list_tools.return_value = [
+            {"name": "search", "description": "d", "inputSchema": {"type": "object"}},
+        ]
+        warm = WarmState()
+        with patch("architect.mcp.discovery.MCPClient", return_value=fake_client) as cls:
+            for _ in range(2):
+                stats = warm.mcp_discovery().discover_and_register([server], ToolRegistry())
+                assert stats["tools_registered"] == 1
+        assert cls.call_count == 1
+        assert fake_client.list_tools.call_count == 1
+
+        warm.close()
+        fake_client.close.assert_called_once()
+
+    def test_mcp_discovery_without_cache_reconnects(self):
+        server = MCPServerConfig(name="docs", url="http://mcp.local")
+        with patch("architect.mcp.discovery.MCPClient") as cls:
+            cls.return_value.list_tools.return_value = []
+            MCPDiscovery().discover_and_register([server], ToolRegistry())
+            MCPDiscovery().discover_and_register([server], ToolRegistry())
+        assert cls.call_count == 2
+
+
+# ── Servidor y cliente ────────────────────────────────────────────────────
+
+
+class TestDaemonRoundTrip:
+    def _run_once(self, sock_path, params):
+        server = DaemonServer(sock_path, _fake_run)
+        server.bind()
+        try:
+            thread, result = _client_in_thread(lambda: DaemonClient(sock_path).run(params))
+            conn, _ = server._sock.accept()
+            with conn:
+                server._handle(conn)
+            thread.join(timeout=10)
+        finally:
+            server.close()
+        return result["value"], server
+
+    def test_run_streams_output_and_exit_code(self, sock_path, tmp_path, capsys):
+        cwd_before = os.getcwd()
+        code, server = self._run_once(sock_path, {
+            "prompt": "hola",
+            "config": tmp_path / "cfg.yaml",
+            "tags": ("a", "b"),
+            "verbose": 2,
+            "code": 3,
+        })
+        out, err = capsys.readouterr()
+
+        assert code == 3
+        assert f"prompt=hola cwd={cwd_before}" in out
+        # Los params se decodifican con los tipos de click (Path, multiple, count)
+        assert f"config=PosixPath:{tmp_path / 'cfg.yaml'} tags=['a', 'b'] v=2" in err
+        assert "guard=1" in out
+        assert "warm=True" in out
+        # El proceso del daemon queda como estaba
+        assert os.getcwd() == cwd_before
+        assert DAEMON_RUN_ENV not in os.environ
+        assert active_warm_state() is None
+        assert server.warm.stats["runs"] == 1
+        assert not sock_path.exists()
+
+    def test_run_uses_client_cwd_and_env(self, tmp_path):
+        """El run usa el cwd y el entorno enviados por el cliente."""
+        server = DaemonServer(tmp_path / "unused.sock", _fake_run)
+        client_end, server_end = socket.socketpair()
+        request = {
+            "type": "run",
+            "params": {"prompt": "p"},
+            "cwd": str(tmp_path),
+            "env": {"ARCH_TEST_VAR": "remoto", "PATH": os.environ.get("PATH", "")},
+        }
+        client_end.sendall((json.dumps(request) + "\n").encode())
+        client_end.shutdown(socket.SHUT_WR)
+        with server_end:
+            server._handle(server_end)
+        events = [json.loads(line) for line in client_end.makefile().read().splitlines()]
+        client_end.close()
+
+        stdout = "".join(e["data"] for e in events if e["event"] == "stdout")
+        assert f"cwd={tmp_path}" in stdout
+        assert "guard=1 env=remoto" in stdout
+        assert events[-1] == {"event": "exit", "code": 0}
+        assert "ARCH_TEST_VAR" not in os.environ
+
+    def test_success_exit_code(self, sock_path, capsys):
+        code, _ = self._run_once(sock_path, {"prompt": "ok"})
+        assert code == 0
+
+    @pytest.mark.usefixtures("restore_logging")
+    def test_run_releases_hedge_threads(self, tmp_path):
+        """Cada run del daemon cierra el router de endpoints: no se acumulan hilos."""
+        from architect.cli import run as run_cmd
+        from architect.llm.adapter import LLMAdapter, LLMResponse
+
+        config = tmp_path / "config.yaml"
+        config.write_text(
+            f"workspace:\n  root: {tmp_path}\n"
+            "llm:\n  api_bases: [http://a, http://b]\n  hedge_requests: true\n"
+            "indexer:\n  enabled: false\n"
+        )
+        started: list[threading.Thread] = []
+
+        def completion(adapter, *args, **kwargs):
+            # Arranca el pool de hedging como lo haría una llamada cubierta
+            adapter._router._pool().submit(lambda: None).result()
+            started.extend(
+                t for t in threading.enumerate() if t.name.startswith("architect-hedge")
+            )
+            return LLMResponse(content="listo", finish_reason="stop")
+
+        server = DaemonServer(tmp_path / "unused.sock", run_cmd)
+        client_end, server_end = socket.socketpair()
+        request = {
+            "type": "run",
+            "params": {"prompt": "hola", "config": str(config), "mode": "yolo", "quiet": True,
+                       "no_stream": True},
+            "cwd": str(tmp_path),
+            "env": {"LITELLM_API_KEY": "sk-stub", "PATH": os.environ.get("PATH", "")},
+        }
+        client_end.sendall((json.dumps(request) + "\n").encode())
+        client_end.shutdown(socket.SHUT_WR)
+        with patch.object(LLMAdapter, "completion", autospec=True, side_effect=completion):
+            with server_end:
+                server._handle(server_end)
+        events = [json.loads(line) for line in client_end.makefile().read().splitlines()]
+        client_end.close()
+
+        assert events[-1] == {"event": "exit", "code": 0}
+        assert started
+        for t in started:
+            t.join(timeout=2)
+        assert not any(t.is_alive() for t in started)
+
+    def test_ping_and_shutdown(self, sock_path):
+        server = DaemonServer(sock_path, _fake_run)
+        server.bind()
+        try:
+            client = DaemonClient(sock_path)
+            thread, result = _client_in_thread(client.ping)
+            conn, _ = server._sock.accept()
+            with conn:
+                server._handle(conn)
+            thread.join(timeout=10)
+            assert result["value"]["event"] == "pong"
+            assert result["value"]["pid"] == os.getpid()
+            assert result["value"]["stats"]["runs"] == 0
+
+            thread, result = _client_in_thread(client.shutdown)
+            conn, _ = server._sock.accept()
+            with conn:
+                server._handle(conn)
+            thread.join(timeout=10)
+            assert result["value"] is True
+            assert server._stop is True
+        finally:
+            server.close()
+
+    def test_client_without_daemon_returns_none(self, sock_path):
+        assert DaemonClient(sock_path).run({"prompt": "x"}) is None
+        assert DaemonClient(sock_path).ping() is None
+
+    def test_bind_replaces_stale_socket(self, sock_path):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(sock_path))
+        stale.close()  # El fichero queda, pero nadie escucha
+        server = DaemonServer(sock_path, _fake_run)
+        server.bind()
+        try:
+            assert sock_path.exists()
+            assert oct(sock_path.stat().st_mode & 0o777) == oct(0o600)
+        finally:
+            server.close()
+
+    def test_socket_created_under_restrictive_umask(self, sock_path, monkeypatch):
+        umasks = []
+
+        class _RecordingSocket(socket.socket):
+            def bind(self, address):
+                current = os.umask(0)
+                os.umask(current)
+                umasks.append(current)
+                super().bind(address)
+
+        monkeypatch.setattr(daemon_mod.socket, "socket", _RecordingSocket)
+        before = os.umask(0o022)
+        try:
+            server = DaemonServer(sock_path, _fake_run)
+            server.bind()
+            server.close()
+            # El umask del proceso se restaura tras el bind
+            assert os.umask(0o022) == 0o022
+        finally:
+            os.umask(before)
+        assert umasks == [0o077]
+
+
+# ── Cliente ligero ────────────────────────────────────────────────────────
+
+
+class TestForwardGuards:
+    def test_no_socket_runs_in_process(self, sock_path, monkeypatch):
+        monkeypatch.setenv(SOCKET_ENV, str(sock_path))
+        assert forward_to_daemon({"prompt": "x"}) is None
+
+    @pytest.mark.parametrize("env_var", [DAEMON_RUN_ENV, NO_DAEMON_ENV])
+    def test_guards_skip_daemon(self, sock_path, monkeypatch, env_var):
+        sock_path.touch()
+        monkeypatch.setenv(SOCKET_ENV, str(sock_path))
+        monkeypatch.setenv(env_var, "1")
+        with patch.object(DaemonClient, "run") as run:
+            assert forward_to_daemon({"prompt": "x"}) is None
+        run.assert_not_called()
+
+    def test_inside_daemon_run_skips(self, sock_path, monkeypatch):
+        sock_path.touch()
+        monkeypatch.setenv(SOCKET_ENV, str(sock_path))
+        monkeypatch.setattr(daemon_mod, "_active", WarmState())
+        with patch.object(DaemonClient, "run") as run:
+            assert forward_to_daemon({"prompt": "x"}) is None
+        run.assert_not_called()
+
+    def test_headless_run_is_forwarded(self, sock_path, monkeypatch):
+        sock_path.touch()
+        monkeypatch.setenv(SOCKET_ENV, str(sock_path))
+        monkeypatch.delenv(DAEMON_RUN_ENV, raising=False)
+        monkeypatch.delenv(NO_DAEMON_ENV, raising=False)
+        monkeypatch.setattr(sys, "stdin", MagicMock(isatty=lambda: False))
+        with patch.object(DaemonClient, "run", return_value=0) as run:
+            assert forward_to_daemon({"prompt": "x"}) == 0
+        run.assert_called_once_with({"prompt": "x"})
+
+    def test_stdin_prompt_runs_in_process(self, sock_path, monkeypatch):
+        sock_path.touch()
+        monkeypatch.setenv(SOCKET_ENV, str(sock_path))
+        monkeypatch.delenv(DAEMON_RUN_ENV, raising=False)
+        monkeypatch.delenv(NO_DAEMON_ENV, raising=False)
+        monkeypatch.setattr(sys, "stdin", MagicMock(isatty=lambda: False))
+        with patch.object(DaemonClient, "run") as run:
+            assert forward_to_daemon({"prompt": "-"}) is None
+        run.assert_not_called()
+
+    def test_serve_status_without_daemon(self, sock_path):
+        from architect.cli import EXIT_FAILED, main
+
+        result = CliRunner().invoke(main, ["serve", "--status", "--socket", str(sock_path)])
+        assert result.exit_code == EXIT_FAILED
+        assert "No daemon listening" in result.output
@@ -5,6 +5,12 @@ Cubre:
 - HookEvent, HookDecision, HookResult (modelo de datos)
 - HooksRegistry (registro y filtrado)
 - HookExecutor (ejecución, exit codes, timeout, async, matcher, file_patterns)
+- Hooks persistentes (persistent: true): un proceso por sesión, protocolo
+  JSON lines, timeout por evento (también al escribir), reinicio tras caída,
+  close()
+- Pool acotado: hooks no bloqueantes concurrentes, pre-hooks secuenciales,
+  resultados de hooks async recogidos para el siguiente paso, estadísticas;
+  el límite de la cola async se respeta con ráfagas desde varios hilos
 - Integración backward-compat con post_edit
 """
 
@@ -14,6 +20,7 @@ import stat
 import sys
 import tempfile
 import textwrap
+import threading
 import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -438,6 +445,362 @@ class TestHookExecutor:
         assert results[0].duration_ms >= 0
 
 
+# ── Tests: Hooks persistentes ───────────────────────────────────────────
+
+
+# Servidor de hooks: responde una línea JSON por evento
+_SERVER = textwrap.dedent("""\
+    import json, os, sys, time
+    count = 0
+    for line in sys.stdin:
+        req = json.loads(line)
+        count += 1
+        tool = (req["context"] or {}).get("tool_name", "")
+        if tool == "slow":
+            time.sleep(5)
+        if tool == "die":
+            sys.exit(1)
+        reply = {"id": req["id"], "additionalContext": f"{os.getpid()}:{count}:{req['event']}"}
+        if tool == "rm":
+            reply = {"id": req["id"], "decision": "block", "reason": "rm prohibido"}
+        if tool == "fix":
+            reply = {"id": req["id"], "decision": "modify", "updatedInput": {"path": "b.py"}}
+        print(json.dumps(reply), flush=True)
+""")
+
+
+def _persistent_executor(workspace: Path, script: str = _SERVER, timeout: int = 10) -> HookExecutor:
+    server = workspace / "server.py"
+    server.write_text(script)
+    hook = HookConfig(
+        command=f"{sys.executable} {server}",
+        name="servidor",
+        persistent=True,
+        timeout=timeout,
+    )
+    return HookExecutor(
+        HooksRegistry(hooks={HookEvent.PRE_TOOL_USE: [hook], HookEvent.POST_TOOL_USE: [hook]}),
+        str(workspace),
+    )
+
+
+def _pid_count(result: HookResult) -> tuple[str, int]:
+    pid, count, _ = result.additional_context.split(":")
+    return pid, int(count)
+
+
+class TestPersistentHooks:
+    def test_one_process_serves_all_events(self, workspace: Path):
+        """El proceso arranca una vez y atiende eventos de distintos tipos."""
+        executor = _persistent_executor(workspace)
+        try:
+            first = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "read_file"})[0]
+            for _ in range(5):
+                executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "read_file"})
+            last = executor.run_event(HookEvent.POST_TOOL_USE, {"tool_name": "read_file"})[0]
+        finally:
+            executor.close()
+
+        assert _pid_count(first)[0] == _pid_count(last)[0]
+        assert _pid_count(last)[1] == 7
+        assert last.additional_context.endswith(":post_tool_use")
+
+    def test_block_and_modify_decisions(self, workspace: Path):
+        executor = _persistent_executor(workspace)
+        try:
+            blocked = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "rm"})
+            modified = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "fix"})
+        finally:
+            executor.close()
+
+        assert blocked[0].decision == HookDecision.BLOCK
+        assert blocked[0].reason == "rm prohibido"
+        assert modified[0].decision == HookDecision.MODIFY
+        assert modified[0].updated_input == {"path": "b.py"}
+
+    def test_crash_restarts_process(self, workspace: Path):
+        """Si el proceso muere durante un evento se reinicia y se reintenta una vez."""
+        executor = _persistent_executor(workspace)
+        try:
+            before = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "a"})[0]
+            crashed = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "die"})[0]
+            after = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "a"})[0]
+        finally:
+            executor.close()
+
+        # El evento que tumba el proceso nunca bloquea
+        assert crashed.decision == HookDecision.ALLOW
+        assert _pid_count(after)[0] != _pid_count(before)[0]
+        assert _pid_count(after)[1] == 1
+
+    def test_timeout_returns_allow_and_restarts(self, workspace: Path):
+        executor = _persistent_executor(workspace, timeout=1)
+        try:
+            start = time.monotonic()
+            slow = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "slow"})[0]
+            elapsed = time.monotonic() - start
+            after = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "a"})[0]
+        finally:
+            executor.close()
+
+        assert elapsed < 3.0
+        assert slow.decision == HookDecision.ALLOW
+        assert slow.additional_context is None
+        assert _pid_count(after)[1] == 1
+
+    def test_hook_not_reading_stdin_times_out_on_write(self, workspace: Path):
+        """Un evento mayor que el buffer del pipe no bloquea si el hook no lee stdin."""
+        script = "import time\ntime.sleep(60)\n"
+        executor = _persistent_executor(workspace, script=script, timeout=1)
+        try:
+            start = time.monotonic()
+            result = executor.run_event(
+                HookEvent.PRE_TOOL_USE, {"tool_name": "a"}, {"tool_input": "y" * 300_000},
+            )[0]
+            elapsed = time.monotonic() - start
+            (server,) = executor._persistent.values()
+        finally:
+            executor.close()
+
+        assert result.decision == HookDecision.ALLOW
+        assert elapsed < 3.0
+        assert server.restarts == 1
+        assert not server.running
+
+    def test_disabled_after_repeated_crashes(self, workspace: Path):
+        executor = _persistent_executor(workspace, script="import sys\nsys.exit(3)\n")
+        try:
+            for _ in range(4):
+                result = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "a"})[0]
+                assert result.decision == HookDecision.ALLOW
+            (server,) = executor._persistent.values()
+            assert server.disabled is True
+        finally:
+            executor.close()
+
+    def test_close_stops_processes(self, workspace: Path):
+        executor = _persistent_executor(workspace)
+        executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "a"})
+        (server,) = executor._persistent.values()
+        assert server.running
+
+        executor.close()
+        assert not server.running
+        assert executor._persistent == {}
+
+    def test_persistent_from_config(self):
+        from architect.cli import _build_hooks_registry
+        from architect.config.schema import AppConfig
+
+        config = AppConfig(hooks={
+            "pre_tool_use": [{"command": "python hook.py", "persistent": True}],
+            "post_edit": [{"command": "ruff check", "persistent": True}],
+        })
+        registry = _build_hooks_registry(config)
+        assert registry.get_hooks(HookEvent.PRE_TOOL_USE)[0].persistent is True
+        assert registry.get_hooks(HookEvent.POST_TOOL_USE)[0].persistent is True
+
+
+# ── Tests: Pool de hooks ────────────────────────────────────────────────
+
+
+def _sleep_hooks(workspace: Path, make_script, count: int, seconds: float) -> list[HookConfig]:
+    hooks = []
+    for i in range(count):
+        make_script(f"sleep{i}.sh", f"#!/bin/bash\nsleep {seconds}\necho 'hook {i}'\n")
+        hooks.append(HookConfig(command=str(workspace / f"sleep{i}.sh"), name=f"h{i}"))
+    return hooks
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestHookPool:
+    def test_post_hooks_run_concurrently_in_order(self, workspace: Path, make_script):
+        hooks = _sleep_hooks(workspace, make_script, 3, 0.5)
+        executor = HookExecutor(
+            HooksRegistry(hooks={HookEvent.POST_TOOL_USE: hooks}), str(workspace),
+            max_concurrency=3,
+        )
+        try:
+            start = time.monotonic()
+            results = executor.run_event(HookEvent.POST_TOOL_USE, {"tool_name": "edit_file"})
+            elapsed = time.monotonic() - start
+        finally:
+            executor.close()
+
+        assert elapsed < 1.2
+        # El orden de los resultados es el del registro, no el de finalización
+        assert [r.additional_context for r in results] == ["hook 0", "hook 1", "hook 2"]
+        assert executor.stats()["peak_active"] == 3
+
+    def test_concurrency_is_bounded(self, workspace: Path, make_script):
+        hooks = _sleep_hooks(workspace, make_script, 4, 0.3)
+        executor = HookExecutor(
+            HooksRegistry(hooks={HookEvent.SESSION_END: hooks}), str(workspace),
+            max_concurrency=2,
+        )
+        try:
+            start = time.monotonic()
+            executor.run_event(HookEvent.SESSION_END, {})
+            elapsed = time.monotonic() - start
+        finally:
+            executor.close()
+
+        stats = executor.stats()
+        assert elapsed >= 0.6
+        assert stats["peak_active"] == 2
+        assert stats["peak_queued"] >= 2
+        assert stats["completed"] == 4
+        assert stats["active"] == 0 and stats["queued"] == 0
+
+    def test_pre_hooks_stay_sequential_and_short_circuit(self, workspace: Path, make_script):
+        make_script("block.sh", "#!/bin/bash\necho 'no' >&2\nexit 2\n")
+        make_script("marker.sh", f"#!/bin/bash\ntouch {workspace / 'ejecutado'}\n")
+        executor = HookExecutor(HooksRegistry(hooks={HookEvent.PRE_TOOL_USE: [
+            HookConfig(command=str(workspace / "block.sh"), name="block"),
+            HookConfig(command=str(workspace / "marker.sh"), name="marker"),
+        ]}), str(workspace))
+
+        results = executor.run_event(HookEvent.PRE_TOOL_USE, {"tool_name": "write_file"})
+        executor.close()
+
+        assert len(results) == 1
+        assert results[0].decision == HookDecision.BLOCK
+        assert not (workspace / "ejecutado").exists()
+        # Los pre-hooks no pasan por el pool
+        assert executor.stats()["completed"] == 0
+
+    def test_async_output_collected(self, workspace: Path, make_script):
+        make_script("lint.sh", "#!/bin/bash\necho 'lint: 2 errores'\n")
+        executor = HookExecutor(HooksRegistry(hooks={HookEvent.POST_TOOL_USE: [
+            HookConfig(command=str(workspace / "lint.sh"), name="lint", is_async=True),
+        ]}), str(workspace))
+
+        results = executor.run_event(HookEvent.POST_TOOL_USE, {"tool_name": "edit_file"})
+        assert results[0].additional_context is None  # placeholder inmediato
+        assert _wait_for(lambda: executor.stats()["async_context_pending"] == 1)
+
+        assert executor.drain_async_context() == ["[async hook lint] lint: 2 errores"]
+        assert executor.drain_async_context() == []
+        executor.close()
+
+    def test_async_queue_is_bounded(self, workspace: Path, make_script):
+        make_script("slow.sh", "#!/bin/bash\nsleep 0.3\n")
+        executor = HookExecutor(HooksRegistry(hooks={HookEvent.POST_TOOL_USE: [
+            HookConfig(command=str(workspace / "slow.sh"), name="slow", is_async=True),
+        ]}), str(workspace), max_concurrency=1)
+
+        for _ in range(10):
+            executor.run_event(HookEvent.POST_TOOL_USE, {"tool_name": "edit_file"})
+        stats = executor.stats()
+        executor.close()
+
+        # 1 worker: como mucho 4 en cola (+1 en ejecución); el resto se descarta
+        assert stats["queued"] <= 4
+        assert stats["async_dropped"] >= 5
+
+    def test_async_queue_bound_holds_under_concurrent_burst(
+        self, workspace: Path, make_script,
+    ):
+        """Comprobar y encolar es atómico: varios hilos no desbordan el límite."""
+        make_script("slow.sh", "#!/bin/bash\nsleep 0.5\n")
+        hook = HookConfig(command=str(workspace / "slow.sh"), name="slow", is_async=True)
+        executor = HookExecutor(HooksRegistry(), str(workspace), max_concurrency=1)
+        executor.log = MagicMock()
+        # Hooks síncronos en cola: no cuentan para el límite async ni en el log
+        sync_hook = HookConfig(command=str(workspace / "slow.sh"), name="sync")
+        for _ in range(3):
+            executor._submit(sync_hook, HookEvent.SESSION_END, {}, None)
+        barrier = threading.Barrier(8)
+
+        def burst() -> None:
+            barrier.wait()
+            for _ in range(10):
+                executor._submit_async(hook, HookEvent.POST_TOOL_USE, {}, None)
+
+        threads = [threading.Thread(target=burst) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = executor.stats()
+        executor.close()
+
+        # 1 worker x factor 4: nunca más de 4 async en cola (+3 síncronos)
+        assert stats["peak_queued"] <= 4 + 3
+        assert stats["async_dropped"] >= 70
+        drops = executor.log.warning.call_args_list
+        assert len(drops) == stats["async_dropped"]
+        assert {c.kwargs["queued"] for c in drops} == {4}
+
+    def test_async_burst_does_not_delay_sync_hooks(self, workspace: Path, make_script):
+        """Con la cola async llena, los hooks post síncronos no esperan turno."""
+        make_script("slow.sh", "#!/bin/bash\nsleep 1\n")
+        sync_hooks = _sleep_hooks(workspace, make_script, 2, 0)
+        executor = HookExecutor(HooksRegistry(hooks={
+            HookEvent.SESSION_END: [
+                HookConfig(command=str(workspace / "slow.sh"), name="slow", is_async=True),
+            ],
+            HookEvent.POST_TOOL_USE: sync_hooks,
+        }), str(workspace), max_concurrency=1)
+        try:
+            for _ in range(6):
+                executor.run_event(HookEvent.SESSION_END, {})
+            assert executor.stats()["async_dropped"] >= 1  # cola async llena
+
+            start = time.monotonic()
+            results = executor.run_event(HookEvent.POST_TOOL_USE, {"tool_name": "edit_file"})
+            elapsed = time.monotonic() - start
+        finally:
+            executor.close()
+
+        assert [r.additional_context for r in results] == ["hook 0", "hook 1"]
+        assert elapsed < 0.9
+
+    def test_pool_recreated_after_close(self, workspace: Path, make_script):
+        hooks = _sleep_hooks(workspace, make_script, 2, 0)
+        registry = HooksRegistry(hooks={HookEvent.POST_TOOL_USE: hooks})
+        executor = HookExecutor(registry, str(workspace))
+        executor.run_event(HookEvent.POST_TOOL_USE, {})
+        executor.close()
+        results = executor.run_event(HookEvent.POST_TOOL_USE, {})
+        executor.close()
+        assert [r.additional_context for r in results] == ["hook 0", "hook 1"]
+
+    def test_loop_injects_async_context(self):
+        """El AgentLoop añade la salida de hooks async en el siguiente paso."""
+        from architect.config.schema import AgentConfig
+        from architect.core.loop import AgentLoop
+        from architect.llm.adapter import LLMResponse
+
+        llm = MagicMock()
+        llm.config.model = "gpt-4o"
+        llm.completion.return_value = LLMResponse(content="listo", finish_reason="stop")
+        ctx = MagicMock()
+        ctx.build_initial.return_value = [{"role": "user", "content": "x"}]
+        hook_executor = MagicMock()
+        hook_executor.run_event.return_value = []
+        hook_executor.drain_async_context.return_value = ["[async hook lint] 2 errores"]
+
+        loop = AgentLoop(
+            llm, MagicMock(), AgentConfig(system_prompt="s", max_steps=3), ctx,
+            hook_executor=hook_executor,
+        )
+        loop.hlog = MagicMock()
+        loop.run("tarea", stream=False)
+
+        sent = llm.completion.call_args.kwargs["messages"]
+        assert {"role": "user", "content": "[Hook context]: [async hook lint] 2 errores"} in sent
+        hook_executor.close.assert_called_once()
+
+
 # ── Tests: Config Schema ────────────────────────────────────────────────
 
 
@@ -452,6 +815,14 @@ class TestHooksConfigSchema:
         assert hook.timeout == 10
         assert hook.async_ is False
         assert hook.enabled is True
+        assert hook.persistent is False
+
+    def test_hooks_max_concurrency(self):
+        from architect.config.schema import AppConfig, HooksConfig
+
+        assert HooksConfig().max_concurrency == 4
+        config = AppConfig(hooks={"max_concurrency": 2})
+        assert config.hooks.max_concurrency == 2
 
     def test_hook_item_config_async_alias(self):
         """async es una keyword Python, se acepta como alias."""
@@ -0,0 +1,232 @@
+"""
+Tests para el pool HTTP compartido (keep-alive) de LLM y MCP.
+
+Cubre:
+- Reutilización de conexiones medida contra un servidor stub HTTP/1.1 local:
+  varios MCPClient al mismo host abren una sola conexión (frente a una por
+  cliente sin pool)
+- Estadísticas por host: peticiones, conexiones nuevas, reutilizadas
+- Cerrar un cliente no cierra el pool compartido
+- LiteLLM recibe un cliente del pool (``litellm.client_session``) y sus
+  llamadas OpenAI-compatibles reutilizan la conexión
+- HTTP/2 sin el paquete ``h2``: fallback a HTTP/1.1
+- configure_http_pool conserva el pool si la configuración no cambia
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from architect import http_pool as http_pool_mod
+from architect.config.schema import AppConfig, HTTPConfig, LLMConfig, MCPServerConfig
+from architect.http_pool import (
+    HTTPPool,
+    configure_http_pool,
+    get_http_pool,
+    install_litellm_client,
+)
+from architect.mcp.client import MCPClient
+
+# ── Servidor stub ─────────────────────────────────────────────────────────
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Responde JSON-RPC (MCP) y chat completions (OpenAI) con keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/chat/completions"):
+            payload = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "pong"},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+            }
+        elif body.get("method") == "tools/list":
+            payload = {"jsonrpc": "2.0", "id": body.get("id"), "result": {"tools": []}}
+        else:
+            payload = {"jsonrpc": "2.0", "id": body.get("id"), "result": {"serverInfo": {}}}
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fresh_pool():
+    """Aísla el pool global del proceso en cada test."""
+    with patch.object(http_pool_mod, "_pool", None):
+        yield
+        if http_pool_mod._pool is not None:
+            http_pool_mod._pool.close()
+
+
+def _url(server) -> str:
+    host, port = server.server_address
+    return f"http://{host}:{port}"
+
+
+def _list_tools_with_clients(server, n: int) -> None:
+    for i in range(n):
+        client = MCPClient(MCPServerConfig(name=f"srv{i}", url=f"{_url(server)}/mcp"))
+        try:
+            client.list_tools()
+        finally:
+            client.close()
+
+
+# ── Reutilización de conexiones (MCP) ─────────────────────────────────────
+
+
+class TestMCPConnectionReuse:
+    def test_clients_share_one_connection(self, stub_server, fresh_pool):
+        """3 clientes x 2 peticiones (initialize + tools/list) -> 1 conexión."""
+        configure_http_pool(HTTPConfig())
+        _list_tools_with_clients(stub_server, 3)
+
+        assert stub_server.connections == 1
+        host = f"127.0.0.1:{stub_server.server_address[1]}"
+        stats = get_http_pool().stats()[host]
+        assert stats["requests"] == 6
+        assert stats["connections"] == 1
+        assert stats["reused"] == 5
+        assert stats["tls_handshakes"] == 0
+
+    def test_disabled_pool_opens_connection_per_client(self, stub_server, fresh_pool):
+        """Sin pool cada cliente paga su propio handshake."""
+        configure_http_pool(HTTPConfig(enabled=False))
+        _list_tools_with_clients(stub_server, 3)
+
+        assert stub_server.connections == 3
+        assert get_http_pool().stats() == {}
+
+    def test_client_close_keeps_pool_open(self, stub_server, fresh_pool):
+        pool = configure_http_pool(HTTPConfig())
+        first = pool.client()
+        first.post(f"{_url(stub_server)}/mcp", json={"id": 1})
+        first.close()
+
+        second = pool.client()
+        second.post(f"{_url(stub_server)}/mcp", json={"id": 2})
+        second.close()
+        assert stub_server.connections == 1
+
+    def test_keepalive_zero_disables_reuse(self, stub_server, fresh_pool):
+        configure_http_pool(HTTPConfig(max_keepalive_connections=0))
+        _list_tools_with_clients(stub_server, 2)
+        assert stub_server.connections == 4
+
+
+# ── LiteLLM ───────────────────────────────────────────────────────────────
+
+
+class TestLiteLLMClient:
+    def test_litellm_uses_pool(self, stub_server, fresh_pool):
+        litellm = pytest.importorskip("litellm")
+        from architect.llm.adapter import LLMAdapter
+
+        configure_http_pool(HTTPConfig())
+        install_litellm_client(litellm)
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+            adapter = LLMAdapter(LLMConfig(
+                model="openai/stub-model",
+                api_base=f"{_url(stub_server)}/v1",
+                api_key_env="OPENAI_API_KEY",
+                stream=False,
+                retries=0,
+            ))
+            for _ in range(3):
+                response = adapter.completion([{"role": "user", "content": "ping"}])
+                assert response.content == "pong"
+
+        assert stub_server.connections == 1
+        host = f"127.0.0.1:{stub_server.server_address[1]}"
+        assert get_http_pool().stats()[host]["requests"] == 3
+
+    def test_install_disabled_resets_client_session(self, fresh_pool):
+        class _FakeLiteLLM:
+            client_session = "old"
+
+        configure_http_pool(HTTPConfig(enabled=False))
+        install_litellm_client(_FakeLiteLLM)
+        assert _FakeLiteLLM.client_session is None
+
+
+# ── Configuración ─────────────────────────────────────────────────────────
+
+
+class TestConfigure:
+    def test_same_config_keeps_pool(self, fresh_pool):
+        pool = configure_http_pool(HTTPConfig())
+        assert configure_http_pool(HTTPConfig()) is pool
+
+    def test_changed_config_replaces_pool(self, fresh_pool):
+        pool = configure_http_pool(HTTPConfig())
+        assert configure_http_pool(HTTPConfig(max_connections=5)) is not pool
+
+    def test_get_http_pool_defaults(self, fresh_pool):
+        pool = get_http_pool()
+        assert pool.enabled
+        assert pool.config == HTTPConfig()
+
+    def test_http2_without_h2_falls_back(self, fresh_pool):
+        real_init = httpx.HTTPTransport.__init__
+
+        def fake_init(self, *args, http2=False, **kwargs):
+            if http2:
+                raise ImportError("h2 not installed")
+            real_init(self, *args, **kwargs)
+
+        pool = HTTPPool(HTTPConfig(http2=True))
+        with patch.object(httpx.HTTPTransport, "__init__", fake_init):
+            pool.transport()
+        assert pool.http2 is False
+
+    def test_http2_enabled_with_h2(self, fresh_pool):
+        pytest.importorskip("h2")
+        pool = HTTPPool(HTTPConfig(http2=True))
+        pool.transport()
+        assert pool.http2 is True
+
+    def test_app_config_section(self):
+        config = AppConfig(http={"max_keepalive_connections": 5, "http2": True})
+        assert config.http.max_keepalive_connections == 5
+        assert config.http.http2 is True
+        with pytest.raises(ValueError):
+            AppConfig(http={"unknown": 1})
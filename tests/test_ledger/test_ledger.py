@@ -0,0 +1,272 @@
+"""
+Tests para el ledger de costes entre sesiones (F14).
+
+Cubre:
+- CostLedger: una fila por llamada con contexto (sesión, paso de pipeline,
+  iteración ralph, worker), creación perezosa, nunca lanza excepciones
+- Consultas: coste por día, p50/p95 de latencia y tasa de caché por modelo,
+  sesiones más caras, ventana de días
+- for_workspace() / LedgerContext.from_env(): redirección de workers paralelos
+- CostTracker: record() añade la fila con latencia; sin ledger no escribe
+- AgentLoop: el session_id se propaga al contexto del ledger
+- CLI: architect stats (tabla y --json)
+"""
+
+import json
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+
+from architect.cli import main
+from architect.costs.ledger import (
+    LEDGER_PATH,
+    LEDGER_PATH_ENV,
+    LEDGER_WORKER_ENV,
+    CostLedger,
+    LedgerContext,
+)
+from architect.costs.prices import ModelPricing
+from architect.costs.tracker import CostTracker, StepCost
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _step(model: str = "gpt-4o", cost: float = 0.01, inp: int = 1000, cached: int = 0) -> StepCost:
+    return StepCost(
+        step=1, model=model, input_tokens=inp, output_tokens=100,
+        cached_tokens=cached, cost_usd=cost, source="agent",
+    )
+
+
+def _price_loader() -> MagicMock:
+    loader = MagicMock()
+    loader.get_prices.return_value = ModelPricing(input_per_million=1.0, output_per_million=2.0)
+    return loader
+
+
+@pytest.fixture
+def ledger(tmp_path: Path) -> CostLedger:
+    ledger = CostLedger(tmp_path / LEDGER_PATH)
+    yield ledger
+    ledger.close()
+
+
+def _rows(path: Path) -> list[sqlite3.Row]:
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM calls ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+# ── Tests: escritura ──────────────────────────────────────────────────────
+
+
+class TestAppend:
+    def test_file_created_lazily(self, ledger: CostLedger):
+        assert not ledger.exists()
+        ledger.append(_step(), latency_s=0.25)
+        assert ledger.exists()
+
+    def test_row_with_context(self, ledger: CostLedger):
+        ctx = LedgerContext(session_id="s-1", pipeline_step="plan", ralph_iteration=2, worker=3)
+        ledger.append(_step(cached=400), latency_s=1.5, context=ctx)
+
+        (row,) = _rows(ledger.path)
+        assert row["session_id"] == "s-1"
+        assert row["pipeline_step"] == "plan"
+        assert row["ralph_iteration"] == 2
+        assert row["worker"] == 3
+        assert row["model"] == "gpt-4o"
+        assert row["cached_tokens"] == 400
+        assert row["latency_ms"] == pytest.approx(1500)
+        assert row["day"] == date.today().isoformat()
+
+    def test_unknown_latency_is_null(self, ledger: CostLedger):
+        ledger.append(_step())
+        assert _rows(ledger.path)[0]["latency_ms"] is None
+
+    def test_write_failure_disables_without_raising(self, tmp_path: Path):
+        blocker = tmp_path / "no-es-directorio"
+        blocker.write_text("x")
+        ledger = CostLedger(blocker / "ledger.db")
+        ledger.append(_step())
+        ledger.append(_step())  # ya deshabilitado: no reintenta
+        assert ledger._disabled is True
+
+
+# ── Tests: consultas ──────────────────────────────────────────────────────
+
+
+class TestQueries:
+    def test_latency_percentiles_per_model(self, ledger: CostLedger):
+        for ms in range(1, 101):
+            ledger.append(_step("gpt-4o"), latency_s=ms / 1000)
+        ledger.append(_step("gpt-4o-mini"))
+
+        by_model = {m["model"]: m for m in ledger.models()}
+        assert by_model["gpt-4o"]["p50_latency_ms"] == 50
+        assert by_model["gpt-4o"]["p95_latency_ms"] == 95
+        assert by_model["gpt-4o-mini"]["p95_latency_ms"] is None
+
+    def test_cache_hit_rate_and_cost(self, ledger: CostLedger):
+        ledger.append(_step("claude", cost=0.02, inp=1000, cached=750))
+        ledger.append(_step("claude", cost=0.03, inp=1000, cached=250))
+
+        (model,) = ledger.models()
+        assert model["calls"] == 2
+        assert model["cost_usd"] == pytest.approx(0.05)
+        assert model["cache_hit_rate"] == pytest.approx(0.5)
+
+    def test_cost_by_day_and_window(self, ledger: CostLedger):
+        ledger.append(_step(cost=0.01))
+        ledger.append(_step(cost=0.02))
+        old = (date.today() - timedelta(days=10)).isoformat()
+        conn = ledger._connect()
+        conn.execute("UPDATE calls SET day = ? WHERE id = 1", (old,))
+        conn.commit()
+
+        assert [d["day"] for d in ledger.cost_by_day()] == [old, date.today().isoformat()]
+        assert ledger.cost_by_day(days=7) == [
+            {"day": date.today().isoformat(), "calls": 1, "cost_usd": 0.02},
+        ]
+        assert ledger.totals(days=7)["calls"] == 1
+        assert ledger.totals()["first_day"] == old
+
+    def test_top_sessions(self, ledger: CostLedger):
+        ledger.append(_step(cost=0.01), context=LedgerContext(session_id="barata"))
+        ledger.append(_step(cost=0.05), context=LedgerContext(session_id="cara"))
+        ledger.append(_step(cost=0.05))  # sin sesión: no aparece
+
+        assert [s["session_id"] for s in ledger.sessions()] == ["cara", "barata"]
+        assert ledger.totals()["sessions"] == 2
+
+    def test_queries_use_indexes(self, ledger: CostLedger):
+        ledger.append(_step(), latency_s=0.1)
+        conn = ledger._connect()
+        plan = " ".join(
+            str(r) for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT latency_ms FROM calls WHERE model = ? "
+                "AND latency_ms IS NOT NULL ORDER BY latency_ms LIMIT 1 OFFSET 0",
+                ("gpt-4o",),
+            )
+        )
+        assert "idx_calls_model_latency" in plan
+
+
+# ── Tests: workspace y workers ────────────────────────────────────────────
+
+
+class TestWorkspaceResolution:
+    def test_default_path(self, tmp_path: Path, monkeypatch):
+        monkeypatch.delenv(LEDGER_PATH_ENV, raising=False)
+        assert CostLedger.for_workspace(tmp_path).path == tmp_path / LEDGER_PATH
+
+    def test_env_override_and_worker(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv(LEDGER_PATH_ENV, str(tmp_path / "principal.db"))
+        monkeypatch.setenv(LEDGER_WORKER_ENV, "2")
+        assert CostLedger.for_workspace(tmp_path / "worktree").path == tmp_path / "principal.db"
+        assert LedgerContext.from_env().worker == 2
+
+    def test_no_worker_env(self, monkeypatch):
+        monkeypatch.delenv(LEDGER_WORKER_ENV, raising=False)
+        assert LedgerContext.from_env() == LedgerContext()
+
+
+# ── Tests: integración con CostTracker y AgentLoop ────────────────────────
+
+
+class TestTrackerIntegration:
+    def test_record_appends_with_latency(self, ledger: CostLedger):
+        tracker = CostTracker(
+            price_loader=_price_loader(), ledger=ledger,
+            ledger_context=LedgerContext(ralph_iteration=4),
+        )
+        tracker.record(3, "gpt-4o", {"prompt_tokens": 1000, "completion_tokens": 10}, latency_s=0.2)
+
+        (row,) = _rows(ledger.path)
+        assert row["step"] == 3
+        assert row["ralph_iteration"] == 4
+        assert row["latency_ms"] == pytest.approx(200)
+        assert row["cost_usd"] == pytest.approx(tracker.total_cost_usd)
+
+    def test_without_ledger_nothing_written(self, tmp_path: Path):
+        tracker = CostTracker(price_loader=_price_loader())
+        tracker.record(0, "gpt-4o", {"prompt_tokens": 10})
+        assert not (tmp_path / LEDGER_PATH).exists()
+
+    def test_loop_propagates_session_id(self, ledger: CostLedger):
+        from architect.config.schema import AgentConfig
+        from architect.core.loop import AgentLoop
+        from architect.llm.adapter import LLMResponse
+
+        llm = MagicMock()
+        llm.config.model = "gpt-4o"
+        llm.completion.return_value = LLMResponse(
+            content="listo", finish_reason="stop",
+            usage={"prompt_tokens": 100, "completion_tokens": 5},
+        )
+        ctx = MagicMock()
+        ctx.build_initial.return_value = [{"role": "user", "content": "x"}]
+        session_manager = MagicMock()
+        tracker = CostTracker(price_loader=_price_loader(), ledger=ledger)
+
+        loop = AgentLoop(
+            llm, MagicMock(), AgentConfig(system_prompt="s", max_steps=3), ctx,
+            cost_tracker=tracker, session_manager=session_manager,
+            session_id="sesion-42",
+        )
+        loop.hlog = MagicMock()
+        loop.run("tarea", stream=False)
+
+        (row,) = _rows(ledger.path)
+        assert row["session_id"] == "sesion-42"
+        assert row["latency_ms"] is not None
+
+
+# ── Tests: CLI ────────────────────────────────────────────────────────────
+
+
+def _config(tmp_path: Path) -> Path:
+    path = tmp_path / "config.yaml"
+    path.write_text(f"workspace:\n  root: {tmp_path}\n")
+    return path
+
+
+class TestStatsCommand:
+    def test_no_ledger(self, tmp_path: Path):
+        result = CliRunner().invoke(main, ["stats", "-c", str(_config(tmp_path))])
+        assert result.exit_code == 0, result.output
+        assert "No ledger" in result.output
+
+    def test_table(self, tmp_path: Path):
+        ledger = CostLedger(tmp_path / LEDGER_PATH)
+        ledger.append(
+            _step("gpt-4o", cost=0.5), latency_s=1.2, context=LedgerContext(session_id="s-1"),
+        )
+        ledger.close()
+
+        result = CliRunner().invoke(main, ["stats", "-c", str(_config(tmp_path))])
+        assert result.exit_code == 0, result.output
+        assert "1 LLM calls, 1 sessions, $0.5000" in result.output
+        assert "gpt-4o" in result.output
+        assert "1200ms" in result.output
+        assert "s-1" in result.output
+
+    def test_json(self, tmp_path: Path):
+        ledger = CostLedger(tmp_path / LEDGER_PATH)
+        ledger.append(_step("gpt-4o", cost=0.5), latency_s=1.2)
+        ledger.close()
+
+        result = CliRunner().invoke(
+            main, ["stats", "-c", str(_config(tmp_path)), "--days", "7", "--json"],
+        )
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert data["days"] == 7
+        assert data["totals"]["calls"] == 1
+        assert data["by_model"][0]["p95_latency_ms"] == 1200
@@ -0,0 +1,286 @@
+"""
+Tests para LocalLLMCache sobre SQLite (F14).
+
+Cubre:
+- get/set con upsert atómico y TTL por created_at
+- Totales mantenidos por triggers (stats sin recorrer entradas)
+- Límite de tamaño con evicción LRU por last_hit
+- Contadores de hits, misses y evicciones
+- clear() y limpieza de entradas del formato JSON anterior
+- Escrituras concurrentes desde varias conexiones
+- Claves por cadena de hashes de prefijo (cada mensaje se serializa una vez)
+- completion_stream consulta y escribe la cache
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from architect.llm.adapter import LLMResponse, StreamChunk
+from architect.llm.cache import LocalLLMCache, PrefixHasher
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _msgs(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+def _response(content: str = "ok") -> LLMResponse:
+    return LLMResponse(content=content, finish_reason="stop")
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    instance = LocalLLMCache(tmp_path, ttl_hours=1)
+    yield instance
+    instance.close()
+
+
+# ── Tests: get/set ────────────────────────────────────────────────────────
+
+
+class TestGetSet:
+    def test_miss_then_hit(self, cache: LocalLLMCache):
+        assert cache.get(_msgs("hola"), None) is None
+        cache.set(_msgs("hola"), None, _response("respuesta"))
+        cached = cache.get(_msgs("hola"), None)
+        assert cached is not None
+        assert cached.content == "respuesta"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_single_database_file(self, cache: LocalLLMCache, tmp_path: Path):
+        cache.set(_msgs("a"), None, _response())
+        cache.set(_msgs("b"), None, _response())
+        assert (tmp_path / "llm_cache.db").exists()
+        assert not list(tmp_path.glob("*.json"))
+
+    def test_upsert_replaces_without_double_counting(self, cache: LocalLLMCache):
+        cache.set(_msgs("a"), None, _response("v1"))
+        cache.set(_msgs("a"), None, _response("version 2"))
+        assert cache.get(_msgs("a"), None).content == "version 2"
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["total_size_bytes"] == len(_response("version 2").model_dump_json())
+
+    def test_expired_entry_is_miss(self, cache: LocalLLMCache):
+        cache.set(_msgs("a"), None, _response())
+        with patch("architect.llm.cache.time.time", return_value=time.time() + 7200):
+            assert cache.get(_msgs("a"), None) is None
+            assert cache.stats()["expired"] == 1
+
+    def test_persists_across_instances(self, tmp_path: Path):
+        first = LocalLLMCache(tmp_path)
+        first.set(_msgs("a"), None, _response("persistida"))
+        first.close()
+        second = LocalLLMCache(tmp_path)
+        assert second.get(_msgs("a"), None).content == "persistida"
+        second.close()
+
+
+# ── Tests: tamaño máximo y LRU ────────────────────────────────────────────
+
+
+class TestEviction:
+    def test_lru_entries_evicted_over_cap(self, tmp_path: Path):
+        cache = LocalLLMCache(tmp_path, max_size_mb=1)
+        big = "x" * 300_000
+        with patch("architect.llm.cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]):
+            cache.set(_msgs("a"), None, _response(big))
+            cache.set(_msgs("b"), None, _response(big))
+            cache.set(_msgs("c"), None, _response(big))
+            # Hit en "a": pasa a ser la más reciente
+            assert cache.get(_msgs("a"), None) is not None
+            cache.set(_msgs("d"), None, _response(big))
+
+        assert cache.evictions == 1
+        stats = cache.stats()
+        assert stats["entries"] == 3
+        assert stats["total_size_bytes"] <= 1024 * 1024
+        with patch("architect.llm.cache.time.time", return_value=10.0):
+            assert cache.get(_msgs("b"), None) is None
+            assert cache.get(_msgs("a"), None) is not None
+        cache.close()
+
+    def test_no_cap_when_zero(self, tmp_path: Path):
+        cache = LocalLLMCache(tmp_path, max_size_mb=0)
+        for i in range(5):
+            cache.set(_msgs(str(i)), None, _response("x" * 300_000))
+        assert cache.stats()["entries"] == 5
+        assert cache.evictions == 0
+        cache.close()
+
+
+# ── Tests: stats y clear ──────────────────────────────────────────────────
+
+
+class TestStatsAndClear:
+    def test_stats_counters(self, cache: LocalLLMCache):
+        cache.set(_msgs("a"), None, _response())
+        cache.get(_msgs("a"), None)
+        cache.get(_msgs("z"), None)
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 0)
+
+    def test_clear(self, cache: LocalLLMCache, tmp_path: Path):
+        cache.set(_msgs("a"), None, _response())
+        cache.set(_msgs("b"), None, _response())
+        (tmp_path / "0123abcd.json").write_text("{}")  # formato anterior
+        assert cache.clear() == 3
+        stats = cache.stats()
+        assert stats["entries"] == 0
+        assert stats["total_size_bytes"] == 0
+
+    def test_unusable_dir_fails_silently(self, tmp_path: Path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        cache = LocalLLMCache(blocker / "sub")
+        assert cache.get(_msgs("a"), None) is None
+        cache.set(_msgs("a"), None, _response())
+        assert cache.stats()["entries"] == 0
+
+
+# ── Tests: concurrencia ───────────────────────────────────────────────────
+
+
+class TestConcurrency:
+    def test_concurrent_writers_on_same_file(self, tmp_path: Path):
+        caches = [LocalLLMCache(tmp_path) for _ in range(4)]
+
+        def _writer(idx: int) -> None:
+            for i in range(25):
+                caches[idx].set(_msgs(f"{idx}-{i}"), None, _response(f"r{idx}-{i}"))
+
+        threads = [threading.Thread(target=_writer, args=(i,)) for i in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+        stats = caches[0].stats()
+        assert stats["entries"] == 100
+        assert caches[1].get(_msgs("3-24"), None).content == "r3-24"
+        for c in caches:
+            c.close()
+
+
+# ── Tests: claves por cadena de prefijo ───────────────────────────────────
+
+
+def _history(n: int) -> list[dict]:
+    return [{"role": "user", "content": f"mensaje {i}"} for i in range(n)]
+
+
+class TestPrefixHasher:
+    def test_deterministic_across_instances(self):
+        msgs, tools = _history(5), [{"name": "read_file"}]
+        assert PrefixHasher().key(msgs, tools) == PrefixHasher().key(list(msgs), list(tools))
+
+    def test_key_independent_of_dict_order(self):
+        a = [{"role": "user", "content": "x"}]
+        b = [{"content": "x", "role": "user"}]
+        assert PrefixHasher().key(a, None) == PrefixHasher().key(b, None)
+
+    def test_each_message_serialized_once(self):
+        hasher = PrefixHasher()
+        msgs, tools = _history(10), [{"name": "grep"}]
+        with patch("architect.llm.cache.json.dumps", wraps=json.dumps) as dumps:
+            hasher.key(msgs, tools)
+            assert dumps.call_count == 11  # 10 mensajes + tools
+            msgs.extend(_history(2))
+            hasher.key(msgs, tools)
+            assert dumps.call_count == 13  # solo los 2 nuevos
+
+    def test_stable_prefix_reported(self):
+        hasher = PrefixHasher()
+        msgs = _history(6)
+        hasher.key(msgs, None)
+        assert hasher.last_stable_prefix == 0
+        hasher.key(msgs + _history(1), None)
+        assert hasher.last_stable_prefix == 6
+        hasher.key([msgs[0], {"role": "assistant", "content": "summary"}, *msgs[4:]], None)
+        assert hasher.last_stable_prefix == 1
+
+    def test_in_place_edit_changes_key(self):
+        hasher = PrefixHasher()
+        msgs = _history(3)
+        before = hasher.key(msgs, None)
+        msgs[0]["content"] += " editado"
+        assert hasher.key(msgs, None) != before
+
+    def test_tools_change_key(self):
+        msgs = _history(2)
+        assert PrefixHasher().key(msgs, None) != PrefixHasher().key(msgs, [{"name": "grep"}])
+
+    def test_adapter_keys_original_messages(self, tmp_path: Path):
+        from architect.config.schema import LLMConfig
+        from architect.llm.adapter import LLMAdapter
+
+        cache = LocalLLMCache(tmp_path)
+        msgs = [{"role": "system", "content": "S"}, *_history(3)]
+        cache.set(msgs, None, _response("desde cache"))
+        adapter = LLMAdapter(
+            LLMConfig(model="claude-sonnet-4-6", prompt_caching=True), local_cache=cache,
+        )
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            assert adapter.completion(msgs).content == "desde cache"
+        cache.close()
+
+
+# ── Tests: streaming ──────────────────────────────────────────────────────
+
+
+def _raw_stream(parts: list[str]) -> list[SimpleNamespace]:
+    """Chunks de streaming de LiteLLM; el último trae finish_reason y usage."""
+    chunks = [
+        SimpleNamespace(
+            choices=[SimpleNamespace(
+                delta=SimpleNamespace(content=p, tool_calls=None), finish_reason=None,
+            )],
+            usage=None,
+        )
+        for p in parts
+    ]
+    chunks.append(SimpleNamespace(
+        choices=[SimpleNamespace(
+            delta=SimpleNamespace(content=None, tool_calls=None), finish_reason="stop",
+        )],
+        usage=SimpleNamespace(prompt_tokens=20, completion_tokens=5, total_tokens=25),
+    ))
+    return chunks
+
+
+class TestStreamingCache:
+    def _adapter(self, cache: LocalLLMCache):
+        from architect.config.schema import LLMConfig
+        from architect.llm.adapter import LLMAdapter
+
+        return LLMAdapter(LLMConfig(model="gpt-4o-mini"), local_cache=cache)
+
+    def test_hit_replayed_as_stream(self, cache: LocalLLMCache):
+        msgs = _history(3)
+        cache.set(msgs, None, _response("desde cache"))
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            items = list(self._adapter(cache).completion_stream(msgs))
+        assert items[0] == StreamChunk(type="content", data="desde cache")
+        assert isinstance(items[-1], LLMResponse)
+        assert items[-1].content == "desde cache"
+
+    def test_completed_stream_written_back(self, cache: LocalLLMCache):
+        msgs = _history(3)
+        adapter = self._adapter(cache)
+        with patch(
+            "architect.llm.adapter.litellm.completion", return_value=iter(_raw_stream(["a", "b"]))
+        ):
+            list(adapter.completion_stream(msgs))
+        assert cache.get(msgs, None).content == "ab"
+        # La segunda llamada (normal o streaming) ya no va al proveedor
+        with patch("architect.llm.adapter.litellm.completion", side_effect=AssertionError):
+            assert adapter.completion(msgs).content == "ab"
+            assert list(adapter.completion_stream(msgs))[-1].usage["total_tokens"] == 25
@@ -600,7 +600,7 @@ class TestPipelineRun:
         assert results[1].duration >= 0.0
 
     def test_run_passes_agent_and_model(self, workspace: Path) -> None:
-        """run() pasa agent y model al factory."""
+        """run() pasa agent, model y el nombre del paso al factory."""
         config = PipelineConfig(
             name="t",
             steps=[
@@ -611,7 +611,7 @@ class TestPipelineRun:
         runner = PipelineRunner(config, factory, str(workspace))
         runner.run()
 
-        factory.assert_called_once_with(agent="plan", model="gpt-4o")
+        factory.assert_called_once_with(agent="plan", model="gpt-4o", step_name="s1")
 
     def test_results_stored_on_runner(self, simple_config: PipelineConfig, workspace: Path) -> None:
         """run() almacena resultados en runner.results."""
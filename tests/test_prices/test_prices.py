@@ -0,0 +1,164 @@
+"""
+Tests para la resolución de precios del PriceLoader (F14).
+
+Cubre:
+- Trie de prefijos: gana el prefijo registrado más largo (gpt-4o-mini
+  frente a gpt-4o), prefijo de proveedor, alias sin proveedor de claves
+  como gemini/..., completado (claude-sonnet -> claude-sonnet-4), fallback
+- Memo por modelo: una resolución por nombre; refresh() e invalidate()
+  descartan la tabla cuando cambia el fichero de precios custom
+- explain(): regla, clave y fichero de origen
+- CLI: architect prices explain
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import structlog
+from click.testing import CliRunner
+
+from architect.cli import main
+from architect.costs.prices import PriceLoader
+
+
+@pytest.fixture
+def loader() -> PriceLoader:
+    return PriceLoader()
+
+
+def _write_prices(path: Path, prices: dict[str, tuple[float, float]]) -> Path:
+    path.write_text(json.dumps({
+        "_comment": "precios de prueba",
+        **{
+            key: {"input_per_million": inp, "output_per_million": out}
+            for key, (inp, out) in prices.items()
+        },
+    }))
+    return path
+
+
+# ── Tests: resolución ─────────────────────────────────────────────────────
+
+
+class TestResolution:
+    def test_exact(self, loader: PriceLoader):
+        resolution = loader.explain("gpt-4o")
+        assert resolution.rule == "exact"
+        assert resolution.matched_key == "gpt-4o"
+        assert resolution.pricing.input_per_million == 2.5
+
+    def test_longest_prefix_wins(self, loader: PriceLoader):
+        resolution = loader.explain("gpt-4o-mini-2024-07-18")
+        assert resolution.rule == "prefix"
+        assert resolution.matched_key == "gpt-4o-mini"
+        assert resolution.pricing.input_per_million == 0.15
+
+    def test_provider_prefix_is_stripped(self, loader: PriceLoader):
+        resolution = loader.explain("anthropic/claude-sonnet-4-6-20250514")
+        assert resolution.matched_key == "claude-sonnet-4-6"
+        assert resolution.matched_as == "claude-sonnet-4-6-20250514"
+
+    def test_provider_key_prefix(self, loader: PriceLoader):
+        resolution = loader.explain("ollama/llama3")
+        assert resolution.rule == "prefix"
+        assert resolution.matched_key == "ollama"
+        assert resolution.pricing.input_per_million == 0.0
+
+    def test_bare_alias_of_provider_key(self, loader: PriceLoader):
+        resolution = loader.explain("gemini-2.0-flash")
+        assert resolution.rule == "exact"
+        assert resolution.matched_key == "gemini/gemini-2.0-flash"
+
+    def test_completion(self, loader: PriceLoader):
+        resolution = loader.explain("claude-sonnet")
+        assert resolution.rule == "completion"
+        assert resolution.matched_key == "claude-sonnet-4"
+
+    def test_fallback(self, loader: PriceLoader):
+        resolution = loader.explain("modelo-desconocido-xyz")
+        assert resolution.rule == "fallback"
+        assert resolution.matched_key is None
+        pricing = resolution.pricing
+        assert (pricing.input_per_million, pricing.output_per_million) == (3.0, 15.0)
+        assert "fallback" in resolution.describe()
+
+
+# ── Tests: memo e invalidación ────────────────────────────────────────────
+
+
+class TestMemo:
+    def test_resolved_once_per_model(self, loader: PriceLoader):
+        with patch.object(loader, "_resolve", wraps=loader._resolve) as resolve:
+            for _ in range(5):
+                loader.get_prices("gpt-4o-mini-2024-07-18")
+            loader.get_prices("gpt-4o")
+        assert resolve.call_count == 2
+        assert loader.memo_size == 2
+
+    def test_invalidate(self, loader: PriceLoader):
+        loader.get_prices("gpt-4o")
+        loader.invalidate()
+        assert loader.memo_size == 0
+
+    def test_custom_prices_override_and_source(self, tmp_path: Path):
+        custom = _write_prices(
+            tmp_path / "precios.json", {"gpt-4o": (1.0, 2.0), "mi-modelo": (0.5, 1.0)},
+        )
+        loader = PriceLoader(custom_path=custom)
+        assert loader.get_prices("gpt-4o").input_per_million == 1.0
+        resolution = loader.explain("mi-modelo-v2")
+        assert resolution.matched_key == "mi-modelo"
+        assert resolution.source == str(custom)
+        assert loader.explain("claude-opus-4-6").source == "default prices"
+
+    def test_refresh_reloads_changed_custom_file(self, tmp_path: Path):
+        custom = _write_prices(tmp_path / "precios.json", {"mi-modelo": (0.5, 1.0)})
+        loader = PriceLoader(custom_path=custom)
+        assert loader.get_prices("mi-modelo").input_per_million == 0.5
+        assert loader.refresh() is False
+        assert loader.memo_size == 1
+
+        _write_prices(custom, {"mi-modelo": (0.7, 1.0)})
+        os.utime(custom, (1, 1))
+        assert loader.refresh() is True
+        assert loader.memo_size == 0
+        assert loader.get_prices("mi-modelo").input_per_million == 0.7
+
+    def test_refresh_without_custom_file(self, loader: PriceLoader):
+        assert loader.refresh() is False
+
+
+# ── Tests: CLI ────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def restore_logging():
+    """El comando configura structlog y handlers globales; se restauran al terminar."""
+    handlers = list(logging.root.handlers)
+    yield
+    logging.root.handlers = handlers
+    structlog.reset_defaults()
+
+
+@pytest.mark.usefixtures("restore_logging")
+class TestPricesExplainCommand:
+    def test_explain_models(self, tmp_path: Path):
+        result = CliRunner().invoke(
+            main, ["prices", "explain", "openai/gpt-4o-mini-2024-07-18", "desconocido"],
+        )
+        assert result.exit_code == 0, result.output
+        assert "longest registered prefix 'gpt-4o-mini'" in result.output
+        assert "input $0.15/M" in result.output
+        assert "generic fallback" in result.output
+
+    def test_explain_with_prices_file(self, tmp_path: Path):
+        custom = _write_prices(tmp_path / "precios.json", {"mi-modelo": (0.5, 1.0)})
+        result = CliRunner().invoke(
+            main, ["prices", "explain", "mi-modelo", "--prices-file", str(custom)],
+        )
+        assert result.exit_code == 0, result.output
+        assert f"exact key 'mi-modelo' from {custom}" in result.output
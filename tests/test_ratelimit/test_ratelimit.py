@@ -0,0 +1,156 @@
+"""
+Tests para el rate limiter RPM/TPM compartido entre procesos (F14).
+
+Cubre:
+- Buckets de peticiones y de tokens con recarga continua
+- Espera (en lugar de error) cuando no hay capacidad
+- Estado compartido entre instancias sobre el mismo fichero SQLite
+- settle() con el usage real y penalize() con retry-after
+- Integración con LLMAdapter (throttle antes de cada llamada, 429 → penalización)
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from architect.llm.ratelimit import RateLimiter, estimate_tokens
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+class _FakeClock:
+    """Reloj simulado: sleep() avanza time() sin esperar de verdad."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+        self.slept: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = _FakeClock()
+    with patch("architect.llm.ratelimit.time.time", fake.time), \
+            patch("architect.llm.ratelimit.time.sleep", fake.sleep):
+        yield fake
+
+
+def _limiter(tmp_path: Path, **kwargs) -> RateLimiter:
+    return RateLimiter("gpt-4o||KEY", state_path=tmp_path / "ratelimit.db", **kwargs)
+
+
+# ── Tests: buckets ────────────────────────────────────────────────────────
+
+
+class TestBuckets:
+    def test_disabled_never_waits(self, tmp_path: Path, clock: _FakeClock):
+        limiter = _limiter(tmp_path)
+        for _ in range(100):
+            assert limiter.acquire(10_000) == 0.0
+        assert clock.slept == []
+
+    def test_rpm_waits_for_refill(self, tmp_path: Path, clock: _FakeClock):
+        limiter = _limiter(tmp_path, rpm=2)
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        # Tercera petición: 1 token de peticiones tarda 30 s en recargarse
+        assert limiter.acquire() == pytest.approx(30.0)
+        assert limiter.waited_seconds == pytest.approx(30.0)
+
+    def test_tpm_waits_for_tokens(self, tmp_path: Path, clock: _FakeClock):
+        limiter = _limiter(tmp_path, tpm=600)
+        assert limiter.acquire(500) == 0.0
+        # Quedan 100; faltan 200 a 10 tokens/s → 20 s
+        assert limiter.acquire(300) == pytest.approx(20.0)
+
+    def test_request_larger_than_capacity_proceeds(self, tmp_path: Path, clock: _FakeClock):
+        limiter = _limiter(tmp_path, tpm=100)
+        assert limiter.acquire(1000) == 0.0
+
+    def test_shared_between_instances(self, tmp_path: Path, clock: _FakeClock):
+        first = _limiter(tmp_path, rpm=1)
+        second = _limiter(tmp_path, rpm=1)
+        assert first.acquire() == 0.0
+        assert second.acquire() == pytest.approx(60.0)
+
+    def test_settle_charges_real_usage(self, tmp_path: Path, clock: _FakeClock):
+        limiter = _limiter(tmp_path, tpm=600)
+        limiter.acquire(100)
+        limiter.settle(estimated=100, actual=600)
+        # 600 reales: el bucket queda vacío; 100 tokens a 10 tokens/s → 10 s
+        assert limiter.acquire(100) == pytest.approx(10.0)
+
+    def test_penalize_blocks_everyone(self, tmp_path: Path, clock: _FakeClock):
+        first = _limiter(tmp_path, rpm=1000)
+        second = _limiter(tmp_path, rpm=1000)
+        first.penalize(12.0)
+        assert second.acquire() >= 12.0
+
+
+class TestEstimate:
+    def test_counts_content_and_tool_arguments(self):
+        msgs = [
+            {"role": "user", "content": "x" * 400},
+            {"role": "assistant", "content": None, "tool_calls": [
+                {"function": {"name": "grep", "arguments": "y" * 40}},
+            ]},
+        ]
+        assert estimate_tokens(msgs) == 110 + 8
+
+
+# ── Tests: integración con el adapter ─────────────────────────────────────
+
+
+class TestAdapterIntegration:
+    def _adapter(self, tmp_path: Path, **limits):
+        from architect.config.schema import LLMConfig
+        from architect.llm.adapter import LLMAdapter
+
+        with patch("architect.llm.ratelimit.DEFAULT_STATE_PATH", tmp_path / "rl.db"):
+            return LLMAdapter(LLMConfig(model="gpt-4o-mini", retries=1, **limits))
+
+    def test_no_limiter_without_limits(self, tmp_path: Path):
+        assert self._adapter(tmp_path)._rate_limiter is None
+
+    def test_completion_throttled(self, tmp_path: Path):
+        adapter = self._adapter(tmp_path, rpm_limit=60)
+        raw = SimpleNamespace(
+            choices=[SimpleNamespace(
+                message=SimpleNamespace(content="ok", tool_calls=None), finish_reason="stop",
+            )],
+            usage=SimpleNamespace(prompt_tokens=5, completion_tokens=1, total_tokens=6),
+        )
+        with patch.object(adapter._rate_limiter, "acquire", return_value=0.0) as acquire, \
+                patch("architect.llm.adapter.litellm.completion", return_value=raw):
+            adapter.completion([{"role": "user", "content": "hola"}])
+        acquire.assert_called_once()
+
+    def test_retry_after_header_penalizes(self, tmp_path: Path):
+        import litellm
+
+        adapter = self._adapter(tmp_path, rpm_limit=60)
+        error = litellm.RateLimitError("429", llm_provider="openai", model="gpt-4o-mini")
+        error.litellm_response_headers = {"retry-after": "7"}
+        with patch.object(adapter._rate_limiter, "penalize") as penalize, \
+                patch("architect.llm.adapter.litellm.completion", side_effect=error), \
+                patch("tenacity.nap.time.sleep"), \
+                pytest.raises(litellm.RateLimitError):
+            adapter.completion([{"role": "user", "content": "hola"}])
+        penalize.assert_called_once_with(7.0)
+
+    def test_retry_after_ms_preferred(self):
+        from architect.llm.adapter import LLMAdapter
+
+        exc = SimpleNamespace(
+            litellm_response_headers={"retry-after-ms": "1500", "retry-after": "2"},
+        )
+        assert LLMAdapter._retry_after_seconds(exc) == 1.5
+        assert LLMAdapter._retry_after_seconds(SimpleNamespace()) is None
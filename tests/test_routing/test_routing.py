@@ -0,0 +1,241 @@
+"""
+Tests para el enrutado entre varios api_base con latencia EWMA y hedging (F14).
+
+Cubre:
+- Ranking: endpoints sin medir primero, después por latencia EWMA
+- Endpoints con errores salen del ranking durante el cooldown
+- Hedging: segunda petición al superar el p95; gana la primera respuesta
+- close(): libera los hilos de hedging (router, LLMAdapter y ModelCascade)
+- Integración con LLMAdapter contra servidores stub OpenAI-compatibles locales
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from architect.llm.routing import EndpointRouter
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _completion_body(text: str) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "stub",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+    }).encode()
+
+
+class _StubServer:
+    """Servidor /chat/completions local con latencia y respuesta configurables."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False) -> None:
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):  # noqa: N802
+                stub.hits += 1
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(stub.delay)
+                if stub.fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = _completion_body(stub.name)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def servers():
+    created: list[_StubServer] = []
+
+    def make(name: str, delay: float = 0.0, fail: bool = False) -> _StubServer:
+        server = _StubServer(name, delay, fail)
+        created.append(server)
+        return server
+
+    yield make
+    for server in created:
+        server.close()
+
+
+# ── Tests: router ─────────────────────────────────────────────────────────
+
+
+class TestRanking:
+    def test_unmeasured_first_then_fastest(self):
+        router = EndpointRouter(["a", "b", "c"])
+        router.record_success("a", 0.5)
+        router.record_success("b", 0.1)
+        assert router.ranked() == ["c", "b", "a"]
+
+    def test_unhealthy_endpoint_demoted(self):
+        router = EndpointRouter(["a", "b"])
+        router.record_success("a", 0.1)
+        router.record_success("b", 0.9)
+        for _ in range(3):
+            router.record_failure("a")
+        assert router.ranked() == ["b", "a"]
+
+    def test_recent_error_loses_tie_with_unmeasured(self):
+        router = EndpointRouter(["a", "b"])
+        router.record_failure("a")
+        assert router.ranked() == ["b", "a"]
+
+    def test_successes_restore_health(self):
+        router = EndpointRouter(["a"])
+        router.record_failure("a")
+        for _ in range(5):
+            router.record_success("a", 0.1)
+        assert router.stats()[0]["error_ewma"] < 0.1
+
+    def test_requires_endpoints(self):
+        with pytest.raises(ValueError):
+            EndpointRouter([])
+
+
+class TestHedging:
+    def _warm(self, router: EndpointRouter, url: str, latency: float) -> None:
+        for _ in range(10):
+            router.record_success(url, latency)
+
+    def test_no_hedge_without_samples(self):
+        router = EndpointRouter(["a", "b"], hedge=True)
+        calls: list[str] = []
+        assert router.call(lambda url: calls.append(url) or url) == "a"
+        assert calls == ["a"]
+
+    def test_slow_primary_hedged_and_backup_wins(self):
+        router = EndpointRouter(["a", "b"], hedge=True)
+        self._warm(router, "a", 0.01)
+        self._warm(router, "b", 0.02)
+
+        def fn(url: str) -> str:
+            time.sleep(0.5 if url == "a" else 0.0)
+            return url
+
+        started = time.monotonic()
+        assert router.call(fn) == "b"
+        assert time.monotonic() - started < 0.4
+        assert router.stats()[1]["hedges_won"] == 1
+        router.close()
+
+    def test_fast_primary_not_hedged(self):
+        router = EndpointRouter(["a", "b"], hedge=True)
+        self._warm(router, "a", 0.2)
+        self._warm(router, "b", 0.3)
+        calls: list[str] = []
+        assert router.call(lambda url: calls.append(url) or url) == "a"
+        assert calls == ["a"]
+        router.close()
+
+    def test_failed_primary_falls_back_to_hedge(self):
+        router = EndpointRouter(["a", "b"], hedge=True)
+        self._warm(router, "a", 0.01)
+        self._warm(router, "b", 0.02)
+
+        def fn(url: str) -> str:
+            if url == "a":
+                time.sleep(0.1)
+                raise ConnectionError("a caído")
+            time.sleep(0.2)
+            return url
+
+        assert router.call(fn) == "b"
+        router.close()
+
+    def test_close_stops_hedge_threads(self):
+        router = EndpointRouter(["a", "b"], hedge=True)
+        self._warm(router, "a", 0.01)
+        self._warm(router, "b", 0.01)
+        assert router.call(lambda url: time.sleep(0.05) or url) in ("a", "b")
+        threads = [t for t in threading.enumerate() if t.name.startswith("architect-hedge")]
+        assert threads
+        router.close()
+        router.close()  # idempotente
+        for t in threads:
+            t.join(timeout=2)
+        assert not any(t.is_alive() for t in threads)
+        # El router sigue usable: el pool se vuelve a crear al cubrir otra llamada
+        assert router.call(lambda url: time.sleep(0.05) or url) in ("a", "b")
+        router.close()
+
+
+# ── Tests: integración con LLMAdapter ─────────────────────────────────────
+
+
+class TestAdapterRouting:
+    def _adapter(self, urls: list[str], monkeypatch, hedge: bool = False):
+        from architect.config.schema import LLMConfig
+        from architect.llm.adapter import LLMAdapter
+
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-stub")
+        return LLMAdapter(LLMConfig(
+            model="openai/stub", api_bases=urls, hedge_requests=hedge, retries=1, timeout=5,
+        ))
+
+    def test_routes_to_fastest_stub(self, servers, monkeypatch):
+        slow = servers("lento", delay=0.3)
+        fast = servers("rapido")
+        adapter = self._adapter([slow.url, fast.url], monkeypatch)
+        msgs = [{"role": "user", "content": "hola"}]
+        # Las dos primeras llamadas miden cada endpoint; después gana el rápido
+        for _ in range(2):
+            adapter.completion(msgs)
+        answers = [adapter.completion(msgs).content for _ in range(3)]
+        assert answers == ["rapido"] * 3
+        assert slow.hits == 1
+
+    def test_failing_stub_skipped_after_retry(self, servers, monkeypatch):
+        from tenacity import wait_none
+
+        monkeypatch.setattr("architect.llm.adapter.wait_exponential", lambda **kw: wait_none())
+        broken = servers("roto", fail=True)
+        healthy = servers("sano")
+        adapter = self._adapter([broken.url, healthy.url], monkeypatch)
+        assert adapter.completion([{"role": "user", "content": "hola"}]).content == "sano"
+        stats = {s["url"]: s for s in adapter.endpoint_stats}
+        assert stats[broken.url]["errors"] >= 1
+
+    def test_adapter_and_cascade_close_routers(self, monkeypatch):
+        from unittest.mock import patch
+
+        from architect.config.schema import LLMModelsConfig
+        from architect.llm.cascade import ModelCascade
+
+        adapter = self._adapter(["http://a", "http://b"], monkeypatch, hedge=True)
+        cascade = ModelCascade(adapter, LLMModelsConfig(summary="openai/mini"))
+        derived = cascade.adapter("summary")
+        with patch.object(EndpointRouter, "close", autospec=True) as close:
+            cascade.close()
+        assert {c.args[0] for c in close.call_args_list} == {adapter._router, derived._router}
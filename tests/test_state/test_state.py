@@ -0,0 +1,169 @@
+"""
+Tests para AgentState con memoria acotada.
+
+Cubre:
+- StepResult / ToolCallResult con __slots__
+- BlobStore: escritura deduplicada, carga y limpieza
+- Spill a disco de outputs grandes y carga perezosa con full_output
+- AgentLoop: el almacén de blobs se borra al terminar la sesión
+- Benchmark de memoria (tracemalloc) de una sesión sintética de 500 pasos
+"""
+
+import tracemalloc
+from unittest.mock import MagicMock
+
+import pytest
+
+from architect.core.blobs import BlobStore
+from architect.core.state import AgentState, StepResult, ToolCallResult
+from architect.llm.adapter import LLMResponse
+from architect.tools.base import ToolResult
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _tool_call(output: str, success: bool = True) -> ToolCallResult:
+    return ToolCallResult(
+        tool_name="run_command",
+        args={"command": "pytest"},
+        result=ToolResult(success=success, output=output),
+    )
+
+
+def _step(i: int, output: str) -> StepResult:
+    return StepResult(
+        step_number=i,
+        llm_response=LLMResponse(finish_reason="tool_calls"),
+        tool_calls_made=[_tool_call(output)],
+    )
+
+
+@pytest.fixture
+def store():
+    blob_store = BlobStore("test")
+    yield blob_store
+    blob_store.close()
+
+
+# ── Tests: slots ──────────────────────────────────────────────────────────
+
+
+class TestSlots:
+    def test_no_instance_dict(self):
+        assert not hasattr(_tool_call("x"), "__dict__")
+        assert not hasattr(_step(1, "x"), "__dict__")
+
+    def test_still_frozen(self):
+        tc = _tool_call("x")
+        with pytest.raises(AttributeError):
+            tc.tool_name = "other"  # type: ignore[misc]
+
+
+# ── Tests: BlobStore ──────────────────────────────────────────────────────
+
+
+class TestBlobStore:
+    def test_put_and_load(self, store: BlobStore):
+        ref = store.put("hello ✓")
+        assert ref.load() == "hello ✓"
+        assert ref.size == 7
+
+    def test_deduplicates_content(self, store: BlobStore):
+        a = store.put("same" * 100)
+        b = store.put("same" * 100)
+        assert a.path == b.path
+        assert store.bytes_written == 400
+
+    def test_close_removes_directory(self):
+        blob_store = BlobStore()
+        root = blob_store.root
+        blob_store.put("data")
+        blob_store.close()
+        assert not root.exists()
+
+
+# ── Tests: spill ──────────────────────────────────────────────────────────
+
+
+class TestSpill:
+    def test_small_output_kept_in_memory(self, store: BlobStore):
+        tc = _tool_call("short")
+        assert tc.spill(store, 100) is tc
+        assert tc.full_output == "short"
+
+    def test_large_output_spilled_and_loaded_lazily(self, store: BlobStore):
+        output = "line\n" * 2000
+        spilled = _tool_call(output).spill(store, 1000)
+        assert spilled.output_ref is not None
+        assert len(spilled.result.output) < 1000
+        assert spilled.result.output.startswith("line\n")
+        assert spilled.full_output == output
+        assert spilled.result.success is True
+
+    def test_add_step_spills_when_configured(self, store: BlobStore):
+        state = AgentState(blob_store=store, spill_threshold=1000)
+        state.add_step(_step(1, "x" * 5000))
+        tc = state.steps[0].tool_calls_made[0]
+        assert tc.output_ref is not None
+        assert tc.full_output == "x" * 5000
+
+    def test_add_step_without_store_keeps_output(self):
+        state = AgentState()
+        step = _step(1, "x" * 5000)
+        state.add_step(step)
+        assert state.steps[0] is step
+
+    def test_output_dict_unaffected(self, store: BlobStore):
+        state = AgentState(blob_store=store, spill_threshold=1000)
+        state.add_step(_step(1, "x" * 5000))
+        output = state.to_output_dict()
+        assert output["tools_used"] == [{"name": "run_command", "success": True}]
+
+
+class TestLoopLifecycle:
+    def test_loop_closes_blob_store_at_session_end(self):
+        from architect.config.schema import AgentConfig, ContextConfig
+        from architect.core.context import ContextManager
+        from architect.core.loop import AgentLoop
+
+        llm = MagicMock()
+        llm.config.model = "gpt-4o"
+        llm.completion.return_value = LLMResponse(content="listo", finish_reason="stop")
+        ctx = MagicMock()
+        ctx.build_initial.return_value = [{"role": "user", "content": "x"}]
+
+        loop = AgentLoop(
+            llm, MagicMock(), AgentConfig(system_prompt="s", max_steps=3), ctx,
+            context_manager=ContextManager(ContextConfig(spill_tool_output_chars=1000)),
+        )
+        loop.hlog = MagicMock()
+        state = loop.run("tarea", stream=False)
+
+        assert state.blob_store is not None
+        assert not state.blob_store.root.exists()
+
+
+# ── Benchmark: memoria de una sesión de 500 pasos ─────────────────────────
+
+
+def _session_memory(state: AgentState, steps: int = 500, size: int = 20_000) -> int:
+    """Memoria retenida (bytes) tras registrar `steps` pasos sintéticos."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(steps):
+            state.add_step(_step(i, f"{i:05d}" + "o" * size))
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+class TestMemoryBenchmark:
+    def test_spilling_bounds_memory_of_500_step_session(self, store: BlobStore):
+        in_memory = _session_memory(AgentState())
+        spilled = _session_memory(AgentState(blob_store=store, spill_threshold=8000))
+
+        # 500 outputs de ~20 KB -> ~10 MB en memoria sin spill
+        assert in_memory > 500 * 20_000
+        assert spilled < in_memory / 4
+        assert store.bytes_written >= 500 * 20_000
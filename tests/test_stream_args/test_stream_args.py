@@ -0,0 +1,217 @@
+"""
+Tests para la acumulación incremental de argumentos de tool calls en streaming.
+
+Cubre:
+- ToolArgsBuffer: detección del cierre del objeto JSON fragmento a fragmento
+  (llaves y comillas escapadas dentro de strings), JSON inválido, contenido
+  tras el cierre
+- Volcado a fichero temporal al superar el umbral, sin perder contenido
+- completion_stream: emite StreamChunk(type="tool_call") en cuanto los
+  argumentos de una llamada están completos, antes del final del stream
+- completion_stream libera los ficheros temporales de los buffers también
+  si el stream falla o el consumidor lo abandona antes de terminar
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from architect.config.schema import LLMConfig
+from architect.llm import LLMAdapter, LLMResponse, StreamChunk
+from architect.llm.streamjson import ToolArgsBuffer
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+
+def _feed_all(buffer: ToolArgsBuffer, fragments: list[str]) -> list[bool]:
+    return [buffer.feed(f) for f in fragments]
+
+
+def _tc_chunk(index: int, *, id=None, name=None, args=None) -> SimpleNamespace:
+    """Chunk de streaming con un fragmento de tool call."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            delta=SimpleNamespace(
+                content=None,
+                tool_calls=[SimpleNamespace(
+                    index=index,
+                    id=id,
+                    function=SimpleNamespace(name=name, arguments=args),
+                )],
+            ),
+            finish_reason=None,
+        )],
+        usage=None,
+    )
+
+
+def _final_chunk() -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            delta=SimpleNamespace(content=None, tool_calls=None), finish_reason="tool_calls",
+        )],
+        usage=SimpleNamespace(prompt_tokens=20, completion_tokens=5, total_tokens=25),
+    )
+
+
+# ── Tests: ToolArgsBuffer ─────────────────────────────────────────────────
+
+
+class TestToolArgsBuffer:
+    def test_completes_on_last_fragment(self):
+        buffer = ToolArgsBuffer()
+        flags = _feed_all(buffer, ['{"pa', 'th": "a.py", ', '"n": [1, {"x": 2}]', "}"])
+        assert flags == [False, False, False, True]
+        assert buffer.ready
+        assert buffer.parsed() == {"path": "a.py", "n": [1, {"x": 2}]}
+
+    def test_braces_and_escaped_quotes_inside_strings(self):
+        buffer = ToolArgsBuffer()
+        payload = json.dumps({"content": 'def f():\n    return {"a": "}\\"{"}\n'})
+        flags = _feed_all(buffer, [payload[i:i + 3] for i in range(0, len(payload), 3)])
+        assert flags.count(True) == 1 and flags[-1] is True
+        assert buffer.parsed() == json.loads(payload)
+
+    def test_invalid_json_is_not_ready(self):
+        buffer = ToolArgsBuffer()
+        assert buffer.feed('{"a": tru}') is False
+        assert buffer.complete
+        assert not buffer.ready
+        assert buffer.parsed() is None
+        assert buffer.text() == '{"a": tru}'
+
+    def test_trailing_content_revokes_ready(self):
+        buffer = ToolArgsBuffer()
+        assert buffer.feed('{"a": 1}') is True
+        buffer.feed("  ")
+        assert buffer.ready
+        buffer.feed("{}")
+        assert not buffer.ready
+        assert buffer.parsed() is None
+
+    def test_non_object_top_level_is_not_ready(self):
+        buffer = ToolArgsBuffer()
+        _feed_all(buffer, ["[1, ", "2]"])
+        assert buffer.complete
+        assert not buffer.ready
+
+    def test_incomplete_is_not_ready(self):
+        buffer = ToolArgsBuffer()
+        _feed_all(buffer, ['{"a": {"b": 1}', ', "c": "}"'])
+        assert not buffer.complete
+        assert buffer.parsed() is None
+
+    def test_spills_to_temp_file_above_threshold(self):
+        buffer = ToolArgsBuffer(spool_threshold=64)
+        content = "x" * 500
+        payload = json.dumps({"path": "big.txt", "content": content})
+        _feed_all(buffer, [payload[i:i + 10] for i in range(0, len(payload), 10)])
+        assert buffer.spilled
+        assert buffer.size == len(payload)
+        assert buffer.text() == payload
+        assert buffer.parsed()["content"] == content
+        buffer.close()
+        assert not buffer.spilled
+
+    def test_small_arguments_stay_in_memory(self):
+        buffer = ToolArgsBuffer(spool_threshold=64)
+        buffer.feed('{"a": 1}')
+        assert not buffer.spilled
+
+
+# ── Tests: completion_stream ──────────────────────────────────────────────
+
+
+class TestCompletionStream:
+    def _run(self, chunks: list) -> list:
+        adapter = LLMAdapter(LLMConfig(model="gpt-4o-mini"))
+        with patch("architect.llm.adapter.litellm.completion", return_value=iter(chunks)):
+            return list(adapter.completion_stream([{"role": "user", "content": "hola"}]))
+
+    def test_tool_call_chunk_before_stream_end(self):
+        items = self._run([
+            _tc_chunk(0, id="call_1", name="write_file", args='{"path": "a.py", '),
+            _tc_chunk(0, args='"content": "print(1)"}'),
+            _tc_chunk(1, id="call_2", name="read_file", args='{"path": '),
+            _tc_chunk(1, args='"b.py"}'),
+            _final_chunk(),
+        ])
+        ready = [json.loads(i.data) for i in items if isinstance(i, StreamChunk)]
+        assert ready == [
+            {"index": 0, "id": "call_1", "name": "write_file"},
+            {"index": 1, "id": "call_2", "name": "read_file"},
+        ]
+        response = items[-1]
+        assert isinstance(response, LLMResponse)
+        assert [tc.arguments for tc in response.tool_calls] == [
+            {"path": "a.py", "content": "print(1)"},
+            {"path": "b.py"},
+        ]
+
+    def test_invalid_arguments_fall_back_to_empty_dict(self):
+        items = self._run([
+            _tc_chunk(0, id="call_1", name="read_file", args='{"path": '),
+            _final_chunk(),
+        ])
+        assert not [i for i in items if isinstance(i, StreamChunk)]
+        assert items[-1].tool_calls[0].arguments == {}
+
+    @pytest.mark.parametrize("size", [10, 300_000])
+    def test_large_arguments_roundtrip(self, size: int):
+        content = "línea\n" * size
+        payload = json.dumps({"path": "big.txt", "content": content})
+        pieces = [payload[i:i + 4096] for i in range(0, len(payload), 4096)]
+        chunks = [_tc_chunk(0, id="call_1", name="write_file", args=pieces[0])]
+        chunks += [_tc_chunk(0, args=p) for p in pieces[1:]]
+        items = self._run(chunks + [_final_chunk()])
+        assert items[-1].tool_calls[0].arguments["content"] == content
+
+
+class TestBufferRelease:
+    """Los buffers volcados a disco se cierran aunque el stream no termine."""
+
+    def _stream(self, chunks):
+        buffers: list[ToolArgsBuffer] = []
+
+        class _TrackedBuffer(ToolArgsBuffer):
+            def __init__(self) -> None:
+                super().__init__(spool_threshold=16)
+                buffers.append(self)
+
+        adapter = LLMAdapter(LLMConfig(model="gpt-4o-mini"))
+        patches = (
+            patch("architect.llm.adapter.ToolArgsBuffer", _TrackedBuffer),
+            patch("architect.llm.adapter.litellm.completion", return_value=chunks),
+        )
+        return adapter, patches, buffers
+
+    def test_released_when_stream_fails(self):
+        def chunks():
+            yield _tc_chunk(0, id="call_1", name="write_file", args='{"path": "a.py", ')
+            yield _tc_chunk(0, args='"content": "' + "x" * 64)
+            raise ConnectionError("conexión cortada")
+
+        adapter, patches, buffers = self._stream(chunks())
+        with patches[0], patches[1], pytest.raises(ConnectionError):
+            list(adapter.completion_stream([{"role": "user", "content": "hola"}]))
+        assert buffers and buffers[0].size > 16
+        assert not buffers[0].spilled
+
+    def test_released_when_consumer_stops_early(self):
+        chunks = iter([
+            _tc_chunk(0, id="call_1", name="write_file", args='{"path": "a.py", "c": "'),
+            _tc_chunk(0, args="x" * 64 + '"}'),
+            _tc_chunk(1, id="call_2", name="read_file", args='{"path": "' + "y" * 64),
+            _final_chunk(),
+        ])
+        adapter, patches, buffers = self._stream(chunks)
+        with patches[0], patches[1]:
+            stream = adapter.completion_stream([{"role": "user", "content": "hola"}])
+            first = next(stream)
+            assert first.type == "tool_call"
+            stream.close()
+        assert len(buffers) == 1
+        assert buffers[0].size > 16
+        assert not buffers[0].spilled